@@ -56,6 +56,7 @@ setup(
     ],
     extras_require={
         "redis": ["redis[hiredis]>=4.5.0"],
+        "speedups": ["orjson>=3.8.0"],
         "dev": [
             "pytest>=7.4.0",
             "pytest-asyncio>=0.21.0",
@@ -76,6 +77,9 @@ setup(
     entry_points={
         "console_scripts": [
             "extended-memory-mcp-server=extended_memory_mcp.server:mcp_server_entry",
+            "extended-memory-mcp-daemon=extended_memory_mcp.daemon:mcp_daemon_entry",
+            "extended-memory-mcp-shim=extended_memory_mcp.daemon:mcp_shim_entry",
+            "extended-memory-mcp-http=extended_memory_mcp.http_server:mcp_http_entry",
         ],
     },
 )
@@ -28,7 +28,7 @@ Loads tool descriptions from external markdown files for better maintainability.
 import json
 import logging
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional
 
 
 class ToolDescriptionsLoader:
@@ -147,6 +147,51 @@ class ToolDescriptionsLoader:
             raise KeyError(f"Schema not found for tool: {tool_name}")
         return schemas[tool_name]
 
+    def validate(self, tool_names: Iterable[str]) -> List[str]:
+        """
+        Check that descriptions and schemas agree with the served tool list.
+
+        Args:
+            tool_names: Names of the tools the server exposes
+
+        Returns:
+            List of problems found (empty if consistent)
+        """
+        tool_names = list(tool_names)
+        problems = []
+
+        try:
+            schemas = self.load_input_schemas()
+        except Exception as e:
+            return [f"Cannot load input schemas: {e}"]
+
+        for tool_name in tool_names:
+            try:
+                if not self.load_tool_description(tool_name):
+                    problems.append(f"Description for {tool_name} is empty")
+            except Exception as e:
+                problems.append(f"Cannot load description for {tool_name}: {e}")
+
+            schema = schemas.get(tool_name)
+            if schema is None:
+                problems.append(f"Schema not found for tool: {tool_name}")
+                continue
+
+            properties = schema.get("properties")
+            if schema.get("type") != "object" or not isinstance(properties, dict):
+                problems.append(f"Schema for {tool_name} must be an object with properties")
+                continue
+
+            for field in schema.get("required", []):
+                if field not in properties:
+                    problems.append(f"Schema for {tool_name} requires undefined field: {field}")
+
+        for tool_name in schemas:
+            if tool_name not in tool_names:
+                problems.append(f"Schema defined for unknown tool: {tool_name}")
+
+        return problems
+
 
 def create_tool_descriptions_loader(config_dir: Optional[Path] = None) -> ToolDescriptionsLoader:
     """
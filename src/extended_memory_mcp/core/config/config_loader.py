@@ -79,6 +79,14 @@ class ConfigLoader:
                 "storage": {
                     "sqlite_default_path": "~/.local/share/extended-memory-mcp/memory.db",
                     "connection_timeout": 30.0,
+                    "sqlite_reader_connections": 4,
+                    "pragma_profile": "balanced",
+                    "pragma_settings": {},
+                    "batch_chunk_size": 500,
+                    "write_window_ms": 0,
+                    "write_batch_size": 64,
+                    "content_compression": "none",
+                    "content_compression_min_bytes": 4096,
                     "redis_key_prefix": "extended_memory",
                     "redis_ttl_hours": 8760,
                     "redis_socket_timeout": 30.0,
@@ -93,12 +101,48 @@ class ConfigLoader:
                     "version": "1.0.0",
                     "description": "Persistent memory for cross-chat interactions",
                     "mcp_timeout": 30.0,
+                    "max_request_size_mb": 10,
+                    "max_concurrent_requests": 8,
+                    "json_backend": "auto",
+                    "daemon_socket_path": None,
+                    "daemon_idle_timeout": 300,
+                    "http_host": "127.0.0.1",
+                    "http_port": 8765,
+                    "http_max_connections": 64,
+                    "http_keepalive_timeout": 30.0,
+                    "http_max_sessions": 256,
+                    "http_session_idle_timeout": 3600.0,
                 },
                 "memory": {
                     "default_importance_threshold": 5,
+                    "max_contexts_per_project": 10000,
                     "max_search_results": 20,
                     "similarity_threshold": 0.8,
                 },
+                "retention": {
+                    "working_memory_hours": 24,
+                    "project_context_months": 6,
+                    "critical_decisions_years": 1,
+                    "archive_threshold": 3,
+                    "critical_threshold": 8,
+                    "sweep_batch_size": 500,
+                },
+                "maintenance": {
+                    "enabled": True,
+                    "startup_delay_seconds": 60,
+                    "expire_contexts": {"interval_seconds": 3600, "budget_seconds": 5},
+                    "cleanup_unused_tags": {"interval_seconds": 21600, "budget_seconds": 2},
+                    "wal_checkpoint": {"interval_seconds": 300, "budget_seconds": 1},
+                    "optimize": {"interval_seconds": 86400, "budget_seconds": 5},
+                    "incremental_vacuum": {"interval_seconds": 86400, "budget_seconds": 2},
+                },
+                "search": {
+                    "bm25_weight": 1.0,
+                    "importance_weight": 0.5,
+                    "recency_weight": 0.5,
+                    "recency_half_life_days": 30,
+                    "snippet_tokens": 24,
+                },
             }
         }
 
@@ -31,8 +31,6 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, Optional
 
-from jinja2 import Environment, FileSystemLoader, Template
-
 
 def is_safe_path(file_path: str) -> bool:
     """
@@ -98,7 +96,20 @@ class InstructionManager:
             instructions_dir = current_dir.parent / "config" / "instructions"
 
         self.instructions_dir = Path(instructions_dir)
-        self.env = Environment(
+        self._env = None
+
+    @property
+    def env(self):
+        """Jinja2 environment for instruction templates (jinja2 is imported on first use)"""
+        if self._env is None:
+            self._env = self._create_environment()
+        return self._env
+
+    def _create_environment(self):
+        """Create Jinja2 environment for templates in instructions_dir"""
+        from jinja2 import Environment, FileSystemLoader
+
+        return Environment(
             loader=FileSystemLoader(str(self.instructions_dir)),
             trim_blocks=True,
             lstrip_blocks=True,
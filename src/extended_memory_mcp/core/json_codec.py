@@ -0,0 +1,241 @@
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+JSON Codec
+
+Single JSON encode/decode entry point for the protocol and storage layers.
+Uses orjson or msgspec when installed and falls back to the stdlib `json`
+module otherwise.
+
+All backends produce UTF-8 JSON without ASCII escaping. Decode errors are
+raised as ValueError regardless of backend. Values a fast backend cannot
+represent (e.g. integers wider than 64 bits) are encoded with the stdlib.
+
+PreEncodedJSON lets constant values be encoded once and reused as bytes.
+"""
+
+import json
+import logging
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# Backend preference for "auto"
+BACKENDS = ("orjson", "msgspec", "json")
+
+
+class JSONCodec:
+    """
+    JSON encoder/decoder backed by the fastest available library.
+
+    Responsibilities:
+    - Encode objects to JSON bytes or str (compact or indented)
+    - Decode JSON from bytes or str
+    - Keep stdlib-compatible semantics across backends
+    """
+
+    def __init__(self, backend: str = "auto"):
+        """
+        Initialize JSON codec.
+
+        Args:
+            backend: "auto", "orjson", "msgspec" or "json"
+
+        Raises:
+            ValueError: If backend is unknown or not installed
+        """
+        self.name = self._resolve_backend(backend)
+
+        if self.name == "orjson":
+            self._encode = self._orjson_encode
+            self._decode = orjson.loads
+            self._encode_errors = (TypeError,)
+        elif self.name == "msgspec":
+            self._msgspec_encoder = msgspec.json.Encoder()
+            self._msgspec_decoder = msgspec.json.Decoder()
+            self._encode = self._msgspec_encode
+            self._decode = self._msgspec_decode
+            self._encode_errors = (TypeError, OverflowError, msgspec.EncodeError)
+        else:
+            self._encode = self._stdlib_encode
+            self._decode = json.loads
+            self._encode_errors = ()
+
+    @staticmethod
+    def _resolve_backend(backend: str) -> str:
+        """Pick installed backend for requested name"""
+        available = {"orjson": orjson is not None, "msgspec": msgspec is not None, "json": True}
+
+        if backend == "auto":
+            return next(name for name in BACKENDS if available[name])
+
+        if backend not in available:
+            raise ValueError(f"Unknown JSON backend: {backend}")
+        if not available[backend]:
+            raise ValueError(f"JSON backend '{backend}' is not installed")
+        return backend
+
+    def dumps_bytes(self, obj: Any, indent: bool = False) -> bytes:
+        """
+        Encode object as UTF-8 JSON bytes.
+
+        Args:
+            obj: JSON-serializable object
+            indent: Pretty-print with 2-space indentation
+
+        Returns:
+            Encoded JSON
+        """
+        try:
+            return self._encode(obj, indent)
+        except self._encode_errors:
+            # Fast backends are stricter than the stdlib (big ints, non-str keys)
+            return self._stdlib_encode(obj, indent)
+
+    def dumps(self, obj: Any, indent: bool = False) -> str:
+        """
+        Encode object as JSON string.
+
+        Args:
+            obj: JSON-serializable object
+            indent: Pretty-print with 2-space indentation
+
+        Returns:
+            Encoded JSON
+        """
+        return self.dumps_bytes(obj, indent).decode("utf-8")
+
+    def loads(self, data: Union[str, bytes, bytearray]) -> Any:
+        """
+        Decode JSON document.
+
+        Args:
+            data: JSON text as str or UTF-8 bytes
+
+        Returns:
+            Decoded object
+
+        Raises:
+            ValueError: If data is not valid JSON
+        """
+        return self._decode(data)
+
+    @staticmethod
+    def _stdlib_encode(obj: Any, indent: bool) -> bytes:
+        """Encode with stdlib json"""
+        if indent:
+            return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    @staticmethod
+    def _orjson_encode(obj: Any, indent: bool) -> bytes:
+        """Encode with orjson"""
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+
+    def _msgspec_encode(self, obj: Any, indent: bool) -> bytes:
+        """Encode with msgspec"""
+        data = self._msgspec_encoder.encode(obj)
+        if indent:
+            return msgspec.json.format(data, indent=2)
+        return data
+
+    def _msgspec_decode(self, data: Union[str, bytes, bytearray]) -> Any:
+        """Decode with msgspec, raising ValueError like the other backends"""
+        try:
+            return self._msgspec_decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+
+_codec: Optional[JSONCodec] = None
+
+
+def create_json_codec(backend: Optional[str] = None) -> JSONCodec:
+    """
+    Factory function to create JSON codec.
+
+    Args:
+        backend: Backend name (default: defaults.server.json_backend, "auto")
+
+    Returns:
+        Configured JSONCodec instance
+    """
+    if backend is None:
+        from extended_memory_mcp.core.config import get_default
+
+        backend = get_default("server.json_backend", "auto")
+
+    try:
+        return JSONCodec(backend)
+    except ValueError as e:
+        logging.getLogger("MemoryMCP.JSONCodec").warning(f"{e}, falling back to auto")
+        return JSONCodec("auto")
+
+
+def get_json_codec() -> JSONCodec:
+    """Get process-wide JSON codec (created on first use)"""
+    global _codec
+    if _codec is None:
+        _codec = create_json_codec()
+    return _codec
+
+
+class PreEncodedJSON(dict):
+    """
+    JSON object that carries its own encoding.
+
+    Behaves as a normal dict for readers, while writers that know about it
+    (JSONRPCResponseBuilder.encode_response_json) emit `encoded` directly.
+    Treat instances as read-only: the bytes are not updated on mutation.
+    """
+
+    __slots__ = ("encoded",)
+
+    def __init__(self, value: dict):
+        super().__init__(value)
+        self.encoded = dumps_bytes(value)
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """Encode object as JSON string with the process-wide codec"""
+    return get_json_codec().dumps(obj, indent)
+
+
+def dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+    """Encode object as UTF-8 JSON bytes with the process-wide codec"""
+    return get_json_codec().dumps_bytes(obj, indent)
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """Decode JSON document with the process-wide codec"""
+    return get_json_codec().loads(data)
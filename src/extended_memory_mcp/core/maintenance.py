@@ -0,0 +1,321 @@
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Maintenance - periodic housekeeping jobs run in the background of the server.
+
+The storage provider names its jobs (IStorageProvider.maintenance_jobs):
+- expire_contexts: retention sweep (cleanup_expired), every provider
+- cleanup_unused_tags, wal_checkpoint, optimize (PRAGMA optimize, i.e.
+  ANALYZE where statistics are stale) and incremental_vacuum: SQLite
+
+Each job has its own interval and per-run time budget from
+defaults.maintenance.<job>. Jobs run one at a time, start only while no
+client request is in flight, and call budget.checkpoint() between steps:
+it waits while requests are in flight and tells the job to stop once its
+budget is spent. Single-statement jobs are bounded by the statement itself
+(PASSIVE checkpoints, a sampled ANALYZE). status() reports the runs,
+durations and last result of every job.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .errors import error_handler
+
+logger = logging.getLogger(__name__)
+
+# (interval_seconds, budget_seconds) per job; an interval of 0 disables the job
+DEFAULT_JOB_SETTINGS: Dict[str, Dict[str, float]] = {
+    "expire_contexts": {"interval_seconds": 3600, "budget_seconds": 5.0},
+    "cleanup_unused_tags": {"interval_seconds": 21600, "budget_seconds": 2.0},
+    "wal_checkpoint": {"interval_seconds": 300, "budget_seconds": 1.0},
+    "optimize": {"interval_seconds": 86400, "budget_seconds": 5.0},
+    "incremental_vacuum": {"interval_seconds": 86400, "budget_seconds": 2.0},
+}
+DEFAULT_INTERVAL_SECONDS = 3600.0
+DEFAULT_BUDGET_SECONDS = 1.0
+
+# Delay before the first run of every job, so startup is not slowed down
+DEFAULT_STARTUP_DELAY = 60.0
+
+# Seconds between checks of whether client requests are still in flight
+IDLE_POLL_INTERVAL = 0.05
+
+JobFunction = Callable[["MaintenanceBudget"], Awaitable[Any]]
+
+
+class MaintenanceBudget:
+    """Time budget of one job run, checked by the job between its steps"""
+
+    def __init__(
+        self,
+        seconds: float,
+        is_busy: Callable[[], bool] = lambda: False,
+        poll_interval: float = IDLE_POLL_INTERVAL,
+    ):
+        self.seconds = seconds
+        self.is_busy = is_busy
+        self.poll_interval = poll_interval
+        self.deadline = asyncio.get_running_loop().time() + seconds
+        # Times the job waited for client requests to finish
+        self.yields = 0
+
+    def remaining(self) -> float:
+        """Seconds left (negative once spent)"""
+        return self.deadline - asyncio.get_running_loop().time()
+
+    def expired(self) -> bool:
+        """Whether the budget is spent"""
+        return self.remaining() <= 0
+
+    async def checkpoint(self) -> bool:
+        """
+        Let other tasks run, waiting while client requests are in flight.
+
+        Returns:
+            True if the job may take another step, False once the budget is spent
+        """
+        await asyncio.sleep(0)
+        while self.is_busy() and not self.expired():
+            self.yields += 1
+            await asyncio.sleep(min(self.poll_interval, max(self.remaining(), 0)))
+        return not self.expired()
+
+
+async def next_step(budget: Optional[MaintenanceBudget]) -> bool:
+    """Between the steps of a job: yield to other tasks, False once the budget is spent"""
+    if budget is None:
+        await asyncio.sleep(0)
+        return True
+    return await budget.checkpoint()
+
+
+class MaintenanceJob:
+    """One periodic job and the history operators see in status()"""
+
+    def __init__(self, name: str, run: JobFunction, interval: float, budget: float):
+        self.name = name
+        self.run = run
+        self.interval = interval
+        self.budget = budget
+        # Event loop time of the next run
+        self.next_run = 0.0
+
+        self.runs = 0
+        self.failures = 0
+        self.over_budget = 0
+        self.last_started_ms: Optional[int] = None
+        self.last_duration_ms: Optional[float] = None
+        self.max_duration_ms = 0.0
+        self.total_duration_ms = 0.0
+        self.last_result: Any = None
+        self.last_error: Optional[str] = None
+        self.last_yields = 0
+
+    def status(self) -> Dict[str, Any]:
+        """Run statistics of this job"""
+        return {
+            "interval_seconds": self.interval,
+            "budget_seconds": self.budget,
+            "runs": self.runs,
+            "failures": self.failures,
+            "over_budget": self.over_budget,
+            "last_started_ms": self.last_started_ms,
+            "last_duration_ms": self.last_duration_ms,
+            "max_duration_ms": self.max_duration_ms,
+            "average_duration_ms": self.total_duration_ms / self.runs if self.runs else None,
+            "last_result": self.last_result,
+            "last_error": self.last_error,
+            "last_yields": self.last_yields,
+        }
+
+
+class MaintenanceScheduler:
+    """
+    Runs maintenance jobs in one background task, between client requests.
+
+    Responsibilities:
+    - Run each job after its interval, one job at a time
+    - Hold jobs back while client requests are in flight
+    - Record durations, results and errors per job
+    """
+
+    def __init__(
+        self,
+        jobs: List[MaintenanceJob],
+        is_busy: Callable[[], bool] = lambda: False,
+        startup_delay: float = DEFAULT_STARTUP_DELAY,
+        poll_interval: float = IDLE_POLL_INTERVAL,
+    ):
+        """
+        Initialize maintenance scheduler.
+
+        Args:
+            jobs: Jobs to run (those with an interval of 0 never run)
+            is_busy: Returns True while client requests are in flight
+            startup_delay: Seconds after start() before the first runs
+            poll_interval: Seconds between is_busy checks while waiting
+        """
+        self.jobs = {job.name: job for job in jobs if job.interval > 0}
+        self.is_busy = is_busy
+        self.startup_delay = startup_delay
+        self.poll_interval = poll_interval
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background task is active"""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background task (no-op without jobs or when already running)"""
+        if self.running or not self.jobs:
+            return
+        first_run = asyncio.get_running_loop().time() + self.startup_delay
+        for job in self.jobs.values():
+            job.next_run = first_run
+        self._task = asyncio.create_task(self._run_forever())
+
+    async def close(self) -> None:
+        """Stop the background task, interrupting the current job"""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def run_job(self, name: str) -> Any:
+        """
+        Run one job now, whatever its schedule, and record the run.
+
+        Returns:
+            The job's result (None if it failed)
+        """
+        job = self.jobs[name]
+        loop = asyncio.get_running_loop()
+        budget = MaintenanceBudget(job.budget, self.is_busy, self.poll_interval)
+        job.last_started_ms = time.time_ns() // 1_000_000
+        started = time.perf_counter()
+        try:
+            job.last_result = await job.run(budget)
+            job.last_error = None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.failures += 1
+            job.last_result = None
+            job.last_error = error_handler.handle_error(
+                e, context={"job": name}, operation="maintenance_job"
+            ).message
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            job.runs += 1
+            job.last_duration_ms = duration_ms
+            job.total_duration_ms += duration_ms
+            job.max_duration_ms = max(job.max_duration_ms, duration_ms)
+            job.last_yields = budget.yields
+            if duration_ms > job.budget * 1000:
+                job.over_budget += 1
+            job.next_run = loop.time() + job.interval
+
+        logger.debug(
+            f"Maintenance job {name} took {duration_ms:.1f} ms: "
+            f"{job.last_error or job.last_result}"
+        )
+        return job.last_result
+
+    async def run_due(self) -> List[str]:
+        """Run every job whose time has come, each once no request is in flight"""
+        loop = asyncio.get_running_loop()
+        ran = []
+        for job in sorted(self.jobs.values(), key=lambda j: j.next_run):
+            if job.next_run > loop.time():
+                continue
+            await self.wait_idle()
+            await self.run_job(job.name)
+            ran.append(job.name)
+        return ran
+
+    async def wait_idle(self) -> None:
+        """Wait until no client request is in flight"""
+        while self.is_busy():
+            await asyncio.sleep(self.poll_interval)
+
+    async def _run_forever(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            next_run = min(job.next_run for job in self.jobs.values())
+            await asyncio.sleep(max(next_run - loop.time(), 0))
+            await self.run_due()
+
+    def status(self) -> Dict[str, Any]:
+        """Scheduler state and per-job statistics"""
+        return {
+            "running": self.running,
+            "jobs": {name: job.status() for name, job in self.jobs.items()},
+        }
+
+
+def create_maintenance_scheduler(
+    jobs: Dict[str, JobFunction],
+    is_busy: Callable[[], bool] = lambda: False,
+    settings: Optional[Dict[str, Dict[str, float]]] = None,
+    startup_delay: Optional[float] = None,
+) -> MaintenanceScheduler:
+    """
+    Factory function to create Maintenance Scheduler.
+
+    Args:
+        jobs: Job functions by name (see IStorageProvider.maintenance_jobs)
+        is_busy: Returns True while client requests are in flight
+        settings: interval_seconds / budget_seconds per job name
+            (default: defaults.maintenance.<job>)
+        startup_delay: Seconds before the first runs
+            (default: defaults.maintenance.startup_delay_seconds)
+
+    Returns:
+        Scheduler; it has no jobs when defaults.maintenance.enabled is false
+    """
+    from .config import get_default
+
+    if not get_default("maintenance.enabled", True):
+        jobs = {}
+    if startup_delay is None:
+        startup_delay = get_default("maintenance.startup_delay_seconds", DEFAULT_STARTUP_DELAY)
+
+    scheduled = []
+    for name, run in jobs.items():
+        job_settings = dict(DEFAULT_JOB_SETTINGS.get(name, {}))
+        job_settings.update(get_default(f"maintenance.{name}", None) or {})
+        job_settings.update((settings or {}).get(name, {}))
+        scheduled.append(
+            MaintenanceJob(
+                name,
+                run,
+                interval=float(job_settings.get("interval_seconds", DEFAULT_INTERVAL_SECONDS)),
+                budget=float(job_settings.get("budget_seconds", DEFAULT_BUDGET_SECONDS)),
+            )
+        )
+
+    return MaintenanceScheduler(scheduled, is_busy=is_busy, startup_delay=float(startup_delay))
@@ -0,0 +1,281 @@
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Connection Pool - Long-lived aiosqlite connections for one database file.
+
+Responsible for:
+- One writer connection, used by one caller at a time
+- Up to N read-only connections for concurrent readers (WAL mode)
+- Applying PRAGMA settings (see pragma_profiles) and the schema's SQL
+  functions (see migrations) once, when a connection is opened
+- Interrupting statements of cancelled callers
+"""
+
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Any, Dict, List, Optional, Set
+
+import aiosqlite
+
+from .migrations import register_sql_functions
+from .pragma_profiles import create_pragma_settings, pragma_statements, resolve_pragma_settings
+
+logger = logging.getLogger(__name__)
+
+# Default number of read-only connections
+DEFAULT_READERS = 4
+
+
+class PooledConnection:
+    """
+    Async context manager that leases a pooled connection to one caller.
+
+    On exit the connection goes back to the pool. Uncommitted work is rolled
+    back, matching what closing a per-call connection used to do. When the
+    block exits because the caller was cancelled, the running statement is
+    interrupted first: aiosqlite runs statements in a worker thread, so
+    cancelling the awaiting task alone does not stop them.
+    """
+
+    def __init__(self, pool: "SQLiteConnectionPool", readonly: bool):
+        self._pool = pool
+        self._readonly = readonly
+        self._connection: Optional[aiosqlite.Connection] = None
+
+    async def __aenter__(self) -> aiosqlite.Connection:
+        self._connection = await self._pool.acquire(self._readonly)
+        return self._connection
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        connection, self._connection = self._connection, None
+        healthy = True
+        try:
+            if exc_type is not None and issubclass(exc_type, asyncio.CancelledError):
+                await connection.interrupt()
+            if connection.in_transaction:
+                await connection.rollback()
+        except Exception as e:
+            logger.warning(f"Discarding pooled connection after failed reset: {e}")
+            healthy = False
+        finally:
+            await self._pool.release(connection, self._readonly, healthy)
+
+
+class SQLiteConnectionPool:
+    """
+    Pool of persistent aiosqlite connections.
+
+    Connections are opened on first use and kept until close(). SQLite allows
+    a single writer at a time, so all writes share one connection and callers
+    queue for it; reads run on separate read-only connections.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        readers: int = DEFAULT_READERS,
+        pragmas: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initialize connection pool.
+
+        Args:
+            db_path: SQLite database file path
+            readers: Maximum number of read-only connections (0: reads use the writer)
+            pragmas: Resolved PRAGMA settings (default: the balanced profile)
+        """
+        self.db_path = db_path
+        # Every connection to :memory: is a separate database
+        self.max_readers = 0 if db_path == ":memory:" else max(0, int(readers))
+        self.pragmas = pragmas if pragmas is not None else resolve_pragma_settings()
+
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._idle_readers: List[aiosqlite.Connection] = []
+        self._open_readers = 0
+
+        # Every open connection, so a pool dropped without close() still closes them
+        self._connections: Set[aiosqlite.Connection] = set()
+        weakref.finalize(self, _close_abandoned, self._connections)
+
+        # Created on first use, inside the running event loop
+        self._writer_lock: Optional[asyncio.Lock] = None
+        self._reader_slots: Optional[asyncio.Semaphore] = None
+
+    @property
+    def open_connections(self) -> int:
+        """Number of currently open connections"""
+        return self._open_readers + (1 if self._writer is not None else 0)
+
+    def connection(self, readonly: bool = False) -> PooledConnection:
+        """
+        Lease a connection for the duration of an `async with` block.
+
+        Args:
+            readonly: Use a read-only connection instead of the writer
+
+        Returns:
+            Async context manager yielding an aiosqlite connection
+        """
+        return PooledConnection(self, readonly and self.max_readers > 0)
+
+    async def acquire(self, readonly: bool = False) -> aiosqlite.Connection:
+        """Take a connection out of the pool (prefer connection())"""
+        if self._writer_lock is None:
+            self._writer_lock = asyncio.Lock()
+            self._reader_slots = asyncio.Semaphore(max(1, self.max_readers))
+
+        if not readonly:
+            await self._writer_lock.acquire()
+            try:
+                if self._writer is None:
+                    self._writer = await self._open(readonly=False)
+            except BaseException:
+                self._writer_lock.release()
+                raise
+            return self._writer
+
+        await self._reader_slots.acquire()
+        try:
+            if self._idle_readers:
+                return self._idle_readers.pop()
+            # Schema setup and WAL mode come from the writer
+            if self._writer is None:
+                async with self.connection():
+                    pass
+            connection = await self._open(readonly=True)
+            self._open_readers += 1
+            return connection
+        except BaseException:
+            self._reader_slots.release()
+            raise
+
+    async def release(
+        self, connection: aiosqlite.Connection, readonly: bool, healthy: bool = True
+    ) -> None:
+        """Return a connection taken with acquire()"""
+        if not readonly:
+            if not healthy and connection is self._writer:
+                self._writer = None
+                await self._close_quietly(connection)
+            self._writer_lock.release()
+            return
+
+        if healthy:
+            self._idle_readers.append(connection)
+        else:
+            self._open_readers -= 1
+            await self._close_quietly(connection)
+        self._reader_slots.release()
+
+    async def close(self) -> None:
+        """Close all connections (the pool reopens them if used again)"""
+        idle, self._idle_readers = self._idle_readers, []
+        self._open_readers -= len(idle)
+        for connection in idle:
+            await self._close_quietly(connection)
+
+        if self._writer is not None:
+            # Wait for the current writer to finish its statement
+            async with self._writer_lock:
+                writer, self._writer = self._writer, None
+                if writer is not None:
+                    await self._close_quietly(writer)
+
+    async def _open(self, readonly: bool) -> aiosqlite.Connection:
+        """Open a connection and apply its PRAGMAs"""
+        connection = aiosqlite.connect(self.db_path)
+        # A pool that is never closed must not keep the interpreter alive
+        worker = getattr(connection, "_thread", connection)
+        if isinstance(worker, threading.Thread):
+            worker.daemon = True
+        await connection
+
+        try:
+            await connection.execute("PRAGMA foreign_keys = ON")
+            for statement in pragma_statements(self.pragmas, readonly):
+                await connection.execute(statement)
+            if readonly:
+                await connection.execute("PRAGMA query_only = ON")
+            await register_sql_functions(connection)
+        except BaseException:
+            await self._close_quietly(connection)
+            raise
+
+        self._connections.add(connection)
+        logger.debug(f"Opened {'reader' if readonly else 'writer'} connection to {self.db_path}")
+        return connection
+
+    async def _close_quietly(self, connection: aiosqlite.Connection) -> None:
+        """Close connection, ignoring errors from an already broken one"""
+        self._connections.discard(connection)
+        try:
+            await connection.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled connection: {e}")
+
+
+def _close_abandoned(connections: Set[aiosqlite.Connection]) -> None:
+    """Close connections of a pool that was garbage collected (or alive at exit) unclosed"""
+    if not connections:
+        return
+    abandoned = list(connections)
+    connections.clear()
+
+    async def close_all():
+        for connection in abandoned:
+            try:
+                await connection.close()
+            except Exception as e:
+                logger.debug(f"Error closing abandoned connection: {e}")
+
+    # The loop that opened them may be closed or closing, so close them on a
+    # private loop in a helper thread (joined unless a loop is running here)
+    closer = threading.Thread(target=asyncio.run, args=(close_all(),), daemon=True)
+    closer.start()
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        closer.join()
+
+
+def create_connection_pool(
+    db_path: str, readers: Optional[int] = None, profile: Optional[str] = None
+) -> SQLiteConnectionPool:
+    """
+    Factory function to create SQLite connection pool.
+
+    Args:
+        db_path: SQLite database file path
+        readers: Read-only connections (default: defaults.storage.sqlite_reader_connections)
+        profile: PRAGMA profile name (default: from configuration, see pragma_profiles)
+
+    Returns:
+        Configured SQLiteConnectionPool instance
+    """
+    from ..config import get_default
+
+    if readers is None:
+        readers = get_default("storage.sqlite_reader_connections", DEFAULT_READERS)
+
+    return SQLiteConnectionPool(db_path, readers=readers, pragmas=create_pragma_settings(profile))
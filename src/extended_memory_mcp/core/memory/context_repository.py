@@ -29,15 +29,69 @@ Responsible for:
 """
 
 import logging
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import aiosqlite
 
+from extended_memory_mcp.core.errors import StorageError
+from extended_memory_mcp.core.storage.content_codec import (
+    ContentCodec,
+    create_content_codec,
+    decompress,
+)
+from extended_memory_mcp.core.storage.storage_utils import search_words
+from extended_memory_mcp.core.storage.timestamps import MS_PER_DAY, now_ms, present_context
+
 from .database_manager import DatabaseManager
+from .migrations import FTS_TABLE, PLAIN_CONTENT_FUNCTION
+from .tags_repository import link_context_tags, normalize_tags
 
 logger = logging.getLogger(__name__)
 
+# Columns read by row_to_context (qualified for the full-text join)
+CONTEXT_COLUMNS = (
+    "contexts.id, contexts.project_id, contexts.content, contexts.importance_level,"
+    " contexts.status, contexts.created_ms, contexts.expires_ms, contexts.content_codec"
+)
+
+# Text of contexts.content in SQL; only compressed rows call the function
+PLAIN_CONTENT = (
+    f"IIF(content_codec IS NULL, content, {PLAIN_CONTENT_FUNCTION}(content, content_codec))"
+)
+
+
+def row_to_context(row: Tuple[Any, ...]) -> Dict[str, Any]:
+    """Context dict of a CONTEXT_COLUMNS row (content decompressed, timestamps derived)"""
+    return present_context(
+        {
+            "id": row[0],
+            "project_id": row[1],
+            "content": decompress(row[2], row[7]),
+            "importance_level": row[3],
+            "status": row[4],
+            "created_ms": row[5],
+            "expires_ms": row[6],
+        }
+    )
+
+
+def build_fts_query(term: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Each word becomes a quoted term and all words must match, so user input
+    never reaches the FTS5 query syntax. Prefix terms ("word"*) are avoided
+    on purpose: FTS5 merges their whole doclist before returning a row,
+    which defeats the newest-first LIMIT scan for common words.
+
+    Returns:
+        MATCH expression, or None if the text holds no searchable words
+    """
+    words = search_words(term)
+    if not words:
+        return None
+    return " ".join(f'"{word}"' for word in words)
+
 
 class ContextRepository:
     """
@@ -45,8 +99,9 @@ class ContextRepository:
     Simple CRUD without business logic - that stays in services.
     """
 
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, content_codec: Optional[ContentCodec] = None):
         self.db_manager = db_manager
+        self.content_codec = content_codec or create_content_codec()
 
     async def save_context(
         self,
@@ -54,14 +109,20 @@ class ContextRepository:
         importance_level: int,
         project_id: Optional[str] = None,
         tags: Optional[List[str]] = None,
+        lifetime_ms: Optional[int] = None,
     ) -> Optional[int]:
         """
         Save context to database (Claude controls all parameters)
 
+        The context row and its tags are written together, in a transaction
+        shared with concurrent saves (see write_queue).
+
         Args:
             content: The context content
             importance_level: 1-10, Claude's importance rating
             project_id: Project isolation (None for global)
+            tags: Tags for searchability
+            lifetime_ms: Expiry after creation in ms (None: never expires)
 
         Returns:
             Context ID if successful, None if failed
@@ -69,43 +130,122 @@ class ContextRepository:
         try:
             # Ensure database is initialized
             await self.db_manager.ensure_database()
+            # Compressed before queueing: the writer is not held for it
+            stored, codec = self.content_codec.compress(content)
 
-            async with self.db_manager.get_connection() as db:
-                # Enable foreign keys
-                await db.execute("PRAGMA foreign_keys = ON")
-
+            async def insert(db: aiosqlite.Connection) -> Tuple[int, int]:
+                created_ms = now_ms()
                 # Insert context without context_type field
                 cursor = await db.execute(
                     """
                     INSERT INTO contexts (
-                        project_id, content,
-                        importance_level, created_at
-                    ) VALUES (?, ?, ?, ?)
+                        project_id, content, content_codec,
+                        importance_level, created_ms, expires_ms
+                    ) VALUES (?, ?, ?, ?, ?, ?)
                 """,
                     (
                         project_id,
-                        content,
+                        stored,
+                        codec,
                         importance_level,
-                        datetime.now().isoformat(),
+                        created_ms,
+                        None if lifetime_ms is None else created_ms + lifetime_ms,
                     ),
                 )
-
                 context_id = cursor.lastrowid
-                await db.commit()
+                return context_id, await link_context_tags(db, context_id, tags)
+
+            context_id, tag_count = await self.db_manager.write(insert)
 
-                logger.info(f"Saved context {context_id} for project {project_id}")
-                return context_id
+            logger.info(
+                f"Saved context {context_id} for project {project_id} with {tag_count} tags"
+            )
+            return context_id
 
         except Exception as e:
             logger.error(f"Failed to save context: {e}")
             return None
 
+    async def save_contexts_batch(self, contexts: List[Dict[str, Any]]) -> List[int]:
+        """
+        Save several contexts and their tags in one write of the write queue.
+
+        Rows are inserted with executemany and tags linked with two more
+        executemany calls, whatever the number of contexts.
+
+        Args:
+            contexts: Validated items with content, importance_level, project_id,
+                tags and optionally lifetime_ms (expiry after creation)
+
+        Returns:
+            Context IDs in input order
+
+        Raises:
+            Exception: If the write fails (nothing from the batch is kept)
+        """
+        if not contexts:
+            return []
+
+        await self.db_manager.ensure_database()
+        stored = [self.content_codec.compress(c["content"]) for c in contexts]
+
+        async def insert(db: aiosqlite.Connection) -> List[int]:
+            created_ms = now_ms()
+            await db.executemany(
+                """
+                INSERT INTO contexts (
+                    project_id, content, content_codec, importance_level, created_ms, expires_ms
+                ) VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        c.get("project_id"),
+                        content,
+                        codec,
+                        c["importance_level"],
+                        created_ms,
+                        None if c.get("lifetime_ms") is None else created_ms + c["lifetime_ms"],
+                    )
+                    for c, (content, codec) in zip(contexts, stored)
+                ],
+            )
+
+            # One writer, one statement: AUTOINCREMENT ids of the batch are consecutive
+            async with db.execute("SELECT last_insert_rowid()") as cursor:
+                last_id = (await cursor.fetchone())[0]
+            context_ids = list(range(last_id - len(contexts) + 1, last_id + 1))
+
+            links = [
+                (context_id, tag)
+                for context_id, context in zip(context_ids, contexts)
+                for tag in normalize_tags(context.get("tags"))
+            ]
+            if links:
+                await db.executemany(
+                    "INSERT OR IGNORE INTO tags (name) VALUES (?)",
+                    [(tag,) for tag in dict.fromkeys(tag for _, tag in links)],
+                )
+                await db.executemany(
+                    """
+                    INSERT OR IGNORE INTO context_tags (context_id, tag_id)
+                    SELECT ?, id FROM tags WHERE name = ?
+                    """,
+                    links,
+                )
+            return context_ids
+
+        context_ids = await self.db_manager.write(insert)
+        logger.info(f"Saved batch of {len(context_ids)} contexts")
+        return context_ids
+
     async def load_contexts(
         self,
         project_id: Optional[str] = None,
         importance_min: int = 7,
         limit: int = 50,
         offset: int = 0,
+        before: Optional[Tuple[int, int]] = None,
+        tags: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Load contexts with filtering (Claude-controlled parameters)
@@ -114,7 +254,10 @@ class ContextRepository:
             project_id: Filter by project (None for all projects)
             importance_min: Minimum importance level (default: 7)
             limit: Maximum number of contexts to return
-            offset: Skip this many contexts (pagination)
+            offset: Skip this many contexts (prefer `before` for deep pages)
+            before: (created_ms, id) key; only contexts after it in
+                newest-first order are returned (keyset pagination)
+            tags: Only contexts having any of these tags
 
         Returns:
             List of context dictionaries sorted chronologically (newest first, returned oldest first)
@@ -122,7 +265,7 @@ class ContextRepository:
         try:
             await self.db_manager.ensure_database()
 
-            async with self.db_manager.get_connection() as db:
+            async with self.db_manager.get_connection(readonly=True) as db:
                 # Build dynamic query
                 where_conditions = ["importance_level >= ?"]
                 params = [importance_min]
@@ -131,42 +274,51 @@ class ContextRepository:
                     where_conditions.append("project_id = ?")
                     params.append(project_id)
 
+                tag_names = normalize_tags(tags or [])
+                if tag_names:
+                    placeholders = ",".join("?" * len(tag_names))
+                    # Correlated probe of the context_tags key, so the rows
+                    # still come off the timeline index in order
+                    where_conditions.append(
+                        f"""EXISTS (
+                            SELECT 1 FROM context_tags ct
+                            JOIN tags t ON t.id = ct.tag_id
+                            WHERE ct.context_id = contexts.id AND t.name IN ({placeholders})
+                        )"""
+                    )
+                    params.extend(tag_names)
+
                 where_clause = " AND ".join(where_conditions)
+                select = f"""
+                    SELECT {CONTEXT_COLUMNS}
+                    FROM contexts
+                    WHERE {where_clause}"""
+
+                if before is None:
+                    query = select
+                else:
+                    # Keyset seek in two index ranges merged in order: the rest of
+                    # the cursor's timestamp, then older ones. A row-value
+                    # (created_ms, id) < (?, ?) would walk every row sharing the
+                    # timestamp, and batch saves share one per chunk.
+                    query = (
+                        f"{select} AND created_ms = ? AND id < ?"
+                        f" UNION ALL {select} AND created_ms < ?"
+                    )
+                    params = [*params, *before, *params, before[0]]
                 params.extend([limit, offset])
 
-                # Build the complete query safely - search newest first, return oldest first
-                query = (
-                    """
-                    SELECT id, project_id, content,
-                           importance_level, status, created_at,
-                           expires_at
-                    FROM contexts
-                    WHERE """
-                    + where_clause
-                    + """
-                    ORDER BY created_at DESC, id DESC
+                # Search newest first, return oldest first
+                query += """
+                    ORDER BY created_ms DESC, id DESC
                     LIMIT ? OFFSET ?
                 """
-                )
 
                 cursor = await db.execute(query, params)
 
                 rows = await cursor.fetchall()
 
-                contexts = []
-                for row in rows:
-                    context = {
-                        "id": row[0],
-                        "project_id": row[1],
-                        "content": row[2],
-                        "importance_level": row[3],
-                        "status": row[4],
-                        "created_at": row[5],
-                        "expires_at": row[6],
-                    }
-                    contexts.append(context)
-
-                return contexts
+                return [row_to_context(row) for row in rows]
 
         except Exception as e:
             logger.error(f"Failed to load contexts: {e}")
@@ -175,14 +327,9 @@ class ContextRepository:
     async def get_context_by_id(self, context_id: int) -> Optional[Dict[str, Any]]:
         """Get single context by ID"""
         try:
-            async with self.db_manager.get_connection() as db:
+            async with self.db_manager.get_connection(readonly=True) as db:
                 cursor = await db.execute(
-                    """
-                    SELECT id, project_id, content,
-                           importance_level, status, created_at,
-                           expires_at
-                    FROM contexts WHERE id = ?
-                """,
+                    f"SELECT {CONTEXT_COLUMNS} FROM contexts WHERE id = ?",
                     (context_id,),
                 )
 
@@ -190,15 +337,7 @@ class ContextRepository:
                 if not row:
                     return None
 
-                return {
-                    "id": row[0],
-                    "project_id": row[1],
-                    "content": row[2],
-                    "importance_level": row[3],
-                    "status": row[4],
-                    "created_at": row[5],
-                    "expires_at": row[6],
-                }
+                return row_to_context(row)
 
         except Exception as e:
             logger.error(f"Failed to get context {context_id}: {e}")
@@ -207,34 +346,85 @@ class ContextRepository:
     async def delete_context(self, context_id: int) -> bool:
         """Delete context by ID (Claude decides what to forget)"""
         try:
-            async with self.db_manager.get_connection() as db:
-                # Enable foreign keys for cascade delete
-                await db.execute("PRAGMA foreign_keys = ON")
-
-                cursor = await db.execute(
-                    """
-                    DELETE FROM contexts WHERE id = ?
-                """,
-                    (context_id,),
-                )
+            async def delete(db: aiosqlite.Connection) -> int:
+                cursor = await db.execute("DELETE FROM contexts WHERE id = ?", (context_id,))
+                return cursor.rowcount
 
-                await db.commit()
-
-                if cursor.rowcount > 0:
-                    logger.info(f"Deleted context {context_id}")
-                    return True
-                else:
-                    logger.warning(f"Context {context_id} not found for deletion")
-                    return False
+            if await self.db_manager.write(delete) > 0:
+                logger.info(f"Deleted context {context_id}")
+                return True
+            else:
+                logger.warning(f"Context {context_id} not found for deletion")
+                return False
 
         except Exception as e:
             logger.error(f"Failed to delete context {context_id}: {e}")
             return False
 
+    async def delete_expired(self, now: int, limit: int) -> int:
+        """
+        Delete up to `limit` contexts whose expiry is at or before `now`.
+
+        Walks the partial expiry index oldest first; callers repeat until
+        fewer than `limit` rows are removed, one short write per batch.
+
+        Returns:
+            Number of contexts deleted
+        """
+
+        async def delete(db: aiosqlite.Connection) -> int:
+            cursor = await db.execute(
+                """
+                DELETE FROM contexts WHERE id IN (
+                    SELECT id FROM contexts WHERE expires_ms <= ?
+                    ORDER BY expires_ms LIMIT ?
+                )
+                """,
+                (now, limit),
+            )
+            return cursor.rowcount
+
+        return await self.db_manager.write(delete)
+
+    async def count_projects_over(self, cap: int) -> List[Tuple[str, int]]:
+        """(project_id, context count) of projects holding more than `cap` contexts"""
+        async with self.db_manager.get_connection(readonly=True) as db:
+            cursor = await db.execute(
+                """
+                SELECT project_id, COUNT(*) FROM contexts
+                WHERE project_id IS NOT NULL
+                GROUP BY project_id HAVING COUNT(*) > ?
+                """,
+                (cap,),
+            )
+            return [(row[0], row[1]) for row in await cursor.fetchall()]
+
+    async def delete_oldest(self, project_id: str, limit: int) -> int:
+        """
+        Delete the `limit` oldest contexts of a project.
+
+        Returns:
+            Number of contexts deleted
+        """
+
+        async def delete(db: aiosqlite.Connection) -> int:
+            cursor = await db.execute(
+                """
+                DELETE FROM contexts WHERE id IN (
+                    SELECT id FROM contexts WHERE project_id = ?
+                    ORDER BY created_ms, id LIMIT ?
+                )
+                """,
+                (project_id, limit),
+            )
+            return cursor.rowcount
+
+        return await self.db_manager.write(delete)
+
     async def count_contexts(self, project_id: Optional[str] = None) -> int:
         """Count total contexts, optionally filtered by project"""
         try:
-            async with self.db_manager.get_connection() as db:
+            async with self.db_manager.get_connection(readonly=True) as db:
                 if project_id is not None:
                     cursor = await db.execute(
                         """
@@ -257,34 +447,20 @@ class ContextRepository:
     ) -> List[Dict[str, Any]]:
         """Load high-importance contexts across all projects"""
         try:
-            async with self.db_manager.get_connection() as db:
+            async with self.db_manager.get_connection(readonly=True) as db:
                 cursor = await db.execute(
-                    """
-                    SELECT id, project_id, content,
-                           importance_level, status, created_at
+                    f"""
+                    SELECT {CONTEXT_COLUMNS}
                     FROM contexts
                     WHERE importance_level >= ? AND status = 'active'
-                    ORDER BY created_at DESC
+                    ORDER BY created_ms DESC
                     LIMIT ?
                 """,
                     (min_importance, limit),
                 )
 
                 rows = await cursor.fetchall()
-
-                contexts = []
-                for row in rows:
-                    context = {
-                        "id": row[0],
-                        "project_id": row[1],
-                        "content": row[2],
-                        "importance_level": row[3],
-                        "status": row[4],
-                        "created_at": row[5],
-                    }
-                    contexts.append(context)
-
-                return contexts
+                return [row_to_context(row) for row in rows]
 
         except Exception as e:
             logger.error(f"Failed to load high importance contexts: {e}")
@@ -307,40 +483,19 @@ class ContextRepository:
 
             await self.db_manager.ensure_database()
 
-            async with self.db_manager.get_connection() as db:
+            async with self.db_manager.get_connection(readonly=True) as db:
                 # Create placeholders for IN clause
                 placeholders = ",".join("?" * len(context_ids))
 
-                query = (
-                    """
-                    SELECT id, project_id, content,
-                           importance_level, status, created_at,
-                           expires_at
-                    FROM contexts
-                    WHERE id IN ("""
-                    + placeholders
-                    + """)
-                    ORDER BY created_at DESC
-                """
-                )
+                query = f"SELECT {CONTEXT_COLUMNS} FROM contexts WHERE id IN ({placeholders})"
 
                 cursor = await db.execute(query, context_ids)
                 rows = await cursor.fetchall()
 
-                contexts = []
-                for row in rows:
-                    context = {
-                        "id": row[0],
-                        "project_id": row[1],
-                        "content": row[2],
-                        "importance_level": row[3],
-                        "status": row[4],
-                        "created_at": row[5],
-                        "expires_at": row[6],
-                    }
-                    contexts.append(context)
+                # Newest first; sorting the few rows here spares SQLite a temp B-tree
+                rows.sort(key=lambda row: (row[5] or 0, row[0]), reverse=True)
 
-                return contexts
+                return [row_to_context(row) for row in rows]
 
         except Exception as e:
             logger.error(f"Failed to load contexts by IDs: {e}")
@@ -353,6 +508,7 @@ class ContextRepository:
         content_search: Optional[str] = None,
         limit: int = 100,
         offset: int = 0,
+        before: Optional[Tuple[int, int]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Search contexts with SQL-based filtering to avoid N+1 and Python filtering issues.
@@ -360,9 +516,12 @@ class ContextRepository:
         Args:
             project_id: Filter by project (None for all projects)
             importance_min: Minimum importance level
-            content_search: Search term in content (SQL LIKE)
+            content_search: Words that must all appear in content (FTS5 MATCH,
+                SQL LIKE when FTS5 is unavailable or there are no words)
             limit: Maximum number of contexts to return
-            offset: Skip this many contexts (pagination)
+            offset: Skip this many contexts (prefer `before` for deep pages)
+            before: (created_ms, id) key of the last context already returned;
+                full-text matches are ordered by id alone, so only its id is used
 
         Returns:
             List of context dictionaries with SQL-optimized filtering
@@ -370,56 +529,171 @@ class ContextRepository:
         try:
             await self.db_manager.ensure_database()
 
-            async with self.db_manager.get_connection() as db:
+            async with self.db_manager.get_connection(readonly=True) as db:
                 # Build dynamic query with SQL-based filtering
+                source = "contexts"
+                order_by = "created_ms DESC, contexts.id DESC"
                 where_conditions = ["importance_level >= ?"]
                 params = [importance_min]
 
+                if content_search:
+                    fts_query = build_fts_query(content_search)
+                    if self.db_manager.full_text_search and fts_query:
+                        # Walk the index newest-first (ids follow creation order),
+                        # so LIMIT stops the scan early even for common words.
+                        # CROSS JOIN keeps the full-text index as the outer loop.
+                        source = (
+                            f"{FTS_TABLE} CROSS JOIN contexts"
+                            f" ON contexts.id = {FTS_TABLE}.rowid"
+                        )
+                        order_by = f"{FTS_TABLE}.rowid DESC"
+                        where_conditions.insert(0, f"{FTS_TABLE} MATCH ?")
+                        params.insert(0, fts_query)
+                        if before is not None:
+                            where_conditions.append(f"{FTS_TABLE}.rowid < ?")
+                            params.append(before[1])
+                            before = None
+                    else:
+                        where_conditions.append(f"{PLAIN_CONTENT} LIKE ?")
+                        params.append(f"%{content_search}%")
+
+                if before is not None:
+                    where_conditions.append("(created_ms, contexts.id) < (?, ?)")
+                    params.extend(before)
+
                 if project_id is not None:
                     where_conditions.append("project_id = ?")
                     params.append(project_id)
 
-                # SQL-based content search (RESERVED: for future advanced search features)
-                if content_search:
-                    where_conditions.append("content LIKE ?")
-                    params.append(f"%{content_search}%")
-
                 where_clause = " AND ".join(where_conditions)
                 params.extend([limit, offset])
 
                 # Build the complete query with SQL filtering
-                query = (
-                    """
-                    SELECT id, project_id, content,
-                           importance_level, status, created_at,
-                           expires_at
-                    FROM contexts
-                    WHERE """
-                    + where_clause
-                    + """
-                    ORDER BY created_at DESC
+                query = f"""
+                    SELECT {CONTEXT_COLUMNS}
+                    FROM {source}
+                    WHERE {where_clause}
+                    ORDER BY {order_by}
                     LIMIT ? OFFSET ?
                 """
-                )
 
                 cursor = await db.execute(query, params)
                 rows = await cursor.fetchall()
 
-                contexts = []
-                for row in rows:
-                    context = {
+                return [row_to_context(row) for row in rows]
+
+        except Exception as e:
+            logger.error(f"Failed to search contexts optimized: {e}")
+            return []
+
+    async def search_contexts_ranked(
+        self,
+        fts_query: str,
+        weights: Dict[str, float],
+        project_id: Optional[str] = None,
+        importance_min: int = 1,
+        limit: int = 10,
+        snippet_tokens: int = 24,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank full-text matches by BM25, importance and recency.
+
+        Scoring follows core/storage/search_ranking.py: bm25() is divided by
+        the best match of the result set, recency decays with the configured
+        half-life. Only the returned hits get a snippet() excerpt.
+
+        Args:
+            fts_query: MATCH expression from build_fts_query()
+            weights: Ranking weights from get_search_weights()
+            project_id: Filter by project (None for all projects)
+            importance_min: Minimum importance level
+            limit: Maximum number of hits
+            snippet_tokens: Snippet length in words (at most 64)
+
+        Returns:
+            Hits (id, project_id, snippet, importance_level, created_ms,
+            created_at, score), best first
+
+        Raises:
+            StorageError: If FTS5 is unavailable or the query fails
+        """
+        await self.db_manager.ensure_database()
+        if not self.db_manager.full_text_search:
+            raise StorageError("Full-text index is not available")
+
+        where_conditions = [f"{FTS_TABLE} MATCH ?", "importance_level >= ?"]
+        params: List[Any] = [fts_query, importance_min]
+        if project_id is not None:
+            where_conditions.append("project_id = ?")
+            params.append(project_id)
+
+        half_life = weights["recency_half_life_days"]
+        params.extend(
+            [
+                weights["bm25_weight"],
+                weights["importance_weight"],
+                weights["recency_weight"] * half_life,
+                half_life,
+                now_ms(),
+                MS_PER_DAY,
+                limit,
+            ]
+        )
+
+        try:
+            async with self.db_manager.get_connection(readonly=True) as db:
+                # bm25() is negative, lower is better. The final ORDER BY sorts
+                # the computed score, the one ordering no index can provide.
+                cursor = await db.execute(
+                    f"""
+                    WITH hits AS (
+                        SELECT contexts.id, project_id, importance_level, created_ms,
+                               -bm25({FTS_TABLE}) AS relevance
+                        FROM {FTS_TABLE} CROSS JOIN contexts ON contexts.id = {FTS_TABLE}.rowid
+                        WHERE {" AND ".join(where_conditions)}
+                    )
+                    SELECT id, project_id, importance_level, created_ms,
+                           ? * relevance / MAX(relevance) OVER ()
+                           + ? * importance_level / 10.0
+                           + ? / (? + MAX(COALESCE(
+                               (? - created_ms) / CAST(? AS REAL), 0
+                             ), 0)) AS score
+                    FROM hits
+                    ORDER BY score DESC, id DESC
+                    LIMIT ?
+                    """,
+                    params,
+                )
+                rows = await cursor.fetchall()
+                if not rows:
+                    return []
+
+                ids = [row[0] for row in rows]
+                placeholders = ",".join("?" * len(ids))
+                cursor = await db.execute(
+                    f"""
+                    SELECT rowid, snippet({FTS_TABLE}, 0, '**', '**', '…', ?)
+                    FROM {FTS_TABLE}
+                    WHERE {FTS_TABLE} MATCH ? AND rowid IN ({placeholders})
+                    """,
+                    [min(max(1, snippet_tokens), 64), fts_query, *ids],
+                )
+                snippets = dict(await cursor.fetchall())
+
+            return [
+                present_context(
+                    {
                         "id": row[0],
                         "project_id": row[1],
-                        "content": row[2],
-                        "importance_level": row[3],
-                        "status": row[4],
-                        "created_at": row[5],
-                        "expires_at": row[6],
+                        "snippet": snippets.get(row[0], ""),
+                        "importance_level": row[2],
+                        "created_ms": row[3],
+                        "score": row[4],
                     }
-                    contexts.append(context)
-
-                return contexts
+                )
+                for row in rows
+            ]
 
         except Exception as e:
-            logger.error(f"Failed to search contexts optimized: {e}")
-            return []
+            logger.error(f"Failed to rank contexts: {e}")
+            raise StorageError(f"Ranked search failed: {e}", original_error=e)
@@ -24,17 +24,29 @@ Database Manager - Handles database connection and initialization.
 
 Responsible for:
 - Database path management
-- Schema initialization
-- Connection handling
+- Schema initialization (versioned, see migrations)
+- Connection handling (pooled, see connection_pool)
+- Group-committed writes (see write_queue)
+- Housekeeping statements run by the maintenance scheduler
 """
 
+import asyncio
 import logging
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
 
 import aiosqlite
 
+from .connection_pool import PooledConnection, create_connection_pool
+from .migrations import apply_migrations, get_schema_version, has_full_text_index
+from .write_queue import create_write_queue
+
+T = TypeVar("T")
+
+# Rows sampled per index by PRAGMA optimize's ANALYZE (bounds its run time)
+ANALYSIS_LIMIT = 400
+
 logger = logging.getLogger(__name__)
 
 
@@ -47,6 +59,15 @@ class DatabaseManager:
     def __init__(self, db_path: Optional[str] = None):
         self.db_path = db_path or self._get_default_db_path()
         self._ensure_db_directory()
+        self.pool = create_connection_pool(self.db_path)
+        self.write_queue = create_write_queue(self.pool)
+
+        # Schema is migrated once, on first use
+        self._schema_ready = False
+        self._schema_lock: Optional[asyncio.Lock] = None
+
+        # Whether contexts_fts exists (known once the schema is ready)
+        self.full_text_search = False
 
     def _get_default_db_path(self) -> str:
         """
@@ -80,101 +101,123 @@ class DatabaseManager:
         db_dir.mkdir(parents=True, exist_ok=True)
 
     async def ensure_database(self) -> bool:
-        """Ensure database is initialized (lazy initialization)"""
-        # Check if database exists and has tables
-        try:
-            async with aiosqlite.connect(self.db_path) as db:
-                cursor = await db.execute(
-                    "SELECT name FROM sqlite_master WHERE type='table' AND name='contexts'"
-                )
-                result = await cursor.fetchone()
-                if not result:
-                    # Database exists but no tables, initialize
-                    return await self.initialize_database()
-                return True
-        except Exception:
-            # Database might not exist, initialize it
-            return await self.initialize_database()
+        """
+        Ensure database schema is current (lazy initialization).
+
+        Costs nothing once the schema has been migrated by this manager, so
+        repositories call it on every operation.
+        """
+        if self._schema_ready:
+            return True
+        return await self.initialize_database()
 
     async def initialize_database(self) -> bool:
         """
-        Initialize database with schema if not exists.
+        Apply pending schema migrations.
         Returns True if successful, False otherwise.
         """
+        if self._schema_lock is None:
+            self._schema_lock = asyncio.Lock()
+
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                # Create normalized schema with proper constraints (context_type removed)
-                await db.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS contexts (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        project_id TEXT,
-                        content TEXT NOT NULL,
-                        importance_level INTEGER NOT NULL,
-                        status TEXT DEFAULT 'active',
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        expires_at TIMESTAMP,
-                        access_count INTEGER DEFAULT 0,
-                        last_accessed TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """
-                )
-
-                # Normalized tags schema
-                await db.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS tags (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        name TEXT UNIQUE NOT NULL
-                    )
-                """
-                )
-
-                await db.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS context_tags (
-                        context_id INTEGER,
-                        tag_id INTEGER,
-                        PRIMARY KEY (context_id, tag_id),
-                        FOREIGN KEY (context_id) REFERENCES contexts(id) ON DELETE CASCADE,
-                        FOREIGN KEY (tag_id) REFERENCES tags(id) ON DELETE CASCADE
+            async with self._schema_lock:
+                if self._schema_ready:
+                    # Migrated by a caller that held the lock before us
+                    return True
+
+                async with self.get_connection() as db:
+                    previous = await get_schema_version(db)
+                    version = await apply_migrations(db)
+                    self.full_text_search = await has_full_text_index(db)
+
+                if version != previous:
+                    logger.info(
+                        f"Database at {self.db_path} migrated to schema version {version}"
                     )
-                """
-                )
-
-                # Projects table
-                await db.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS projects (
-                        id TEXT PRIMARY KEY,
-                        name TEXT NOT NULL,
-                        description TEXT,
-                        last_accessed TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        status TEXT DEFAULT 'active'
-                    )
-                """
-                )
-
-                # Create indexes for performance
-                await db.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_contexts_project_id ON contexts(project_id)"
-                )
-                await db.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_contexts_importance ON contexts(importance_level)"
-                )
-                await db.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_contexts_created_at ON contexts(created_at)"
-                )
-                await db.execute("CREATE INDEX IF NOT EXISTS idx_tags_name ON tags(name)")
-
-                await db.commit()
-                logger.info(f"Database initialized at {self.db_path}")
+                self._schema_ready = True
                 return True
 
         except Exception as e:
             logger.error(f"Failed to initialize database: {e}")
             return False
 
-    def get_connection(self):
-        """Get database connection context manager"""
-        return aiosqlite.connect(self.db_path)
+    def get_connection(self, readonly: bool = False) -> PooledConnection:
+        """
+        Get pooled database connection context manager.
+
+        Args:
+            readonly: Use a read-only connection; pass True for queries that do not write
+
+        Returns:
+            Context manager leasing the connection (interrupted on cancellation)
+        """
+        return self.pool.connection(readonly)
+
+    async def write(self, write: Callable[[aiosqlite.Connection], Awaitable[T]]) -> T:
+        """
+        Run a write in a group commit shared with concurrent writers.
+
+        Args:
+            write: Coroutine function running its statements on the given
+                writer connection; it must not commit
+
+        Returns:
+            The write's return value, after its transaction has committed
+
+        Raises:
+            Exception: What the write raised (its statements are rolled back)
+        """
+        return await self.write_queue.submit(write)
+
+    async def checkpoint(self) -> Dict[str, int]:
+        """
+        Copy committed WAL frames into the database file without blocking.
+
+        A PASSIVE checkpoint stops at frames still needed by open readers
+        instead of waiting for them.
+
+        Returns:
+            busy (1 if the checkpoint could not run), wal_frames, checkpointed
+        """
+        await self.ensure_database()
+        async with self.get_connection() as db:
+            async with db.execute("PRAGMA wal_checkpoint(PASSIVE)") as cursor:
+                busy, wal_frames, checkpointed = await cursor.fetchone()
+        return {"busy": busy, "wal_frames": wal_frames, "checkpointed": checkpointed}
+
+    async def optimize(self) -> None:
+        """Refresh planner statistics (ANALYZE) of tables whose contents changed enough"""
+        await self.ensure_database()
+        async with self.get_connection() as db:
+            await db.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+            await db.execute("PRAGMA optimize")
+
+    async def incremental_vacuum(self, pages: int) -> int:
+        """
+        Return up to `pages` free pages to the file system.
+
+        Only databases created with auto_vacuum = INCREMENTAL (the PRAGMA
+        profiles' default) shrink; for others this frees nothing.
+
+        Returns:
+            Number of pages freed
+        """
+        await self.ensure_database()
+        async with self.get_connection() as db:
+            async with db.execute("PRAGMA auto_vacuum") as cursor:
+                if (await cursor.fetchone())[0] != 2:  # INCREMENTAL
+                    return 0
+            async with db.execute("PRAGMA freelist_count") as cursor:
+                before = (await cursor.fetchone())[0]
+            if not before:
+                return 0
+            # The statement frees one page per step and execute() steps only
+            # once; executescript() runs it to completion
+            await db.executescript(f"PRAGMA incremental_vacuum({int(pages)})")
+            async with db.execute("PRAGMA freelist_count") as cursor:
+                return before - (await cursor.fetchone())[0]
+
+    async def close(self) -> None:
+        """Commit queued writes, then close pooled connections"""
+        await self.write_queue.close()
+        await self.pool.close()
@@ -30,11 +30,12 @@ Responsible for:
 """
 
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from ..instruction_manager import InstructionManager
+from ..storage.timestamps import MS_PER_DAY, MS_PER_HOUR, now_ms
 from .context_repository import ContextRepository
 
 # Personality service removed - functionality deleted
@@ -132,23 +133,17 @@ class InstructionService:
             )
 
             # Filter for recent contexts not already included
-            recent_cutoff = datetime.now() - timedelta(days=7)
+            recent_cutoff = now_ms() - 7 * MS_PER_DAY
             for context in recent_contexts:
-                if context not in all_contexts:
-                    try:
-                        created_at = datetime.fromisoformat(context["created_at"])
-                        if created_at >= recent_cutoff:
-                            all_contexts.append(context)
-                    except (ValueError, TypeError):
-                        # Skip contexts with invalid dates
-                        continue
+                if context not in all_contexts and context["created_ms"] >= recent_cutoff:
+                    all_contexts.append(context)
 
             # 3. Load tags for all contexts
             for context in all_contexts:
                 context["tags"] = await self.tags_repo.load_context_tags(context["id"])
 
             # 4. Sort by recency only (newest first), limit to requested amount
-            all_contexts.sort(key=lambda x: x["created_at"], reverse=True)
+            all_contexts.sort(key=lambda x: x["created_ms"], reverse=True)
 
             final_contexts = all_contexts[:limit]
 
@@ -199,21 +194,15 @@ class InstructionService:
 
             if recent_contexts:
                 latest_context = recent_contexts[0]
-                last_activity = latest_context.get("created_at")
-
-                try:
-                    latest_time = datetime.fromisoformat(last_activity)
-                    cutoff_time = datetime.now() - timedelta(hours=24)
-                    has_recent = latest_time >= cutoff_time
-                except (ValueError, TypeError):
-                    has_recent = False
+                last_activity = latest_context.get("created_ms")
+                has_recent = bool(last_activity) and last_activity >= now_ms() - 24 * MS_PER_HOUR
 
             return {
                 "has_contexts": total_contexts > 0,
                 "total_contexts": total_contexts,
                 "has_recent_contexts": has_recent,
                 "last_activity_date": (
-                    datetime.fromisoformat(last_activity) if last_activity else None
+                    datetime.fromtimestamp(last_activity / 1000) if last_activity else None
                 ),
                 "project_guidance": "",  # Could be loaded from project-specific config
             }
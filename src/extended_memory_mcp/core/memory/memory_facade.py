@@ -204,3 +204,7 @@ class MemoryFacade:
     def get_db_path(self) -> str:
         """Get current database path."""
         return self.db_path
+
+    async def close(self) -> None:
+        """Close pooled database connections."""
+        await self.db_manager.close()
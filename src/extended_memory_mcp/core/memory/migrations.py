@@ -0,0 +1,545 @@
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Schema Migrations - Versioned SQLite schema, keyed on PRAGMA user_version.
+
+Responsible for:
+- The ordered list of schema migrations (the only source of the schema)
+- Applying pending migrations, each in its own IMMEDIATE transaction
+- Refusing databases written by a newer version of the server
+
+Databases created before versioning report user_version 0. Migration 1 only
+uses IF NOT EXISTS statements, so it adopts them without changes.
+The schema calls SQL functions defined by register_sql_functions(), which
+every connection writing contexts must run first.
+To change the schema, append a migration; never edit an applied one.
+"""
+
+import logging
+import sqlite3
+from typing import Awaitable, Callable, Optional, Sequence, Tuple
+
+import aiosqlite
+
+from ..errors import StorageError
+from ..storage.content_codec import decompress
+from ..storage.timestamps import MS_PER_DAY
+
+logger = logging.getLogger(__name__)
+
+
+class Migration:
+    """
+    One schema version: the statements that upgrade from the previous one.
+
+    Migrations that need to inspect the database pass an `apply` coroutine,
+    run after the statements inside the same transaction.
+    """
+
+    __slots__ = ("version", "description", "statements", "apply")
+
+    def __init__(
+        self,
+        version: int,
+        description: str,
+        statements: Sequence[str] = (),
+        apply: Optional[Callable[[aiosqlite.Connection], Awaitable[None]]] = None,
+    ):
+        self.version = version
+        self.description = description
+        self.statements = tuple(statements)
+        self.apply = apply
+
+    def __repr__(self) -> str:
+        return f"Migration({self.version}, {self.description!r})"
+
+
+# Full-text index over contexts.content, kept in sync by triggers
+FTS_TABLE = "contexts_fts"
+
+
+async def _create_contexts_fts(db: aiosqlite.Connection) -> None:
+    """Create and backfill the FTS5 index (skipped when SQLite lacks FTS5)"""
+    try:
+        await db.execute(
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE}
+            USING fts5(content, content='contexts', content_rowid='id')
+            """
+        )
+    except sqlite3.OperationalError as e:
+        logger.warning(f"SQLite without FTS5 ({e}): content search falls back to LIKE")
+        return
+
+    await db.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS contexts_fts_insert AFTER INSERT ON contexts BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.id, new.content);
+        END
+        """
+    )
+    await db.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS contexts_fts_delete AFTER DELETE ON contexts BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content)
+            VALUES ('delete', old.id, old.content);
+        END
+        """
+    )
+    # Only content changes touch the index (not access counters)
+    await db.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS contexts_fts_update AFTER UPDATE OF content ON contexts
+        BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content)
+            VALUES ('delete', old.id, old.content);
+            INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.id, new.content);
+        END
+        """
+    )
+    # Backfill rows written before the index existed
+    await db.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+# SQL function giving the text of stored content: plain_content(content, content_codec)
+PLAIN_CONTENT_FUNCTION = "plain_content"
+
+# contexts with plain text content, the external content of the FTS5 index
+PLAIN_CONTENT_VIEW = "contexts_text"
+
+
+async def register_sql_functions(db: aiosqlite.Connection) -> None:
+    """Define the application SQL functions used by views and triggers"""
+    await db.create_function(PLAIN_CONTENT_FUNCTION, 2, decompress, deterministic=True)
+
+
+async def _index_plain_content(db: aiosqlite.Connection) -> None:
+    """
+    Point the FTS5 index at plain text content.
+
+    Compressed rows would feed their bytes to an index reading
+    contexts.content, so the index reads a view decompressing them instead.
+    snippet() and deletes read the view one row at a time; the triggers
+    index what the view returns.
+    """
+    await register_sql_functions(db)
+    if not await has_full_text_index(db):
+        return
+
+    plain = f"{PLAIN_CONTENT_FUNCTION}({{t}}.content, {{t}}.content_codec)"
+    await db.execute(
+        f"""
+        CREATE VIEW IF NOT EXISTS {PLAIN_CONTENT_VIEW} AS
+        SELECT id, {plain.format(t="contexts")} AS content FROM contexts
+        """
+    )
+    for trigger in ("contexts_fts_insert", "contexts_fts_delete", "contexts_fts_update"):
+        await db.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    await db.execute(f"DROP TABLE {FTS_TABLE}")
+    await db.execute(
+        f"""
+        CREATE VIRTUAL TABLE {FTS_TABLE}
+        USING fts5(content, content='{PLAIN_CONTENT_VIEW}', content_rowid='id')
+        """
+    )
+    await db.execute(
+        f"""
+        CREATE TRIGGER contexts_fts_insert AFTER INSERT ON contexts BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.id, {plain.format(t="new")});
+        END
+        """
+    )
+    await db.execute(
+        f"""
+        CREATE TRIGGER contexts_fts_delete AFTER DELETE ON contexts BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content)
+            VALUES ('delete', old.id, {plain.format(t="old")});
+        END
+        """
+    )
+    await db.execute(
+        f"""
+        CREATE TRIGGER contexts_fts_update
+        AFTER UPDATE OF content, content_codec ON contexts
+        BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content)
+            VALUES ('delete', old.id, {plain.format(t="old")});
+            INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.id, {plain.format(t="new")});
+        END
+        """
+    )
+    await db.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+# tag_stats scope holding the totals over all projects (project ids are never empty)
+ALL_PROJECTS = ""
+
+# Keeps the newer of the stored and the inserted last_used (NULL-safe)
+_LATEST_USE = (
+    "MAX(IFNULL(last_used, excluded.last_used), IFNULL(excluded.last_used, last_used))"
+)
+
+
+def _tag_stats_schema(last_used_type: str, used_at: str) -> Tuple[str, ...]:
+    """
+    Statements creating, backfilling and maintaining tag_stats.
+
+    Args:
+        last_used_type: Declared type of tag_stats.last_used
+        used_at: SQL time of a use, with {t} standing for the contexts row
+            prefix ("c.", "OLD." or "")
+    """
+    c_used, old_used, row_used = (used_at.format(t=t) for t in ("c.", "OLD.", ""))
+
+    def remaining_last_use(removed_context: str) -> str:
+        # Newest use of tag_stats' tag in its scope, ignoring the removed context
+        return f"""
+            SELECT MAX({c_used}) FROM context_tags ct
+            JOIN contexts c ON c.id = ct.context_id
+            WHERE ct.tag_id = tag_stats.tag_id AND ct.context_id <> {removed_context}
+              AND (tag_stats.project_id = '{ALL_PROJECTS}' OR c.project_id = tag_stats.project_id)
+        """
+
+    return (
+        f"""
+        CREATE TABLE IF NOT EXISTS tag_stats (
+            project_id TEXT NOT NULL,
+            tag_id INTEGER NOT NULL,
+            usage_count INTEGER NOT NULL,
+            last_used {last_used_type},
+            PRIMARY KEY (project_id, tag_id)
+        ) WITHOUT ROWID
+        """,
+        # Walked backwards: usage_count DESC, last_used DESC within a scope
+        "CREATE INDEX IF NOT EXISTS idx_tag_stats_rank"
+        " ON tag_stats(project_id, usage_count, last_used)",
+        f"""
+        INSERT INTO tag_stats (project_id, tag_id, usage_count, last_used)
+        SELECT '{ALL_PROJECTS}', ct.tag_id, COUNT(*), MAX({c_used})
+        FROM context_tags ct JOIN contexts c ON c.id = ct.context_id
+        GROUP BY ct.tag_id
+        """,
+        f"""
+        INSERT INTO tag_stats (project_id, tag_id, usage_count, last_used)
+        SELECT c.project_id, ct.tag_id, COUNT(*), MAX({c_used})
+        FROM context_tags ct JOIN contexts c ON c.id = ct.context_id
+        WHERE c.project_id IS NOT NULL
+        GROUP BY c.project_id, ct.tag_id
+        """,
+        # Links of contexts that do not exist are not counted
+        f"""
+        CREATE TRIGGER IF NOT EXISTS tag_stats_link_insert
+        AFTER INSERT ON context_tags
+        WHEN EXISTS (SELECT 1 FROM contexts WHERE id = NEW.context_id)
+        BEGIN
+            INSERT INTO tag_stats (project_id, tag_id, usage_count, last_used)
+            SELECT '{ALL_PROJECTS}', NEW.tag_id, 1, {row_used}
+            FROM contexts WHERE id = NEW.context_id
+            ON CONFLICT (project_id, tag_id) DO UPDATE SET
+                usage_count = usage_count + 1,
+                last_used = {_LATEST_USE};
+            INSERT INTO tag_stats (project_id, tag_id, usage_count, last_used)
+            SELECT project_id, NEW.tag_id, 1, {row_used}
+            FROM contexts WHERE id = NEW.context_id AND project_id IS NOT NULL
+            ON CONFLICT (project_id, tag_id) DO UPDATE SET
+                usage_count = usage_count + 1,
+                last_used = {_LATEST_USE};
+        END
+        """,
+        # Unlinking a tag from a context that stays; context deletes are
+        # counted by tag_stats_context_delete before the cascade runs
+        f"""
+        CREATE TRIGGER IF NOT EXISTS tag_stats_link_delete
+        AFTER DELETE ON context_tags
+        WHEN EXISTS (SELECT 1 FROM contexts WHERE id = OLD.context_id)
+        BEGIN
+            UPDATE tag_stats SET
+                usage_count = usage_count - 1,
+                last_used = CASE
+                    WHEN last_used = (SELECT {row_used} FROM contexts WHERE id = OLD.context_id)
+                    THEN ({remaining_last_use("OLD.context_id")})
+                    ELSE last_used
+                END
+            WHERE tag_id = OLD.tag_id AND project_id IN (
+                '{ALL_PROJECTS}', (SELECT project_id FROM contexts WHERE id = OLD.context_id)
+            );
+            DELETE FROM tag_stats WHERE tag_id = OLD.tag_id AND usage_count <= 0;
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS tag_stats_context_delete
+        BEFORE DELETE ON contexts
+        BEGIN
+            UPDATE tag_stats SET
+                usage_count = usage_count - 1,
+                last_used = CASE
+                    WHEN last_used = {old_used}
+                    THEN ({remaining_last_use("OLD.id")})
+                    ELSE last_used
+                END
+            WHERE project_id IN ('{ALL_PROJECTS}', OLD.project_id)
+              AND tag_id IN (SELECT tag_id FROM context_tags WHERE context_id = OLD.id);
+            DELETE FROM tag_stats
+            WHERE project_id IN ('{ALL_PROJECTS}', OLD.project_id)
+              AND tag_id IN (SELECT tag_id FROM context_tags WHERE context_id = OLD.id)
+              AND usage_count <= 0;
+        END
+        """,
+    )
+
+
+def _created_ms_from_text(column: str) -> str:
+    """
+    SQL converting a legacy created_at string to epoch ms.
+
+    The server wrote naive local-time isoformat() strings ('T' separator);
+    the column default CURRENT_TIMESTAMP writes UTC with a space.
+    """
+    local = f"{column} LIKE '%T%' AND substr({column}, 20) NOT GLOB '*[+Z-]*'"
+    return (
+        f"CAST(round((julianday({column}, CASE WHEN {local} THEN 'utc' ELSE '+0 seconds' END)"
+        f" - 2440587.5) * {MS_PER_DAY}) AS INTEGER)"
+    )
+
+
+_NOW_MS = f"CAST(round((julianday('now') - 2440587.5) * {MS_PER_DAY}) AS INTEGER)"
+
+
+MIGRATIONS: Tuple[Migration, ...] = (
+    Migration(
+        1,
+        "baseline schema",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS contexts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                project_id TEXT,
+                content TEXT NOT NULL,
+                importance_level INTEGER NOT NULL,
+                status TEXT DEFAULT 'active',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                expires_at TIMESTAMP,
+                access_count INTEGER DEFAULT 0,
+                last_accessed TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS tags (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS context_tags (
+                context_id INTEGER,
+                tag_id INTEGER,
+                PRIMARY KEY (context_id, tag_id),
+                FOREIGN KEY (context_id) REFERENCES contexts(id) ON DELETE CASCADE,
+                FOREIGN KEY (tag_id) REFERENCES tags(id) ON DELETE CASCADE
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS projects (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                description TEXT,
+                last_accessed TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                status TEXT DEFAULT 'active'
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_contexts_project_id ON contexts(project_id)",
+            "CREATE INDEX IF NOT EXISTS idx_contexts_importance ON contexts(importance_level)",
+            "CREATE INDEX IF NOT EXISTS idx_contexts_created_at ON contexts(created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_tags_name ON tags(name)",
+        ),
+    ),
+    Migration(
+        2,
+        "performance indexes for project and tag queries",
+        (
+            "CREATE INDEX IF NOT EXISTS idx_contexts_project_created"
+            " ON contexts(project_id, created_at DESC)",
+            "CREATE INDEX IF NOT EXISTS idx_contexts_project_importance"
+            " ON contexts(project_id, importance_level)",
+            "CREATE INDEX IF NOT EXISTS idx_context_tags_tag_id ON context_tags(tag_id)",
+            "CREATE INDEX IF NOT EXISTS idx_context_tags_context_id ON context_tags(context_id)",
+            "CREATE INDEX IF NOT EXISTS idx_context_tags_composite"
+            " ON context_tags(tag_id, context_id)",
+        ),
+    ),
+    Migration(3, "FTS5 full-text index on context content", apply=_create_contexts_fts),
+    Migration(
+        4,
+        "indexes matched to repository queries",
+        (
+            # (project_id, created_at) walked backwards yields created_at DESC,
+            # id DESC; the DESC column stored ids ascending within a timestamp
+            "DROP INDEX IF EXISTS idx_contexts_project_created",
+            "CREATE INDEX IF NOT EXISTS idx_contexts_project_created"
+            " ON contexts(project_id, created_at)",
+            # Range on importance_level invites a sort of the whole range
+            "DROP INDEX IF EXISTS idx_contexts_project_importance",
+            "DROP INDEX IF EXISTS idx_contexts_importance",
+            # Prefixes of idx_contexts_project_created, the context_tags
+            # primary key, idx_context_tags_composite and UNIQUE(name)
+            "DROP INDEX IF EXISTS idx_contexts_project_id",
+            "DROP INDEX IF EXISTS idx_context_tags_context_id",
+            "DROP INDEX IF EXISTS idx_context_tags_tag_id",
+            "DROP INDEX IF EXISTS idx_tags_name",
+        ),
+    ),
+    Migration(
+        5,
+        "trigger-maintained tag usage statistics",
+        # last_used holds datetime(created_at): one format whatever was stored
+        _tag_stats_schema("TIMESTAMP", "datetime({t}created_at)"),
+    ),
+    Migration(
+        6,
+        "integer epoch-ms creation time",
+        (
+            "ALTER TABLE contexts ADD COLUMN created_ms INTEGER",
+            f"UPDATE contexts SET created_ms = {_created_ms_from_text('created_at')}",
+            # Rows inserted without created_ms (older writers, column default)
+            f"""
+            CREATE TRIGGER IF NOT EXISTS contexts_created_ms_default
+            AFTER INSERT ON contexts WHEN NEW.created_ms IS NULL
+            BEGIN
+                UPDATE contexts SET created_ms = COALESCE(
+                    {_created_ms_from_text("NEW.created_at")}, {_NOW_MS}
+                ) WHERE id = NEW.id;
+            END
+            """,
+            # Timeline indexes move to the integer column (same shapes as migration 4)
+            "DROP INDEX IF EXISTS idx_contexts_created_at",
+            "DROP INDEX IF EXISTS idx_contexts_project_created",
+            "CREATE INDEX IF NOT EXISTS idx_contexts_created_ms ON contexts(created_ms)",
+            "CREATE INDEX IF NOT EXISTS idx_contexts_project_created_ms"
+            " ON contexts(project_id, created_ms)",
+            # tag_stats is derived data: rebuild it on epoch ms
+            "DROP TRIGGER IF EXISTS tag_stats_link_insert",
+            "DROP TRIGGER IF EXISTS tag_stats_link_delete",
+            "DROP TRIGGER IF EXISTS tag_stats_context_delete",
+            "DROP TABLE IF EXISTS tag_stats",
+            *_tag_stats_schema("INTEGER", "{t}created_ms"),
+        ),
+    ),
+    Migration(
+        7,
+        "integer epoch-ms expiry time",
+        (
+            "ALTER TABLE contexts ADD COLUMN expires_ms INTEGER",
+            f"""
+            UPDATE contexts SET expires_ms = {_created_ms_from_text('expires_at')}
+            WHERE expires_at IS NOT NULL
+            """,
+            # Most contexts never expire: the sweep walks only those that do
+            "CREATE INDEX IF NOT EXISTS idx_contexts_expires_ms"
+            " ON contexts(expires_ms) WHERE expires_ms IS NOT NULL",
+        ),
+    ),
+    Migration(
+        8,
+        "per-row content compression",
+        # NULL: content is plain text, else the codec of its compressed bytes
+        ("ALTER TABLE contexts ADD COLUMN content_codec TEXT",),
+        apply=_index_plain_content,
+    ),
+)
+
+# Schema version this server writes
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+async def get_schema_version(db: aiosqlite.Connection) -> int:
+    """Read the schema version stored in the database header"""
+    async with db.execute("PRAGMA user_version") as cursor:
+        row = await cursor.fetchone()
+    return int(row[0]) if row else 0
+
+
+async def has_full_text_index(db: aiosqlite.Connection) -> bool:
+    """Check whether the FTS5 index was created"""
+    async with db.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ) as cursor:
+        return await cursor.fetchone() is not None
+
+
+async def apply_migrations(
+    db: aiosqlite.Connection, migrations: Sequence[Migration] = MIGRATIONS
+) -> int:
+    """
+    Bring the database schema up to the latest migration.
+
+    Each migration runs in a BEGIN IMMEDIATE transaction together with its
+    user_version update, and the version is re-read after the write lock is
+    taken, so concurrent processes never apply a migration twice.
+
+    Args:
+        db: Writer connection (must not be in a transaction)
+        migrations: Migrations ordered by version
+
+    Returns:
+        Schema version after migrating
+
+    Raises:
+        StorageError: If the database is newer than this server or a migration fails
+    """
+    latest = migrations[-1].version if migrations else 0
+    current = await get_schema_version(db)
+    if current > latest:
+        raise StorageError(
+            f"Database schema version {current} is newer than supported version {latest}",
+            context={"schema_version": current, "supported_version": latest},
+        )
+
+    for migration in migrations:
+        if migration.version <= current:
+            continue
+
+        await db.execute("BEGIN IMMEDIATE")
+        try:
+            current = await get_schema_version(db)
+            if migration.version <= current:
+                # Another process applied it while we waited for the lock
+                await db.rollback()
+                continue
+
+            for statement in migration.statements:
+                await db.execute(statement)
+            if migration.apply is not None:
+                await migration.apply(db)
+            await db.execute(f"PRAGMA user_version = {int(migration.version)}")
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            raise StorageError(
+                f"Schema migration {migration.version} ({migration.description}) failed: {e}",
+                context={"schema_version": current, "migration": migration.version},
+                original_error=e,
+            )
+
+        current = migration.version
+        logger.info(f"Applied schema migration {migration.version}: {migration.description}")
+
+    return current
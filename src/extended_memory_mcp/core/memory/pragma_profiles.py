@@ -0,0 +1,176 @@
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+PRAGMA Profiles - Named SQLite tuning presets for pooled connections.
+
+Profiles:
+- durable: fsync on every commit (synchronous FULL), no memory mapping
+- balanced: WAL with synchronous NORMAL, memory-mapped reads (default)
+- fast-ephemeral: no fsync and rare checkpoints, for caches and test databases
+  that may lose recent commits on power loss
+
+The profile comes from SQLITE_PRAGMA_PROFILE (env or config) or
+defaults.storage.pragma_profile; entries in defaults.storage.pragma_settings
+override single values of the selected profile.
+"""
+
+import re
+from typing import Any, Dict, List, Mapping, Optional
+
+from ..errors import ConfigurationError
+
+DEFAULT_PRAGMA_PROFILE = "balanced"
+
+PRAGMA_PROFILES: Dict[str, Dict[str, Any]] = {
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -64000,  # 64MB
+        "temp_store": "DEFAULT",
+        "mmap_size": 0,
+        "busy_timeout": 30000,  # ms
+        "wal_autocheckpoint": 1000,  # pages
+        "auto_vacuum": "INCREMENTAL",  # free pages returned by the maintenance job
+    },
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,
+        "temp_store": "MEMORY",
+        "mmap_size": 268435456,  # 256MB
+        "busy_timeout": 30000,
+        "wal_autocheckpoint": 1000,
+        "auto_vacuum": "INCREMENTAL",
+    },
+    "fast-ephemeral": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -128000,
+        "temp_store": "MEMORY",
+        "mmap_size": 268435456,
+        "busy_timeout": 5000,
+        "wal_autocheckpoint": 10000,
+        "auto_vacuum": "INCREMENTAL",
+    },
+}
+
+# PRAGMAs accepted in profiles and pragma_settings
+SUPPORTED_PRAGMAS = (
+    "busy_timeout",
+    # Only takes effect before the first table is created (new databases)
+    "auto_vacuum",
+    "journal_mode",
+    "synchronous",
+    "cache_size",
+    "temp_store",
+    "mmap_size",
+    "wal_autocheckpoint",
+)
+
+# Stored in the database file rather than the connection: set by the writer only
+DATABASE_PRAGMAS = frozenset({"journal_mode", "auto_vacuum"})
+
+_VALUE_PATTERN = re.compile(r"^-?\d+$|^[A-Za-z_]+$")
+
+
+def resolve_pragma_settings(
+    profile: str = DEFAULT_PRAGMA_PROFILE, overrides: Optional[Mapping[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Combine a named profile with explicit overrides.
+
+    Args:
+        profile: Profile name (see PRAGMA_PROFILES)
+        overrides: PRAGMA values replacing those of the profile
+
+    Returns:
+        PRAGMA name -> value, in the order they should be applied
+
+    Raises:
+        ConfigurationError: If the profile, a PRAGMA name or a value is not supported
+    """
+    if profile not in PRAGMA_PROFILES:
+        raise ConfigurationError(
+            f"Unknown SQLite PRAGMA profile '{profile}'",
+            context={"profile": profile, "available": sorted(PRAGMA_PROFILES)},
+        )
+
+    settings = dict(PRAGMA_PROFILES[profile])
+    settings.update(overrides or {})
+
+    for name, value in settings.items():
+        if name not in SUPPORTED_PRAGMAS:
+            raise ConfigurationError(
+                f"Unsupported SQLite PRAGMA '{name}'",
+                context={"pragma": name, "supported": list(SUPPORTED_PRAGMAS)},
+            )
+        # Values are interpolated into SQL, so only plain numbers and keywords pass
+        if isinstance(value, bool) or not _VALUE_PATTERN.match(str(value)):
+            raise ConfigurationError(
+                f"Invalid value for SQLite PRAGMA '{name}': {value!r}",
+                context={"pragma": name, "value": value},
+            )
+
+    # busy_timeout first, so the remaining statements wait for locks
+    return {name: settings[name] for name in SUPPORTED_PRAGMAS if name in settings}
+
+
+def pragma_statements(settings: Mapping[str, Any], readonly: bool = False) -> List[str]:
+    """
+    Build the PRAGMA statements for one connection.
+
+    Args:
+        settings: Result of resolve_pragma_settings()
+        readonly: Connection is a read-only reader (database-level PRAGMAs skipped)
+
+    Returns:
+        SQL statements to execute after opening the connection
+    """
+    return [
+        f"PRAGMA {name} = {value}"
+        for name, value in settings.items()
+        if not (readonly and name in DATABASE_PRAGMAS)
+    ]
+
+
+def create_pragma_settings(profile: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Factory function to resolve PRAGMA settings from configuration.
+
+    Args:
+        profile: Profile name (default: SQLITE_PRAGMA_PROFILE, then
+            defaults.storage.pragma_profile)
+
+    Returns:
+        PRAGMA name -> value for SQLiteConnectionPool
+    """
+    from ..config import get_default, get_env_default
+
+    if profile is None:
+        profile = get_env_default(
+            "SQLITE_PRAGMA_PROFILE",
+            get_default("storage.pragma_profile", DEFAULT_PRAGMA_PROFILE),
+        )
+
+    return resolve_pragma_settings(
+        str(profile).strip().lower(), get_default("storage.pragma_settings", None)
+    )
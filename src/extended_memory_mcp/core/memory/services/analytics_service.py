@@ -31,9 +31,10 @@ Responsible for:
 
 import logging
 import os
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+from ...storage.timestamps import MS_PER_DAY, format_timestamp, now_ms
 from ..context_repository import ContextRepository
 from ..database_manager import DatabaseManager
 from ..tags_repository import TagsRepository
@@ -60,7 +61,7 @@ class AnalyticsService:
     async def get_database_stats(self) -> Dict[str, Any]:
         """Get comprehensive database statistics for monitoring"""
         try:
-            async with self.db_manager.get_connection() as db:
+            async with self.db_manager.get_connection(readonly=True) as db:
                 # Basic counts
                 cursor = await db.execute("SELECT COUNT(*) FROM contexts WHERE status = 'active'")
                 active_contexts = (await cursor.fetchone())[0]
@@ -83,13 +84,13 @@ class AnalyticsService:
                 # Date range of contexts
                 cursor = await db.execute(
                     """
-                    SELECT MIN(created_at) as oldest, MAX(created_at) as newest
+                    SELECT MIN(created_ms) as oldest, MAX(created_ms) as newest
                     FROM contexts WHERE status = 'active'
                 """
                 )
                 row = await cursor.fetchone()
-                oldest_context = row[0] if row[0] else None
-                newest_context = row[1] if row[1] else None
+                oldest_context = format_timestamp(row[0]) if row[0] else None
+                newest_context = format_timestamp(row[1]) if row[1] else None
 
                 # Context type distribution - using tags instead of context_type
                 cursor = await db.execute(
@@ -172,16 +173,8 @@ class AnalyticsService:
             popular_tags = await self.tags_repo.get_popular_tags(limit=10)
 
             # Recent activity (last 7 days)
-            recent_cutoff = datetime.now() - timedelta(days=7)
-            recent_count = 0
-
-            for context in all_contexts:
-                try:
-                    created_at = datetime.fromisoformat(context["created_at"])
-                    if created_at >= recent_cutoff:
-                        recent_count += 1
-                except (ValueError, TypeError):
-                    continue
+            recent_cutoff = now_ms() - 7 * MS_PER_DAY
+            recent_count = sum(1 for c in all_contexts if c["created_ms"] >= recent_cutoff)
 
             return {
                 "project_id": project_id,
@@ -212,7 +205,7 @@ class AnalyticsService:
         Uses normalized tags schema for efficient querying.
         """
         try:
-            async with self.db_manager.get_connection() as db:
+            async with self.db_manager.get_connection(readonly=True) as db:
                 # Get tag usage patterns with context information
                 cursor = await db.execute(
                     """
@@ -220,7 +213,7 @@ class AnalyticsService:
                         t.name,
                         COUNT(ct.context_id) as usage_count,
                         AVG(c.importance_level) as avg_importance,
-                        MAX(c.created_at) as latest_usage,
+                        MAX(c.created_ms) as latest_usage,
                         COUNT(DISTINCT c.project_id) as project_count
                     FROM tags t
                     JOIN context_tags ct ON t.id = ct.tag_id
@@ -261,7 +254,7 @@ class AnalyticsService:
                             "tag": row[0],
                             "usage_count": row[1],
                             "avg_importance": round(row[2], 2),
-                            "latest_usage": row[3],
+                            "latest_usage": format_timestamp(row[3]),
                             "project_count": row[4],
                         }
                     )
@@ -301,7 +294,7 @@ class AnalyticsService:
                 recommendations.append("Consider archiving old contexts")
 
             # Check for orphaned data
-            async with self.db_manager.get_connection() as db:
+            async with self.db_manager.get_connection(readonly=True) as db:
                 # Check for contexts without tags
                 cursor = await db.execute(
                     """
@@ -81,23 +81,14 @@ class ContextService:
             # Ensure database is initialized
             await self.db_manager.ensure_database()
 
-            # Save the context
-            context_id = await self.context_repo.save_context(
+            # Context and tags are written in one transaction
+            return await self.context_repo.save_context(
                 content=content,
                 importance_level=importance_level,
                 project_id=project_id,
                 tags=tags,
             )
 
-            # Save tags if provided and context was saved successfully
-            if context_id and tags:
-                await self.tags_repo.save_context_tags(context_id, tags)
-
-            logger.info(
-                f"Saved context {context_id} for project {project_id} with {len(tags) if tags else 0} tags"
-            )
-            return context_id
-
         except Exception as e:
             logger.error(f"Failed to save context: {e}")
             return None
@@ -33,7 +33,9 @@ from typing import Any, Dict, List, Optional
 
 import aiosqlite
 
+from ..storage.timestamps import MS_PER_HOUR, now_ms
 from .database_manager import DatabaseManager
+from .migrations import ALL_PROJECTS
 
 
 # Default tags configuration
@@ -51,6 +53,52 @@ def get_default_tags_config():
 logger = logging.getLogger(__name__)
 
 
+def normalize_tags(tags: Optional[List[str]]) -> List[str]:
+    """Lowercase and strip tag names, dropping blanks, non-strings and duplicates"""
+    names: Dict[str, None] = {}
+    for tag_name in tags or []:
+        if isinstance(tag_name, str) and tag_name.strip():
+            names[tag_name.strip().lower()] = None
+    return list(names)
+
+
+async def link_context_tags(
+    db: aiosqlite.Connection, context_id: int, tags: Optional[List[str]]
+) -> int:
+    """
+    Attach tags to a context inside the caller's transaction (no commit).
+
+    Missing tags are created with one multi-row INSERT and the links are
+    written by one INSERT ... SELECT over all tag names, so the number of
+    statements does not grow with the number of tags.
+
+    Args:
+        db: Writer connection
+        context_id: Context to tag
+        tags: Tag names (normalized here)
+
+    Returns:
+        Number of distinct tag names linked
+    """
+    names = normalize_tags(tags)
+    if not names:
+        return 0
+
+    await db.execute(
+        "INSERT OR IGNORE INTO tags (name) VALUES " + ",".join(["(?)"] * len(names)), names
+    )
+
+    placeholders = ",".join("?" * len(names))
+    await db.execute(
+        f"""
+        INSERT OR IGNORE INTO context_tags (context_id, tag_id)
+        SELECT ?, id FROM tags WHERE name IN ({placeholders})
+        """,
+        [context_id, *names],
+    )
+    return len(names)
+
+
 class TagsRepository:
     """
     Handles all tag-related database operations.
@@ -63,38 +111,11 @@ class TagsRepository:
     async def save_context_tags(self, context_id: int, tags: List[str]) -> bool:
         """Save tags for a context using normalized schema"""
         try:
-            async with self.db_manager.get_connection() as db:
-                for tag_name in tags:
-                    if not isinstance(tag_name, str) or not tag_name.strip():
-                        continue
-
-                    tag_name = tag_name.strip().lower()
-
-                    # Insert tag if not exists
-                    await db.execute(
-                        """
-                        INSERT OR IGNORE INTO tags (name) VALUES (?)
-                    """,
-                        (tag_name,),
-                    )
-
-                    # Get tag ID
-                    cursor = await db.execute("SELECT id FROM tags WHERE name = ?", (tag_name,))
-                    tag_row = await cursor.fetchone()
-                    if tag_row:
-                        tag_id = tag_row[0]
+            async def link(db: aiosqlite.Connection) -> int:
+                return await link_context_tags(db, context_id, tags)
 
-                        # Link context to tag
-                        await db.execute(
-                            """
-                            INSERT OR IGNORE INTO context_tags (context_id, tag_id)
-                            VALUES (?, ?)
-                        """,
-                            (context_id, tag_id),
-                        )
-
-                await db.commit()
-                return True
+            await self.db_manager.write(link)
+            return True
 
         except Exception as e:
             logger.error(f"Failed to save context tags: {e}")
@@ -103,19 +124,19 @@ class TagsRepository:
     async def load_context_tags(self, context_id: int) -> List[str]:
         """Load tags for a specific context"""
         try:
-            async with self.db_manager.get_connection() as db:
+            async with self.db_manager.get_connection(readonly=True) as db:
                 cursor = await db.execute(
                     """
                     SELECT t.name FROM tags t
                     JOIN context_tags ct ON t.id = ct.tag_id
                     WHERE ct.context_id = ?
-                    ORDER BY t.name
                 """,
                     (context_id,),
                 )
 
+                # A context has a handful of tags: sort them here, not in a temp B-tree
                 rows = await cursor.fetchall()
-                return [row[0] for row in rows]
+                return sorted(row[0] for row in rows)
 
         except Exception as e:
             logger.error(f"Failed to load tags for context {context_id}: {e}")
@@ -146,7 +167,8 @@ class TagsRepository:
 
         Note:
             - If project_id is provided, only returns tags used in that project
-            - Uses JOIN with contexts table to enable project-based filtering
+            - Reads the tag_stats table, which triggers keep current per project
+              and for all projects, so the cost does not grow with the data
             - Returns combination of popular tags (≥min_usage) and recent tags (1 use, within recent_hours)
         """
         try:
@@ -163,47 +185,38 @@ class TagsRepository:
             if recent_hours is None:
                 recent_hours = config.get("tags", {}).get("recent_tags_hours", 24)
 
-            async with self.db_manager.get_connection() as db:
-                # Build query with optional project_id filter
-                if project_id is not None:
-                    # Filter by project_id
-                    query = """
-                        SELECT t.name, COUNT(ct.context_id) as usage_count, MAX(c.created_at) as latest_use
-                        FROM tags t
-                        JOIN context_tags ct ON t.id = ct.tag_id
-                        JOIN contexts c ON ct.context_id = c.id
-                        WHERE c.project_id = ?
-                        GROUP BY t.id, t.name
-                        HAVING
-                            usage_count >= ?
-                            OR (usage_count = 1 AND datetime(latest_use) > datetime('now', '-' || ? || ' hours'))
-                        ORDER BY usage_count DESC, latest_use DESC
-                        LIMIT ?
+            # Recent single-use tags rank below every popular tag (count >= 2),
+            # so they are read only to fill the remaining slots
+            scope = ALL_PROJECTS if project_id is None else project_id
+
+            async with self.db_manager.get_connection(readonly=True) as db:
+                # Both reads walk idx_tag_stats_rank backwards, newest first
+                cursor = await db.execute(
                     """
+                    SELECT t.name, s.usage_count FROM tag_stats s
+                    JOIN tags t ON t.id = s.tag_id
+                    WHERE s.project_id = ? AND s.usage_count >= ?
+                    ORDER BY s.usage_count DESC, s.last_used DESC
+                    LIMIT ?
+                """,
+                    (scope, min_usage, limit),
+                )
+                rows = await cursor.fetchall()
+
+                if len(rows) < limit and min_usage > 1:
                     cursor = await db.execute(
-                        query,
-                        (project_id, min_usage, recent_hours, limit),
-                    )
-                else:
-                    # Original query without project filter
-                    query = """
-                        SELECT t.name, COUNT(ct.context_id) as usage_count, MAX(c.created_at) as latest_use
-                        FROM tags t
-                        JOIN context_tags ct ON t.id = ct.tag_id
-                        JOIN contexts c ON ct.context_id = c.id
-                        GROUP BY t.id, t.name
-                        HAVING
-                            usage_count >= ?
-                            OR (usage_count = 1 AND datetime(latest_use) > datetime('now', '-' || ? || ' hours'))
-                        ORDER BY usage_count DESC, latest_use DESC
+                        """
+                        SELECT t.name, s.usage_count FROM tag_stats s
+                        JOIN tags t ON t.id = s.tag_id
+                        WHERE s.project_id = ? AND s.usage_count = 1
+                          AND s.last_used > ?
+                        ORDER BY s.last_used DESC
                         LIMIT ?
-                    """
-                    cursor = await db.execute(
-                        query,
-                        (min_usage, recent_hours, limit),
+                    """,
+                        (scope, now_ms() - recent_hours * MS_PER_HOUR, limit - len(rows)),
                     )
+                    rows += await cursor.fetchall()
 
-                rows = await cursor.fetchall()
                 result = [{"tag": row[0], "count": row[1]} for row in rows]
 
                 # Log performance metrics
@@ -223,7 +236,7 @@ class TagsRepository:
     ) -> List[int]:
         """Find context IDs that have a specific tag, optionally filtered by project"""
         try:
-            async with self.db_manager.get_connection() as db:
+            async with self.db_manager.get_connection(readonly=True) as db:
                 if project_id is not None:
                     # Filter by both tag and project_id
                     cursor = await db.execute(
@@ -281,41 +294,43 @@ class TagsRepository:
             if not normalized_tags:
                 return []
 
-            async with self.db_manager.get_connection() as db:
+            async with self.db_manager.get_connection(readonly=True) as db:
                 # Create placeholders for IN clause
                 placeholders = ", ".join("?" * len(normalized_tags))
 
+                # Walk the timeline index newest-first and probe the context_tags
+                # key per context: no DISTINCT or sort over every tagged context
+                has_tag = (
+                    """
+                    EXISTS (
+                        SELECT 1 FROM context_tags ct
+                        JOIN tags t ON ct.tag_id = t.id
+                        WHERE ct.context_id = c.id AND t.name IN ("""
+                    + placeholders
+                    + """)
+                    )"""
+                )
+
                 if project_id is not None:
                     # Filter by tags and project_id using OR logic
-                    query = (
-                        """
-                        SELECT DISTINCT ct.context_id FROM context_tags ct
-                        JOIN tags t ON ct.tag_id = t.id
-                        JOIN contexts c ON ct.context_id = c.id
-                        WHERE t.name IN ("""
-                        + placeholders
-                        + """) AND c.project_id = ?
-                        ORDER BY ct.context_id DESC
+                    query = f"""
+                        SELECT c.id FROM contexts c
+                        WHERE c.project_id = ? AND {has_tag}
+                        ORDER BY c.created_ms DESC, c.id DESC
                         LIMIT ?
                     """
-                    )
                     cursor = await db.execute(
                         query,
-                        (*normalized_tags, project_id, limit),
+                        (project_id, *normalized_tags, limit),
                     )
                 else:
                     # Original query without project filter
-                    query = (
-                        """
-                        SELECT DISTINCT ct.context_id FROM context_tags ct
-                        JOIN tags t ON ct.tag_id = t.id
-                        WHERE t.name IN ("""
-                        + placeholders
-                        + """)
-                        ORDER BY ct.context_id DESC
+                    query = f"""
+                        SELECT c.id FROM contexts c
+                        WHERE {has_tag}
+                        ORDER BY c.created_ms DESC, c.id DESC
                         LIMIT ?
                     """
-                    )
                     cursor = await db.execute(
                         query,
                         (*normalized_tags, limit),
@@ -331,15 +346,11 @@ class TagsRepository:
     async def delete_context_tags(self, context_id: int) -> bool:
         """Delete all tags for a specific context"""
         try:
-            async with self.db_manager.get_connection() as db:
-                await db.execute(
-                    """
-                    DELETE FROM context_tags WHERE context_id = ?
-                """,
-                    (context_id,),
-                )
-                await db.commit()
-                return True
+            async def unlink(db: aiosqlite.Connection) -> None:
+                await db.execute("DELETE FROM context_tags WHERE context_id = ?", (context_id,))
+
+            await self.db_manager.write(unlink)
+            return True
 
         except Exception as e:
             logger.error(f"Failed to delete tags for context {context_id}: {e}")
@@ -348,16 +359,17 @@ class TagsRepository:
     async def cleanup_unused_tags(self) -> int:
         """Remove tags that are not linked to any contexts"""
         try:
-            async with self.db_manager.get_connection() as db:
+            async def delete_unused(db: aiosqlite.Connection) -> int:
                 cursor = await db.execute(
                     """
                     DELETE FROM tags
                     WHERE id NOT IN (SELECT DISTINCT tag_id FROM context_tags)
                 """
                 )
-                await db.commit()
                 return cursor.rowcount
 
+            return await self.db_manager.write(delete_unused)
+
         except Exception as e:
             logger.error(f"Failed to cleanup unused tags: {e}")
             return 0
@@ -376,7 +388,7 @@ class TagsRepository:
             if not context_ids:
                 return {}
 
-            async with self.db_manager.get_connection() as db:
+            async with self.db_manager.get_connection(readonly=True) as db:
                 # Create placeholders for IN clause
                 placeholders = ",".join("?" * len(context_ids))
 
@@ -388,7 +400,6 @@ class TagsRepository:
                     WHERE ct.context_id IN ("""
                     + placeholders
                     + """)
-                    ORDER BY ct.context_id, t.name
                     """
                 )
                 cursor = await db.execute(
@@ -409,6 +420,8 @@ class TagsRepository:
                 for context_id in context_ids:
                     if context_id not in context_tags:
                         context_tags[context_id] = []
+                    else:
+                        context_tags[context_id].sort()
 
                 return context_tags
 
@@ -0,0 +1,225 @@
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Write Queue - group commit for concurrent writes on the writer connection.
+
+Responsible for:
+- Collecting writes submitted within a short window (or while the previous
+  group commits), up to a maximum group size
+- Running each group in one transaction, each write in its own SAVEPOINT,
+  so a failing write is rolled back alone and the others still commit
+- Handing every caller its own result or error once the group has committed
+
+Without it every save ends in its own COMMIT; with synchronous=FULL each of
+those is an fsync, and concurrent savers queue behind one another's.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+import aiosqlite
+
+from ..errors import StorageError
+from .connection_pool import SQLiteConnectionPool
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# A write runs its statements on the writer connection and must not commit
+Write = Callable[[aiosqlite.Connection], Awaitable[Any]]
+
+# Default collection window in milliseconds and maximum writes per transaction.
+# No window: a lone writer never waits, and writes arriving while a group
+# commits still share the next one.
+DEFAULT_WINDOW_MS = 0.0
+DEFAULT_MAX_BATCH = 64
+
+
+class WriteQueue:
+    """
+    Coalesces concurrent writes into shared transactions.
+
+    Callers await submit(); one flusher task per queue takes the pending
+    writes, runs them on the pool's writer connection and commits once.
+    A write whose caller was cancelled before its group started is dropped;
+    once started it is committed with its group.
+    """
+
+    def __init__(
+        self,
+        pool: SQLiteConnectionPool,
+        window_ms: float = DEFAULT_WINDOW_MS,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ):
+        """
+        Initialize write queue.
+
+        Args:
+            pool: Connection pool whose writer connection runs the groups
+            window_ms: How long a group waits for more writes after the first
+                (0: only writes queued while the previous group ran)
+            max_batch: Maximum number of writes per transaction
+        """
+        self.pool = pool
+        self.window = max(0.0, float(window_ms)) / 1000
+        self.max_batch = max(1, int(max_batch))
+
+        self._pending: List[Tuple[Write, asyncio.Future]] = []
+        self._flusher: Optional[asyncio.Task] = None
+        # Created on first use, inside the running event loop
+        self._full: Optional[asyncio.Event] = None
+
+        # Totals since creation
+        self.writes = 0
+        self.commits = 0
+
+    async def submit(self, write: Callable[[aiosqlite.Connection], Awaitable[T]]) -> T:
+        """
+        Run a write in the next group commit.
+
+        Args:
+            write: Coroutine function running the write's statements on the
+                connection it is given (without committing)
+
+        Returns:
+            The write's return value, once its transaction has committed
+
+        Raises:
+            Exception: What the write raised (only its own statements are
+                rolled back), or the error that failed the whole commit
+        """
+        loop = asyncio.get_running_loop()
+        if self._full is None:
+            self._full = asyncio.Event()
+
+        future = loop.create_future()
+        self._pending.append((write, future))
+        if len(self._pending) >= self.max_batch:
+            self._full.set()
+        if self._flusher is None or self._flusher.done():
+            self._flusher = loop.create_task(self._flush_pending())
+            self._flusher.add_done_callback(self._flusher_stopped)
+        return await future
+
+    async def close(self) -> None:
+        """Wait until every submitted write has been committed (or failed)"""
+        if self._flusher is not None and not self._flusher.done():
+            await asyncio.wait({self._flusher})
+
+    async def _flush_pending(self) -> None:
+        """Commit pending writes group by group until none are left"""
+        while self._pending:
+            if self.window and len(self._pending) < self.max_batch:
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.window)
+                except asyncio.TimeoutError:
+                    pass
+            group = self._pending[: self.max_batch]
+            del self._pending[: self.max_batch]
+            await self._commit_group([(w, f) for w, f in group if not f.cancelled()])
+
+    def _flusher_stopped(self, flusher: asyncio.Task) -> None:
+        """
+        Fail the writes a stopped flusher left behind.
+
+        Runs as a done callback, so it also covers a flusher cancelled before
+        its first step. A flusher that emptied the queue leaves nothing, and
+        writes submitted since then belong to the next flusher.
+        """
+        if flusher is not self._flusher or not (flusher.cancelled() or flusher.exception()):
+            return
+        pending, self._pending = self._pending, []
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(StorageError("Write queue stopped"))
+
+    async def _commit_group(self, group: List[Tuple[Write, asyncio.Future]]) -> None:
+        """Run a group of writes in one transaction and resolve their futures"""
+        if not group:
+            return
+
+        outcomes: List[Tuple[asyncio.Future, Any, Optional[BaseException]]] = []
+        try:
+            async with self.pool.connection() as db:
+                await db.execute("BEGIN")
+                for write, future in group:
+                    await db.execute("SAVEPOINT queued_write")
+                    try:
+                        result = await write(db)
+                    except Exception as e:
+                        await db.execute("ROLLBACK TO queued_write")
+                        await db.execute("RELEASE queued_write")
+                        outcomes.append((future, None, e))
+                    else:
+                        await db.execute("RELEASE queued_write")
+                        outcomes.append((future, result, None))
+                await db.commit()
+        except BaseException as e:
+            # Nothing of the group was committed
+            error = e if isinstance(e, Exception) else StorageError("Group commit cancelled")
+            logger.error(f"Group commit of {len(group)} writes failed: {error}")
+            for _, future in group:
+                if not future.done():
+                    future.set_exception(error)
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        self.writes += len(group)
+        self.commits += 1
+        for future, result, error in outcomes:
+            if future.done():
+                continue  # caller cancelled while its write ran
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+
+def create_write_queue(
+    pool: SQLiteConnectionPool,
+    window_ms: Optional[float] = None,
+    max_batch: Optional[int] = None,
+) -> WriteQueue:
+    """
+    Factory function to create write queue.
+
+    Args:
+        pool: Connection pool providing the writer connection
+        window_ms: Collection window (default: defaults.storage.write_window_ms)
+        max_batch: Writes per transaction (default: defaults.storage.write_batch_size)
+
+    Returns:
+        Configured WriteQueue instance
+    """
+    from ..config import get_default
+
+    if window_ms is None:
+        window_ms = get_default("storage.write_window_ms", DEFAULT_WINDOW_MS)
+    if max_batch is None:
+        max_batch = get_default("storage.write_batch_size", DEFAULT_MAX_BATCH)
+
+    return WriteQueue(pool, window_ms=window_ms, max_batch=max_batch)
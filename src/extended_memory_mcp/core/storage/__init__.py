@@ -30,7 +30,6 @@ Provides abstract storage interface with multiple provider implementations:
 """
 
 from .interfaces.storage_provider import IStorageProvider
-from .providers.sqlite.sqlite_provider import SQLiteStorageProvider
 from .storage_factory import StorageFactory, get_storage_provider
 
 # from .providers.redis.redis_provider import RedisStorageProvider  # Temporarily disabled
@@ -42,3 +41,13 @@ __all__ = [
     "SQLiteStorageProvider",
     # 'RedisStorageProvider'
 ]
+
+
+def __getattr__(name):
+    # Providers are imported on first use so only the selected backend's
+    # dependencies (aiosqlite or redis) are loaded
+    if name == "SQLiteStorageProvider":
+        from .providers.sqlite.sqlite_provider import SQLiteStorageProvider
+
+        return SQLiteStorageProvider
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,181 @@
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Content Codec - transparent compression of long context content.
+
+Content at least defaults.storage.content_compression_min_bytes long (as
+UTF-8) is stored compressed with zlib, or zstd when the zstandard package
+is installed. Every stored context carries the codec it was written with
+(None for plain text), so readers never depend on the current setting and
+rows whose compressed form would not be smaller stay plain.
+
+SQLite stores the compressed bytes as a BLOB in contexts.content, with the
+codec in contexts.content_codec. Redis stores them base64-encoded in the
+context JSON, with the codec in its "content_codec" field.
+"""
+
+import base64
+import logging
+import zlib
+from typing import Optional, Tuple, Union
+
+from extended_memory_mcp.core.errors import ConfigurationError, StorageError
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+ZLIB = "zlib"
+ZSTD = "zstd"
+# Setting values besides the codec names
+DISABLED = "none"
+AUTO = "auto"
+
+DEFAULT_MIN_BYTES = 4096
+
+
+def decompress(data: Union[str, bytes], codec: Optional[str]) -> str:
+    """
+    Text of stored content.
+
+    Args:
+        data: Stored content (plain text when codec is None)
+        codec: Codec marker stored with the content
+
+    Returns:
+        Plain text content
+
+    Raises:
+        StorageError: If the codec is unknown or not installed
+    """
+    if codec is None:
+        return data if isinstance(data, str) else bytes(data).decode("utf-8")
+    if codec == ZLIB:
+        return zlib.decompress(data).decode("utf-8")
+    if codec == ZSTD:
+        if zstandard is None:
+            raise StorageError("Context compressed with zstd, but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    raise StorageError(f"Unknown content codec: {codec}")
+
+
+def decompress_text(data: str, codec: Optional[str]) -> str:
+    """Text of content stored by ContentCodec.compress_text()"""
+    if codec is None:
+        return data
+    return decompress(base64.b64decode(data), codec)
+
+
+class ContentCodec:
+    """
+    Compresses context content above a size threshold.
+
+    Responsibilities:
+    - Pick the codec for new content (or none)
+    - Keep content that is short or does not shrink as plain text
+    """
+
+    def __init__(self, codec: str = DISABLED, min_bytes: int = DEFAULT_MIN_BYTES):
+        """
+        Initialize content codec.
+
+        Args:
+            codec: "none", "auto" (zstd when installed, else zlib), "zlib" or "zstd"
+            min_bytes: Smallest UTF-8 size that is compressed
+
+        Raises:
+            ValueError: If codec is unknown or not installed
+        """
+        if codec == AUTO:
+            codec = ZSTD if zstandard is not None else ZLIB
+        if codec not in (DISABLED, ZLIB, ZSTD):
+            raise ValueError(f"Unknown content codec: {codec}")
+        if codec == ZSTD and zstandard is None:
+            raise ValueError("Content codec 'zstd' needs the zstandard package")
+
+        self.name: Optional[str] = None if codec == DISABLED else codec
+        self.min_bytes = max(1, int(min_bytes))
+        self._zstd = zstandard.ZstdCompressor() if codec == ZSTD else None
+
+    def compress(self, content: str) -> Tuple[Union[str, bytes], Optional[str]]:
+        """
+        Stored form of content.
+
+        Returns:
+            (compressed bytes, codec), or (content, None) when it stays plain
+        """
+        if self.name is None:
+            return content, None
+        data = content.encode("utf-8")
+        if len(data) < self.min_bytes:
+            return content, None
+
+        packed = self._zstd.compress(data) if self._zstd is not None else zlib.compress(data)
+        if len(packed) >= len(data):
+            return content, None
+        return packed, self.name
+
+    def compress_text(self, content: str) -> Tuple[str, Optional[str]]:
+        """Stored form of content for text stores (compressed bytes base64-encoded)"""
+        packed, codec = self.compress(content)
+        if codec is None:
+            return content, None
+        return base64.b64encode(packed).decode("ascii"), codec
+
+
+def create_content_codec(
+    codec: Optional[str] = None, min_bytes: Optional[int] = None
+) -> ContentCodec:
+    """
+    Factory function to create content codec.
+
+    Args:
+        codec: Codec setting (default: defaults.storage.content_compression, "none")
+        min_bytes: Threshold (default: defaults.storage.content_compression_min_bytes)
+
+    Returns:
+        Configured ContentCodec instance
+
+    Raises:
+        ConfigurationError: If the codec setting or threshold is invalid
+    """
+    from extended_memory_mcp.core.config import get_default
+
+    if codec is None:
+        codec = get_default("storage.content_compression", DISABLED)
+    if min_bytes is None:
+        min_bytes = get_default("storage.content_compression_min_bytes", DEFAULT_MIN_BYTES)
+
+    codec = str(codec or DISABLED).lower()
+    if codec == ZSTD and zstandard is None:
+        logger.warning("zstandard is not installed, compressing context content with zlib")
+        codec = ZLIB
+    try:
+        return ContentCodec(codec, int(min_bytes))
+    except (TypeError, ValueError) as e:
+        raise ConfigurationError(
+            f"Invalid content compression setting: {e}",
+            context={"codec": codec, "min_bytes": min_bytes},
+        )
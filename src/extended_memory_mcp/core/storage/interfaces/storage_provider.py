@@ -30,19 +30,23 @@ from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+from extended_memory_mcp.core.maintenance import JobFunction, MaintenanceBudget
 from extended_memory_mcp.storage_types.storage_types import (
+    BatchContextItem,
+    BatchSaveResultList,
     ContextData,
     ContextList,
+    ContextPage,
     InitContextsResult,
     PopularTag,
     ProjectInfo,
     ProjectList,
     SearchFilters,
+    SearchResultList,
     StorageStats,
     TagList,
 )
 
-
 class IStorageProvider(ABC):
     """
     Abstract storage provider interface.
@@ -95,6 +99,25 @@ class IStorageProvider(ABC):
         """
         pass
 
+    @abstractmethod
+    async def save_contexts_batch(
+        self, contexts: List[BatchContextItem], chunk_size: Optional[int] = None
+    ) -> BatchSaveResultList:
+        """
+        Save many contexts with few round trips.
+
+        Items are validated one by one; valid items are written in chunks,
+        each chunk atomically. A failed chunk does not stop later chunks.
+
+        Args:
+            contexts: Contexts to save (see validate_batch_item)
+            chunk_size: Items per transaction/pipeline (default: get_batch_chunk_size())
+
+        Returns:
+            One BatchSaveResult per input item, in input order
+        """
+        pass
+
     @abstractmethod
     async def load_context(self, context_id: str) -> Optional[ContextData]:
         """
@@ -130,6 +153,36 @@ class IStorageProvider(ABC):
         """
         pass
 
+    @abstractmethod
+    async def load_contexts_page(
+        self,
+        project_id: Optional[str] = None,
+        limit: int = 50,
+        importance_threshold: int = 7,
+        tags_filter: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+    ) -> ContextPage:
+        """
+        Load one page of contexts, newest first (created_ms, then id).
+
+        Pages are continued with opaque cursors (core/storage/pagination.py)
+        instead of offsets, so deep pages are as cheap as the first one.
+
+        Args:
+            project_id: Filter by project (None for all projects)
+            limit: Maximum number of contexts in the page
+            importance_threshold: Minimum importance level (default: 7)
+            tags_filter: Filter by tags using OR logic (any of these tags)
+            cursor: next_cursor of the previous page (None for the first page)
+
+        Returns:
+            ContextPage with the contexts and the cursor of the next page
+
+        Raises:
+            ValidationError: If the cursor is malformed
+        """
+        pass
+
     @abstractmethod
     async def load_contexts_by_ids(self, context_ids: List[str]) -> ContextList:
         """
@@ -183,13 +236,40 @@ class IStorageProvider(ABC):
                 - project_id: Filter by project
                 - min_importance: Minimum importance level
                 - tags_filter: List of required tags
-                - content_search: Text search in content (RESERVED: for future advanced search features)
+                - content_search: Words that must all appear in the content
 
         Returns:
             List of matching ContextData
         """
         pass
 
+    @abstractmethod
+    async def search_contexts_ranked(
+        self,
+        query: str,
+        project_id: Optional[str] = None,
+        min_importance: int = 1,
+        limit: int = 10,
+        weights: Optional[Dict[str, float]] = None,
+    ) -> SearchResultList:
+        """
+        Full-text search ranked by relevance, importance and recency.
+
+        Every word of the query must appear in a hit. Scoring is defined in
+        core/storage/search_ranking.py.
+
+        Args:
+            query: Free-text search
+            project_id: Filter by project (None for all projects)
+            min_importance: Minimum importance level
+            limit: Maximum number of hits
+            weights: Overrides of the defaults.search ranking weights
+
+        Returns:
+            Hits with snippets instead of full content, best first
+        """
+        pass
+
     # Tag operations
     @abstractmethod
     async def get_context_tags(self, context_id: str) -> List[str]:
@@ -265,15 +345,27 @@ class IStorageProvider(ABC):
         pass
 
     @abstractmethod
-    async def cleanup_expired(self) -> int:
+    async def cleanup_expired(self, budget: Optional[MaintenanceBudget] = None) -> int:
         """
         Clean up expired or old contexts based on retention policy.
 
+        Args:
+            budget: Time budget checked between delete batches (None: run to the end)
+
         Returns:
             Number of contexts cleaned up
         """
         pass
 
+    def maintenance_jobs(self) -> Dict[str, JobFunction]:
+        """
+        Periodic housekeeping of this provider, run by the maintenance scheduler.
+
+        Returns:
+            Job coroutine functions by job name, each called with a MaintenanceBudget
+        """
+        return {"expire_contexts": self.cleanup_expired}
+
     @abstractmethod
     async def load_init_contexts(
         self, project_id: Optional[str] = None, limit: int = 30
@@ -0,0 +1,92 @@
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Pagination - opaque continuation cursors for newest-first context listings.
+
+Contexts are listed by (created_ms DESC, id DESC). A cursor records the key
+of the last context of a page; the next page holds the contexts strictly
+after it in that order. Providers seek to the key (an index range in SQLite,
+a score range in Redis), so every page costs the same however deep it is.
+
+Cursors are base64url-encoded JSON and only meaningful to the provider that
+issued them.
+"""
+
+import base64
+import binascii
+from typing import Any, Dict, Optional, Tuple, Union
+
+from extended_memory_mcp.core import json_codec
+from extended_memory_mcp.core.errors import ValidationError
+from extended_memory_mcp.core.storage.timestamps import context_ms
+
+ContextKey = Tuple[int, Union[int, str]]
+
+
+def encode_cursor(context: Dict[str, Any]) -> str:
+    """Cursor continuing after the given context"""
+    raw = json_codec.dumps([context_ms(context), context["id"]])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[ContextKey]:
+    """
+    Recover the (created_ms, id) key from a cursor.
+
+    Returns:
+        Key of the last context already returned, or None for the first page
+
+    Raises:
+        ValidationError: If the cursor is malformed
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_ms, context_id = json_codec.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+        raise ValidationError("Invalid pagination cursor", context={"cursor": cursor})
+
+    if (
+        not isinstance(created_ms, int)
+        or isinstance(created_ms, bool)
+        or not isinstance(context_id, (int, str))
+    ):
+        raise ValidationError("Invalid pagination cursor", context={"cursor": cursor})
+    return created_ms, context_id
+
+
+def build_page(rows: list, limit: int) -> Dict[str, Any]:
+    """
+    Cut a page from `limit + 1` newest-first rows.
+
+    Returns:
+        ContextPage with the first `limit` rows and the cursor after the last
+        one (None when the extra row shows there is nothing more)
+    """
+    contexts = rows[:limit]
+    has_more = len(rows) > limit and bool(contexts)
+    return {
+        "contexts": contexts,
+        "next_cursor": encode_cursor(contexts[-1]) if has_more else None,
+    }
@@ -23,8 +23,15 @@
 Storage providers package.
 """
 
-from .sqlite.sqlite_provider import SQLiteStorageProvider
-
 # from .redis.redis_provider import RedisStorageProvider  # Temporarily disabled
 
 __all__ = ["SQLiteStorageProvider"]  # 'RedisStorageProvider'
+
+
+def __getattr__(name):
+    # Imported on first use: see extended_memory_mcp.core.storage
+    if name == "SQLiteStorageProvider":
+        from .sqlite.sqlite_provider import SQLiteStorageProvider
+
+        return SQLiteStorageProvider
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
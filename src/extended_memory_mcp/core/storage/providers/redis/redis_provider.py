@@ -26,18 +26,23 @@ Refactored to use service layer architecture, following the same pattern as SQLi
 All business logic is extracted into dedicated services for better maintainability.
 """
 
-import json
 import logging
 from typing import Any, Dict, List, Optional
 
+from extended_memory_mcp.core import json_codec
+from extended_memory_mcp.core.maintenance import MaintenanceBudget
 from extended_memory_mcp.storage_types.storage_types import (
+    BatchContextItem,
+    BatchSaveResultList,
     ContextData,
     ContextList,
+    ContextPage,
     InitContextsResult,
     PopularTag,
     ProjectInfo,
     ProjectList,
     SearchFilters,
+    SearchResultList,
     StorageStats,
     TagList,
 )
@@ -61,6 +66,9 @@ except ImportError as e:
     REDIS_VERSION_ERROR = str(e)
 
 from ...interfaces.storage_provider import IStorageProvider
+from ...pagination import build_page, decode_cursor
+from ...search_ranking import get_search_weights, get_snippet_tokens
+from ...storage_utils import save_batch_in_chunks
 from .services import (
     RedisAnalyticsService,
     RedisConnectionService,
@@ -153,6 +161,17 @@ class RedisStorageProvider(IStorageProvider):
         """Save context using context service."""
         return await self.context_service.save_context(content, importance_level, project_id, tags)
 
+    async def save_contexts_batch(
+        self, contexts: List[BatchContextItem], chunk_size: Optional[int] = None
+    ) -> BatchSaveResultList:
+        """Save contexts in chunks, one pipelined transaction per chunk."""
+        return await save_batch_in_chunks(
+            contexts,
+            chunk_size,
+            self.context_service.save_contexts_batch,
+            operation="save_contexts_batch_redis",
+        )
+
     async def load_contexts(
         self,
         project_id: Optional[str] = None,
@@ -165,6 +184,24 @@ class RedisStorageProvider(IStorageProvider):
             project_id, limit, importance_threshold, tags_filter
         )
 
+    async def load_contexts_page(
+        self,
+        project_id: Optional[str] = None,
+        limit: int = 50,
+        importance_threshold: int = 7,
+        tags_filter: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+    ) -> ContextPage:
+        """Load a page using score-ranged reads of the timeline sorted sets."""
+        rows = await self.context_service.load_contexts_page(
+            project_id=project_id,
+            limit=limit,
+            importance_threshold=importance_threshold,
+            tags_filter=tags_filter,
+            before=decode_cursor(cursor),
+        )
+        return build_page(rows, limit)
+
     async def load_context(self, context_id: str) -> Optional[ContextData]:
         """Load single context using context service."""
         return await self.context_service.load_context(context_id)
@@ -193,6 +230,24 @@ class RedisStorageProvider(IStorageProvider):
         """Search contexts using context service."""
         return await self.context_service.search_contexts(filters)
 
+    async def search_contexts_ranked(
+        self,
+        query: str,
+        project_id: Optional[str] = None,
+        min_importance: int = 1,
+        limit: int = 10,
+        weights: Optional[Dict[str, float]] = None,
+    ) -> SearchResultList:
+        """Rank contexts using context service (scored in Python)."""
+        return await self.context_service.search_contexts_ranked(
+            query,
+            get_search_weights(weights),
+            project_id=project_id,
+            min_importance=min_importance,
+            limit=limit,
+            snippet_tokens=get_snippet_tokens(),
+        )
+
     async def find_contexts_by_multiple_tags(
         self, tags: List[str], project_id: Optional[str] = None, limit: int = 50
     ) -> ContextList:
@@ -232,7 +287,7 @@ class RedisStorageProvider(IStorageProvider):
             for key in keys:
                 context_json = await redis.get(key)
                 if context_json:
-                    context_data = json.loads(context_json)
+                    context_data = json_codec.loads(context_json)
                     project_id = context_data.get("project_id")
                     if project_id:
                         project_counts[project_id] = project_counts.get(project_id, 0) + 1
@@ -263,9 +318,9 @@ class RedisStorageProvider(IStorageProvider):
         """Get storage stats using analytics service."""
         return await self.analytics_service.get_storage_stats()
 
-    async def cleanup_expired(self) -> int:
+    async def cleanup_expired(self, budget: Optional[MaintenanceBudget] = None) -> int:
         """Cleanup expired contexts using analytics service."""
-        return await self.analytics_service.cleanup_expired()
+        return await self.analytics_service.cleanup_expired(budget)
 
     async def load_high_importance_contexts(self, limit: int = 5) -> List[Dict[str, Any]]:
         """Load high importance contexts using analytics service."""
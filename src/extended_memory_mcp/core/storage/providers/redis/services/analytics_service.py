@@ -24,15 +24,18 @@
 Handles analytics operations: storage stats, cleanup, high importance contexts, and init contexts.
 """
 
-import json
 import logging
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
+from extended_memory_mcp.core.maintenance import MaintenanceBudget, next_step
+from extended_memory_mcp.core.storage.timestamps import context_ms, now_ms
+
 # Module-level logger
 logger = logging.getLogger(__name__)
 
 from .connection_service import RedisConnectionService
+from .context_service import read_context, with_content
 
 
 class RedisAnalyticsService:
@@ -76,19 +79,58 @@ class RedisAnalyticsService:
             logger.error(f"Error getting Redis storage stats: {e}")
             return {"provider": "redis", "error": str(e)}
 
-    async def cleanup_expired(self) -> int:
-        """Clean up expired contexts in Redis.
-        Redis handles expiration automatically, so this is mostly a no-op.
+    async def cleanup_expired(self, budget: Optional[MaintenanceBudget] = None) -> int:
+        """Delete expired contexts, then the oldest contexts of projects over the cap.
+
+        Expired contexts are read off the expiry sorted set and the oldest
+        ones off each project timeline, retention.sweep_batch_size per
+        MULTI/EXEC, with the event loop running between batches. With a
+        budget the sweep stops once it is spent.
         """
-        try:
-            # For demonstration, we could implement manual cleanup logic here
-            # For now, just return 0 since Redis auto-expires
+        if not self.context_service:
             return 0
 
+        retention = self.context_service.retention
+        batch = retention.sweep_batch_size
+        removed = 0
+        try:
+            redis = await self.connection.get_connection()
+
+            expiry_key = self.context_service.expiry_key()
+            now = now_ms()
+            while True:
+                members = await redis.zrangebyscore(expiry_key, "-inf", now, start=0, num=batch)
+                if not members:
+                    break
+                removed += await self.context_service.delete_contexts(members)
+                if len(members) < batch or not await next_step(budget):
+                    break
+
+            cap = retention.max_contexts_per_project
+            if cap and (budget is None or not budget.expired()):
+                pattern = self.connection.make_key("project", "*", "timeline")
+                timeline_keys = [key async for key in redis.scan_iter(match=pattern)]
+                for timeline_key in timeline_keys:
+                    excess = await redis.zcard(timeline_key) - cap
+                    while excess > 0:
+                        members = await redis.zrange(timeline_key, 0, min(batch, excess) - 1)
+                        if not members:
+                            break
+                        removed += await self.context_service.delete_contexts(members)
+                        # Members of contexts that were already gone
+                        await redis.zrem(timeline_key, *members)
+                        excess -= len(members)
+                        if not await next_step(budget):
+                            return removed
+
+            if removed:
+                logger.info(f"Retention sweep removed {removed} contexts")
+            return removed
+
         except Exception as e:
 
             logger.error(f"Error in Redis cleanup: {e}")
-            return 0
+            return removed
 
     async def load_init_contexts(
         self, project_id: Optional[str] = None, limit: int = 10
@@ -130,16 +172,16 @@ class RedisAnalyticsService:
             for key in context_keys[: limit * 3]:  # Get more than needed, filter by importance
                 context_json = await redis.get(key)
                 if context_json:
-                    context = json.loads(context_json)
+                    context = read_context(context_json, content=False)
                     if context.get("importance_level", 0) >= 7:  # High importance threshold
-                        high_importance_contexts.append(context)
+                        high_importance_contexts.append(with_content(context))
 
                 if len(high_importance_contexts) >= limit:
                     break
 
             # Sort by importance and creation time
             high_importance_contexts.sort(
-                key=lambda x: (x.get("importance_level", 0), x.get("created_at", "")), reverse=True
+                key=lambda x: (x.get("importance_level", 0), context_ms(x)), reverse=True
             )
 
             return high_importance_contexts[:limit]
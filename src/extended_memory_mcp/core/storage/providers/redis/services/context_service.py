@@ -24,11 +24,17 @@
 Handles context operations: save, load, delete, search, and forget contexts.
 """
 
-import json
 import logging
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from extended_memory_mcp.core import json_codec
+from extended_memory_mcp.core.storage.content_codec import create_content_codec, decompress_text
+from extended_memory_mcp.core.storage.storage_utils import content_matches
+from extended_memory_mcp.core.storage.retention import create_retention_policy
+from extended_memory_mcp.core.storage.search_ranking import rank_contexts
+from extended_memory_mcp.core.storage.timestamps import context_ms, now_ms, present_context
 
 # Module-level logger
 logger = logging.getLogger(__name__)
@@ -36,11 +42,58 @@ logger = logging.getLogger(__name__)
 from .connection_service import RedisConnectionService
 
 
+def timeline_score(context: Dict[str, Any]) -> int:
+    """Timeline sorted-set score of a stored context: its created_ms"""
+    return context_ms(context)
+
+
+def read_context(context_json: Any, content: bool = True) -> Dict[str, Any]:
+    """
+    Decode a stored context and add the created_at string it is served with.
+
+    Args:
+        context_json: Stored context JSON
+        content: Decompress content; pass False to filter on the other
+            fields first, then call with_content() on the contexts kept
+    """
+    context_data = present_context(json_codec.loads(context_json))
+    return with_content(context_data) if content else context_data
+
+
+def with_content(context_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace compressed content of a decoded context by its text"""
+    codec = context_data.pop("content_codec", None)
+    if codec is not None:
+        context_data["content"] = decompress_text(context_data["content"], codec)
+    return context_data
+
+
+def _decode(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
 class RedisContextService:
     """Service for managing context operations in Redis."""
 
+    # Members read per ZREVRANGEBYSCORE while filling a page
+    TIMELINE_BATCH = 100
+
     def __init__(self, connection_service: RedisConnectionService):
         self.connection = connection_service
+        self.retention = create_retention_policy()
+        self.content_codec = create_content_codec()
+        self._timelines_ready = False
+
+    def timeline_keys(self, project_id: Optional[str]) -> List[str]:
+        """Sorted sets listing a context by creation time: global and per project"""
+        keys = [self.connection.make_key("timeline")]
+        if project_id:
+            keys.append(self.connection.make_key("project", project_id, "timeline"))
+        return keys
+
+    def expiry_key(self) -> str:
+        """Sorted set of contexts that expire: {context_id: expires_ms}"""
+        return self.connection.make_key("expiry")
 
     async def save_context(
         self,
@@ -52,31 +105,45 @@ class RedisContextService:
         """Save context to Redis.
 
         Storage structure:
-        - context:{context_id} = {full context data}
+        - context:{context_id} = {full context data} (long content compressed,
+          see content_codec)
         - project:{project_id}:contexts = [list of context_ids]
         - tag:{tag}:contexts = [list of context_ids]
+        - timeline, project:{project_id}:timeline = {context_id: created_ms}
+        - expiry = {context_id: expires_ms} (contexts that expire)
         """
         try:
             redis = await self.connection.get_connection()
 
             # Generate unique context ID
             context_id = str(uuid.uuid4())
+            created_ms = now_ms()
 
             # Prepare context data
             context_data = {
                 "id": context_id,
-                "content": content,
                 "importance_level": importance_level,
                 "project_id": project_id,
                 "tags": tags or [],
-                "created_at": datetime.now(timezone.utc).isoformat(),
+                "created_ms": created_ms,
+                "expires_ms": self.retention.expires_ms(importance_level, created_ms),
                 "updated_at": datetime.now(timezone.utc).isoformat(),
             }
+            self._set_content(context_data, content)
 
             # Store main context
             context_key = self.connection.make_key("context", context_id)
             ttl_seconds = getattr(self.connection, "ttl_seconds", None)
-            await redis.set(context_key, json.dumps(context_data), ex=ttl_seconds)
+            await redis.set(context_key, json_codec.dumps(context_data), ex=ttl_seconds)
+
+            # Add to timelines (newest-first paging by score range)
+            score = timeline_score(context_data)
+            for timeline_key in self.timeline_keys(project_id):
+                await redis.zadd(timeline_key, {context_id: score})
+                if ttl_seconds:
+                    await redis.expire(timeline_key, ttl_seconds)
+            if context_data["expires_ms"] is not None:
+                await redis.zadd(self.expiry_key(), {context_id: context_data["expires_ms"]})
 
             # Add to project index
             if project_id:
@@ -103,6 +170,73 @@ class RedisContextService:
             logger.error(f"Error saving context to Redis: {e}")
             return None
 
+    async def save_contexts_batch(self, contexts: List[Dict[str, Any]]) -> List[str]:
+        """Save several contexts in one MULTI/EXEC pipeline.
+
+        Uses the same keys as save_context, with one round trip for the
+        whole batch instead of several per context.
+
+        Args:
+            contexts: Validated items with content, importance_level, project_id, tags
+
+        Returns:
+            Context IDs in input order
+
+        Raises:
+            Exception: If the pipeline fails (the transaction is discarded)
+        """
+        if not contexts:
+            return []
+
+        redis = await self.connection.get_connection()
+        ttl_seconds = getattr(self.connection, "ttl_seconds", None)
+        now = datetime.now(timezone.utc).isoformat()
+        score = now_ms()
+
+        context_ids = []
+        touched_lists = set()
+        pipe = redis.pipeline(transaction=True)
+        for context in contexts:
+            context_id = str(uuid.uuid4())
+            context_ids.append(context_id)
+            project_id = context.get("project_id")
+            tags = context.get("tags") or []
+
+            context_data = {
+                "id": context_id,
+                "importance_level": context["importance_level"],
+                "project_id": project_id,
+                "tags": tags,
+                "created_ms": score,
+                "expires_ms": self.retention.expires_ms(context["importance_level"], score),
+                "updated_at": now,
+            }
+            self._set_content(context_data, context["content"])
+            pipe.set(
+                self.connection.make_key("context", context_id),
+                json_codec.dumps(context_data),
+                ex=ttl_seconds,
+            )
+            if context_data["expires_ms"] is not None:
+                pipe.zadd(self.expiry_key(), {context_id: context_data["expires_ms"]})
+
+            list_keys = [self.connection.make_key("tag", tag, "contexts") for tag in tags]
+            if project_id:
+                list_keys.append(self.connection.make_key("project", project_id, "contexts"))
+            for list_key in list_keys:
+                pipe.lpush(list_key, context_id)
+                touched_lists.add(list_key)
+            for timeline_key in self.timeline_keys(project_id):
+                pipe.zadd(timeline_key, {context_id: score})
+                touched_lists.add(timeline_key)
+
+        if ttl_seconds:
+            for list_key in touched_lists:
+                pipe.expire(list_key, ttl_seconds)
+
+        await pipe.execute()
+        return context_ids
+
     async def load_contexts(
         self,
         project_id: Optional[str] = None,
@@ -202,7 +336,7 @@ class RedisContextService:
                 context_json = await redis.get(context_key)
 
                 if context_json:
-                    context_data = json.loads(context_json)
+                    context_data = read_context(context_json, content=False)
 
                     # Apply filters
                     if context_data.get("importance_level", 0) < importance_threshold:
@@ -210,14 +344,94 @@ class RedisContextService:
 
                     contexts.append(context_data)
 
-            # Sort by created_at DESC, then by id for deterministic order
-            contexts.sort(key=lambda x: (x.get("created_at", ""), x.get("id", "")), reverse=True)
-            return contexts[:limit]
+            # Sort by created_ms DESC, then by id for deterministic order
+            contexts.sort(key=lambda x: (context_ms(x), x.get("id", "")), reverse=True)
+            return [with_content(context_data) for context_data in contexts[:limit]]
 
         except Exception as e:
             logger.error(f"Error loading contexts from Redis: {e}")
             return []
 
+    async def ensure_timelines(self, redis) -> None:
+        """Index contexts saved before timelines existed (once per service)"""
+        if self._timelines_ready:
+            return
+        if not await redis.exists(self.connection.make_key("timeline")):
+            pattern = self.connection.make_key("context", "*")
+            keys = [key async for key in redis.scan_iter(match=pattern)]
+            if keys:
+                pipe = redis.pipeline(transaction=False)
+                for context_json in await redis.mget(keys):
+                    if context_json:
+                        context_data = json_codec.loads(context_json)
+                        score = timeline_score(context_data)
+                        for timeline_key in self.timeline_keys(context_data.get("project_id")):
+                            pipe.zadd(timeline_key, {context_data["id"]: score})
+                await pipe.execute()
+        self._timelines_ready = True
+
+    async def load_contexts_page(
+        self,
+        project_id: Optional[str] = None,
+        limit: int = 50,
+        importance_threshold: int = 7,
+        tags_filter: Optional[List[str]] = None,
+        before: Optional[Tuple[int, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Read up to `limit + 1` contexts after a (created_ms, id) key, newest first.
+
+        Seeks the timeline sorted set by score (created_ms). Members sharing
+        the cursor's score come back in reverse id order, as in SQLite, and
+        only those with a smaller id are kept. Members whose context has
+        expired are dropped from the timeline on the way.
+        """
+        redis = await self.connection.get_connection()
+        await self.ensure_timelines(redis)
+        timeline_key = self.timeline_keys(project_id)[-1]
+        wanted_tags = {tag.strip().lower() for tag in tags_filter or [] if tag and tag.strip()}
+
+        contexts: List[Dict[str, Any]] = []
+        stale: List[str] = []
+
+        async def collect(context_ids: List[str]) -> None:
+            values = await redis.mget([self.connection.make_key("context", i) for i in context_ids])
+            for context_id, context_json in zip(context_ids, values):
+                if len(contexts) > limit:
+                    return
+                if not context_json:
+                    stale.append(context_id)
+                    continue
+                context_data = read_context(context_json, content=False)
+                if context_data.get("importance_level", 0) < importance_threshold:
+                    continue
+                if wanted_tags and not wanted_tags.intersection(context_data.get("tags", [])):
+                    continue
+                contexts.append(with_content(context_data))
+
+        max_score = "+inf"
+        if before is not None:
+            score = before[0]
+            ties = [_decode(m) for m in await redis.zrevrangebyscore(timeline_key, score, score)]
+            tied = [m for m in ties if m < str(before[1])]
+            if tied:
+                await collect(tied)
+            max_score = f"({score}"
+
+        offset = 0
+        while len(contexts) <= limit:
+            members = await redis.zrevrangebyscore(
+                timeline_key, max_score, "-inf", start=offset, num=self.TIMELINE_BATCH
+            )
+            if not members:
+                break
+            offset += len(members)
+            await collect([_decode(m) for m in members])
+
+        if stale:
+            await redis.zrem(timeline_key, *stale)
+        return contexts
+
     async def load_context(self, context_id: str) -> Optional[Dict[str, Any]]:
         """Load single context by ID from Redis."""
         try:
@@ -227,7 +441,7 @@ class RedisContextService:
             context_json = await redis.get(context_key)
 
             if context_json:
-                return json.loads(context_json)
+                return read_context(context_json)
             return None
 
         except Exception as e:
@@ -238,38 +452,66 @@ class RedisContextService:
     async def delete_context(self, context_id: str) -> bool:
         """Delete context and remove from all indices."""
         try:
-            redis = await self.connection.get_connection()
+            return await self.delete_contexts([context_id]) > 0
 
-            # Get context data first (to clean up indices)
-            context_key = self.connection.make_key("context", context_id)
-            context_json = await redis.get(context_key)
+        except Exception as e:
 
-            if not context_json:
-                return False
+            logger.error(f"Error deleting context from Redis: {e}")
+            return False
+
+    async def delete_contexts(self, context_ids: List[Any]) -> int:
+        """Delete contexts and their index entries in one MULTI/EXEC pipeline.
+
+        Ids may be sorted-set members as read (bytes). Ids whose context is
+        already gone (key TTL) are only dropped from the global timeline and
+        the expiry set; their project is unknown.
+
+        Returns:
+            Number of contexts deleted
 
-            context_data = json.loads(context_json)
+        Raises:
+            Exception: If Redis fails (the transaction is discarded)
+        """
+        if not context_ids:
+            return 0
+
+        redis = await self.connection.get_connection()
+        context_ids = [_decode(i) for i in context_ids]
+        context_keys = [self.connection.make_key("context", i) for i in context_ids]
+        stored = await redis.mget(context_keys)
+
+        deleted = 0
+        pipe = redis.pipeline(transaction=True)
+        for context_id, context_key, context_json in zip(context_ids, context_keys, stored):
+            pipe.zrem(self.expiry_key(), context_id)
+            if not context_json:
+                pipe.zrem(self.timeline_keys(None)[0], context_id)
+                continue
 
-            # Delete main context
-            await redis.delete(context_key)
+            context_data = json_codec.loads(context_json)
+            pipe.delete(context_key)
+            deleted += 1
 
-            # Remove from project index
+            # Remove from timelines and the project index
             project_id = context_data.get("project_id")
+            for timeline_key in self.timeline_keys(project_id):
+                pipe.zrem(timeline_key, context_id)
             if project_id:
                 project_contexts_key = self.connection.make_key("project", project_id, "contexts")
-                await redis.lrem(project_contexts_key, 1, context_id)
+                pipe.lrem(project_contexts_key, 1, context_id)
 
             # Remove from tag indices
-            tags = context_data.get("tags", [])
-            for tag in tags:
-                tag_contexts_key = self.connection.make_key("tag", tag, "contexts")
-                await redis.lrem(tag_contexts_key, 1, context_id)
+            for tag in context_data.get("tags", []):
+                pipe.lrem(self.connection.make_key("tag", tag, "contexts"), 1, context_id)
 
-            return True
-
-        except Exception as e:
+        await pipe.execute()
+        return deleted
 
-            logger.error(f"Error deleting context from Redis: {e}")
-            return False
+    def _set_content(self, context_data: Dict[str, Any], content: str) -> None:
+        """Store content in a context dict, compressed when long enough"""
+        context_data["content"], codec = self.content_codec.compress_text(content)
+        if codec is not None:
+            context_data["content_codec"] = codec
 
     async def update_context(
         self, context_id: str, content: Optional[str] = None, importance_level: Optional[int] = None
@@ -284,19 +526,27 @@ class RedisContextService:
             if not context_json:
                 return False
 
-            context_data = json.loads(context_json)
+            context_data = json_codec.loads(context_json)
 
             # Update fields
             if content is not None:
-                context_data["content"] = content
+                context_data.pop("content_codec", None)
+                self._set_content(context_data, content)
             if importance_level is not None:
                 context_data["importance_level"] = importance_level
+                # A new importance tier moves the expiry
+                expires_ms = self.retention.expires_ms(importance_level, context_ms(context_data))
+                context_data["expires_ms"] = expires_ms
+                if expires_ms is None:
+                    await redis.zrem(self.expiry_key(), context_id)
+                else:
+                    await redis.zadd(self.expiry_key(), {context_id: expires_ms})
 
             context_data["updated_at"] = datetime.now(timezone.utc).isoformat()
 
             # Save updated context
             ttl_seconds = getattr(self.connection, "ttl_seconds", None)
-            await redis.set(context_key, json.dumps(context_data), ex=ttl_seconds)
+            await redis.set(context_key, json_codec.dumps(context_data), ex=ttl_seconds)
             return True
 
         except Exception as e:
@@ -304,6 +554,64 @@ class RedisContextService:
             logger.error(f"Error updating context in Redis: {e}")
             return False
 
+    async def search_contexts_ranked(
+        self,
+        query: str,
+        weights: Dict[str, float],
+        project_id: Optional[str] = None,
+        min_importance: int = 1,
+        limit: int = 10,
+        snippet_tokens: int = 24,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank contexts for a free-text query in Python (no full-text index).
+
+        BM25 statistics are taken over every context in scope, so scores
+        follow the SQLite FTS5 ranking.
+        """
+        redis = await self.connection.get_connection()
+
+        contexts = []
+        async for context_data in self.iter_contexts(redis, project_id):
+            if context_data.get("importance_level", 0) >= min_importance:
+                contexts.append(with_content(context_data))
+
+        return rank_contexts(contexts, query, weights, limit, snippet_tokens)
+
+    async def iter_contexts(
+        self, redis, project_id: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stored contexts of a project (or of all projects), newest first.
+
+        Walks the project's timeline sorted set (the global one without a
+        project) and reads TIMELINE_BATCH contexts per MGET. Contexts are
+        yielded with their content still compressed: call with_content()
+        on those that are kept. Members whose context has expired are
+        dropped from the timeline on the way.
+        """
+        await self.ensure_timelines(redis)
+        timeline_key = self.timeline_keys(project_id)[-1]
+
+        start = 0
+        while True:
+            members = await redis.zrevrange(timeline_key, start, start + self.TIMELINE_BATCH - 1)
+            if not members:
+                return
+            start += len(members)
+
+            context_ids = [_decode(m) for m in members]
+            values = await redis.mget([self.connection.make_key("context", i) for i in context_ids])
+            stale = []
+            for context_id, context_json in zip(context_ids, values):
+                if context_json:
+                    yield read_context(context_json, content=False)
+                else:
+                    stale.append(context_id)
+            if stale:
+                await redis.zrem(timeline_key, *stale)
+                start -= len(stale)
+
     async def search_contexts(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Search contexts with complex filters in Redis."""
         try:
@@ -313,51 +621,39 @@ class RedisContextService:
             project_id = filters.get("project_id")
             min_importance = filters.get("min_importance", 1)
             tags_filter = filters.get("tags", [])
-            content_search = filters.get(
-                "content_search"
-            )  # RESERVED: for future advanced search features
+            content_search = filters.get("content_search")
             limit = filters.get("limit", 100)
 
-            # Start with all contexts or project-specific contexts
-            if project_id:
-                pattern = self.connection.make_key("context", f"{project_id}:*")
-            else:
-                pattern = self.connection.make_key("context", "*")
-
-            context_keys = await redis.keys(pattern)
+            # Newest first from the project's (or the global) timeline
             contexts = []
-
-            for key in context_keys:
-                context_json = await redis.get(key)
-                if context_json:
-                    context_data = json.loads(context_json)
-
-                    # Apply filters
-                    if context_data.get("importance_level", 0) < min_importance:
-                        continue
-                    # Apply content search filter (RESERVED: for future advanced search features)
-                    if (
-                        content_search
-                        and content_search.lower() not in context_data.get("content", "").lower()
-                    ):
+            async for context_data in self.iter_contexts(redis, project_id):
+                # Apply filters
+                if context_data.get("importance_level", 0) < min_importance:
+                    continue
+
+                # Check tags filter
+                if tags_filter:
+                    context_tags = context_data.get("tags", [])
+                    if not any(tag in context_tags for tag in tags_filter):
                         continue
 
-                    # Check tags filter
-                    if tags_filter:
-                        context_tags = context_data.get("tags", [])
-                        if not any(tag in context_tags for tag in tags_filter):
-                            continue
+                with_content(context_data)
+                # Same whole-word semantics as the SQLite FTS5 index
+                if content_search and not content_matches(
+                    context_data.get("content", ""), content_search
+                ):
+                    continue
 
-                    contexts.append(context_data)
+                contexts.append(context_data)
 
-                    if len(contexts) >= limit:
-                        break
+                if len(contexts) >= limit:
+                    break
 
             # Sort by importance and creation time (deterministic)
             contexts.sort(
                 key=lambda x: (
                     x.get("importance_level", 0),
-                    x.get("created_at", ""),
+                    context_ms(x),
                     x.get("id", ""),
                 ),
                 reverse=True,
@@ -402,13 +698,10 @@ class RedisContextService:
             for i, result in enumerate(results):
                 if result:  # Skip None results (missing contexts)
                     try:
-                        # Handle both bytes and string results from Redis
-                        if isinstance(result, bytes):
-                            context_data = json.loads(result.decode("utf-8"))
-                        else:
-                            context_data = json.loads(result)
+                        # Codec accepts both bytes and string results from Redis
+                        context_data = read_context(result)
                         contexts.append(context_data)
-                    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                    except ValueError as e:
                         logger.warning(f"Failed to decode context {context_ids[i]}: {e}")
                         continue
 
@@ -416,7 +709,7 @@ class RedisContextService:
             contexts.sort(
                 key=lambda x: (
                     x.get("importance_level", 0),
-                    x.get("created_at", ""),
+                    context_ms(x),
                     x.get("id", ""),
                 ),
                 reverse=True,
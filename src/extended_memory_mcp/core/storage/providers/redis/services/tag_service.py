@@ -24,11 +24,12 @@
 Handles tag operations: get context tags, add tags to contexts, and tag management.
 """
 
-import json
 import logging
 from datetime import datetime, timezone
 from typing import Any, Dict, List
 
+from extended_memory_mcp.core import json_codec
+
 # Module-level logger
 logger = logging.getLogger(__name__)
 
@@ -50,7 +51,7 @@ class RedisTagService:
             context_json = await redis.get(context_key)
 
             if context_json:
-                context_data = json.loads(context_json)
+                context_data = json_codec.loads(context_json)
                 return context_data.get("tags", [])
             return []
 
@@ -70,7 +71,7 @@ class RedisTagService:
             if not context_json:
                 return False
 
-            context_data = json.loads(context_json)
+            context_data = json_codec.loads(context_json)
             tags = context_data.get("tags", [])
 
             if tag not in tags:
@@ -80,7 +81,7 @@ class RedisTagService:
 
                 # Update context
                 ttl_seconds = getattr(self.connection, "ttl_seconds", None)
-                await redis.set(context_key, json.dumps(context_data), ex=ttl_seconds)
+                await redis.set(context_key, json_codec.dumps(context_data), ex=ttl_seconds)
 
                 # Add to tag index
                 tag_contexts_key = self.connection.make_key("tag", tag, "contexts")
@@ -139,7 +140,7 @@ class RedisTagService:
                             context_key = self.connection.make_key("context", context_id)
                             context_json = await redis.get(context_key)
                             if context_json:
-                                context_data = json.loads(context_json)
+                                context_data = json_codec.loads(context_json)
                                 if context_data.get("project_id") == project_id:
                                     filtered_ids.append(context_id)
                         context_count = len(filtered_ids)
@@ -185,7 +186,7 @@ class RedisTagService:
                     context_key = self.connection.make_key("context", context_id)
                     context_json = await redis.get(context_key)
                     if context_json:
-                        context_data = json.loads(context_json)
+                        context_data = json_codec.loads(context_json)
                         if context_data.get("project_id") == project_id:
                             # Redis uses UUID strings, not integers
                             result_ids.append(str(context_id))
@@ -289,10 +290,10 @@ class RedisTagService:
                     for i, context_data in enumerate(context_data_list):
                         if context_data and i < len(context_ids_list):
                             try:
-                                data = json.loads(context_data)
+                                data = json_codec.loads(context_data)
                                 context_id = context_ids_list[i]
                                 context_projects[context_id] = data.get("project_id")
-                            except (json.JSONDecodeError, IndexError):
+                            except (ValueError, IndexError):
                                 continue
 
                     # Count contexts per tag that match project
@@ -385,11 +386,11 @@ class RedisTagService:
                 for i, context_data in enumerate(context_data_list):
                     if context_data and i < len(context_ids_list):
                         try:
-                            data = json.loads(context_data)
+                            data = json_codec.loads(context_data)
                             if data.get("project_id") == project_id:
                                 # Redis uses UUID strings, not integers
                                 filtered_ids.append(str(context_ids_list[i]))
-                        except json.JSONDecodeError:
+                        except ValueError:
                             continue
 
                     # Early exit if we have enough results
@@ -34,22 +34,40 @@ from typing import Any, Dict, List, Optional
 import aiosqlite
 
 from extended_memory_mcp.storage_types.storage_types import (
+    BatchContextItem,
+    BatchSaveResultList,
     ContextData,
     ContextList,
+    ContextPage,
     InitContextsResult,
     PopularTag,
     ProjectInfo,
     ProjectList,
     SearchFilters,
+    SearchResultList,
     StorageStats,
     TagList,
 )
 
 from ....errors import MemoryMCPError, StorageError, ValidationError, error_handler
+from ....maintenance import JobFunction, MaintenanceBudget, next_step
 from ...interfaces.storage_provider import IStorageProvider
+from ...pagination import build_page, decode_cursor
+from ...search_ranking import (
+    FALLBACK_CANDIDATES,
+    get_search_weights,
+    get_snippet_tokens,
+    rank_contexts,
+)
+from ...retention import create_retention_policy
+from ...storage_utils import content_matches, save_batch_in_chunks, search_words
+from ...timestamps import context_ms, now_ms
 
 logger = logging.getLogger(__name__)
 
+# Pages released per PRAGMA incremental_vacuum step (4 MB at 4 KB pages)
+VACUUM_STEP_PAGES = 1024
+
 
 class SQLiteStorageProvider(IStorageProvider):
     """
@@ -81,6 +99,7 @@ class SQLiteStorageProvider(IStorageProvider):
         self.db_manager = DatabaseManager(db_path)
         self.context_repo = ContextRepository(self.db_manager)
         self.tags_repo = TagsRepository(self.db_manager)
+        self.retention = create_retention_policy()
 
         # High-level services for complex operations
         self.instruction_service = InstructionService(
@@ -95,14 +114,9 @@ class SQLiteStorageProvider(IStorageProvider):
         self._db_path = db_path
 
     async def initialize(self) -> bool:
-        """Initialize SQLite database and tables."""
+        """Initialize SQLite database by applying pending schema migrations."""
         try:
-            await self.db_manager.ensure_database()
-
-            # Create performance indexes for scalability
-            await self._create_performance_indexes()
-
-            return True
+            return await self.db_manager.ensure_database()
         except Exception as e:
             # Use structured error handling
             storage_error = error_handler.handle_error(
@@ -115,7 +129,7 @@ class SQLiteStorageProvider(IStorageProvider):
     async def health_check(self) -> bool:
         """Check SQLite database health."""
         try:
-            async with self.db_manager.get_connection() as db:
+            async with self.db_manager.get_connection(readonly=True) as db:
                 await db.execute("SELECT 1")
                 return True
         except Exception as e:
@@ -134,17 +148,15 @@ class SQLiteStorageProvider(IStorageProvider):
     ) -> Optional[str]:
         """Save context using existing ContextRepository."""
         try:
-            # Use existing repository method
+            # Context row and tags are written in one transaction
             context_id = await self.context_repo.save_context(
                 content=content,
                 importance_level=importance_level,
                 project_id=project_id,
+                tags=tags,
+                lifetime_ms=self.retention.lifetime_ms(importance_level),
             )
 
-            if context_id and tags:
-                # Add tags using TagsRepository
-                await self.tags_repo.save_context_tags(context_id, tags)
-
             return str(context_id) if context_id else None
 
         except Exception as e:
@@ -161,6 +173,23 @@ class SQLiteStorageProvider(IStorageProvider):
             )
             return None
 
+    async def save_contexts_batch(
+        self, contexts: List[BatchContextItem], chunk_size: Optional[int] = None
+    ) -> BatchSaveResultList:
+        """Save contexts in chunked transactions (executemany per chunk)."""
+
+        async def save_chunk(chunk: List[BatchContextItem]) -> List[int]:
+            return await self.context_repo.save_contexts_batch(
+                [
+                    {**item, "lifetime_ms": self.retention.lifetime_ms(item["importance_level"])}
+                    for item in chunk
+                ]
+            )
+
+        return await save_batch_in_chunks(
+            contexts, chunk_size, save_chunk, operation="save_contexts_batch_sqlite"
+        )
+
     async def load_contexts(
         self,
         project_id: Optional[str] = None,
@@ -191,7 +220,7 @@ class SQLiteStorageProvider(IStorageProvider):
                 ]
 
                 # Sort by creation time (newest first) and limit
-                filtered_contexts.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+                filtered_contexts.sort(key=context_ms, reverse=True)
 
                 return filtered_contexts[:limit]
             else:
@@ -228,6 +257,36 @@ class SQLiteStorageProvider(IStorageProvider):
             )
             return []
 
+    async def load_contexts_page(
+        self,
+        project_id: Optional[str] = None,
+        limit: int = 50,
+        importance_threshold: int = 7,
+        tags_filter: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+    ) -> ContextPage:
+        """Load a page with a keyset seek on (created_ms, id) instead of OFFSET."""
+        before = decode_cursor(cursor)
+        if before is not None and not isinstance(before[1], int):
+            raise ValidationError("Invalid pagination cursor", context={"cursor": cursor})
+
+        rows = await self.context_repo.load_contexts(
+            project_id=project_id,
+            importance_min=importance_threshold,
+            limit=limit + 1,
+            before=before,
+            tags=tags_filter,
+        )
+        page = build_page(rows, limit)
+
+        if page["contexts"]:
+            tags_batch = await self.tags_repo.load_context_tags_batch(
+                [ctx["id"] for ctx in page["contexts"]]
+            )
+            for context in page["contexts"]:
+                context["tags"] = tags_batch.get(context["id"], [])
+        return page
+
     async def load_contexts_by_ids(self, context_ids: List[str]) -> ContextList:
         """
         Load specific contexts by their IDs using optimized batch queries.
@@ -297,7 +356,7 @@ class SQLiteStorageProvider(IStorageProvider):
         try:
             # Simple query: get distinct project_ids from contexts
             # Redis-compatible approach - no complex JOINs
-            async with aiosqlite.connect(self.db_manager.db_path) as db:
+            async with self.db_manager.get_connection(readonly=True) as db:
                 async with db.execute(
                     "SELECT DISTINCT project_id, COUNT(*) as context_count FROM contexts WHERE project_id IS NOT NULL GROUP BY project_id"
                 ) as cursor:
@@ -341,9 +400,7 @@ class SQLiteStorageProvider(IStorageProvider):
             project_id = filters.get("project_id")
             min_importance = filters.get("min_importance", 1)
             tags_filter = filters.get("tags", [])
-            content_search = filters.get(
-                "content_search"
-            )  # RESERVED: for future advanced search features
+            content_search = filters.get("content_search")
             limit = filters.get("limit", 100)
 
             if tags_filter:
@@ -368,9 +425,8 @@ class SQLiteStorageProvider(IStorageProvider):
                         continue
 
                     # Content search filter
-                    if (
-                        content_search
-                        and content_search.lower() not in context.get("content", "").lower()
+                    if content_search and not content_matches(
+                        context.get("content", ""), content_search
                     ):
                         continue
 
@@ -388,7 +444,7 @@ class SQLiteStorageProvider(IStorageProvider):
 
                 # Sort and limit final results
                 filtered_contexts.sort(
-                    key=lambda x: (x.get("importance_level", 0), x.get("created_at", "")),
+                    key=lambda x: (x.get("importance_level", 0), context_ms(x)),
                     reverse=True,
                 )
 
@@ -418,6 +474,50 @@ class SQLiteStorageProvider(IStorageProvider):
             logger.error(f"Error searching contexts: {e}")
             return []
 
+    async def search_contexts_ranked(
+        self,
+        query: str,
+        project_id: Optional[str] = None,
+        min_importance: int = 1,
+        limit: int = 10,
+        weights: Optional[Dict[str, float]] = None,
+    ) -> SearchResultList:
+        """Rank FTS5 matches in SQL; without FTS5, rank LIKE matches in Python."""
+        from ....memory.context_repository import build_fts_query
+
+        weights = get_search_weights(weights)
+        snippet_tokens = get_snippet_tokens()
+
+        await self.db_manager.ensure_database()
+        fts_query = build_fts_query(query)
+        if not fts_query:
+            return []
+
+        if self.db_manager.full_text_search:
+            hits = await self.context_repo.search_contexts_ranked(
+                fts_query,
+                weights,
+                project_id=project_id,
+                importance_min=min_importance,
+                limit=limit,
+                snippet_tokens=snippet_tokens,
+            )
+        else:
+            # LIKE on the longest word; rank_contexts() checks the others
+            candidates = await self.context_repo.search_contexts_optimized(
+                project_id=project_id,
+                importance_min=min_importance,
+                content_search=max(search_words(query), key=len),
+                limit=FALLBACK_CANDIDATES,
+            )
+            hits = rank_contexts(candidates, query, weights, limit, snippet_tokens)
+
+        if hits:
+            tags_batch = await self.tags_repo.load_context_tags_batch([h["id"] for h in hits])
+            for hit in hits:
+                hit["tags"] = tags_batch.get(hit["id"], [])
+        return hits
+
     async def get_context_tags(self, context_id: str) -> List[str]:
         """Get tags for context using existing TagsRepository."""
         try:
@@ -482,7 +582,7 @@ class SQLiteStorageProvider(IStorageProvider):
     async def get_storage_stats(self) -> StorageStats:
         """Get SQLite storage statistics."""
         try:
-            async with self.db_manager.get_connection() as db:
+            async with self.db_manager.get_connection(readonly=True) as db:
                 # Count contexts
                 cursor = await db.execute("SELECT COUNT(*) FROM contexts")
                 context_count = (await cursor.fetchone())[0]
@@ -513,16 +613,68 @@ class SQLiteStorageProvider(IStorageProvider):
             logger.error(f"Error getting SQLite storage stats: {e}")
             return {"provider": "sqlite", "error": str(e)}
 
-    async def cleanup_expired(self) -> int:
-        """Clean up expired contexts in SQLite."""
+    async def cleanup_expired(self, budget: Optional[MaintenanceBudget] = None) -> int:
+        """
+        Delete expired contexts, then the oldest contexts of projects over the cap.
+
+        Each batch of retention.sweep_batch_size deletes is its own write, and
+        the event loop runs between batches, so saves are never held up for
+        more than one batch. With a budget the sweep stops once it is spent
+        and resumes on the next call.
+        """
+        batch = self.retention.sweep_batch_size
+        removed = 0
         try:
-            # Implement cleanup logic based on retention policies
-            # For now, return 0 (no automatic cleanup)
-            return 0
+            now = now_ms()
+            while True:
+                deleted = await self.context_repo.delete_expired(now, batch)
+                removed += deleted
+                if deleted < batch or not await next_step(budget):
+                    break
+
+            cap = self.retention.max_contexts_per_project
+            if cap and (budget is None or not budget.expired()):
+                for project_id, count in await self.context_repo.count_projects_over(cap):
+                    excess = count - cap
+                    while excess > 0:
+                        deleted = await self.context_repo.delete_oldest(
+                            project_id, min(batch, excess)
+                        )
+                        if not deleted:
+                            break
+                        removed += deleted
+                        excess -= deleted
+                        if not await next_step(budget):
+                            return removed
+
+            if removed:
+                logger.info(f"Retention sweep removed {removed} contexts")
+            return removed
         except Exception as e:
+            error_handler.handle_error(
+                e, context={"removed": removed}, operation="cleanup_expired_sqlite"
+            )
+            return removed
+
+    def maintenance_jobs(self) -> Dict[str, JobFunction]:
+        """Retention sweep plus tag cleanup, WAL checkpoints, ANALYZE and vacuum."""
+        jobs = super().maintenance_jobs()
+        jobs.update(
+            cleanup_unused_tags=lambda budget: self.tags_repo.cleanup_unused_tags(),
+            wal_checkpoint=lambda budget: self.db_manager.checkpoint(),
+            optimize=lambda budget: self.db_manager.optimize(),
+            incremental_vacuum=self.incremental_vacuum,
+        )
+        return jobs
 
-            logger.error(f"Error in SQLite cleanup: {e}")
-            return 0
+    async def incremental_vacuum(self, budget: Optional[MaintenanceBudget] = None) -> int:
+        """Shrink the database file by its free pages, VACUUM_STEP_PAGES per step."""
+        freed = 0
+        while True:
+            step = await self.db_manager.incremental_vacuum(VACUUM_STEP_PAGES)
+            freed += step
+            if step < VACUUM_STEP_PAGES or not await next_step(budget):
+                return freed
 
     async def forget_context(self, context_id: str) -> bool:
         """
@@ -568,42 +720,6 @@ class SQLiteStorageProvider(IStorageProvider):
             logger.error(f"Error loading high importance contexts: {e}")
             return []
 
-    async def _create_performance_indexes(self) -> None:
-        """
-        Create performance indexes for scalability.
-        Called during initialization to ensure optimal query performance.
-        """
-        indexes = [
-            # Core context indexes for fast filtering
-            "CREATE INDEX IF NOT EXISTS idx_contexts_project_created ON contexts(project_id, created_at DESC)",
-            "CREATE INDEX IF NOT EXISTS idx_contexts_project_importance ON contexts(project_id, importance_level)",
-            "CREATE INDEX IF NOT EXISTS idx_contexts_importance ON contexts(importance_level)",
-            "CREATE INDEX IF NOT EXISTS idx_contexts_created_at ON contexts(created_at)",
-            # Tag relationship indexes for JOIN optimization
-            "CREATE INDEX IF NOT EXISTS idx_context_tags_tag_id ON context_tags(tag_id)",
-            "CREATE INDEX IF NOT EXISTS idx_context_tags_context_id ON context_tags(context_id)",
-            "CREATE INDEX IF NOT EXISTS idx_context_tags_composite ON context_tags(tag_id, context_id)",
-            # Tag lookup indexes
-            "CREATE INDEX IF NOT EXISTS idx_tags_name ON tags(name)",
-            # Project isolation indexes
-            "CREATE INDEX IF NOT EXISTS idx_contexts_project_id ON contexts(project_id)",
-        ]
-
-        try:
-            import aiosqlite
-
-            async with aiosqlite.connect(self.db_manager.db_path) as db:
-                for index_sql in indexes:
-                    await db.execute(index_sql)
-                await db.commit()
-
-            logger.info(f"Created {len(indexes)} performance indexes for SQLite scalability")
-
-        except Exception as e:
-            logger.warning(f"Failed to create some performance indexes: {e}")
-            # Non-critical - continue initialization
-
     async def close(self) -> None:
-        """Close SQLite connections (no persistent connections to close)."""
-        # SQLite connections are auto-closed in context managers
-        pass
+        """Close pooled SQLite connections."""
+        await self.db_manager.close()
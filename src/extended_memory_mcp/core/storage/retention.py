@@ -0,0 +1,149 @@
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Retention - when contexts expire and how many a project may keep.
+
+Expiry is fixed when a context is saved, from its importance tier:
+- importance >= critical_threshold: critical_decisions_years
+- importance >= archive_threshold: project_context_months
+- below: working_memory_hours
+A tier set to 0 or null never expires. The windows come from the
+retention_policies section and the tiers from importance_thresholds, both
+falling back to defaults.retention.
+
+cleanup_expired() of each provider removes contexts past their expiry, then
+the oldest contexts of projects above defaults.memory.max_contexts_per_project,
+in batches of defaults.retention.sweep_batch_size so no single write holds
+the database (or Redis) for long.
+"""
+
+from typing import Any, Dict, Optional
+
+from extended_memory_mcp.core.errors import ConfigurationError
+
+from .timestamps import MS_PER_DAY, MS_PER_HOUR
+
+DEFAULT_RETENTION: Dict[str, Any] = {
+    "working_memory_hours": 24,
+    "project_context_months": 6,
+    "critical_decisions_years": 1,
+    "archive_threshold": 3,
+    "critical_threshold": 8,
+    "sweep_batch_size": 500,
+}
+DEFAULT_MAX_CONTEXTS_PER_PROJECT = 10000
+
+# Calendar-free lengths: expiry only needs to be stable, not to land on a date
+MS_PER_MONTH = 30 * MS_PER_DAY
+MS_PER_YEAR = 365 * MS_PER_DAY
+
+
+class RetentionPolicy:
+    """Expiry windows by importance tier, the per-project cap and the sweep batch size"""
+
+    def __init__(
+        self,
+        working_memory_hours: Optional[float] = 24,
+        project_context_months: Optional[float] = 6,
+        critical_decisions_years: Optional[float] = 1,
+        archive_threshold: int = 3,
+        critical_threshold: int = 8,
+        max_contexts_per_project: Optional[int] = DEFAULT_MAX_CONTEXTS_PER_PROJECT,
+        sweep_batch_size: int = 500,
+    ):
+        self.archive_threshold = archive_threshold
+        self.critical_threshold = critical_threshold
+        self.max_contexts_per_project = max_contexts_per_project or None
+        self.sweep_batch_size = max(1, int(sweep_batch_size))
+        self._lifetimes_ms = (
+            _lifetime_ms(working_memory_hours, MS_PER_HOUR),
+            _lifetime_ms(project_context_months, MS_PER_MONTH),
+            _lifetime_ms(critical_decisions_years, MS_PER_YEAR),
+        )
+
+    def lifetime_ms(self, importance_level: int) -> Optional[int]:
+        """How long a context of this importance is kept (None: forever)"""
+        if importance_level >= self.critical_threshold:
+            return self._lifetimes_ms[2]
+        if importance_level >= self.archive_threshold:
+            return self._lifetimes_ms[1]
+        return self._lifetimes_ms[0]
+
+    def expires_ms(self, importance_level: int, created_ms: int) -> Optional[int]:
+        """Expiry time in epoch ms of a context created at created_ms (None: never)"""
+        lifetime = self.lifetime_ms(importance_level)
+        return None if lifetime is None else created_ms + lifetime
+
+    def __repr__(self) -> str:
+        return (
+            f"RetentionPolicy(lifetimes_ms={self._lifetimes_ms}, "
+            f"max_contexts_per_project={self.max_contexts_per_project})"
+        )
+
+
+def _lifetime_ms(value: Optional[float], unit_ms: int) -> Optional[int]:
+    return int(value * unit_ms) if value else None
+
+
+def create_retention_policy(overrides: Optional[Dict[str, Any]] = None) -> RetentionPolicy:
+    """
+    Build the retention policy from configuration, then overrides.
+
+    Raises:
+        ConfigurationError: If a setting is unknown, negative or not a number
+    """
+    from extended_memory_mcp.core.config import get_default, get_runtime_config
+
+    sections = {
+        "working_memory_hours": "retention_policies",
+        "project_context_months": "retention_policies",
+        "critical_decisions_years": "retention_policies",
+        "archive_threshold": "importance_thresholds",
+        "critical_threshold": "importance_thresholds",
+    }
+    settings: Dict[str, Any] = {}
+    for name, fallback in DEFAULT_RETENTION.items():
+        if name in sections:
+            settings[name] = get_runtime_config(sections[name], name, f"retention.{name}")
+        else:
+            settings[name] = get_default(f"retention.{name}", fallback)
+    settings["max_contexts_per_project"] = get_default(
+        "memory.max_contexts_per_project", DEFAULT_MAX_CONTEXTS_PER_PROJECT
+    )
+    for name, value in (overrides or {}).items():
+        if name not in settings:
+            raise ConfigurationError(f"Unknown retention setting '{name}'")
+        settings[name] = value
+
+    for name, value in settings.items():
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ConfigurationError(f"Retention setting '{name}' must be a number, got {value!r}")
+        if value < 0:
+            raise ConfigurationError(f"Retention setting '{name}' must not be negative")
+    # Only the windows and the cap may be null (no limit)
+    for name in ("archive_threshold", "critical_threshold", "sweep_batch_size"):
+        if settings[name] is None:
+            settings[name] = DEFAULT_RETENTION[name]
+    return RetentionPolicy(**settings)
@@ -0,0 +1,261 @@
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Search Ranking - shared scoring rules for ranked context search.
+
+A hit's score combines three signals, each weighted from defaults.search:
+- Text relevance: Okapi BM25, divided by the best BM25 of the result set
+  so it falls in (0, 1]
+- Importance: importance_level / 10
+- Recency: half_life / (half_life + age_days), 0.5 at one half-life
+
+SQLite computes the same formula in SQL over its FTS5 index; providers
+without a full-text index (Redis, SQLite built without FTS5) rank their
+candidates with rank_contexts() here, so all providers agree.
+"""
+
+import math
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from extended_memory_mcp.core.errors import ConfigurationError
+from extended_memory_mcp.storage_types.storage_types import SearchResultList
+
+from .storage_utils import search_words
+from .timestamps import MS_PER_DAY, context_ms, now_ms, present_context, to_epoch_ms
+
+DEFAULT_SEARCH_WEIGHTS: Dict[str, float] = {
+    "bm25_weight": 1.0,
+    "importance_weight": 0.5,
+    "recency_weight": 0.5,
+    "recency_half_life_days": 30.0,
+}
+
+# Words shown around the matches (FTS5 snippet() allows at most 64)
+DEFAULT_SNIPPET_TOKENS = 24
+MAX_SNIPPET_TOKENS = 64
+
+# BM25 constants, the same as SQLite FTS5 bm25()
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Most candidates ranked in Python when SQLite has no full-text index
+FALLBACK_CANDIDATES = 1000
+
+HIGHLIGHT = "**"
+ELLIPSIS = "…"
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def get_search_weights(overrides: Optional[Dict[str, Any]] = None) -> Dict[str, float]:
+    """
+    Resolve ranking weights from defaults.search, then overrides.
+
+    Raises:
+        ConfigurationError: If a weight is unknown, negative or not a number
+    """
+    from extended_memory_mcp.core.config import get_default
+
+    weights = {
+        name: get_default(f"search.{name}", fallback)
+        for name, fallback in DEFAULT_SEARCH_WEIGHTS.items()
+    }
+    weights.update(overrides or {})
+
+    resolved = {}
+    for name, value in weights.items():
+        if name not in DEFAULT_SEARCH_WEIGHTS:
+            raise ConfigurationError(f"Unknown search weight '{name}'")
+        try:
+            resolved[name] = float(value)
+        except (TypeError, ValueError):
+            raise ConfigurationError(f"Search weight '{name}' must be a number, got {value!r}")
+        if resolved[name] < 0:
+            raise ConfigurationError(f"Search weight '{name}' must not be negative")
+    if resolved["recency_half_life_days"] <= 0:
+        raise ConfigurationError("Search weight 'recency_half_life_days' must be positive")
+    return resolved
+
+
+def get_snippet_tokens(tokens: Optional[int] = None) -> int:
+    """Resolve snippet length in words (default: defaults.search.snippet_tokens)"""
+    if tokens is None:
+        from extended_memory_mcp.core.config import get_default
+
+        tokens = get_default("search.snippet_tokens", DEFAULT_SNIPPET_TOKENS)
+    return min(max(1, int(tokens)), MAX_SNIPPET_TOKENS)
+
+
+def age_in_days(created_ms: Optional[int], now: Optional[int] = None) -> float:
+    """Days since an epoch-ms timestamp (0 for missing or future values)"""
+    if not created_ms:
+        return 0.0
+    if now is None:
+        now = now_ms()
+    return max((now - created_ms) / MS_PER_DAY, 0.0)
+
+
+def combine_score(
+    relevance: float, importance_level: int, age_days: float, weights: Dict[str, float]
+) -> float:
+    """Weighted score of one hit (relevance already normalized to (0, 1])"""
+    half_life = weights["recency_half_life_days"]
+    return (
+        weights["bm25_weight"] * relevance
+        + weights["importance_weight"] * importance_level / 10
+        + weights["recency_weight"] * half_life / (half_life + max(age_days, 0.0))
+    )
+
+
+def bm25_scores(documents: List[List[str]], words: List[str]) -> List[float]:
+    """
+    Okapi BM25 of each tokenized document for the search words.
+
+    Documents are the whole collection: document frequencies and the average
+    length are taken over all of them, non-matching ones score 0.
+    """
+    if not documents:
+        return []
+    total = len(documents)
+    average_length = sum(len(doc) for doc in documents) / total or 1.0
+
+    idf = {}
+    for word in set(words):
+        containing = sum(1 for doc in documents if word in doc)
+        # FTS5 clamps non-positive idf to a tiny positive value
+        idf[word] = max(math.log((total - containing + 0.5) / (containing + 0.5)), 1e-6)
+
+    scores = []
+    for doc in documents:
+        length_factor = BM25_K1 * (1 - BM25_B + BM25_B * len(doc) / average_length)
+        score = 0.0
+        for word in words:
+            frequency = doc.count(word)
+            if frequency:
+                score += idf[word] * frequency * (BM25_K1 + 1) / (frequency + length_factor)
+        scores.append(score)
+    return scores
+
+
+def make_snippet(content: str, words: Iterable[str], tokens: int = DEFAULT_SNIPPET_TOKENS) -> str:
+    """
+    Excerpt of content around the matched words, like FTS5 snippet().
+
+    The window of `tokens` words holding the most matches is returned, matches
+    wrapped in ** and cut-off ends marked with an ellipsis.
+    """
+    wanted = set(words)
+    spans = list(_WORD.finditer(content))
+    if not spans:
+        return content[:200]
+
+    hits = [span.group().lower() in wanted for span in spans]
+    start = 0
+    if len(spans) > tokens:
+        in_window = best = sum(hits[:tokens])
+        for first in range(1, len(spans) - tokens + 1):
+            in_window += hits[first + tokens - 1] - hits[first - 1]
+            if in_window > best:
+                best, start = in_window, first
+        # Lead into the first match with a little context
+        if best:
+            first_hit = hits.index(True, start)
+            start = max(0, min(first_hit - tokens // 4, len(spans) - tokens))
+    end = min(start + tokens, len(spans))
+
+    parts = [ELLIPSIS] if start > 0 else []
+    position = spans[start].start()
+    for index in range(start, end):
+        span = spans[index]
+        parts.append(content[position : span.start()])
+        parts.append(f"{HIGHLIGHT}{span.group()}{HIGHLIGHT}" if hits[index] else span.group())
+        position = span.end()
+    if end < len(spans):
+        parts.append(ELLIPSIS)
+    else:
+        parts.append(content[position:])
+    return "".join(parts).strip()
+
+
+def rank_contexts(
+    contexts: List[Dict[str, Any]],
+    query: str,
+    weights: Dict[str, float],
+    limit: int,
+    snippet_tokens: int = DEFAULT_SNIPPET_TOKENS,
+    now: Union[int, datetime, None] = None,
+) -> SearchResultList:
+    """
+    Rank contexts for a search without a full-text index.
+
+    Args:
+        contexts: Every candidate context (already filtered by project,
+            importance, ...); BM25 statistics are computed over all of them
+        query: Free-text search
+        weights: Ranking weights from get_search_weights()
+        limit: Maximum number of hits
+        snippet_tokens: Snippet length in words
+        now: Reference time for recency, epoch ms or datetime (default: current time)
+
+    Returns:
+        Hits containing every search word, best first
+    """
+    words = search_words(query)
+    if not words:
+        return []
+
+    documents = [search_words(ctx.get("content", "")) for ctx in contexts]
+    scores = bm25_scores(documents, words)
+    matches = [
+        (ctx, score)
+        for ctx, doc, score in zip(contexts, documents, scores)
+        if all(word in doc for word in words)
+    ]
+    if not matches:
+        return []
+
+    reference_ms = to_epoch_ms(now) if now is not None else now_ms()
+    best = max(score for _, score in matches) or 1.0
+    results = [
+        present_context(
+            {
+                "id": ctx.get("id"),
+                "project_id": ctx.get("project_id"),
+                "snippet": make_snippet(ctx.get("content", ""), words, snippet_tokens),
+                "importance_level": ctx.get("importance_level", 0),
+                "created_ms": context_ms(ctx),
+                "score": combine_score(
+                    score / best,
+                    ctx.get("importance_level", 0),
+                    age_in_days(context_ms(ctx), reference_ms),
+                    weights,
+                ),
+                "tags": ctx.get("tags", []),
+            }
+        )
+        for ctx, score in matches
+    ]
+    results.sort(key=lambda hit: hit["score"], reverse=True)
+    return results[:limit]
@@ -0,0 +1,160 @@
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Storage utilities shared by the storage providers.
+
+- search_words / content_matches: FTS5-compatible word matching for
+  content searches that are not answered by SQLite FTS5 itself
+- validate_batch_item / save_batch_in_chunks: the bulk save driver behind
+  every save_contexts_batch implementation
+"""
+
+import re
+from typing import Any, Awaitable, Callable, List, Optional
+
+from extended_memory_mcp.core.errors import ValidationError, error_handler
+from extended_memory_mcp.storage_types.storage_types import BatchContextItem, BatchSaveResultList
+
+# Default number of contexts written per transaction/pipeline in bulk saves
+DEFAULT_BATCH_CHUNK_SIZE = 500
+
+
+def get_batch_chunk_size(chunk_size: Optional[int] = None) -> int:
+    """Resolve bulk save chunk size (default: defaults.storage.batch_chunk_size)"""
+    if chunk_size is None:
+        from extended_memory_mcp.core.config import get_default
+
+        chunk_size = get_default("storage.batch_chunk_size", DEFAULT_BATCH_CHUNK_SIZE)
+    return max(1, int(chunk_size))
+
+
+def search_words(term: str) -> List[str]:
+    """Split a content search into lowercase words"""
+    return re.findall(r"[^\W_]+", term.lower())
+
+
+def content_matches(content: str, term: str) -> bool:
+    """
+    Check content against a content search the way SQLite FTS5 does.
+
+    Every search word must appear as a whole word of the content
+    (case-insensitive). Searches without words fall back to a plain
+    substring check.
+    """
+    words = search_words(term)
+    if not words:
+        return term.lower() in content.lower()
+    return set(words) <= set(search_words(content))
+
+
+def validate_batch_item(item: Any) -> BatchContextItem:
+    """
+    Check one bulk save item and fill in defaults.
+
+    Args:
+        item: Candidate BatchContextItem
+
+    Returns:
+        Normalized item with content, importance_level, project_id and tags
+
+    Raises:
+        ValidationError: If the item cannot be stored
+    """
+    if not isinstance(item, dict):
+        raise ValidationError(f"Expected an object, got {type(item).__name__}")
+
+    content = item.get("content")
+    if not isinstance(content, str) or not content.strip():
+        raise ValidationError("content must be a non-empty string")
+
+    importance_level = item.get("importance_level", 5)
+    if (
+        isinstance(importance_level, bool)
+        or not isinstance(importance_level, int)
+        or not 1 <= importance_level <= 10
+    ):
+        raise ValidationError("importance_level must be an integer from 1 to 10")
+
+    project_id = item.get("project_id")
+    if project_id is not None and not isinstance(project_id, str):
+        raise ValidationError("project_id must be a string")
+
+    tags = item.get("tags") or []
+    if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+        raise ValidationError("tags must be a list of strings")
+
+    return {
+        "content": content,
+        "importance_level": importance_level,
+        "project_id": project_id,
+        "tags": tags,
+    }
+
+
+async def save_batch_in_chunks(
+    contexts: List[Any],
+    chunk_size: Optional[int],
+    save_chunk: Callable[[List[BatchContextItem]], Awaitable[List[Any]]],
+    operation: str,
+) -> BatchSaveResultList:
+    """
+    Shared driver for save_contexts_batch implementations.
+
+    Validates every item, hands valid items to save_chunk in chunks and maps
+    the returned IDs (or the chunk's error) back to per-item results.
+
+    Args:
+        contexts: Items as received from the caller
+        chunk_size: Items per save_chunk call (None: configured default)
+        save_chunk: Provider coroutine storing one chunk atomically, returning IDs in order
+        operation: Operation name for error reporting
+
+    Returns:
+        One BatchSaveResult per input item, in input order
+    """
+    results: BatchSaveResultList = []
+    valid = []
+    for index, item in enumerate(contexts):
+        result = {"index": index, "success": False, "context_id": None}
+        try:
+            valid.append((index, validate_batch_item(item)))
+        except ValidationError as e:
+            result["error"] = e.message
+        results.append(result)
+
+    chunk_size = get_batch_chunk_size(chunk_size)
+    for start in range(0, len(valid), chunk_size):
+        chunk = valid[start : start + chunk_size]
+        try:
+            context_ids = await save_chunk([item for _, item in chunk])
+            for (index, _), context_id in zip(chunk, context_ids):
+                results[index].update(success=True, context_id=str(context_id))
+        except Exception as e:
+            storage_error = error_handler.handle_error(
+                e,
+                context={"first_index": chunk[0][0], "chunk_size": len(chunk)},
+                operation=operation,
+            )
+            for index, _ in chunk:
+                results[index]["error"] = storage_error.message
+
+    return results
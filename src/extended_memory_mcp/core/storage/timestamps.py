@@ -0,0 +1,95 @@
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Timestamps - context creation times as integer epoch milliseconds.
+
+Both providers store, filter and sort contexts by `created_ms` (UTC epoch
+milliseconds). The ISO string in `created_at` is derived from it once, when
+a context leaves the provider, and always has the same form:
+2026-01-31T09:30:00.123+00:00. Expiry times follow the same scheme
+(`expires_ms`, `expires_at`).
+
+Records written before the switch carry only a `created_at` string; naive
+strings were written in local time, offset-aware ones are taken as given.
+"""
+
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Union
+
+MS_PER_HOUR = 3_600_000
+MS_PER_DAY = 86_400_000
+
+
+def now_ms() -> int:
+    """Current time in epoch milliseconds"""
+    return time.time_ns() // 1_000_000
+
+
+def to_epoch_ms(value: Union[int, float, str, datetime, None]) -> Optional[int]:
+    """
+    Convert a stored timestamp to epoch milliseconds.
+
+    Args:
+        value: Epoch ms, datetime or ISO string (naive values are local time)
+
+    Returns:
+        Epoch milliseconds, or None if the value is empty or unparseable
+    """
+    if value is None or value == "" or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    return int(value.timestamp() * 1000)
+
+
+def format_timestamp(ms: Optional[int]) -> str:
+    """ISO 8601 UTC string of an epoch-ms timestamp ('' when unknown)"""
+    if ms is None:
+        return ""
+    return datetime.fromtimestamp(ms / 1000, timezone.utc).isoformat(timespec="milliseconds")
+
+
+def context_ms(context: Dict[str, Any]) -> int:
+    """Creation time of a context in epoch ms (0 when unknown)"""
+    ms = context.get("created_ms")
+    if ms is None:
+        ms = to_epoch_ms(context.get("created_at"))
+    return ms or 0
+
+
+def present_context(context: Dict[str, Any]) -> Dict[str, Any]:
+    """Set `created_ms` and the derived `created_at` (and `expires_at`) strings on a context"""
+    ms = context_ms(context)
+    context["created_ms"] = ms
+    context["created_at"] = format_timestamp(ms) if ms else ""
+    if "expires_ms" in context:
+        context["expires_at"] = format_timestamp(context["expires_ms"]) or None
+    return context
@@ -0,0 +1,490 @@
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Daemon Mode
+
+One long-lived server process shared by many MCP clients over a Unix domain
+socket. Each client window runs the thin stdio shim
+(`extended-memory-mcp-shim`), which forwards newline-delimited JSON-RPC
+between its stdin/stdout and the daemon, starting the daemon on first use.
+
+Sessions share the storage provider (database connections and caches) and
+skip per-window startup, while MCP state such as `current_project` stays
+scoped to each connection.
+"""
+
+import argparse
+import asyncio
+import functools
+import hashlib
+import logging
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: no daemon mode, the shim serves in-process
+    fcntl = None
+
+from extended_memory_mcp.core.errors import ConfigurationError, NetworkError, ValidationError
+from extended_memory_mcp.protocol.request_dispatcher import create_request_dispatcher
+from extended_memory_mcp.protocol.stdin_reader import (
+    create_stdin_reader,
+    get_max_request_bytes,
+    read_line,
+)
+from extended_memory_mcp.responses.json_rpc_builder import JSONRPCResponseBuilder
+from extended_memory_mcp.responses.response_writer import create_response_writer
+from extended_memory_mcp.server import ClientSession, MemoryMCPServer, serve_messages
+
+logger = logging.getLogger("MemoryMCP.Daemon")
+
+# Seconds the daemon keeps running without connected clients (0: forever)
+DEFAULT_IDLE_TIMEOUT = 300.0
+
+# Seconds the shim waits for an auto-started daemon to accept connections
+DAEMON_START_TIMEOUT = 10.0
+
+# Read size used when relaying daemon output to stdout
+RELAY_CHUNK_SIZE = 64 * 1024
+
+# Files next to the socket are created for the owning user only, and never
+# through a symlink planted in the shared temp directory
+PRIVATE_FILE_FLAGS = os.O_CREAT | getattr(os, "O_NOFOLLOW", 0)
+PRIVATE_FILE_MODE = 0o600
+
+
+def get_daemon_socket_path(connection_string: Optional[str] = None) -> str:
+    """
+    Resolve the daemon socket path.
+
+    Uses defaults.server.daemon_socket_path when set. Otherwise the path is
+    derived from the user and the storage connection string, so clients
+    configured for different databases never share a daemon.
+
+    Args:
+        connection_string: Storage connection string (default: from environment/config)
+
+    Returns:
+        Filesystem path of the Unix socket
+    """
+    from extended_memory_mcp.core.config import get_default
+
+    configured = get_default("server.daemon_socket_path", None)
+    if configured:
+        return os.path.expanduser(str(configured))
+
+    if connection_string is None:
+        from extended_memory_mcp.core.storage.storage_factory import StorageFactory
+
+        connection_string = StorageFactory.get_connection_string()
+
+    digest = hashlib.sha256(connection_string.encode("utf-8")).hexdigest()[:12]
+    uid = getattr(os, "getuid", lambda: 0)()
+    return os.path.join(tempfile.gettempdir(), f"extended-memory-mcp-{uid}-{digest}.sock")
+
+
+def _file_id(path: str) -> Tuple[int, int, int]:
+    """
+    Identity of the file at path (not following symlinks).
+
+    The change time is part of it because file systems such as tmpfs hand
+    the inode of a removed socket to the next one created.
+    """
+    stat = os.lstat(path)
+    return stat.st_dev, stat.st_ino, stat.st_ctime_ns
+
+
+class SessionResponseWriter:
+    """
+    Response sink for one socket client.
+
+    Provides the send_response/wait_writable interface RequestDispatcher
+    expects, writing to the client's StreamWriter instead of stdout.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+
+    def send_response(self, response: Union[Dict[str, Any], List[Dict[str, Any]]]) -> None:
+        """Queue one response line for the client (dropped if it disconnected)"""
+        if self.writer.is_closing():
+            return
+        self.writer.write(JSONRPCResponseBuilder.encode_response_json(response) + b"\n")
+
+    async def wait_writable(self) -> None:
+        """Wait until the client has drained queued responses"""
+        try:
+            await self.writer.drain()
+        except ConnectionError:
+            pass  # Client went away; the read loop sees EOF next
+
+
+class MemoryMCPDaemon:
+    """
+    Serves MCP sessions over a Unix domain socket.
+
+    Responsibilities:
+    - Own the socket path (replacing stale sockets, refusing live ones), under
+      a lock file so concurrently started daemons never both bind it
+    - Run one ClientSession and RequestDispatcher per connection
+    - Shut down after idle_timeout seconds without clients
+    """
+
+    def __init__(
+        self,
+        server: MemoryMCPServer,
+        socket_path: str,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        max_line_bytes: Optional[int] = None,
+    ):
+        """
+        Initialize daemon.
+
+        Args:
+            server: Initialized server shared by all sessions
+            socket_path: Unix socket path to listen on
+            idle_timeout: Seconds without clients before serve() returns (0: never)
+            max_line_bytes: Maximum accepted message size (default: from config)
+        """
+        self.server = server
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.max_line_bytes = max_line_bytes or get_max_request_bytes()
+
+        self._listener: Optional[asyncio.AbstractServer] = None
+        # Identity of the socket file this daemon bound (see _file_id)
+        self._socket_id: Optional[Tuple[int, int, int]] = None
+        self.sessions: Dict[int, ClientSession] = {}
+        self._session_tasks: Dict[int, asyncio.Task] = {}
+        self._next_session_id = 1
+        self._changed = asyncio.Event()
+        self._stopping = False
+
+    @property
+    def active_sessions(self) -> int:
+        """Number of connected clients"""
+        return len(self.sessions)
+
+    async def start(self) -> None:
+        """
+        Start listening on the socket.
+
+        Raises:
+            ConfigurationError: If another daemon is already serving the path
+        """
+        lock_path = f"{self.socket_path}.lock"
+        lock_fd = os.open(lock_path, os.O_RDWR | PRIVATE_FILE_FLAGS, PRIVATE_FILE_MODE)
+        try:
+            if fcntl is not None:
+                await asyncio.to_thread(fcntl.flock, lock_fd, fcntl.LOCK_EX)
+            await self._claim_socket_path()
+
+            # Only the owning user may talk to the daemon: the umask keeps the
+            # socket private from the moment it is bound, not only after chmod
+            umask = os.umask(0o077)
+            try:
+                self._listener = await asyncio.start_unix_server(
+                    self._handle_client, path=self.socket_path, limit=self.max_line_bytes + 1
+                )
+            finally:
+                os.umask(umask)
+            os.chmod(self.socket_path, 0o600)
+            self._socket_id = _file_id(self.socket_path)
+        finally:
+            os.close(lock_fd)  # Releases the lock
+        logger.info(f"Daemon listening on {self.socket_path}")
+
+    async def _claim_socket_path(self) -> None:
+        """Remove a stale socket file left by a daemon that died"""
+        if not os.path.exists(self.socket_path):
+            return
+
+        try:
+            _, writer = await asyncio.open_unix_connection(self.socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(self.socket_path)
+            return
+
+        writer.close()
+        raise ConfigurationError(
+            f"Another daemon is already listening on {self.socket_path}",
+            context={"socket_path": self.socket_path},
+        )
+
+    async def serve(self) -> None:
+        """Serve clients until stop() is called or the daemon has been idle too long"""
+        while not self._stopping:
+            self._changed.clear()
+            timeout = None
+            if not self.sessions and self.idle_timeout:
+                timeout = self.idle_timeout
+
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                logger.info(f"No clients for {self.idle_timeout:g}s, shutting down")
+                return
+
+    def stop(self) -> None:
+        """Ask serve() to return"""
+        self._stopping = True
+        self._changed.set()
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Run one client session until the client closes its side"""
+        session = ClientSession(self.server, self._next_session_id)
+        self._next_session_id += 1
+        self.sessions[session.session_id] = session
+        self._session_tasks[session.session_id] = asyncio.current_task()
+        self._changed.set()
+        logger.info(f"Session {session.session_id} connected ({self.active_sessions} active)")
+
+        dispatcher = create_request_dispatcher(
+            handler=session.handle_request,
+            logger=self.server.logger,
+            response_builder=SessionResponseWriter(writer),
+        )
+
+        try:
+            readline = functools.partial(read_line, reader, self.max_line_bytes)
+            await serve_messages(readline, dispatcher)
+        except ConnectionError:
+            pass
+        finally:
+            del self.sessions[session.session_id]
+            del self._session_tasks[session.session_id]
+            self._changed.set()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+            logger.info(
+                f"Session {session.session_id} disconnected ({self.active_sessions} active)"
+            )
+
+    async def close(self) -> None:
+        """Stop listening, end open sessions and remove the socket file if still ours"""
+        if self._listener is not None:
+            self._listener.close()
+            await self._listener.wait_closed()
+            self._listener = None
+
+        tasks = list(self._session_tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        # A daemon that replaced ours as stale owns the path now
+        if self._socket_id is not None:
+            try:
+                if _file_id(self.socket_path) == self._socket_id:
+                    os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+            self._socket_id = None
+
+
+async def run_daemon(socket_path: Optional[str] = None, idle_timeout: Optional[float] = None):
+    """
+    Initialize the server once and serve clients over the Unix socket.
+
+    Args:
+        socket_path: Socket path (default: get_daemon_socket_path())
+        idle_timeout: Idle shutdown in seconds (default: defaults.server.daemon_idle_timeout)
+    """
+    from extended_memory_mcp.core.config import get_default
+
+    if idle_timeout is None:
+        idle_timeout = float(get_default("server.daemon_idle_timeout", DEFAULT_IDLE_TIMEOUT))
+
+    server = MemoryMCPServer()
+    await server.initialize()
+
+    daemon = MemoryMCPDaemon(server, socket_path or get_daemon_socket_path(), idle_timeout)
+    await daemon.start()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, daemon.stop)
+
+    try:
+        await daemon.serve()
+    finally:
+        await daemon.close()
+        await server.close()
+
+
+def spawn_daemon(socket_path: str) -> subprocess.Popen:
+    """
+    Start a detached daemon process for socket_path.
+
+    The daemon logs to `<socket_path>.log`, created readable by the user only.
+
+    Args:
+        socket_path: Socket path the daemon should listen on
+
+    Returns:
+        Handle of the started process
+    """
+    log_fd = os.open(
+        f"{socket_path}.log", os.O_WRONLY | os.O_APPEND | PRIVATE_FILE_FLAGS, PRIVATE_FILE_MODE
+    )
+    with os.fdopen(log_fd, "ab") as log_file:
+        return subprocess.Popen(
+            [sys.executable, "-m", "extended_memory_mcp.daemon", "--socket", socket_path],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=log_file,
+            start_new_session=True,
+        )
+
+
+async def connect_to_daemon(
+    socket_path: str, autostart: bool = True, limit: int = RELAY_CHUNK_SIZE
+) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """
+    Connect to the daemon, starting it first if nothing is listening.
+
+    Args:
+        socket_path: Daemon socket path
+        autostart: Spawn a daemon when none is running
+        limit: StreamReader buffer limit
+
+    Returns:
+        Reader and writer of the connection
+
+    Raises:
+        NetworkError: If no daemon could be reached
+    """
+    try:
+        return await asyncio.open_unix_connection(socket_path, limit=limit)
+    except (FileNotFoundError, ConnectionRefusedError) as e:
+        if not autostart:
+            raise NetworkError(f"No daemon listening on {socket_path}", original_error=e) from e
+
+    process = spawn_daemon(socket_path)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + DAEMON_START_TIMEOUT
+
+    while loop.time() < deadline:
+        await asyncio.sleep(0.05)
+        try:
+            return await asyncio.open_unix_connection(socket_path, limit=limit)
+        except (FileNotFoundError, ConnectionRefusedError):
+            if process.poll() is not None and not os.path.exists(socket_path):
+                break  # Daemon exited without ever listening
+
+    raise NetworkError(
+        f"Daemon did not start on {socket_path} (see {socket_path}.log)",
+        context={"socket_path": socket_path},
+    )
+
+
+async def run_shim(socket_path: Optional[str] = None) -> None:
+    """
+    Relay MCP stdio to the daemon.
+
+    Falls back to serving in-process where Unix sockets are unavailable.
+
+    Args:
+        socket_path: Daemon socket path (default: get_daemon_socket_path())
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        from extended_memory_mcp.server import main
+
+        await main()
+        return
+
+    reader, writer = await connect_to_daemon(socket_path or get_daemon_socket_path())
+
+    stdin_reader = create_stdin_reader()
+    response_writer = create_response_writer()
+    await response_writer.start()
+
+    async def forward_requests() -> None:
+        while True:
+            try:
+                line = await stdin_reader.readline()
+            except ValidationError as e:
+                # Oversized messages are answered here instead of being relayed
+                response = JSONRPCResponseBuilder.build_invalid_request_response(
+                    error_data=e.message
+                )
+                response_writer.write(JSONRPCResponseBuilder.encode_response_json(response) + b"\n")
+                continue
+
+            if line is None:
+                break
+            if not line.endswith(b"\n"):
+                line += b"\n"
+            writer.write(line)
+            await writer.drain()
+
+        # Daemon answers what is in flight, then closes the connection
+        writer.write_eof()
+
+    async def forward_responses() -> None:
+        while True:
+            chunk = await reader.read(RELAY_CHUNK_SIZE)
+            if not chunk:
+                break
+            response_writer.write(chunk)
+            await response_writer.wait_writable()
+
+    requests_task = asyncio.create_task(forward_requests())
+    try:
+        await forward_responses()
+    finally:
+        requests_task.cancel()
+        await asyncio.gather(requests_task, return_exceptions=True)
+        stdin_reader.close()
+        writer.close()
+        await response_writer.close()
+
+
+def mcp_daemon_entry():
+    """Entry point for the shared daemon process"""
+    parser = argparse.ArgumentParser(description="Extended Memory MCP daemon")
+    parser.add_argument("--socket", help="Unix socket path")
+    parser.add_argument("--idle-timeout", type=float, help="Idle shutdown in seconds (0: never)")
+    args = parser.parse_args()
+
+    asyncio.run(run_daemon(socket_path=args.socket, idle_timeout=args.idle_timeout))
+
+
+def mcp_shim_entry():
+    """Entry point for MCP clients - stdio shim forwarding to the shared daemon"""
+    asyncio.run(run_shim())
+
+
+if __name__ == "__main__":
+    mcp_daemon_entry()
@@ -24,9 +24,11 @@ Summary Formatter
 Handles generation of human-readable context summaries
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+from extended_memory_mcp.core.storage.timestamps import MS_PER_HOUR, context_ms, now_ms
+
 
 class ContextSummaryFormatter:
     """Formats context data into human-readable summaries"""
@@ -60,26 +62,18 @@ class ContextSummaryFormatter:
         recent_items = 0
 
         # Calculate 24h threshold
-        recent_threshold = datetime.now() - timedelta(hours=self.recent_hours_threshold)
+        recent_threshold = now_ms() - self.recent_hours_threshold * MS_PER_HOUR
 
         for ctx in contexts:
             importance = ctx.get("importance_level", 0)
-            created_at = ctx.get("created_at", "")
 
             # Count high importance
             if importance >= self.high_importance_threshold:
                 high_importance += 1
 
             # Check if item is from last 24h
-            if created_at:
-                try:
-                    item_time = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-                    if item_time.replace(tzinfo=None) > recent_threshold:
-                        recent_items += 1
-                except Exception:
-                    logger.warning(
-                        f"Could not parse created_at timestamp for context {context.get('id')}: {e}"
-                    )
+            if context_ms(ctx) > recent_threshold:
+                recent_items += 1
 
         return {
             "high_importance": high_importance,
@@ -125,17 +119,15 @@ class ContextSummaryFormatter:
         # Sort contexts chronologically (oldest first, like a chat log)
         sorted_contexts = sorted(
             contexts,
-            key=lambda x: x.get("created_at", ""),
+            key=context_ms,
             reverse=False,  # Chronological order: oldest first
         )
 
         content_parts = []
         for ctx in sorted_contexts:  # Remove enumeration completely
             content = ctx.get("content", "").strip()
-            created_at = ctx.get("created_at", "")
-
             # Format creation date
-            date_str = self._format_creation_date(created_at)
+            date_str = self._format_creation_date(context_ms(ctx))
 
             # Standard truncation
             content = self._truncate_content(content, "general")
@@ -144,16 +136,13 @@ class ContextSummaryFormatter:
 
         return content_parts
 
-    def _format_creation_date(self, created_at: str) -> str:
-        """Format creation date for display"""
-        if not created_at:
+    def _format_creation_date(self, created_ms: int) -> str:
+        """Format creation date for display (local time)"""
+        if not created_ms:
             return ""
 
-        try:
-            dt = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-            return f" ({dt.strftime('%m-%d %H:%M')})"
-        except Exception:
-            return ""
+        dt = datetime.fromtimestamp(created_ms / 1000)
+        return f" ({dt.strftime('%m-%d %H:%M')})"
 
     def _truncate_content(self, content: str, ctx_type: str) -> str:
         """Truncate content based on context type importance"""
@@ -0,0 +1,630 @@
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Streamable HTTP Transport
+
+Serves the MCP protocol over HTTP/1.1 on localhost, following the MCP
+Streamable HTTP transport: one endpoint accepting JSON-RPC messages by POST.
+
+- Keep-alive connections (HTTP/1.1 default, idle timeout per connection)
+- Responses as application/json, or as an SSE stream (text/event-stream)
+  that emits each response of a batch as soon as it is ready
+- Sessions via the Mcp-Session-Id header, each with its own ClientSession;
+  idle sessions expire and the least recently used one makes room for a
+  new session once the session cap is reached
+- Connection cap, in-flight request cap and body size limit from
+  defaults.server
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from extended_memory_mcp.core import json_codec
+from extended_memory_mcp.protocol.request_dispatcher import (
+    RequestDispatcher,
+    create_request_dispatcher,
+)
+from extended_memory_mcp.protocol.stdin_reader import get_max_request_bytes
+from extended_memory_mcp.responses.json_rpc_builder import JSONRPCResponseBuilder
+from extended_memory_mcp.server import ClientSession, MemoryMCPServer
+
+logger = logging.getLogger("MemoryMCP.HTTP")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_ENDPOINT = "/mcp"
+DEFAULT_MAX_CONNECTIONS = 64
+DEFAULT_MAX_IN_FLIGHT = 8
+DEFAULT_KEEPALIVE_TIMEOUT = 30.0
+DEFAULT_MAX_SESSIONS = 256
+DEFAULT_SESSION_IDLE_TIMEOUT = 3600.0
+
+# Longest wait between two sweeps of idle sessions
+MAX_SESSION_SWEEP_INTERVAL = 60.0
+
+# Request line plus headers
+MAX_HEADER_BYTES = 64 * 1024
+
+SESSION_HEADER = "mcp-session-id"
+
+STATUS_REASONS = {
+    200: "OK",
+    202: "Accepted",
+    204: "No Content",
+    400: "Bad Request",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    415: "Unsupported Media Type",
+    431: "Request Header Fields Too Large",
+    501: "Not Implemented",
+    503: "Service Unavailable",
+}
+
+LOCAL_HOSTNAMES = {"localhost", "127.0.0.1", "::1"}
+
+
+class HTTPRequest:
+    """Parsed HTTP/1.1 request"""
+
+    def __init__(self, method: str, path: str, version: str, headers: Dict[str, str]):
+        self.method = method
+        self.path = path
+        self.version = version
+        self.headers = headers
+        self.body = b""
+
+    @property
+    def keep_alive(self) -> bool:
+        """Whether the client wants the connection kept open"""
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    def accepts(self, media_type: str) -> bool:
+        """Check the Accept header for a media type"""
+        return media_type in self.headers.get("accept", "")
+
+
+class HTTPError(Exception):
+    """Request rejected with an HTTP status; the connection is closed if close is set"""
+
+    def __init__(self, status: int, message: str, close: bool = False):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.close = close
+
+
+class HTTPSession:
+    """MCP session bound to an Mcp-Session-Id"""
+
+    def __init__(
+        self, session_id: str, client_session: ClientSession, dispatcher: RequestDispatcher
+    ):
+        self.session_id = session_id
+        self.client_session = client_session
+        self.dispatcher = dispatcher
+        self.last_used = time.monotonic()
+
+    def touch(self) -> None:
+        """Record use of the session (idle time restarts)"""
+        self.last_used = time.monotonic()
+
+
+class StreamableHTTPServer:
+    """
+    Asyncio HTTP/1.1 server for the MCP Streamable HTTP transport.
+
+    Responsibilities:
+    - Parse requests with size limits and keep connections alive
+    - Route POST/DELETE on the MCP endpoint to per-session dispatchers
+    - Cap concurrent connections and in-flight JSON-RPC requests
+    """
+
+    def __init__(
+        self,
+        server: MemoryMCPServer,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        endpoint: str = DEFAULT_ENDPOINT,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        max_body_bytes: Optional[int] = None,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        session_idle_timeout: float = DEFAULT_SESSION_IDLE_TIMEOUT,
+    ):
+        """
+        Initialize HTTP transport.
+
+        Args:
+            server: Initialized server shared by all sessions
+            host: Interface to bind (keep to localhost)
+            port: TCP port (0 picks a free port)
+            endpoint: Path of the MCP endpoint
+            max_connections: Open connections allowed at once
+            max_in_flight: JSON-RPC requests executing at once, across all clients
+            max_body_bytes: Maximum request body size (default: from config)
+            keepalive_timeout: Seconds an idle keep-alive connection stays open
+            max_sessions: Sessions kept at once; a new session evicts the
+                least recently used one beyond this
+            session_idle_timeout: Seconds an unused session is kept
+        """
+        self.server = server
+        self.host = host
+        self.port = port
+        self.endpoint = endpoint
+        self.max_connections = max(1, int(max_connections))
+        self.max_body_bytes = max_body_bytes or get_max_request_bytes()
+        self.keepalive_timeout = keepalive_timeout
+        self.max_sessions = max(1, int(max_sessions))
+        self.session_idle_timeout = float(session_idle_timeout)
+
+        self.sessions: Dict[str, HTTPSession] = {}
+        self._session_sweeper: Optional[asyncio.Task] = None
+        self._slots = asyncio.Semaphore(max(1, int(max_in_flight)))
+        self._connections = 0
+        self._listener: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def active_connections(self) -> int:
+        """Number of open client connections"""
+        return self._connections
+
+    async def start(self) -> None:
+        """Start listening"""
+        self._listener = await asyncio.start_server(
+            self._handle_connection, host=self.host, port=self.port, limit=MAX_HEADER_BYTES
+        )
+        self.port = self._listener.sockets[0].getsockname()[1]
+        self._session_sweeper = asyncio.create_task(self._sweep_sessions())
+        logger.info(
+            f"MCP Streamable HTTP listening on http://{self.host}:{self.port}{self.endpoint}"
+        )
+
+    async def serve_forever(self) -> None:
+        """Serve until cancelled"""
+        await self._listener.serve_forever()
+
+    async def close(self) -> None:
+        """Stop listening and drop all sessions"""
+        if self._session_sweeper is not None:
+            self._session_sweeper.cancel()
+            try:
+                await self._session_sweeper
+            except asyncio.CancelledError:
+                pass
+            self._session_sweeper = None
+        if self._listener is not None:
+            self._listener.close()
+            await self._listener.wait_closed()
+            self._listener = None
+        self.sessions.clear()
+
+    # Connection handling
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve requests on one connection until it is closed or idles out"""
+        if self._connections >= self.max_connections:
+            await self._send(writer, 503, b"Too many connections", keep_alive=False)
+            await self._close_writer(writer)
+            return
+
+        self._connections += 1
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(
+                        self._read_request(reader), self.keepalive_timeout
+                    )
+                except asyncio.TimeoutError:
+                    break
+                except HTTPError as e:
+                    await self._send(writer, e.status, e.message.encode(), keep_alive=False)
+                    break
+
+                if request is None:
+                    break
+
+                try:
+                    keep_alive = await self._route(request, writer)
+                except HTTPError as e:
+                    keep_alive = request.keep_alive and not e.close
+                    await self._send(writer, e.status, e.message.encode(), keep_alive=keep_alive)
+
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self._connections -= 1
+            await self._close_writer(writer)
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[HTTPRequest]:
+        """
+        Read one request (headers and body).
+
+        Returns:
+            Parsed request, or None if the client closed the connection
+
+        Raises:
+            HTTPError: If the request is malformed or exceeds size limits
+        """
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            raise HTTPError(431, "Request headers too large", close=True)
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            raise HTTPError(400, "Malformed request line", close=True)
+
+        headers = {}
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        request = HTTPRequest(method.upper(), urlsplit(target).path, version, headers)
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise HTTPError(411, "Chunked request bodies are not supported", close=True)
+
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length", close=True)
+        if length < 0:
+            raise HTTPError(400, "Invalid Content-Length", close=True)
+
+        if length > self.max_body_bytes:
+            raise HTTPError(
+                413, f"Request exceeds maximum size of {self.max_body_bytes} bytes", close=True
+            )
+        if length:
+            try:
+                request.body = await reader.readexactly(length)
+            except asyncio.IncompleteReadError:
+                return None
+
+        return request
+
+    # Routing
+
+    async def _route(self, request: HTTPRequest, writer: asyncio.StreamWriter) -> bool:
+        """
+        Handle one request.
+
+        Returns:
+            Whether the connection stays open
+        """
+        if request.path != self.endpoint:
+            raise HTTPError(404, "Not Found")
+
+        self._check_origin(request)
+
+        if request.method == "POST":
+            return await self._handle_post(request, writer)
+
+        if request.method == "DELETE":
+            session = self._get_session(request)
+            del self.sessions[session.session_id]
+            logger.info(f"HTTP session {session.session_id} closed by client")
+            await self._send(writer, 204, b"", keep_alive=request.keep_alive)
+            return request.keep_alive
+
+        # GET would open a server-to-client stream; this server never initiates messages
+        raise HTTPError(405, "Method Not Allowed")
+
+    @staticmethod
+    def _check_origin(request: HTTPRequest) -> None:
+        """Reject browser requests from non-local origins (DNS rebinding protection)"""
+        origin = request.headers.get("origin")
+        if origin and urlsplit(origin).hostname not in LOCAL_HOSTNAMES:
+            raise HTTPError(403, "Origin not allowed")
+
+    def _get_session(self, request: HTTPRequest) -> HTTPSession:
+        """Look up the session named by the Mcp-Session-Id header"""
+        session_id = request.headers.get(SESSION_HEADER)
+        if not session_id:
+            raise HTTPError(400, "Missing Mcp-Session-Id header")
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise HTTPError(404, "Unknown session")
+        session.touch()
+        return session
+
+    def evict_idle_sessions(self) -> int:
+        """
+        Drop sessions unused for longer than session_idle_timeout.
+
+        Their clients get 404 on the next request and, as the transport
+        specifies, start a new session with initialize.
+
+        Returns:
+            Number of sessions dropped
+        """
+        deadline = time.monotonic() - self.session_idle_timeout
+        idle = [sid for sid, session in self.sessions.items() if session.last_used < deadline]
+        for session_id in idle:
+            del self.sessions[session_id]
+        if idle:
+            logger.info(f"Expired {len(idle)} idle HTTP sessions ({len(self.sessions)} active)")
+        return len(idle)
+
+    async def _sweep_sessions(self) -> None:
+        """Evict idle sessions periodically until cancelled"""
+        interval = min(max(self.session_idle_timeout / 4, 1.0), MAX_SESSION_SWEEP_INTERVAL)
+        while True:
+            await asyncio.sleep(interval)
+            self.evict_idle_sessions()
+
+    def _create_session(self) -> HTTPSession:
+        """Start a new MCP session, evicting the least recently used one at the cap"""
+        self.evict_idle_sessions()
+        while len(self.sessions) >= self.max_sessions:
+            oldest = min(self.sessions.values(), key=lambda s: s.last_used)
+            del self.sessions[oldest.session_id]
+            logger.info(f"HTTP session {oldest.session_id} evicted (session limit reached)")
+
+        session_id = uuid.uuid4().hex
+        client_session = ClientSession(self.server, session_id)
+        dispatcher = create_request_dispatcher(
+            handler=client_session.handle_request, logger=self.server.logger
+        )
+        session = HTTPSession(session_id, client_session, dispatcher)
+        self.sessions[session_id] = session
+        logger.info(f"HTTP session {session_id} started ({len(self.sessions)} active)")
+        return session
+
+    async def _handle_post(self, request: HTTPRequest, writer: asyncio.StreamWriter) -> bool:
+        """Execute the posted JSON-RPC message or batch"""
+        content_type = request.headers.get("content-type", "application/json")
+        if not content_type.startswith("application/json"):
+            raise HTTPError(415, "Content-Type must be application/json")
+
+        try:
+            message = json_codec.loads(request.body)
+        except ValueError as e:
+            response = JSONRPCResponseBuilder.build_parse_error_response(str(e))
+            await self._send_json(writer, 400, response, request.keep_alive)
+            return request.keep_alive
+
+        is_batch = isinstance(message, list)
+        messages = message if is_batch else [message]
+        if not messages or not all(isinstance(m, dict) for m in messages):
+            response = JSONRPCResponseBuilder.build_invalid_request_response(
+                error_data="Expected request object or non-empty batch of objects"
+            )
+            await self._send_json(writer, 400, response, request.keep_alive)
+            return request.keep_alive
+
+        if any(m.get("method") == "initialize" for m in messages):
+            session = self._create_session()
+        else:
+            session = self._get_session(request)
+        headers = {"Mcp-Session-Id": session.session_id}
+
+        dispatcher = session.dispatcher
+        requests = []
+        for m in messages:
+            if dispatcher.is_notification(m):
+                await dispatcher.handle_notification(m)
+            else:
+                requests.append(m)
+
+        if not requests:
+            await self._send(writer, 202, b"", request.keep_alive, headers)
+            return request.keep_alive
+
+        tasks = [asyncio.ensure_future(self._execute(dispatcher, m)) for m in requests]
+
+        # SSE when the client only takes streams, or to stream batch members as they finish
+        if request.accepts("text/event-stream") and (
+            is_batch or not request.accepts("application/json")
+        ):
+            return await self._stream_responses(writer, tasks, request.keep_alive, headers)
+
+        try:
+            responses = [r for r in await asyncio.gather(*tasks) if r is not None]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if not responses:
+            await self._send(writer, 202, b"", request.keep_alive, headers)
+        else:
+            await self._send_json(
+                writer, 200, responses if is_batch else responses[0], request.keep_alive, headers
+            )
+        return request.keep_alive
+
+    async def _execute(
+        self, dispatcher: RequestDispatcher, request: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Execute one request within the global in-flight cap"""
+        async with self._slots:
+            return await dispatcher.execute_request(request)
+
+    # Response writing
+
+    async def _stream_responses(
+        self,
+        writer: asyncio.StreamWriter,
+        tasks: List[asyncio.Future],
+        keep_alive: bool,
+        headers: Dict[str, str],
+    ) -> bool:
+        """Send responses as SSE events in completion order, then end the stream"""
+        stream_headers = dict(headers)
+        stream_headers.update(
+            {
+                "Content-Type": "text/event-stream",
+                "Cache-Control": "no-cache",
+                "Transfer-Encoding": "chunked",
+            }
+        )
+        writer.write(self._head(200, stream_headers, keep_alive))
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                response = await next_done
+                if response is None:
+                    continue
+                data = JSONRPCResponseBuilder.encode_response_json(response)
+                event = b"event: message\ndata: " + data + b"\n\n"
+                writer.write(b"%x\r\n%s\r\n" % (len(event), event))
+                await writer.drain()
+        finally:
+            # Client gone mid-stream: stop the remaining work
+            for task in tasks:
+                task.cancel()
+
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+        return keep_alive
+
+    @staticmethod
+    def _head(status: int, headers: Dict[str, str], keep_alive: bool) -> bytes:
+        """Build status line and headers"""
+        lines = [f"HTTP/1.1 {status} {STATUS_REASONS.get(status, '')}"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _send(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        body: bytes,
+        keep_alive: bool,
+        headers: Optional[Dict[str, str]] = None,
+        content_type: str = "text/plain; charset=utf-8",
+    ) -> None:
+        """Send a complete response"""
+        all_headers = dict(headers or {})
+        if body:
+            all_headers["Content-Type"] = content_type
+        all_headers["Content-Length"] = str(len(body))
+        writer.write(self._head(status, all_headers, keep_alive) + body)
+        await writer.drain()
+
+    async def _send_json(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: Any,
+        keep_alive: bool,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Send a JSON response body"""
+        body = JSONRPCResponseBuilder.encode_response_json(payload)
+        await self._send(writer, status, body, keep_alive, headers, "application/json")
+
+    @staticmethod
+    async def _close_writer(writer: asyncio.StreamWriter) -> None:
+        """Close the connection, ignoring peers that already went away"""
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+def create_http_server(
+    server: MemoryMCPServer, host: Optional[str] = None, port: Optional[int] = None
+) -> StreamableHTTPServer:
+    """
+    Factory function to create the Streamable HTTP transport.
+
+    Args:
+        server: Initialized server
+        host: Bind address (default: defaults.server.http_host)
+        port: TCP port (default: defaults.server.http_port)
+
+    Returns:
+        Configured StreamableHTTPServer instance
+    """
+    from extended_memory_mcp.core.config import get_default
+
+    return StreamableHTTPServer(
+        server,
+        host=host or get_default("server.http_host", DEFAULT_HOST),
+        port=port if port is not None else int(get_default("server.http_port", DEFAULT_PORT)),
+        max_connections=get_default("server.http_max_connections", DEFAULT_MAX_CONNECTIONS),
+        max_in_flight=get_default("server.max_concurrent_requests", DEFAULT_MAX_IN_FLIGHT),
+        keepalive_timeout=float(
+            get_default("server.http_keepalive_timeout", DEFAULT_KEEPALIVE_TIMEOUT)
+        ),
+        max_sessions=get_default("server.http_max_sessions", DEFAULT_MAX_SESSIONS),
+        session_idle_timeout=float(
+            get_default("server.http_session_idle_timeout", DEFAULT_SESSION_IDLE_TIMEOUT)
+        ),
+    )
+
+
+async def run_http_server(host: Optional[str] = None, port: Optional[int] = None) -> None:
+    """Initialize the server and serve MCP over HTTP until interrupted"""
+    server = MemoryMCPServer()
+    await server.initialize()
+
+    http_server = create_http_server(server, host=host, port=port)
+    await http_server.start()
+    try:
+        await http_server.serve_forever()
+    finally:
+        await http_server.close()
+        await server.close()
+
+
+def mcp_http_entry():
+    """Entry point for the Streamable HTTP transport"""
+    parser = argparse.ArgumentParser(description="Extended Memory MCP over Streamable HTTP")
+    parser.add_argument("--host", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, help="TCP port (default: 8765)")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run_http_server(host=args.host, port=args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    mcp_http_entry()
@@ -43,13 +43,28 @@ MCP Protocol Handler
 
 Handles Model Context Protocol (MCP) request/response logic.
 Separated from main server for better maintainability and testing.
+
+Results that never change while the server runs (initialize, tools/list,
+resources/list, prompts/list) are built and JSON-encoded once at startup.
 """
 
-import json
 import logging
 from typing import Any, Dict, Optional
 
 from extended_memory_mcp.config.tools.descriptions_loader import create_tool_descriptions_loader
+from extended_memory_mcp.core import json_codec
+from extended_memory_mcp.core.errors import ConfigurationError
+
+# Tools served by tools/list, in listing order
+TOOL_NAMES = (
+    "save_context",
+    "save_contexts_batch",
+    "load_contexts",
+    "search_contexts",
+    "forget_context",
+    "list_all_projects",
+    "get_popular_tags",
+)
 
 
 def log_request(logger: logging.Logger, method: str, request_id: Any = None):
@@ -85,6 +100,29 @@ class MCPProtocolHandler:
     def __init__(self, logger: logging.Logger):
         self.logger = logger
         self.descriptions_loader = create_tool_descriptions_loader()
+        self._check_tool_definitions()
+
+        # Constant results, encoded once and written as-is by the response builder
+        self.static_results = {
+            "initialize": json_codec.PreEncodedJSON(self._handle_initialize()),
+            "resources/list": json_codec.PreEncodedJSON(self._handle_resources_list()),
+            "prompts/list": json_codec.PreEncodedJSON(self._handle_prompts_list()),
+            "tools/list": json_codec.PreEncodedJSON(self._handle_tools_list()),
+        }
+
+    def _check_tool_definitions(self) -> None:
+        """
+        Verify tool descriptions and schemas before serving them.
+
+        Raises:
+            ConfigurationError: If a description or schema is missing or malformed
+        """
+        problems = self.descriptions_loader.validate(TOOL_NAMES)
+        if problems:
+            raise ConfigurationError(
+                "Inconsistent tool definitions: " + "; ".join(problems),
+                context={"config_dir": str(self.descriptions_loader.config_dir)},
+            )
 
     async def handle_request(
         self, method: str, params: Dict[str, Any], tools_handler, server, request_id: Any = None
@@ -108,27 +146,22 @@ class MCPProtocolHandler:
         try:
             result = None
 
-            if method == "initialize":
-                result = self._handle_initialize()
+            if method in self.static_results:
+                result = self.static_results[method]
 
             elif method == "notifications/initialized":
                 result = None  # No response needed for notifications
 
+            elif method == "notifications/cancelled":
+                # The request dispatcher cancels the running request by id
+                result = None
+
             elif method == "prompts/get":
                 result = self._handle_prompts_get(params)
 
             elif method == "resources/read":
                 result = await self._handle_resources_read(params, server)
 
-            elif method == "resources/list":
-                result = self._handle_resources_list()
-
-            elif method == "prompts/list":
-                result = self._handle_prompts_list()
-
-            elif method == "tools/list":
-                result = self._handle_tools_list()
-
             elif method == "tools/call":
                 result = await self._handle_tools_call(params, tools_handler)
 
@@ -186,7 +219,17 @@ class MCPProtocolHandler:
                     {
                         "uri": uri,
                         "mimeType": "application/json",
-                        "text": json.dumps(startup_context, indent=2, ensure_ascii=False),
+                        "text": json_codec.dumps(startup_context, indent=True),
+                    }
+                ]
+            }
+        elif uri == "memory://maintenance":
+            return {
+                "contents": [
+                    {
+                        "uri": uri,
+                        "mimeType": "application/json",
+                        "text": json_codec.dumps(server.maintenance_status(), indent=True),
                     }
                 ]
             }
@@ -202,7 +245,13 @@ class MCPProtocolHandler:
                     "name": "🧠 Startup Memory Context",
                     "description": "Essential context from previous conversations - immediately available",
                     "mimeType": "application/json",
-                }
+                },
+                {
+                    "uri": "memory://maintenance",
+                    "name": "Maintenance Status",
+                    "description": "Runs and last results of background maintenance jobs",
+                    "mimeType": "application/json",
+                },
             ]
         }
 
@@ -222,17 +271,8 @@ class MCPProtocolHandler:
         """Handle tools/list request - returns available memory tools"""
         tools = []
 
-        # List of all available tools
-        tool_names = [
-            "save_context",
-            "load_contexts",
-            "forget_context",
-            "list_all_projects",
-            "get_popular_tags",
-        ]
-
         # Build tools list using descriptions loader
-        for tool_name in tool_names:
+        for tool_name in TOOL_NAMES:
             description = self.descriptions_loader.load_tool_description(tool_name)
             input_schema = self.descriptions_loader.get_tool_schema(tool_name)
 
@@ -0,0 +1,372 @@
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Request Dispatcher
+
+Runs JSON-RPC requests as concurrent asyncio tasks so that one slow tool call
+does not block the requests queued behind it.
+
+Ordering guarantees required by MCP:
+- `initialize` waits for all in-flight requests and is answered before
+  anything read after it is started
+- Notifications are handled inline, in the order they arrive
+
+JSON-RPC batch arrays are executed concurrently and answered with a single
+batch response.
+
+Every request runs under a deadline (defaults.server.mcp_timeout) and can be
+cancelled by id with `notifications/cancelled`. Cancellation is delivered to
+the handler task, so storage calls awaiting on it are aborted as well.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Union
+
+from extended_memory_mcp.core.errors import error_handler
+from extended_memory_mcp.responses.json_rpc_builder import JSONRPCResponseBuilder
+
+# Default number of requests allowed to run at the same time
+DEFAULT_MAX_IN_FLIGHT = 8
+
+# Default per-request deadline in seconds
+DEFAULT_REQUEST_TIMEOUT = 30.0
+
+RequestHandler = Callable[[str, Dict[str, Any], Any], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class RequestDispatcher:
+    """
+    Dispatches parsed JSON-RPC requests to a handler coroutine.
+
+    Responsibilities:
+    - Run requests concurrently up to a configurable in-flight limit
+    - Write each response as soon as its request finishes
+    - Serialize `initialize` and notifications according to MCP ordering rules
+    - Enforce per-request deadlines and client cancellation
+    """
+
+    def __init__(
+        self,
+        handler: RequestHandler,
+        logger: Optional[logging.Logger] = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        response_builder=JSONRPCResponseBuilder,
+        request_timeout: Optional[float] = DEFAULT_REQUEST_TIMEOUT,
+    ):
+        """
+        Initialize request dispatcher.
+
+        Args:
+            handler: Coroutine function called as handler(method, params, request_id)
+            logger: Logger for dispatch diagnostics
+            max_in_flight: Maximum number of requests executing concurrently
+            response_builder: Object providing send_response and wait_writable
+            request_timeout: Deadline per request in seconds (None or 0 disables it)
+        """
+        self.handler = handler
+        self.logger = logger or logging.getLogger("MemoryMCP.Dispatcher")
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.response_builder = response_builder
+        self.request_timeout = request_timeout or None
+
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._tasks: Set[asyncio.Task] = set()
+
+        # Handler tasks by request id, for notifications/cancelled
+        self._running: Dict[Any, asyncio.Task] = {}
+        self._cancelled: Set[Any] = set()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently executing"""
+        return len(self._tasks)
+
+    @staticmethod
+    def is_notification(request: Dict[str, Any]) -> bool:
+        """Check whether request is a JSON-RPC/MCP notification"""
+        return "id" not in request or str(request.get("method", "")).startswith("notifications/")
+
+    async def dispatch(self, request: Union[Dict[str, Any], List[Any]]) -> None:
+        """
+        Dispatch a single parsed request or a JSON-RPC batch array.
+
+        Returns once the request has been scheduled. When the in-flight limit
+        is reached this waits for a free slot, which applies backpressure to
+        the reader loop.
+
+        Args:
+            request: Parsed JSON-RPC request object or batch array
+        """
+        if isinstance(request, list):
+            await self.dispatch_batch(request)
+            return
+
+        if not isinstance(request, dict):
+            self.response_builder.send_response(self.build_invalid_request(request))
+            return
+
+        method = request.get("method", "")
+
+        if method == "initialize":
+            # Nothing may overtake initialize: finish pending work, then answer it
+            await self.drain()
+            await self.process_request(request)
+            return
+
+        if self.is_notification(request):
+            await self.process_request(request)
+            return
+
+        await self._schedule(self.process_request(request))
+
+    async def handle_notification(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Execute a notification inline, applying `notifications/cancelled` first.
+
+        Args:
+            request: Parsed JSON-RPC notification
+
+        Returns:
+            Error response if the handler failed, otherwise None
+        """
+        if request.get("method") == "notifications/cancelled":
+            params = request.get("params") or {}
+            self.cancel(params.get("requestId"), params.get("reason"))
+        return await self.execute_request(request)
+
+    def cancel(self, request_id: Any, reason: Optional[str] = None) -> bool:
+        """
+        Cancel a running request. Cancelled requests are not answered.
+
+        Args:
+            request_id: ID of the request to cancel
+            reason: Optional reason given by the client
+
+        Returns:
+            True if a running request was cancelled
+        """
+        task = self._running.get(request_id)
+        if task is None or task.done():
+            return False
+
+        self.logger.info(f"Cancelling request {request_id}: {reason or 'no reason given'}")
+        self._cancelled.add(request_id)
+        task.cancel()
+        return True
+
+    async def dispatch_batch(self, batch: List[Any]) -> None:
+        """
+        Dispatch a JSON-RPC batch.
+
+        Members run concurrently and are answered together in one batch
+        response array. The batch occupies a single in-flight slot.
+
+        Args:
+            batch: Parsed batch array
+        """
+        if not batch:
+            self.response_builder.send_response(
+                JSONRPCResponseBuilder.build_invalid_request_response(error_data="Empty batch")
+            )
+            return
+
+        if any(isinstance(m, dict) and m.get("method") == "initialize" for m in batch):
+            await self.drain()
+            await self.process_batch(batch)
+            return
+
+        await self._schedule(self.process_batch(batch))
+
+    async def _schedule(self, coro: Awaitable[None]) -> None:
+        """Run coroutine as an in-flight task once a slot is free"""
+        # Stop taking work while responses are backed up on stdout
+        await self.response_builder.wait_writable()
+
+        await self._slots.acquire()
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._release_slot)
+
+    async def drain(self) -> None:
+        """Wait until all in-flight requests have finished and been answered"""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def _release_slot(self, task: asyncio.Task) -> None:
+        """Forget finished task and free its in-flight slot"""
+        self._tasks.discard(task)
+        self._slots.release()
+
+    async def process_request(self, request: Dict[str, Any]) -> None:
+        """
+        Execute one request and write its response.
+
+        Args:
+            request: Parsed JSON-RPC request object
+        """
+        if self.is_notification(request):
+            response = await self.handle_notification(request)
+        else:
+            response = await self.execute_request(request)
+        if response is not None:
+            self.response_builder.send_response(response)
+
+    async def process_batch(self, batch: List[Any]) -> None:
+        """
+        Execute batch members and write one batch response.
+
+        Notifications are handled first, in order; the remaining members run
+        concurrently. Nothing is written if the batch held only notifications.
+
+        Args:
+            batch: Parsed batch array
+        """
+        requests = []
+        for member in batch:
+            if isinstance(member, dict) and self.is_notification(member):
+                await self.handle_notification(member)
+            else:
+                requests.append(member)
+
+        responses = await asyncio.gather(*(self.execute_request(m) for m in requests))
+        responses = [r for r in responses if r is not None]
+        if responses:
+            self.response_builder.send_response(responses)
+
+    async def execute_request(self, request: Any) -> Optional[Dict[str, Any]]:
+        """
+        Execute one request and build its response.
+
+        Args:
+            request: Parsed JSON-RPC request object
+
+        Returns:
+            JSON-RPC response dict, or None when nothing should be sent
+        """
+        if not isinstance(request, dict):
+            return self.build_invalid_request(request)
+
+        method = request.get("method", "")
+        params = request.get("params", {})
+        request_id = request.get("id")
+
+        # Ensure ID is not None (Claude Desktop compatibility)
+        if request_id is None:
+            request_id = 0
+
+        handler_task = asyncio.ensure_future(self.handler(method, params, request_id))
+        if not self.is_notification(request):
+            self._running[request_id] = handler_task
+
+        try:
+            done, _ = await asyncio.wait({handler_task}, timeout=self.request_timeout)
+
+            if not done:
+                # Deadline passed: abort the handler and wait for its cleanup
+                handler_task.cancel()
+                await asyncio.gather(handler_task, return_exceptions=True)
+                self.logger.warning(
+                    f"Request {request_id} ({method}) timed out after {self.request_timeout}s"
+                )
+                return JSONRPCResponseBuilder.build_request_timeout_response(
+                    request_id, self.request_timeout
+                )
+
+            if handler_task.cancelled():
+                if request_id in self._cancelled:
+                    return None  # Client cancelled: MCP expects no response
+                return JSONRPCResponseBuilder.build_internal_error_response(
+                    request_id, "Request was cancelled"
+                )
+
+            result = handler_task.result()
+
+            # Send response for non-notifications
+            if result is None:
+                return None
+            return JSONRPCResponseBuilder.build_success_response(request_id, result)
+
+        except asyncio.CancelledError:
+            # Dispatcher itself is being cancelled: take the handler down with it
+            handler_task.cancel()
+            raise
+
+        except Exception as e:
+            # Structured error handling for MCP request processing
+            memory_error = error_handler.handle_error(
+                e,
+                context={"method": method, "params": params, "request_id": request_id},
+                operation="mcp_request_processing",
+            )
+
+            # Send appropriate error response based on error type
+            error_message = f"[{memory_error.category.value}] {memory_error.message}"
+            return JSONRPCResponseBuilder.build_internal_error_response(request_id, error_message)
+
+        finally:
+            if self._running.get(request_id) is handler_task:
+                del self._running[request_id]
+            self._cancelled.discard(request_id)
+
+    @staticmethod
+    def build_invalid_request(request: Any) -> Dict[str, Any]:
+        """Build Invalid Request response for a message that is not a request object"""
+        return JSONRPCResponseBuilder.build_invalid_request_response(
+            error_data=f"Expected request object, got {type(request).__name__}"
+        )
+
+
+def create_request_dispatcher(
+    handler: RequestHandler,
+    logger: Optional[logging.Logger] = None,
+    max_in_flight: Optional[int] = None,
+    request_timeout: Optional[float] = None,
+    response_builder=None,
+) -> RequestDispatcher:
+    """
+    Factory function to create Request Dispatcher.
+
+    Args:
+        handler: Coroutine function called as handler(method, params, request_id)
+        logger: Logger instance for dispatch operations
+        max_in_flight: In-flight limit (default: defaults.server.max_concurrent_requests)
+        request_timeout: Per-request deadline in seconds (default: defaults.server.mcp_timeout)
+        response_builder: Response sink (default: JSONRPCResponseBuilder, i.e. stdout)
+
+    Returns:
+        Configured RequestDispatcher instance
+    """
+    from extended_memory_mcp.core.config import get_default
+
+    if max_in_flight is None:
+        max_in_flight = get_default("server.max_concurrent_requests", DEFAULT_MAX_IN_FLIGHT)
+    if request_timeout is None:
+        request_timeout = get_default("server.mcp_timeout", DEFAULT_REQUEST_TIMEOUT)
+
+    return RequestDispatcher(
+        handler,
+        logger=logger,
+        max_in_flight=max_in_flight,
+        response_builder=response_builder or JSONRPCResponseBuilder,
+        request_timeout=request_timeout,
+    )
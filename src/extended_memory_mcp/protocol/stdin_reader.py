@@ -0,0 +1,213 @@
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Stdin Reader
+
+Reads newline-delimited JSON-RPC messages from stdin through an asyncio
+StreamReader instead of a thread pool hop per line.
+
+Responsibilities:
+- Attach stdin to the event loop with connect_read_pipe
+- Reassemble lines that arrive in several chunks
+- Reject (and skip) messages larger than defaults.server.max_request_size_mb
+
+`read_line` implements the framing on any StreamReader, so socket transports
+share the same size limits.
+"""
+
+import asyncio
+import logging
+import selectors
+import sys
+from typing import IO, Optional
+
+from extended_memory_mcp.core.errors import ValidationError
+
+# Default limit for a single request line
+DEFAULT_MAX_REQUEST_SIZE_MB = 10
+
+# Chunk size used by the thread fallback when stdin cannot be polled
+FALLBACK_CHUNK_SIZE = 64 * 1024
+
+
+class StdinReader:
+    """
+    Line reader over a binary stdin stream.
+
+    Uses connect_read_pipe when the stream supports it (pipes, sockets, ttys).
+    Regular files and platforms without pipe support fall back to a single
+    background thread that feeds the same StreamReader in large chunks.
+    """
+
+    def __init__(self, max_line_bytes: int, stream: Optional[IO[bytes]] = None):
+        """
+        Initialize stdin reader.
+
+        Args:
+            max_line_bytes: Maximum accepted size of one message, in bytes
+            stream: Binary stream to read (default: sys.stdin.buffer)
+        """
+        self.max_line_bytes = max(1, int(max_line_bytes))
+        self.stream = stream if stream is not None else sys.stdin.buffer
+        self.logger = logging.getLogger("MemoryMCP.StdinReader")
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._transport: Optional[asyncio.BaseTransport] = None
+        self._feeder: Optional[asyncio.Future] = None
+
+    async def start(self) -> None:
+        """Attach the stream to the running event loop"""
+        loop = asyncio.get_running_loop()
+        # Limit is checked on the buffered line, including the trailing newline
+        self._reader = asyncio.StreamReader(limit=self.max_line_bytes + 1)
+        protocol = asyncio.StreamReaderProtocol(self._reader)
+
+        if self._is_pollable():
+            try:
+                self._transport, _ = await loop.connect_read_pipe(lambda: protocol, self.stream)
+                return
+            except (OSError, ValueError, NotImplementedError) as e:
+                self.logger.debug(f"connect_read_pipe unavailable: {e}")
+
+        # e.g. stdin redirected from a regular file or /dev/null
+        self._feeder = loop.run_in_executor(None, self._feed_from_thread, loop)
+
+    def _is_pollable(self) -> bool:
+        """Check whether the stream can be registered with the loop's selector"""
+        try:
+            with selectors.DefaultSelector() as selector:
+                selector.register(self.stream.fileno(), selectors.EVENT_READ)
+            return True
+        except (OSError, ValueError, AttributeError):
+            return False
+
+    def _feed_from_thread(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Blocking fallback: push stream chunks into the StreamReader"""
+        read = getattr(self.stream, "read1", self.stream.read)
+        try:
+            while True:
+                chunk = read(FALLBACK_CHUNK_SIZE)
+                if not chunk:
+                    break
+                loop.call_soon_threadsafe(self._reader.feed_data, chunk)
+        finally:
+            loop.call_soon_threadsafe(self._reader.feed_eof)
+
+    async def readline(self) -> Optional[bytes]:
+        """
+        Read the next message line.
+
+        Returns:
+            Line bytes including the trailing newline (if any), or None at EOF
+
+        Raises:
+            ValidationError: If the line exceeds max_line_bytes. The oversized
+                line is consumed so the next call starts at the next message.
+        """
+        if self._reader is None:
+            await self.start()
+
+        return await read_line(self._reader, self.max_line_bytes)
+
+    def close(self) -> None:
+        """Detach the stream from the event loop"""
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+
+async def read_line(reader: asyncio.StreamReader, max_line_bytes: int) -> Optional[bytes]:
+    """
+    Read the next newline-delimited message from a StreamReader.
+
+    The reader's limit must be max_line_bytes + 1 (the limit covers the
+    trailing newline).
+
+    Args:
+        reader: Stream to read from
+        max_line_bytes: Maximum accepted size of one message, in bytes
+
+    Returns:
+        Line bytes including the trailing newline (if any), or None at EOF
+
+    Raises:
+        ValidationError: If the line exceeds max_line_bytes. The oversized
+            line is consumed so the next call starts at the next message.
+    """
+    try:
+        return await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError as e:
+        # EOF: return an unterminated final line, if any
+        return e.partial or None
+    except asyncio.LimitOverrunError as e:
+        await _discard_line(reader, e.consumed)
+        raise ValidationError(
+            f"Request exceeds maximum size of {max_line_bytes} bytes",
+            context={"max_request_bytes": max_line_bytes},
+        )
+
+
+async def _discard_line(reader: asyncio.StreamReader, consumed: int) -> None:
+    """Drop buffered data up to and including the next newline"""
+    while True:
+        await reader.readexactly(consumed)
+        try:
+            await reader.readuntil(b"\n")
+            return
+        except asyncio.IncompleteReadError:
+            return
+        except asyncio.LimitOverrunError as e:
+            consumed = e.consumed
+
+
+def get_max_request_bytes(max_request_size_mb: Optional[float] = None) -> int:
+    """
+    Resolve the per-message size limit in bytes.
+
+    Args:
+        max_request_size_mb: Size limit (default: defaults.server.max_request_size_mb)
+
+    Returns:
+        Limit in bytes
+    """
+    if max_request_size_mb is None:
+        from extended_memory_mcp.core.config import get_default
+
+        max_request_size_mb = get_default("server.max_request_size_mb", DEFAULT_MAX_REQUEST_SIZE_MB)
+
+    return int(float(max_request_size_mb) * 1024 * 1024)
+
+
+def create_stdin_reader(
+    stream: Optional[IO[bytes]] = None, max_request_size_mb: Optional[float] = None
+) -> StdinReader:
+    """
+    Factory function to create Stdin Reader.
+
+    Args:
+        stream: Binary stream to read (default: sys.stdin.buffer)
+        max_request_size_mb: Size limit (default: defaults.server.max_request_size_mb)
+
+    Returns:
+        Configured StdinReader instance
+    """
+    return StdinReader(get_max_request_bytes(max_request_size_mb), stream=stream)
@@ -45,8 +45,9 @@ Handles JSON-RPC 2.0 response formatting for MCP protocol.
 Separated from main server for better maintainability and testing.
 """
 
-import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Union
+
+from extended_memory_mcp.core import json_codec
 
 
 class JSONRPCResponseBuilder:
@@ -67,6 +68,45 @@ class JSONRPCResponseBuilder:
     INVALID_PARAMS = -32602
     INTERNAL_ERROR = -32603
 
+    # MCP implementation-defined error codes
+    REQUEST_TIMEOUT = -32001
+
+    # Async response writer used by send_* methods (None: print to stdout)
+    _writer = None
+
+    @classmethod
+    def set_writer(cls, writer) -> None:
+        """
+        Route all send_* output through a single response writer.
+
+        Args:
+            writer: ResponseWriter instance, or None to print directly
+        """
+        cls._writer = writer
+
+    @classmethod
+    async def wait_writable(cls) -> None:
+        """Wait while the response writer has too much output queued (backpressure)"""
+        if cls._writer is not None:
+            await cls._writer.wait_writable()
+
+    @classmethod
+    def write_json(cls, json_response: Union[str, bytes]) -> None:
+        """
+        Write one serialized response line.
+
+        Args:
+            json_response: JSON text (str or UTF-8 bytes) of a complete response
+        """
+        if cls._writer is not None:
+            if isinstance(json_response, str):
+                json_response = json_response.encode("utf-8")
+            cls._writer.write(json_response + b"\n")
+        else:
+            if isinstance(json_response, bytes):
+                json_response = json_response.decode("utf-8")
+            print(json_response, flush=True)
+
     @staticmethod
     def build_success_response(request_id: Any, result: Any) -> Dict[str, Any]:
         """
@@ -122,6 +162,27 @@ class JSONRPCResponseBuilder:
             error_data=error_data,
         )
 
+    @classmethod
+    def build_invalid_request_response(
+        cls, request_id: Any = 0, error_data: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Build invalid request error response.
+
+        Args:
+            request_id: Request ID (default ID when the request could not be read)
+            error_data: Optional error details
+
+        Returns:
+            Dict with invalid request error response
+        """
+        return cls.build_error_response(
+            request_id=request_id,
+            error_code=cls.INVALID_REQUEST,
+            error_message="Invalid Request",
+            error_data=error_data,
+        )
+
     @classmethod
     def build_internal_error_response(
         cls, request_id: Any, error_data: Optional[str] = None
@@ -143,6 +204,25 @@ class JSONRPCResponseBuilder:
             error_data=error_data,
         )
 
+    @classmethod
+    def build_request_timeout_response(cls, request_id: Any, timeout: float) -> Dict[str, Any]:
+        """
+        Build request timeout error response.
+
+        Args:
+            request_id: Request ID from original request
+            timeout: Deadline that was exceeded, in seconds
+
+        Returns:
+            Dict with request timeout error response
+        """
+        return cls.build_error_response(
+            request_id=request_id,
+            error_code=cls.REQUEST_TIMEOUT,
+            error_message="Request timed out",
+            error_data=f"No result within {timeout:g}s",
+        )
+
     @classmethod
     def build_method_not_found_response(cls, request_id: Any, method_name: str) -> Dict[str, Any]:
         """
@@ -163,17 +243,65 @@ class JSONRPCResponseBuilder:
         )
 
     @staticmethod
-    def format_response_json(response: Dict[str, Any]) -> str:
+    def format_response_json(response: Union[Dict[str, Any], List[Dict[str, Any]]]) -> str:
         """
         Format response as JSON string.
 
         Args:
-            response: Response dictionary
+            response: Response dictionary (or list of responses for a batch)
 
         Returns:
             JSON string representation
         """
-        return json.dumps(response, ensure_ascii=False)
+        return json_codec.dumps(response)
+
+    @classmethod
+    def encode_response_json(cls, response: Union[Dict[str, Any], List[Dict[str, Any]]]) -> bytes:
+        """
+        Encode response as UTF-8 JSON bytes, ready to be written to stdout.
+
+        Pre-encoded results (json_codec.PreEncodedJSON) are spliced in as
+        bytes instead of being serialized again.
+
+        Args:
+            response: Response dictionary (or list of responses for a batch)
+
+        Returns:
+            Encoded JSON bytes
+        """
+        if isinstance(response, list):
+            if any(cls._has_pre_encoded_result(member) for member in response):
+                return b"[" + b",".join(cls.encode_response_json(m) for m in response) + b"]"
+            return json_codec.dumps_bytes(response)
+
+        if cls._has_pre_encoded_result(response) and len(response) == 3:
+            return b"".join(
+                (
+                    b'{"jsonrpc":"2.0","id":',
+                    json_codec.dumps_bytes(response.get("id")),
+                    b',"result":',
+                    response["result"].encoded,
+                    b"}",
+                )
+            )
+        return json_codec.dumps_bytes(response)
+
+    @staticmethod
+    def _has_pre_encoded_result(response: Any) -> bool:
+        """Check whether response is a success response with a pre-encoded result"""
+        return isinstance(response, dict) and isinstance(
+            response.get("result"), json_codec.PreEncodedJSON
+        )
+
+    @classmethod
+    def send_response(cls, response: Union[Dict[str, Any], List[Dict[str, Any]]]) -> None:
+        """
+        Send a prebuilt response, or a batch response array, to stdout.
+
+        Args:
+            response: Response dict or list of response dicts
+        """
+        cls.write_json(cls.encode_response_json(response))
 
     @classmethod
     def send_success_response(cls, request_id: Any, result: Any) -> None:
@@ -185,8 +313,7 @@ class JSONRPCResponseBuilder:
             result: Result data
         """
         response = cls.build_success_response(request_id, result)
-        json_response = cls.format_response_json(response)
-        print(json_response, flush=True)
+        cls.write_json(cls.encode_response_json(response))
 
     @classmethod
     def send_error_response(
@@ -202,8 +329,7 @@ class JSONRPCResponseBuilder:
             error_data: Optional error data
         """
         response = cls.build_error_response(request_id, error_code, error_message, error_data)
-        json_response = cls.format_response_json(response)
-        print(json_response, flush=True)
+        cls.write_json(cls.encode_response_json(response))
 
     @classmethod
     def send_parse_error(cls, error_details: Optional[str] = None) -> None:
@@ -214,8 +340,18 @@ class JSONRPCResponseBuilder:
             error_details: Optional error details
         """
         response = cls.build_parse_error_response(error_details)
-        json_response = cls.format_response_json(response)
-        print(json_response, flush=True)
+        cls.write_json(cls.encode_response_json(response))
+
+    @classmethod
+    def send_invalid_request(cls, error_details: Optional[str] = None) -> None:
+        """
+        Send invalid request error response to stdout.
+
+        Args:
+            error_details: Optional error details
+        """
+        response = cls.build_invalid_request_response(error_data=error_details)
+        cls.write_json(cls.encode_response_json(response))
 
     @classmethod
     def send_internal_error(cls, request_id: Any, error_details: Optional[str] = None) -> None:
@@ -227,8 +363,7 @@ class JSONRPCResponseBuilder:
             error_details: Optional error details
         """
         response = cls.build_internal_error_response(request_id, error_details)
-        json_response = cls.format_response_json(response)
-        print(json_response, flush=True)
+        cls.write_json(cls.encode_response_json(response))
 
 
 def create_json_rpc_response_builder() -> JSONRPCResponseBuilder:
@@ -0,0 +1,226 @@
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Response Writer
+
+Async, buffered writer for JSON-RPC responses on stdout.
+
+Responsibilities:
+- Keep stdout writes off the event loop's critical path
+- Coalesce responses produced in the same loop tick into one write
+- Apply backpressure when stdout is slower than request processing
+"""
+
+import asyncio
+import logging
+import selectors
+import sys
+from typing import IO, List, Optional
+
+# Pending output above which producers are asked to wait
+DEFAULT_HIGH_WATER_BYTES = 1024 * 1024
+
+
+class _PipeWriteProtocol(asyncio.Protocol):
+    """Write pipe protocol exposing pause/resume as an awaitable"""
+
+    def __init__(self):
+        self._can_write = asyncio.Event()
+        self._can_write.set()
+        self._closed = asyncio.get_running_loop().create_future()
+
+    def pause_writing(self) -> None:
+        self._can_write.clear()
+
+    def resume_writing(self) -> None:
+        self._can_write.set()
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        # Never leave the writer task blocked on a closed pipe
+        self._can_write.set()
+        if not self._closed.done():
+            self._closed.set_result(None)
+
+    async def wait_writable(self) -> None:
+        await self._can_write.wait()
+
+    async def wait_closed(self) -> None:
+        await self._closed
+
+
+class ResponseWriter:
+    """
+    Single writer for all protocol output.
+
+    Producers call write() with complete, newline-terminated messages; it only
+    queues data. A background task joins everything queued since it last ran
+    and issues one write, then waits for the pipe to drain.
+    """
+
+    def __init__(
+        self,
+        stream: Optional[IO[bytes]] = None,
+        high_water_bytes: int = DEFAULT_HIGH_WATER_BYTES,
+    ):
+        """
+        Initialize response writer.
+
+        Args:
+            stream: Binary output stream (default: sys.stdout.buffer)
+            high_water_bytes: Pending bytes above which wait_writable() blocks
+        """
+        self.stream = stream if stream is not None else sys.stdout.buffer
+        self.high_water_bytes = max(1, int(high_water_bytes))
+        self.logger = logging.getLogger("MemoryMCP.ResponseWriter")
+
+        self._pending: List[bytes] = []
+        self._pending_bytes = 0
+        self._has_data: Optional[asyncio.Event] = None
+        self._below_high_water: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._transport: Optional[asyncio.WriteTransport] = None
+        self._protocol: Optional[_PipeWriteProtocol] = None
+        self._closing = False
+
+        # Statistics (writes vs. messages shows how much was coalesced)
+        self.messages_written = 0
+        self.writes_issued = 0
+
+    async def start(self) -> None:
+        """Attach the stream to the running loop and start the writer task"""
+        loop = asyncio.get_running_loop()
+        self._has_data = asyncio.Event()
+        self._below_high_water = asyncio.Event()
+        self._below_high_water.set()
+
+        if self._is_pollable():
+            try:
+                self._transport, self._protocol = await loop.connect_write_pipe(
+                    _PipeWriteProtocol, self.stream
+                )
+            except (OSError, ValueError, NotImplementedError) as e:
+                self.logger.debug(f"connect_write_pipe unavailable: {e}")
+
+        self._task = asyncio.create_task(self._run())
+
+    def _is_pollable(self) -> bool:
+        """Check whether the stream can be registered with the loop's selector"""
+        try:
+            with selectors.DefaultSelector() as selector:
+                selector.register(self.stream.fileno(), selectors.EVENT_WRITE)
+            return True
+        except (OSError, ValueError, AttributeError):
+            return False
+
+    @property
+    def pending_bytes(self) -> int:
+        """Bytes queued but not yet handed to the OS"""
+        return self._pending_bytes
+
+    def write(self, data: bytes) -> None:
+        """
+        Queue one complete message for output (never blocks).
+
+        Args:
+            data: Serialized message including its trailing newline
+        """
+        if self._task is None:
+            # Not started (e.g. used outside the server loop): write through
+            self.stream.write(data)
+            self.stream.flush()
+            self.messages_written += 1
+            self.writes_issued += 1
+            return
+
+        self._pending.append(data)
+        self._pending_bytes += len(data)
+        self._has_data.set()
+        if self._pending_bytes >= self.high_water_bytes:
+            self._below_high_water.clear()
+
+    async def wait_writable(self) -> None:
+        """Wait until queued output is below the high-water mark"""
+        if self._below_high_water is not None:
+            await self._below_high_water.wait()
+
+    async def _run(self) -> None:
+        """Writer task: coalesce queued messages and write them"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._has_data.wait()
+            self._has_data.clear()
+
+            if self._pending:
+                batch, count = b"".join(self._pending), len(self._pending)
+                self._pending.clear()
+
+                try:
+                    if self._transport is not None:
+                        self._transport.write(batch)
+                        await self._protocol.wait_writable()
+                    else:
+                        await loop.run_in_executor(None, self._write_blocking, batch)
+                except Exception as e:
+                    self.logger.error(f"Failed to write responses: {e}")
+
+                self._pending_bytes -= len(batch)
+                self.messages_written += count
+                self.writes_issued += 1
+                if self._pending_bytes < self.high_water_bytes:
+                    self._below_high_water.set()
+
+            if self._closing and not self._pending:
+                return
+
+    def _write_blocking(self, data: bytes) -> None:
+        """Fallback for streams that cannot be attached to the loop"""
+        self.stream.write(data)
+        self.stream.flush()
+
+    async def close(self) -> None:
+        """Flush everything queued and stop the writer task"""
+        if self._task is None:
+            return
+
+        self._closing = True
+        self._has_data.set()
+        await self._task
+        self._task = None
+
+        if self._transport is not None:
+            # Closing flushes the transport buffer; wait so nothing is lost at exit
+            self._transport.close()
+            await self._protocol.wait_closed()
+            self._transport = None
+
+
+def create_response_writer(stream: Optional[IO[bytes]] = None) -> ResponseWriter:
+    """
+    Factory function to create Response Writer.
+
+    Args:
+        stream: Binary output stream (default: sys.stdout.buffer)
+
+    Returns:
+        ResponseWriter instance
+    """
+    return ResponseWriter(stream=stream)
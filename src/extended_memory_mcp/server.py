@@ -42,38 +42,46 @@
 """
 Memory MCP Server - Main server entry point
 
-Lightweight HTTP server implementing Model Context Protocol (MCP) for persistent memory.
+Lightweight server implementing Model Context Protocol (MCP) for persistent memory.
+Serves stdio here; daemon.py and http_server.py add Unix socket and HTTP transports.
 Clean architecture with separated concerns:
-- HTTP server + JSON-RPC protocol handling
+- Transport + JSON-RPC protocol handling
 - MCP protocol logic (delegated to protocol handler)
 - Memory operations (delegated to tools handler)
 - Response formatting (delegated to response builder)
 """
 
 import asyncio
-import json
+import contextlib
+import functools
 import logging
 import os
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, Optional
 
+from extended_memory_mcp.core import json_codec
 from extended_memory_mcp.core.errors import (
     ConfigurationError,
     MemoryMCPError,
     StorageError,
+    ValidationError,
     error_handler,
 )
+from extended_memory_mcp.core.maintenance import create_maintenance_scheduler
 
 # Import storage abstraction
-from extended_memory_mcp.core.storage import get_storage_provider
+from extended_memory_mcp.core.storage import IStorageProvider, get_storage_provider
 from extended_memory_mcp.core.storage.storage_factory import StorageFactory
 
 # Import component factories
 from extended_memory_mcp.formatters.summary_formatter import create_summary_formatter
 from extended_memory_mcp.protocol.mcp_protocol_handler import create_mcp_protocol_handler
+from extended_memory_mcp.protocol.request_dispatcher import create_request_dispatcher
+from extended_memory_mcp.protocol.stdin_reader import create_stdin_reader
 from extended_memory_mcp.responses.json_rpc_builder import JSONRPCResponseBuilder
+from extended_memory_mcp.responses.response_writer import create_response_writer
 from extended_memory_mcp.tools.memory_tools import create_memory_tools_handler
 
 
@@ -94,6 +102,7 @@ class MemoryMCPServer:
     Responsibilities:
     - HTTP server initialization and configuration
     - Component orchestration (storage, tools, protocol)
+    - Background maintenance between client requests
     - Startup context generation for immediate Claude access
     """
 
@@ -107,6 +116,10 @@ class MemoryMCPServer:
             logger=None
         )  # Logger set after _setup_logging
         self.tools_handler = None
+        self.maintenance = None
+
+        # Client requests being handled, over all transports and sessions
+        self.requests_in_flight = 0
 
         # Current active project (synchronized with tools handler)
         self._current_project = None
@@ -240,8 +253,39 @@ class MemoryMCPServer:
             logger=self.logger,
         )
 
+        # Housekeeping jobs of the storage provider, run while no request is in flight
+        jobs = {}
+        if isinstance(self.storage_provider, IStorageProvider):
+            jobs = self.storage_provider.maintenance_jobs()
+        self.maintenance = create_maintenance_scheduler(
+            jobs, is_busy=lambda: self.requests_in_flight > 0
+        )
+        self.maintenance.start()
+
         self.logger.info("✅ Memory MCP Server initialized successfully")
 
+    @contextlib.contextmanager
+    def request_in_flight(self) -> Iterator[None]:
+        """Count a client request as in flight while the block runs (holds maintenance back)"""
+        self.requests_in_flight += 1
+        try:
+            yield
+        finally:
+            self.requests_in_flight -= 1
+
+    def maintenance_status(self) -> Dict[str, Any]:
+        """Status and durations of the background maintenance jobs"""
+        if self.maintenance is None:
+            return {"running": False, "jobs": {}}
+        return self.maintenance.status()
+
+    async def close(self) -> None:
+        """Stop background maintenance, then close the storage provider"""
+        if self.maintenance is not None:
+            await self.maintenance.close()
+        if self.storage_provider is not None:
+            await self.storage_provider.close()
+
     # Proxy methods for tests
     async def save_context(self, *args, **kwargs):
         return await self.tools_handler.save_context(*args, **kwargs)
@@ -255,8 +299,15 @@ class MemoryMCPServer:
     async def list_all_projects(self, *args, **kwargs):
         return await self.tools_handler.list_all_projects_global(*args, **kwargs)
 
-    async def generate_startup_context(self) -> Dict[str, Any]:
-        """Generate startup memory context for immediate Claude availability"""
+    async def generate_startup_context(
+        self, active_project: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate startup memory context for immediate Claude availability.
+
+        Args:
+            active_project: Project to report as active (default: current_project)
+        """
         try:
             # Load high-importance contexts for speed (limit 5)
             contexts = await self.storage_provider.load_high_importance_contexts(limit=5)
@@ -264,7 +315,7 @@ class MemoryMCPServer:
 
             return {
                 "user_name": "User",
-                "active_project": self.current_project or "memory_mcp",
+                "active_project": active_project or self.current_project or "memory_mcp",
                 "available_projects": [p.get("id") for p in projects],
                 "high_importance_contexts": [
                     {
@@ -301,17 +352,116 @@ class MemoryMCPServer:
             }
 
 
+class ClientSession:
+    """
+    Per-client MCP state for transports that serve many clients.
+
+    Uses the server's shared storage provider, with its own tools handler so
+    that `current_project` does not leak between clients.
+    """
+
+    def __init__(self, server: "MemoryMCPServer", session_id: Any):
+        """
+        Initialize client session.
+
+        Args:
+            server: Initialized server shared by all sessions
+            session_id: Transport-assigned session identifier
+        """
+        self.server = server
+        self.session_id = session_id
+        self.tools_handler = create_memory_tools_handler(
+            storage_provider=server.storage_provider,
+            summary_formatter=server.summary_formatter,
+            logger=server.logger,
+        )
+
+    @property
+    def current_project(self) -> Optional[str]:
+        """Active project of this session"""
+        return self.tools_handler.current_project
+
+    @current_project.setter
+    def current_project(self, value: Optional[str]) -> None:
+        self.tools_handler.current_project = value
+
+    async def handle_request(
+        self, method: str, params: Dict[str, Any], request_id: Any = None
+    ) -> Optional[Dict[str, Any]]:
+        """Handle MCP protocol request in the context of this session"""
+        with self.server.request_in_flight():
+            return await self.server.protocol_handler.handle_request(
+                method=method,
+                params=params,
+                tools_handler=self.tools_handler,
+                server=self,
+                request_id=request_id,
+            )
+
+    async def generate_startup_context(self) -> Dict[str, Any]:
+        """Generate startup context reporting this session's active project"""
+        return await self.server.generate_startup_context(active_project=self.current_project)
+
+    def maintenance_status(self) -> Dict[str, Any]:
+        """Status of the shared server's maintenance jobs"""
+        return self.server.maintenance_status()
+
+
 async def handle_mcp_request(
     server: MemoryMCPServer, method: str, params: Dict[str, Any], request_id: Any = None
 ) -> Dict[str, Any]:
     """Handle MCP protocol requests - delegate to protocol handler"""
-    return await server.protocol_handler.handle_request(
-        method=method,
-        params=params,
-        tools_handler=server.tools_handler,
-        server=server,
-        request_id=request_id,
-    )
+    with server.request_in_flight():
+        return await server.protocol_handler.handle_request(
+            method=method,
+            params=params,
+            tools_handler=server.tools_handler,
+            server=server,
+            request_id=request_id,
+        )
+
+
+async def serve_messages(readline, dispatcher) -> None:
+    """
+    Read newline-delimited JSON-RPC messages and dispatch them until EOF.
+
+    Args:
+        readline: Coroutine function returning the next line (None at EOF)
+        dispatcher: RequestDispatcher executing requests; its response
+            builder also receives parse and size errors
+    """
+    response_builder = dispatcher.response_builder
+
+    while True:
+        # Read JSON-RPC request
+        try:
+            line = await readline()
+        except ValidationError as e:
+            response_builder.send_response(
+                JSONRPCResponseBuilder.build_invalid_request_response(error_data=e.message)
+            )
+            continue
+
+        if line is None:
+            break
+
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            # Parse JSON-RPC request or batch straight from the UTF-8 bytes
+            request = json_codec.loads(line)
+        except ValueError as e:
+            response_builder.send_response(
+                JSONRPCResponseBuilder.build_parse_error_response(str(e))
+            )
+            continue
+
+        await dispatcher.dispatch(request)
+
+    # Input closed: answer everything still in flight before returning
+    await dispatcher.drain()
 
 
 async def main():
@@ -319,54 +469,30 @@ async def main():
     server = MemoryMCPServer()
     await server.initialize()
 
+    # Requests run concurrently; responses are written as each one finishes
+    dispatcher = create_request_dispatcher(
+        handler=functools.partial(handle_mcp_request, server), logger=server.logger
+    )
+
+    # Stdin is read on the event loop itself (no thread hop per message)
+    stdin_reader = create_stdin_reader()
+
+    # All responses go through one buffered writer (coalesced, with backpressure)
+    response_writer = create_response_writer()
+    await response_writer.start()
+    JSONRPCResponseBuilder.set_writer(response_writer)
+
     # MCP protocol: JSON responses to stdout, logging to stderr
     try:
-        while True:
-            # Read JSON-RPC request from stdin
-            line = await asyncio.get_event_loop().run_in_executor(None, sys.stdin.readline)
-            if not line:
-                break
-
-            line = line.strip()
-            if not line:
-                continue
-
-            try:
-                # Parse JSON-RPC request
-                request = json.loads(line)
-                method = request.get("method", "")
-                params = request.get("params", {})
-                request_id = request.get("id")
-
-                # Ensure ID is not None (Claude Desktop compatibility)
-                if request_id is None:
-                    request_id = 0
-
-                try:
-                    # Handle MCP request
-                    result = await handle_mcp_request(server, method, params, request_id)
-
-                    # Send response for non-notifications
-                    if result is not None:
-                        JSONRPCResponseBuilder.send_success_response(request_id, result)
-
-                except Exception as e:
-                    # Structured error handling for MCP request processing
-                    memory_error = error_handler.handle_error(
-                        e,
-                        context={"method": method, "params": params, "request_id": request_id},
-                        operation="mcp_request_processing",
-                    )
-
-                    # Send appropriate error response based on error type
-                    error_message = f"[{memory_error.category.value}] {memory_error.message}"
-                    JSONRPCResponseBuilder.send_internal_error(request_id, error_message)
-
-            except json.JSONDecodeError as e:
-                JSONRPCResponseBuilder.send_parse_error(str(e))
+        await serve_messages(stdin_reader.readline, dispatcher)
 
     except KeyboardInterrupt:
         pass
+    finally:
+        stdin_reader.close()
+        await response_writer.close()
+        JSONRPCResponseBuilder.set_writer(None)
+        await server.close()
 
 
 if __name__ == "__main__":
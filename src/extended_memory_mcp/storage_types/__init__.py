@@ -27,20 +27,28 @@ used across different storage providers (SQLite, Redis, etc.).
 """
 
 from .storage_types import (
+    BatchContextItem,
+    BatchSaveResult,
     ContextData,
+    ContextPage,
     InitContextsResult,
     PopularTag,
     ProjectInfo,
     SearchFilters,
+    SearchResult,
     StorageStats,
     TagInfo,
 )
 
 __all__ = [
+    "BatchContextItem",
+    "BatchSaveResult",
     "ContextData",
+    "ContextPage",
     "ProjectInfo",
     "PopularTag",
     "SearchFilters",
+    "SearchResult",
     "StorageStats",
     "InitContextsResult",
     "TagInfo",
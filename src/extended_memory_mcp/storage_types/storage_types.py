@@ -43,11 +43,39 @@ class ContextData(TypedDict, total=False):
     importance_level: int  # 1-10 importance rating
     project_id: Optional[str]  # Project isolation (None for global)
     tags: List[str]  # Associated tags list
-    created_at: str  # ISO format timestamp
-    expires_at: Optional[str]  # ISO format expiry (optional)
+    created_ms: int  # Creation time, UTC epoch milliseconds (sort and filter key)
+    created_at: str  # Creation time as ISO 8601 UTC, derived from created_ms
+    expires_ms: Optional[int]  # Expiry time, UTC epoch milliseconds (None: never)
+    expires_at: Optional[str]  # Expiry as ISO 8601 UTC, derived from expires_ms
     status: str  # Context status (active, archived, expired)
 
 
+class BatchContextItem(TypedDict, total=False):
+    """
+    One context to store in a bulk save.
+
+    Used by: save_contexts_batch
+    """
+
+    content: str  # Context content text (required)
+    importance_level: int  # 1-10 importance rating (default: 5)
+    project_id: Optional[str]  # Project isolation (None for global)
+    tags: List[str]  # Associated tags list
+
+
+class BatchSaveResult(TypedDict, total=False):
+    """
+    Outcome of one item of a bulk save, in input order.
+
+    Used by: save_contexts_batch
+    """
+
+    index: int  # Position of the item in the request
+    success: bool  # Whether the context was stored
+    context_id: Optional[str]  # Context identifier when stored
+    error: Optional[str]  # Reason the item was rejected or not stored
+
+
 class ProjectInfo(TypedDict, total=False):
     """
     Standard project information structure.
@@ -97,9 +125,7 @@ class SearchFilters(TypedDict, total=False):
 
     project_id: Optional[str]  # Filter by project
     tags_filter: Optional[List[str]]  # Filter by tags (OR logic)
-    content_search: Optional[
-        str
-    ]  # Text search in content (RESERVED: for future advanced search features)
+    content_search: Optional[str]  # Words that must all appear in the content
     min_importance: Optional[int]  # Minimum importance level
     max_importance: Optional[int]  # Maximum importance level
     created_after: Optional[str]  # ISO format date filter
@@ -109,6 +135,34 @@ class SearchFilters(TypedDict, total=False):
     offset: Optional[int]  # Results offset for pagination
 
 
+class ContextPage(TypedDict):
+    """
+    One page of a newest-first context listing.
+
+    Used by: load_contexts_page
+    """
+
+    contexts: List[ContextData]  # Contexts of this page, newest first
+    next_cursor: Optional[str]  # Cursor for the next page (None on the last page)
+
+
+class SearchResult(TypedDict, total=False):
+    """
+    One ranked full-text search hit, with an excerpt instead of full content.
+
+    Used by: search_contexts_ranked
+    """
+
+    id: str  # Context identifier
+    project_id: Optional[str]  # Project the context belongs to
+    snippet: str  # Excerpt around the matched words, matches in **bold**
+    importance_level: int  # Importance level 1-10
+    created_ms: int  # Creation time, UTC epoch milliseconds (sort and filter key)
+    created_at: str  # Creation time as ISO 8601 UTC, derived from created_ms
+    score: float  # Combined relevance, importance and recency score
+    tags: List[str]  # Associated tags
+
+
 class StorageStats(TypedDict):
     """
     Storage provider statistics and metrics.
@@ -151,3 +205,5 @@ StorageResult = Optional[Dict[str, Any]]  # Generic storage operation result
 ContextList = List[ContextData]  # List of contexts
 ProjectList = List[ProjectInfo]  # List of projects
 TagList = List[PopularTag]  # List of tags
+BatchSaveResultList = List[BatchSaveResult]  # Per-item results of a bulk save
+SearchResultList = List[SearchResult]  # Ranked search hits, best first
@@ -25,6 +25,7 @@ Handles execution of MCP memory-related tools
 """
 
 import logging
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from extended_memory_mcp.core.errors import (
@@ -34,6 +35,9 @@ from extended_memory_mcp.core.errors import (
     error_handler,
 )
 from extended_memory_mcp.core.project_utils import normalize_project_id
+from extended_memory_mcp.core.storage.pagination import encode_cursor
+from extended_memory_mcp.core.storage.storage_utils import validate_batch_item
+from extended_memory_mcp.core.storage.timestamps import context_ms
 from extended_memory_mcp.formatters.summary_formatter import ContextSummaryFormatter
 
 
@@ -67,8 +71,12 @@ class MemoryToolsHandler:
 
         if tool_name == "save_context":
             return await self.save_context(**tool_args)
+        elif tool_name == "save_contexts_batch":
+            return await self.save_contexts_batch(**tool_args)
         elif tool_name == "load_contexts":
             return await self.load_contexts(**tool_args)
+        elif tool_name == "search_contexts":
+            return await self.search_contexts(**tool_args)
         elif tool_name == "forget_context":
             return await self.forget_context(**tool_args)
         elif tool_name == "list_all_projects":
@@ -109,8 +117,6 @@ class MemoryToolsHandler:
             )
 
             # Get timestamp for logging
-            from datetime import datetime
-
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
             self.logger.debug(f"Saved context {context_id} for project {project_id} at {timestamp}")
@@ -148,6 +154,80 @@ class MemoryToolsHandler:
                 ]
             }
 
+    async def save_contexts_batch(
+        self,
+        contexts: List[Dict[str, Any]],
+        project_id: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        MCP Tool: save_contexts_batch
+        Bulk import - every item is saved or rejected on its own
+
+        Args:
+            contexts: Items with content, importance_level, tags, project_id
+            project_id: Project for items that do not name one
+            chunk_size: Contexts written per transaction (default: from config)
+        """
+        if not isinstance(contexts, list):
+            return {
+                "content": [
+                    {"type": "text", "text": "❌ Error: contexts must be a list of objects"}
+                ]
+            }
+
+        try:
+            if project_id is None and self.current_project:
+                project_id = self.current_project
+
+            items = []
+            for item in contexts:
+                try:
+                    item = validate_batch_item(item)
+                    item["project_id"] = normalize_project_id(item["project_id"] or project_id)
+                except ValidationError:
+                    pass  # Passed on as-is: the provider rejects it at its own index
+                items.append(item)
+
+            results = await self.storage_provider.save_contexts_batch(items, chunk_size=chunk_size)
+
+            saved = sum(1 for r in results if r.get("success"))
+            self.logger.info(f"Saved {saved} of {len(results)} contexts in batch")
+
+            lines = [
+                (
+                    f"- [{r['index']}] saved as {r['context_id']}"
+                    if r.get("success")
+                    else f"- [{r['index']}] ❌ {r.get('error', 'not saved')}"
+                )
+                for r in results
+            ]
+            status = "✅" if saved == len(results) else "⚠️"
+            return {
+                "content": [
+                    {
+                        "type": "text",
+                        "text": f"{status} Saved {saved} of {len(results)} contexts\n\n"
+                        + "\n".join(lines),
+                    }
+                ]
+            }
+
+        except Exception as e:
+            memory_error = error_handler.handle_error(
+                e,
+                context={"contexts_count": len(contexts), "project_id": project_id},
+                operation="save_contexts_batch_tool",
+            )
+            return {
+                "content": [
+                    {
+                        "type": "text",
+                        "text": f"❌ Error saving contexts: {memory_error.message}",
+                    }
+                ]
+            }
+
     async def load_contexts(
         self,
         project_id: Optional[str] = None,
@@ -155,6 +235,7 @@ class MemoryToolsHandler:
         init_load: bool = True,
         limit: int = 30,
         tags_filter: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         MCP Tool: load_contexts
@@ -167,6 +248,7 @@ class MemoryToolsHandler:
             limit: Maximum number of contexts
             tags_filter: Filter by specific tags using OR logic (list of strings, max 10 tags)
                         Note: When tags_filter is used, init_load is automatically set to false
+            cursor: Continuation cursor from a previous response (next, older page)
         """
         try:
             # Normalize project_id (replace None/empty with "general")
@@ -219,13 +301,27 @@ class MemoryToolsHandler:
                     f"DEBUG: tags_filter provided {tags_filter}, using regular load_contexts instead of init_load"
                 )
 
-            # Regular context loading (subsequent calls)
-            contexts = await self.storage_provider.load_contexts(
-                project_id=project_id,
-                limit=limit,
-                importance_threshold=importance_level,
-                tags_filter=tags_filter,
-            )
+            if cursor:
+                # Continuation pages: keyset seek after the cursor, no instructions again
+                init_load = False
+                page = await self.storage_provider.load_contexts_page(
+                    project_id=project_id,
+                    limit=limit,
+                    importance_threshold=importance_level,
+                    tags_filter=tags_filter,
+                    cursor=cursor,
+                )
+                contexts = page["contexts"]
+                more_available = page["next_cursor"] is not None
+            else:
+                # Regular context loading (subsequent calls)
+                contexts = await self.storage_provider.load_contexts(
+                    project_id=project_id,
+                    limit=limit,
+                    importance_threshold=importance_level,
+                    tags_filter=tags_filter,
+                )
+                more_available = len(contexts) >= limit
 
             # Load popular tags for suggestions
             # Load popular tags (optimized with Redis caching)
@@ -242,8 +338,6 @@ class MemoryToolsHandler:
             self.logger.info(f"Loaded {len(contexts)} contexts for project {project_id}")
 
             # Get timestamp for response
-            from datetime import datetime
-
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S %Z")
 
             # Format for Claude Desktop UI
@@ -299,9 +393,7 @@ class MemoryToolsHandler:
             text_content += f"Memory contexts in chronological order (showing last {len(contexts)} entries):\n\n"
 
             # Sort contexts chronologically (oldest first)
-            sorted_contexts = sorted(
-                contexts[:10], key=lambda x: x.get("created_at", ""), reverse=False
-            )
+            sorted_contexts = sorted(contexts[:10], key=context_ms, reverse=False)
 
             # Load tags for all contexts in one batch query (avoid N+1)
             context_ids = [ctx.get("id") for ctx in sorted_contexts if ctx.get("id")]
@@ -315,16 +407,11 @@ class MemoryToolsHandler:
                     self.logger.debug(f"Could not load tags batch: {e}")
 
             for ctx in sorted_contexts:
-                created_at = ctx.get("created_at", "")
+                created_ms = context_ms(ctx)
                 date_str = ""
-                if created_at:
-                    try:
-                        from datetime import datetime
-
-                        dt = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-                        date_str = f" ({dt.strftime('%m-%d %H:%M')})"
-                    except:
-                        date_str = ""
+                if created_ms:
+                    dt = datetime.fromtimestamp(created_ms / 1000)
+                    date_str = f" ({dt.strftime('%m-%d %H:%M')})"
 
                 text_content += f"(ID: {ctx.get('id')}, Importance: {ctx.get('importance_level', 0)}/10{date_str})\n"
 
@@ -339,6 +426,14 @@ class MemoryToolsHandler:
             if len(contexts) > 10:
                 text_content += f"... and {len(contexts) - 10} more contexts\n"
 
+            # Continue after the oldest context shown (contexts are newest first)
+            last_shown = contexts[: len(sorted_contexts)][-1]
+            if (len(contexts) > len(sorted_contexts) or more_available) and last_shown.get("id"):
+                text_content += (
+                    f"\n➡️ Older contexts available: call load_contexts with "
+                    f'cursor="{encode_cursor(last_shown)}"\n'
+                )
+
             return {"content": [{"type": "text", "text": text_content}]}
 
         except Exception as e:
@@ -351,6 +446,7 @@ class MemoryToolsHandler:
                     "init_load": init_load,
                     "limit": limit,
                     "tags_filter": tags_filter,
+                    "cursor": cursor,
                 },
                 operation="load_contexts_tool",
             )
@@ -364,6 +460,81 @@ class MemoryToolsHandler:
                 ]
             }
 
+    async def search_contexts(
+        self,
+        query: str,
+        project_id: Optional[str] = None,
+        importance_level: Optional[int] = None,
+        limit: int = 10,
+    ) -> Dict[str, Any]:
+        """
+        MCP Tool: search_contexts
+        Ranked full-text search returning excerpts instead of full content
+
+        Args:
+            query: Words that must all appear in a result
+            project_id: Project to search (None for all projects)
+            importance_level: Minimum importance level (default: 1)
+            limit: Maximum number of results (capped by memory.max_search_results)
+        """
+        if not isinstance(query, str) or not query.strip():
+            return {"content": [{"type": "text", "text": "❌ Error: query must not be empty"}]}
+
+        try:
+            from extended_memory_mcp.core.config import get_default
+
+            if project_id:
+                project_id = normalize_project_id(project_id)
+            max_results = get_default("memory.max_search_results", 20)
+            limit = min(max(1, int(limit)), max_results)
+
+            hits = await self.storage_provider.search_contexts_ranked(
+                query,
+                project_id=project_id,
+                min_importance=importance_level or 1,
+                limit=limit,
+            )
+            self.logger.info(f"Search for {query!r} returned {len(hits)} contexts")
+
+            scope = f"project '{project_id}'" if project_id else "all projects"
+            if not hits:
+                return {
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": f"🔍 No contexts in {scope} contain all of: {query}",
+                        }
+                    ]
+                }
+
+            text_content = f"🔎 **{len(hits)} contexts for '{query}'** ({scope}, best first)\n\n"
+            for hit in hits:
+                text_content += (
+                    f"(ID: {hit.get('id')}, Importance: {hit.get('importance_level', 0)}/10, "
+                    f"Project: {hit.get('project_id') or 'general'}, "
+                    f"Score: {hit.get('score', 0):.2f})\n"
+                )
+                if hit.get("tags"):
+                    text_content += f"🏷️ Tags: {', '.join(hit['tags'])}\n"
+                text_content += f"📝 {hit.get('snippet', '')}\n\n"
+
+            return {"content": [{"type": "text", "text": text_content}]}
+
+        except Exception as e:
+            memory_error = error_handler.handle_error(
+                e,
+                context={"query": query, "project_id": project_id, "limit": limit},
+                operation="search_contexts_tool",
+            )
+            return {
+                "content": [
+                    {
+                        "type": "text",
+                        "text": f"❌ Error searching contexts: {memory_error.message}",
+                    }
+                ]
+            }
+
     async def forget_context(self, context_id: int) -> Dict[str, Any]:
         """
         MCP Tool: forget_context
@@ -479,8 +650,6 @@ class MemoryToolsHandler:
                     "total": 0,
                 }
 
-            from datetime import datetime
-
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
             response_text = f"🏷️ **Popular Tags** (min {min_usage} uses, {len(tags)} found)\n\n"
@@ -44,7 +44,7 @@ def temp_test_db():
     with tempfile.TemporaryDirectory() as temp_dir:
         db_path = Path(temp_dir) / "test_memory.db"
         
-        # Create database with actual normalized schema from init.sql
+        # Create a pre-versioning database (user_version 0) with the normalized schema
         conn = sqlite3.connect(str(db_path))
         cursor = conn.cursor()
         
@@ -145,7 +145,8 @@ async def memory_manager(temp_config_dir, temp_test_db):
     """Create MemoryManager instance with test database"""
     manager = MemoryManager(temp_test_db)
     await manager.initialize_database()
-    return manager
+    yield manager
+    await manager.close()
 
 
 @pytest.fixture(scope="function")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Bulk ingest benchmark.
+
+Imports N tagged contexts into a fresh SQLite database and reports contexts
+per second for:
+1. One save_context call per item (the only option before bulk saves)
+2. save_contexts_batch with several chunk sizes
+
+Run: python tests/performance/test_batch_ingest_throughput.py [contexts]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from extended_memory_mcp.core.storage.providers.sqlite.sqlite_provider import (
+    SQLiteStorageProvider,
+)
+
+CHUNK_SIZES = (50, 500, 2000)
+
+
+class BatchIngestBenchmark:
+    def __init__(self, contexts: int = 5000):
+        self.items = [
+            {
+                "content": f"Imported note {i}: " + "lorem ipsum dolor sit amet " * 8,
+                "importance_level": 1 + i % 10,
+                "project_id": f"import{i % 5}",
+                "tags": ["imported", f"topic{i % 25}", f"source{i % 4}"],
+            }
+            for i in range(contexts)
+        ]
+
+    async def bench(self, chunk_size=None) -> float:
+        """Return contexts per second (chunk_size None: one save_context per item)"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            provider = SQLiteStorageProvider(str(Path(temp_dir) / "bench.db"))
+            await provider.initialize()
+
+            start = time.perf_counter()
+            if chunk_size is None:
+                for item in self.items:
+                    await provider.save_context(**item)
+            else:
+                results = await provider.save_contexts_batch(self.items, chunk_size=chunk_size)
+                assert all(r["success"] for r in results)
+            elapsed = time.perf_counter() - start
+
+            await provider.close()
+            return len(self.items) / elapsed
+
+    async def run(self) -> dict:
+        print(f"🚀 Bulk ingest of {len(self.items)} tagged contexts (SQLite)")
+        print("=" * 50)
+
+        baseline = await self.bench()
+        results = {"save_context": baseline}
+        print(f"   save_context per item: {baseline:10,.0f} contexts/s")
+
+        for chunk_size in CHUNK_SIZES:
+            rate = await self.bench(chunk_size)
+            results[f"batch_{chunk_size}"] = rate
+            print(
+                f"   batch, chunk {chunk_size:5d}:   {rate:10,.0f} contexts/s"
+                f" ({rate / baseline:.1f}x)"
+            )
+        return results
+
+
+async def main():
+    contexts = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    await BatchIngestBenchmark(contexts).run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Content compression benchmark.
+
+Stores N long design notes in a fresh SQLite database once per content
+codec and reports:
+1. Compression ratio of the notes and of the database file
+2. CPU cost per context of compressing (save) and decompressing (load)
+3. Full-text search latency, which reads the plain text view for snippets
+
+Run: python tests/performance/test_compression_ratio.py [contexts]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from extended_memory_mcp.core.memory.context_repository import ContextRepository
+from extended_memory_mcp.core.memory.database_manager import DatabaseManager
+from extended_memory_mcp.core.storage.content_codec import ContentCodec, decompress
+
+CODECS = ("none", "zlib", "zstd")
+MIN_BYTES = 1024
+
+WEIGHTS = {
+    "bm25_weight": 1.0,
+    "importance_weight": 0.5,
+    "recency_weight": 0.5,
+    "recency_half_life_days": 30,
+}
+
+
+def make_note(index: int) -> str:
+    """Long design note, repetitive the way real ones are"""
+    sections = [
+        f"## Decision {index}: session cache backend",
+        "Context: sessions outgrew the in-process LRU after the multi-worker rollout.",
+        f"Options considered: Redis cluster, SQLite WAL, sticky sessions (round {index % 7}).",
+        "Chosen: Redis with per-project key prefixes, TTL 30 days, eviction allkeys-lru.",
+        "Consequences: cache misses on deploy, warm-up job added, metrics on hit ratio.",
+        f"Follow-ups: benchmark p99 latency, revisit in sprint {index % 12}.",
+        f"Owner: team-{index % 5}.",
+    ]
+    return "\n".join(sections * 6)
+
+
+class ContentCompressionBenchmark:
+    def __init__(self, contexts: int = 2000):
+        self.notes = [make_note(i) for i in range(contexts)]
+        self.raw_bytes = sum(len(note.encode("utf-8")) for note in self.notes)
+
+    def bench_codec(self, codec: ContentCodec) -> dict:
+        """Ratio and CPU microseconds per note of the codec alone"""
+        start = time.process_time()
+        stored = [codec.compress(note) for note in self.notes]
+        compress = time.process_time() - start
+
+        start = time.process_time()
+        for content, name in stored:
+            decompress(content, name)
+        decompress_time = time.process_time() - start
+
+        stored_bytes = sum(
+            len(content) if name else len(content.encode("utf-8")) for content, name in stored
+        )
+        return {
+            "ratio": self.raw_bytes / stored_bytes,
+            "compress_us": compress / len(self.notes) * 1e6,
+            "decompress_us": decompress_time / len(self.notes) * 1e6,
+        }
+
+    async def bench_database(self, codec: ContentCodec) -> dict:
+        """Database file size and save/load/search timings"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manager = DatabaseManager(str(Path(temp_dir) / "bench.db"))
+            repo = ContextRepository(manager, codec)
+            try:
+                items = [
+                    {"content": note, "importance_level": 5, "project_id": "bench", "tags": []}
+                    for note in self.notes
+                ]
+                start = time.perf_counter()
+                for chunk in range(0, len(items), 500):
+                    await repo.save_contexts_batch(items[chunk : chunk + 500])
+                save = time.perf_counter() - start
+
+                start = time.perf_counter()
+                loaded = await repo.load_contexts("bench", importance_min=1, limit=len(items))
+                load = time.perf_counter() - start
+                assert len(loaded) == len(items)
+
+                start = time.perf_counter()
+                for i in range(50):
+                    await repo.search_contexts_ranked(f'"team-{i % 5}"', WEIGHTS, limit=10)
+                search = (time.perf_counter() - start) / 50
+
+                async with manager.get_connection() as db:
+                    await db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                file_bytes = Path(manager.db_path).stat().st_size
+            finally:
+                await manager.close()
+
+        return {
+            "file_mb": file_bytes / 1e6,
+            "save_s": save,
+            "load_s": load,
+            "search_ms": search * 1e3,
+        }
+
+    async def run(self) -> dict:
+        print(f"🚀 Content compression ({len(self.notes)} notes, {self.raw_bytes / 1e6:.1f} MB)")
+        print("=" * 60)
+
+        results = {}
+        for name in CODECS:
+            try:
+                codec = ContentCodec(name, MIN_BYTES)
+            except ValueError:
+                print(f"   {name:5} not installed")
+                continue
+            results[name] = {**self.bench_codec(codec), **await self.bench_database(codec)}
+            r = results[name]
+            print(
+                f"   {name:5} ratio {r['ratio']:5.1f}x"
+                f"   compress {r['compress_us']:6.1f} µs"
+                f"   decompress {r['decompress_us']:6.1f} µs"
+            )
+            print(
+                f"         file {r['file_mb']:6.2f} MB   save {r['save_s']:.2f}s"
+                f"   load {r['load_s']:.3f}s   ranked search {r['search_ms']:.2f} ms"
+            )
+
+        baseline = results["none"]["file_mb"]
+        for name, r in results.items():
+            if name != "none":
+                print(f"\n🎯 {name}: database file {baseline / r['file_mb']:.1f}x smaller")
+        return results
+
+
+async def main():
+    contexts = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    await ContentCompressionBenchmark(contexts).run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Content search benchmark: LIKE scan versus FTS5 MATCH.
+
+Loads N contexts (default 100k) into a fresh SQLite database and times
+search_contexts_optimized(content_search=...) for missing, rare, common and
+multi-word searches, once through the FTS5 index and once with the LIKE
+fallback the repository uses when FTS5 is unavailable. LIKE only keeps up
+when most rows match, so its scan stops after LIMIT rows.
+
+Run: python tests/performance/test_fts_search.py [contexts]
+"""
+
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from extended_memory_mcp.core.storage.providers.sqlite.sqlite_provider import (
+    SQLiteStorageProvider,
+)
+
+WORDS = (
+    "database index query cache latency schema memory project release deploy "
+    "python sqlite redis context session token vector cluster backup review"
+).split()
+
+SEARCHES = ("kangaroo", "zebrafish", "database", "sqlite latency", "migration plan")
+ROUNDS = 20
+
+
+class FTSSearchBenchmark:
+    def __init__(self, contexts: int = 100_000):
+        rng = random.Random(42)
+        self.items = []
+        for i in range(contexts):
+            words = rng.choices(WORDS, k=30)
+            if i % 1000 == 0:
+                words.append("zebrafish")
+            if i % 50 == 0:
+                words.extend(("migration", "plan"))
+            self.items.append(
+                {
+                    "content": f"Note {i}: " + " ".join(words),
+                    "importance_level": 1 + i % 10,
+                    "project_id": f"project{i % 10}",
+                }
+            )
+
+    async def time_search(self, repo, term: str) -> tuple:
+        """Return (milliseconds per search, result count)"""
+        results = await repo.search_contexts_optimized(content_search=term, limit=20)
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            await repo.search_contexts_optimized(content_search=term, limit=20)
+        return (time.perf_counter() - start) * 1000 / ROUNDS, len(results)
+
+    async def run(self) -> dict:
+        print(f"🚀 Content search over {len(self.items)} contexts (SQLite)")
+        print("=" * 50)
+
+        results = {}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            provider = SQLiteStorageProvider(str(Path(temp_dir) / "bench.db"))
+            await provider.initialize()
+            await provider.save_contexts_batch(self.items, chunk_size=5000)
+
+            repo = provider.context_repo
+            manager = provider.db_manager
+            assert manager.full_text_search, "SQLite was built without FTS5"
+
+            for term in SEARCHES:
+                manager.full_text_search = False
+                like_ms, like_count = await self.time_search(repo, term)
+                manager.full_text_search = True
+                fts_ms, fts_count = await self.time_search(repo, term)
+
+                results[term] = {"like_ms": like_ms, "fts_ms": fts_ms}
+                print(
+                    f"   {term!r:18} LIKE {like_ms:8.2f} ms ({like_count:2d} hits)"
+                    f"   FTS {fts_ms:8.2f} ms ({fts_count:2d} hits)"
+                    f"   {like_ms / fts_ms:6.1f}x"
+                )
+
+            await provider.close()
+        return results
+
+
+async def main():
+    contexts = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    await FTSSearchBenchmark(contexts).run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Group commit benchmark.
+
+Saves contexts with tags through SQLiteStorageProvider from a growing number
+of concurrent callers and reports writes per second for:
+1. One transaction per save (write queue groups of one, previous behaviour)
+2. Group commit (defaults.storage.write_window_ms / write_batch_size)
+
+Both PRAGMA profiles that keep data are measured: balanced (synchronous
+NORMAL, no fsync per commit in WAL mode) and durable (fsync per commit).
+
+Run: python tests/performance/test_group_commit.py [saves] [window_ms] [batch_size]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from extended_memory_mcp.core.memory.pragma_profiles import create_pragma_settings
+from extended_memory_mcp.core.memory.write_queue import (
+    DEFAULT_MAX_BATCH,
+    DEFAULT_WINDOW_MS,
+    WriteQueue,
+)
+from extended_memory_mcp.core.storage.providers.sqlite.sqlite_provider import (
+    SQLiteStorageProvider,
+)
+
+CONCURRENCY = (1, 4, 16, 64)
+
+
+class GroupCommitBenchmark:
+    def __init__(
+        self,
+        saves: int = 1000,
+        window_ms: float = DEFAULT_WINDOW_MS,
+        batch_size: int = DEFAULT_MAX_BATCH,
+    ):
+        self.saves = saves
+        self.window_ms = window_ms
+        self.batch_size = batch_size
+
+    async def bench(self, profile: str, grouped: bool, concurrency: int) -> tuple:
+        """Return (saves per second, saves per commit)"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            provider = SQLiteStorageProvider(str(Path(temp_dir) / "bench.db"))
+            await provider.initialize()
+            db_manager = provider.db_manager
+            await db_manager.pool.close()
+            db_manager.pool.pragmas = create_pragma_settings(profile)
+            if grouped:
+                queue = WriteQueue(db_manager.pool, self.window_ms, self.batch_size)
+            else:
+                queue = WriteQueue(db_manager.pool, window_ms=0, max_batch=1)
+            db_manager.write_queue = queue
+
+            slots = asyncio.Semaphore(concurrency)
+
+            async def save(i):
+                async with slots:
+                    await provider.save_context(
+                        f"Benchmark context {i}",
+                        importance_level=5,
+                        project_id="bench",
+                        tags=["benchmark", f"tag{i % 7}"],
+                    )
+
+            start = time.perf_counter()
+            await asyncio.gather(*(save(i) for i in range(self.saves)))
+            elapsed = time.perf_counter() - start
+
+            await provider.close()
+            return self.saves / elapsed, queue.writes / max(queue.commits, 1)
+
+    async def run(self) -> dict:
+        print(
+            f"🚀 Concurrent saves ({self.saves} per run, window {self.window_ms} ms,"
+            f" groups of up to {self.batch_size})"
+        )
+        print("=" * 50)
+
+        results = {}
+        for profile in ("balanced", "durable"):
+            print(f"   profile {profile}:")
+            for concurrency in CONCURRENCY:
+                single, _ = await self.bench(profile, grouped=False, concurrency=concurrency)
+                grouped, per_commit = await self.bench(
+                    profile, grouped=True, concurrency=concurrency
+                )
+                results[(profile, concurrency)] = {"single_ops": single, "grouped_ops": grouped}
+                print(
+                    f"      {concurrency:3d} callers: commit per save {single:8,.0f} saves/s"
+                    f"   group commit {grouped:8,.0f} saves/s ({grouped / single:.1f}x,"
+                    f" {per_commit:.1f} saves/commit)"
+                )
+        return results
+
+
+async def main():
+    saves = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    window_ms = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_WINDOW_MS
+    batch_size = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_MAX_BATCH
+    await GroupCommitBenchmark(saves, window_ms, batch_size).run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+JSON codec microbenchmark.
+
+Measures encode/decode cost of realistic `load_contexts` payloads for every
+installed JSON backend:
+1. Redis context records (one document per context, as stored by
+   RedisContextService)
+2. The tools/call response carrying the rendered load_contexts text
+
+Run: python tests/performance/test_json_codec_throughput.py [contexts]
+"""
+
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+from extended_memory_mcp.core import json_codec
+from extended_memory_mcp.core.json_codec import BACKENDS, JSONCodec
+from extended_memory_mcp.responses.json_rpc_builder import JSONRPCResponseBuilder
+
+
+def make_context(index: int) -> dict:
+    """Build a context record shaped like the ones stored in Redis"""
+    now = datetime.now(timezone.utc).isoformat()
+    return {
+        "id": str(uuid.uuid4()),
+        "content": (
+            f"Decision #{index}: moved the session cache to Redis — "
+            "eviction by LRU, TTL 30 days, keys prefixed per project. "
+        )
+        * 6,
+        "importance_level": index % 10 + 1,
+        "project_id": "extended-memory-mcp",
+        "tags": ["architecture", "redis", "cache", f"sprint-{index % 12}"],
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def make_tool_response(contexts: list) -> dict:
+    """Build the JSON-RPC response returned by load_contexts"""
+    text = "\n\n".join(
+        f"📝 [{c['importance_level']}] {c['content']}\n🏷️ {', '.join(c['tags'])}" for c in contexts
+    )
+    return JSONRPCResponseBuilder.build_success_response(
+        42, {"content": [{"type": "text", "text": text}]}
+    )
+
+
+class JSONCodecBenchmark:
+    def __init__(self, contexts: int = 50, rounds: int = 200):
+        self.contexts = [make_context(i) for i in range(contexts)]
+        self.response = make_tool_response(self.contexts)
+        self.rounds = rounds
+
+    def bench(self, codec: JSONCodec) -> dict:
+        """Return encode/decode microseconds per load_contexts call"""
+        records = [codec.dumps(c) for c in self.contexts]
+        response = codec.dumps_bytes(self.response)
+
+        start = time.perf_counter()
+        for _ in range(self.rounds):
+            for context in self.contexts:
+                codec.dumps(context)
+            codec.dumps_bytes(self.response)
+        encode = (time.perf_counter() - start) / self.rounds
+
+        start = time.perf_counter()
+        for _ in range(self.rounds):
+            for record in records:
+                codec.loads(record)
+            codec.loads(response)
+        decode = (time.perf_counter() - start) / self.rounds
+
+        return {"encode_us": encode * 1e6, "decode_us": decode * 1e6}
+
+    def run(self) -> dict:
+        print(f"🚀 JSON codec cost per load_contexts call ({len(self.contexts)} contexts)")
+        print("=" * 50)
+
+        results = {}
+        for name in BACKENDS:
+            try:
+                codec = JSONCodec(name)
+            except ValueError:
+                print(f"   {name:8} not installed")
+                continue
+            results[name] = self.bench(codec)
+            print(
+                f"   {name:8} encode {results[name]['encode_us']:8.1f} µs"
+                f"   decode {results[name]['decode_us']:8.1f} µs"
+            )
+
+        active = json_codec.get_json_codec().name
+        baseline = results["json"]
+        if active != "json":
+            total = results[active]["encode_us"] + results[active]["decode_us"]
+            speedup = (baseline["encode_us"] + baseline["decode_us"]) / total
+            print(f"\n🎯 Active backend '{active}' is {speedup:.1f}x the stdlib")
+        else:
+            print("\nℹ️ Only the stdlib backend is available (pip install orjson)")
+        return results
+
+
+def main():
+    contexts = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    JSONCodecBenchmark(contexts).run()
+
+
+if __name__ == "__main__":
+    main()
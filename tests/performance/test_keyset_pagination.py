@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Deep pagination benchmark: LIMIT/OFFSET versus keyset cursors.
+
+Loads N contexts (default 100k) into a fresh SQLite database and times one
+page of 50 at increasing depths, once with ContextRepository.load_contexts
+offset and once with load_contexts_page cursors positioned at the same depth.
+
+Run: python tests/performance/test_keyset_pagination.py [contexts]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from extended_memory_mcp.core.storage.pagination import decode_cursor, encode_cursor
+from extended_memory_mcp.core.storage.providers.sqlite.sqlite_provider import (
+    SQLiteStorageProvider,
+)
+
+PAGE_SIZE = 50
+ROUNDS = 20
+
+
+class KeysetPaginationBenchmark:
+    def __init__(self, contexts: int = 100_000):
+        self.items = [
+            {"content": f"Note {i}", "importance_level": 8, "project_id": "bench"}
+            for i in range(contexts)
+        ]
+
+    async def time_ms(self, load) -> float:
+        await load()
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            await load()
+        return (time.perf_counter() - start) * 1000 / ROUNDS
+
+    async def run(self) -> dict:
+        print(f"🚀 Page of {PAGE_SIZE} at depth, {len(self.items)} contexts (SQLite)")
+        print("=" * 50)
+
+        results = {}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            provider = SQLiteStorageProvider(str(Path(temp_dir) / "bench.db"))
+            await provider.initialize()
+            await provider.save_contexts_batch(self.items, chunk_size=5000)
+            repo = provider.context_repo
+
+            depth = PAGE_SIZE
+            while depth < len(self.items):
+                # Cursor of the context just before this depth
+                previous = await repo.load_contexts(importance_min=1, limit=1, offset=depth - 1)
+                cursor = encode_cursor(previous[0])
+
+                offset_ms = await self.time_ms(
+                    lambda: repo.load_contexts(importance_min=1, limit=PAGE_SIZE, offset=depth)
+                )
+                keyset_ms = await self.time_ms(
+                    lambda: repo.load_contexts(
+                        importance_min=1, limit=PAGE_SIZE + 1, before=decode_cursor(cursor)
+                    )
+                )
+                results[depth] = {"offset_ms": offset_ms, "keyset_ms": keyset_ms}
+                print(
+                    f"   depth {depth:7d}: OFFSET {offset_ms:7.2f} ms"
+                    f"   cursor {keyset_ms:6.2f} ms   {offset_ms / keyset_ms:6.1f}x"
+                )
+                depth *= 10
+
+            await provider.close()
+        return results
+
+
+async def main():
+    contexts = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    await KeysetPaginationBenchmark(contexts).run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Popular tags benchmark: tag_stats top-N read versus the GROUP BY aggregate.
+
+Grows a fresh SQLite database in steps up to N contexts (default 100k), each
+with two of 500 tags, and after every step times get_popular_tags (indexed
+read of the trigger-maintained tag_stats table) against the aggregate query
+it replaced. Latency of the former should stay flat as the data grows.
+
+Run: python tests/performance/test_popular_tags.py [contexts]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from extended_memory_mcp.core.storage.providers.sqlite.sqlite_provider import (
+    SQLiteStorageProvider,
+)
+
+ROUNDS = 20
+TAGS = 500
+
+# get_popular_tags before tag_stats
+AGGREGATE_QUERY = """
+    SELECT t.name, COUNT(ct.context_id) as usage_count, MAX(c.created_at) as latest_use
+    FROM tags t
+    JOIN context_tags ct ON t.id = ct.tag_id
+    JOIN contexts c ON ct.context_id = c.id
+    GROUP BY t.id, t.name
+    HAVING
+        usage_count >= ?
+        OR (usage_count = 1 AND datetime(latest_use) > datetime('now', '-' || ? || ' hours'))
+    ORDER BY usage_count DESC, latest_use DESC
+    LIMIT ?
+"""
+
+
+class PopularTagsBenchmark:
+    def __init__(self, contexts: int = 100_000):
+        self.contexts = contexts
+
+    def items(self, start: int, stop: int) -> list:
+        return [
+            {
+                "content": f"Note {i}",
+                "importance_level": 5,
+                "project_id": f"project-{i % 10}",
+                # Skewed usage: low tag ids are much more popular
+                "tags": [f"tag-{i % 7}", f"tag-{(i * i) % TAGS}"],
+            }
+            for i in range(start, stop)
+        ]
+
+    async def time_ms(self, load) -> float:
+        await load()
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            await load()
+        return (time.perf_counter() - start) * 1000 / ROUNDS
+
+    async def run(self) -> dict:
+        print(f"🚀 Popular tags (top 10) as the database grows to {self.contexts} contexts")
+        print("=" * 50)
+
+        results = {}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            provider = SQLiteStorageProvider(str(Path(temp_dir) / "bench.db"))
+            await provider.initialize()
+            tags_repo = provider.tags_repo
+
+            async def aggregate():
+                async with provider.db_manager.get_connection(readonly=True) as db:
+                    cursor = await db.execute(AGGREGATE_QUERY, (2, 24, 10))
+                    return await cursor.fetchall()
+
+            saved, size = 0, 1000
+            while saved < self.contexts:
+                size = min(size, self.contexts)
+                start = time.perf_counter()
+                await provider.save_contexts_batch(self.items(saved, size), chunk_size=5000)
+                write_ms = (time.perf_counter() - start) * 1000 / (size - saved)
+                saved = size
+
+                stats_ms = await self.time_ms(lambda: tags_repo.get_popular_tags(limit=10))
+                project_ms = await self.time_ms(
+                    lambda: tags_repo.get_popular_tags(limit=10, project_id="project-3")
+                )
+                aggregate_ms = await self.time_ms(aggregate)
+                results[saved] = {
+                    "tag_stats_ms": stats_ms,
+                    "tag_stats_project_ms": project_ms,
+                    "aggregate_ms": aggregate_ms,
+                    "write_ms_per_context": write_ms,
+                }
+                print(
+                    f"   {saved:7d} contexts: tag_stats {stats_ms:6.2f} ms"
+                    f" (project {project_ms:5.2f} ms)   GROUP BY {aggregate_ms:8.2f} ms"
+                    f"   save {write_ms:.3f} ms/context"
+                )
+                size *= 10
+
+            await provider.close()
+        return results
+
+
+async def main():
+    contexts = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    await PopularTagsBenchmark(contexts).run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
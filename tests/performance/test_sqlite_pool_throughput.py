@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+SQLite connection pool benchmark.
+
+Runs a mixed workload through SQLiteStorageProvider (save_context with tags,
+load_contexts, get_popular_tags) and reports operations per second for:
+1. A new aiosqlite connection per repository call (previous behaviour)
+2. The persistent pool (one writer, N readers)
+
+Each variant runs sequentially and with concurrent callers.
+
+Run: python tests/performance/test_sqlite_pool_throughput.py [operations] [concurrency]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import aiosqlite
+
+from extended_memory_mcp.core.storage.providers.sqlite.sqlite_provider import (
+    SQLiteStorageProvider,
+)
+
+
+def use_per_call_connections(provider: SQLiteStorageProvider) -> None:
+    """Make the provider open a fresh connection for every call, as before pooling"""
+    db_path = provider.db_manager.db_path
+    provider.db_manager.pool.connection = lambda readonly=False: aiosqlite.connect(db_path)
+
+
+class SQLitePoolBenchmark:
+    def __init__(self, operations: int = 300, concurrency: int = 8):
+        self.operations = operations
+        self.concurrency = concurrency
+
+    async def operation(self, provider: SQLiteStorageProvider, i: int) -> None:
+        """One save, one load and one tag query"""
+        await provider.save_context(
+            f"Benchmark context {i}",
+            importance_level=5 + i % 5,
+            project_id="bench",
+            tags=["benchmark", f"tag{i % 7}", f"group{i % 3}"],
+        )
+        await provider.load_contexts(project_id="bench", limit=10)
+        await provider.get_popular_tags(limit=10, project_id="bench")
+
+    async def bench(self, pooled: bool, concurrency: int) -> float:
+        """Return operations per second"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            provider = SQLiteStorageProvider(str(Path(temp_dir) / "bench.db"))
+            await provider.initialize()
+            if not pooled:
+                await provider.close()
+                use_per_call_connections(provider)
+
+            slots = asyncio.Semaphore(concurrency)
+
+            async def run(i):
+                async with slots:
+                    await self.operation(provider, i)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(run(i) for i in range(self.operations)))
+            elapsed = time.perf_counter() - start
+
+            await provider.close()
+            return self.operations / elapsed
+
+    async def run(self) -> dict:
+        print(f"🚀 SQLite provider throughput ({self.operations} ops: save + load + tags)")
+        print("=" * 50)
+
+        results = {}
+        for concurrency in (1, self.concurrency):
+            before = await self.bench(pooled=False, concurrency=concurrency)
+            after = await self.bench(pooled=True, concurrency=concurrency)
+            results[concurrency] = {"per_call_ops": before, "pooled_ops": after}
+            print(f"   concurrency {concurrency}:")
+            print(f"      connection per call: {before:8,.0f} ops/s")
+            print(f"      connection pool:     {after:8,.0f} ops/s ({after / before:.1f}x)")
+        return results
+
+
+async def main():
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    await SQLitePoolBenchmark(operations, concurrency).run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+SQLite PRAGMA profile benchmark.
+
+Measures write throughput (save_context with tags, one commit each) and read
+throughput (concurrent load_contexts) through SQLiteStorageProvider for every
+profile in PRAGMA_PROFILES, against SQLite's own defaults (rollback journal,
+synchronous FULL, 2MB cache).
+
+Run: python tests/performance/test_sqlite_pragma_profiles.py [writes] [reads] [concurrency]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from extended_memory_mcp.core.memory.connection_pool import SQLiteConnectionPool
+from extended_memory_mcp.core.memory.pragma_profiles import (
+    PRAGMA_PROFILES,
+    resolve_pragma_settings,
+)
+from extended_memory_mcp.core.storage.providers.sqlite.sqlite_provider import (
+    SQLiteStorageProvider,
+)
+
+# Baseline: only what the server needs to share the file, everything else default
+SQLITE_DEFAULTS = {"journal_mode": "DELETE", "busy_timeout": 30000}
+
+
+class PragmaProfileBenchmark:
+    def __init__(self, writes: int = 500, reads: int = 1000, concurrency: int = 8):
+        self.writes = writes
+        self.reads = reads
+        self.concurrency = concurrency
+
+    async def bench(self, pragmas: dict) -> dict:
+        """Return write and read operations per second for one PRAGMA set"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            provider = SQLiteStorageProvider(str(Path(temp_dir) / "bench.db"))
+            provider.db_manager.pool = SQLiteConnectionPool(
+                provider.db_manager.db_path, readers=4, pragmas=pragmas
+            )
+            await provider.initialize()
+
+            start = time.perf_counter()
+            for i in range(self.writes):
+                await provider.save_context(
+                    f"Benchmark context {i} " + "lorem ipsum " * 20,
+                    importance_level=5 + i % 5,
+                    project_id=f"bench{i % 4}",
+                    tags=["benchmark", f"tag{i % 7}"],
+                )
+            write_elapsed = time.perf_counter() - start
+
+            slots = asyncio.Semaphore(self.concurrency)
+
+            async def read(i):
+                async with slots:
+                    await provider.load_contexts(project_id=f"bench{i % 4}", limit=20)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(read(i) for i in range(self.reads)))
+            read_elapsed = time.perf_counter() - start
+
+            await provider.close()
+            return {
+                "write_ops": self.writes / write_elapsed,
+                "read_ops": self.reads / read_elapsed,
+            }
+
+    async def run(self) -> dict:
+        print(f"🚀 SQLite PRAGMA profiles ({self.writes} writes, {self.reads} reads)")
+        print("=" * 50)
+
+        variants = {"sqlite defaults": SQLITE_DEFAULTS}
+        for name in PRAGMA_PROFILES:
+            variants[name] = resolve_pragma_settings(name)
+
+        results = {}
+        for name, pragmas in variants.items():
+            results[name] = result = await self.bench(pragmas)
+            print(
+                f"   {name:16s} writes {result['write_ops']:8,.0f} ops/s"
+                f"   reads {result['read_ops']:8,.0f} ops/s"
+            )
+        return results
+
+
+async def main():
+    writes = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    reads = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    await PragmaProfileBenchmark(writes, reads, concurrency).run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
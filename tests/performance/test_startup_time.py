@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Cold start benchmark.
+
+Starts the stdio server in a fresh interpreter, sends `initialize` and
+measures the time until the response arrives (interpreter start, imports,
+storage initialization and the first response). Also reports which optional
+heavy dependencies were imported along the way.
+
+The pytest functions at the bottom run the same measurement with a generous
+budget so cold-start regressions fail the test suite.
+
+Run: python tests/performance/test_startup_time.py [runs]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+INITIALIZE = (
+    json.dumps({"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}}) + "\n"
+).encode()
+
+# Dependencies that SQLite deployments should not import before the first response
+LAZY_MODULES = ("jinja2", "redis")
+
+# Initializes the server in-process and reports which lazy modules got imported
+MODULE_PROBE = """
+import asyncio, json, sys
+from extended_memory_mcp.server import MemoryMCPServer
+server = MemoryMCPServer()
+asyncio.run(server.initialize())
+print(json.dumps(sorted(m for m in {modules!r} if m in sys.modules)))
+"""
+
+# Generous cold start budget for CI machines (seconds, median of runs)
+STARTUP_BUDGET = float(os.environ.get("STARTUP_BUDGET_SECONDS", "5.0"))
+
+
+class StartupBenchmark:
+    def __init__(self, runs: int = 5):
+        self.runs = runs
+        # Removed when the benchmark is garbage collected
+        self.temp_dir = tempfile.TemporaryDirectory(prefix="startup-bench-")
+        self.env = dict(
+            os.environ,
+            STORAGE_CONNECTION_STRING=f"sqlite:///{Path(self.temp_dir.name) / 'memory.db'}",
+            LOG_LEVEL="ERROR",
+        )
+
+    def time_to_initialize(self) -> float:
+        """Seconds from process launch to the initialize response"""
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "extended_memory_mcp.server"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=self.env,
+        )
+        try:
+            process.stdin.write(INITIALIZE)
+            process.stdin.flush()
+            line = process.stdout.readline()
+            elapsed = time.perf_counter() - start
+        finally:
+            process.stdin.close()
+            process.wait(timeout=30)
+            process.stdout.close()
+
+        assert json.loads(line)["id"] == 1, f"unexpected response: {line!r}"
+        return elapsed
+
+    def loaded_lazy_modules(self) -> list:
+        """Lazy dependencies imported by a SQLite server after initialize"""
+        output = subprocess.run(
+            [sys.executable, "-c", MODULE_PROBE.format(modules=LAZY_MODULES)],
+            capture_output=True,
+            env=self.env,
+            timeout=60,
+            check=True,
+        ).stdout
+        return json.loads(output.splitlines()[-1])
+
+    def run(self):
+        print(f"🚀 Cold start: launch to first initialize response ({self.runs} runs)")
+        print("=" * 50)
+
+        # First run warms the database file and the bytecode cache
+        self.time_to_initialize()
+        timings = [self.time_to_initialize() for _ in range(self.runs)]
+        median = statistics.median(timings)
+        print(f"   median: {median * 1000:.0f} ms")
+        print(f"   min:    {min(timings) * 1000:.0f} ms")
+        print(f"   max:    {max(timings) * 1000:.0f} ms")
+
+        loaded = self.loaded_lazy_modules()
+        print(f"\n📦 Lazy dependencies imported (SQLite): {', '.join(loaded) or 'none'}")
+        return {"median_seconds": median, "timings": timings, "loaded_lazy_modules": loaded}
+
+
+def test_sqlite_startup_skips_lazy_dependencies():
+    """jinja2 and redis are not imported until something needs them"""
+    assert StartupBenchmark().loaded_lazy_modules() == []
+
+
+def test_startup_within_budget():
+    """Launch to first initialize response stays within the cold start budget"""
+    benchmark = StartupBenchmark(runs=3)
+    benchmark.time_to_initialize()
+    median = statistics.median(benchmark.time_to_initialize() for _ in range(benchmark.runs))
+    assert median < STARTUP_BUDGET, f"cold start took {median:.2f}s (budget {STARTUP_BUDGET}s)"
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    StartupBenchmark(runs).run()
+
+
+if __name__ == "__main__":
+    main()
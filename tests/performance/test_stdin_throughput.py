@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Stdin loop throughput microbenchmark.
+
+Pushes a burst of small JSON-RPC messages through a pipe and measures
+messages per second for:
+1. run_in_executor(readline) per line (previous main loop)
+2. StdinReader (asyncio StreamReader attached with connect_read_pipe)
+
+Both variants parse each line and hand it to the RequestDispatcher with a
+no-op handler, so the numbers reflect the read/dispatch loop only.
+
+Run: python tests/performance/test_stdin_throughput.py [messages]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+
+from extended_memory_mcp.protocol.request_dispatcher import RequestDispatcher
+from extended_memory_mcp.protocol.stdin_reader import StdinReader
+
+MESSAGE = (
+    json.dumps({"jsonrpc": "2.0", "id": 1, "method": "tools/list", "params": {}}) + "\n"
+).encode()
+
+
+class NullResponseBuilder:
+    """Response builder that discards responses"""
+
+    @staticmethod
+    def send_response(response):
+        pass
+
+    @staticmethod
+    async def wait_writable():
+        pass
+
+
+async def noop_handler(method, params, request_id):
+    return {}
+
+
+def start_writer(write_fd: int, count: int) -> threading.Thread:
+    """Write `count` messages into the pipe from a background thread"""
+
+    def write():
+        payload = MESSAGE * count
+        view = memoryview(payload)
+        while view:
+            written = os.write(write_fd, view[:65536])
+            view = view[written:]
+        os.close(write_fd)
+
+    thread = threading.Thread(target=write, daemon=True)
+    thread.start()
+    return thread
+
+
+class StdinThroughputBenchmark:
+    def __init__(self, count: int = 20000):
+        self.count = count
+
+    def _dispatcher(self) -> RequestDispatcher:
+        return RequestDispatcher(noop_handler, response_builder=NullResponseBuilder)
+
+    async def bench_executor_readline(self) -> float:
+        """Previous loop: one thread pool hop per line"""
+        read_fd, write_fd = os.pipe()
+        stream = os.fdopen(read_fd, "r")
+        dispatcher = self._dispatcher()
+        loop = asyncio.get_running_loop()
+
+        writer = start_writer(write_fd, self.count)
+        start = time.perf_counter()
+        handled = 0
+        while True:
+            line = await loop.run_in_executor(None, stream.readline)
+            if not line:
+                break
+            await dispatcher.dispatch(json.loads(line))
+            handled += 1
+        await dispatcher.drain()
+        elapsed = time.perf_counter() - start
+
+        writer.join()
+        stream.close()
+        assert handled == self.count
+        return handled / elapsed
+
+    async def bench_stream_reader(self) -> float:
+        """New loop: StreamReader on the event loop"""
+        read_fd, write_fd = os.pipe()
+        stream = os.fdopen(read_fd, "rb", buffering=0)
+        reader = StdinReader(max_line_bytes=10 * 1024 * 1024, stream=stream)
+        await reader.start()
+        dispatcher = self._dispatcher()
+
+        writer = start_writer(write_fd, self.count)
+        start = time.perf_counter()
+        handled = 0
+        while True:
+            line = await reader.readline()
+            if line is None:
+                break
+            await dispatcher.dispatch(json.loads(line))
+            handled += 1
+        await dispatcher.drain()
+        elapsed = time.perf_counter() - start
+
+        writer.join()
+        reader.close()
+        stream.close()
+        assert handled == self.count
+        return handled / elapsed
+
+    async def run(self):
+        print(f"🚀 Stdin loop throughput ({self.count} messages)")
+        print("=" * 50)
+
+        executor_rate = await self.bench_executor_readline()
+        print(f"   run_in_executor(readline): {executor_rate:,.0f} msg/s")
+
+        reader_rate = await self.bench_stream_reader()
+        print(f"   StdinReader:               {reader_rate:,.0f} msg/s")
+
+        print(f"\n🎯 StdinReader is {reader_rate / executor_rate:.1f}x the executor loop")
+        return {"executor_msgs_per_sec": executor_rate, "reader_msgs_per_sec": reader_rate}
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    await StdinThroughputBenchmark(count).run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Tests for bulk context saving
+
+Tests save_contexts_batch on the SQLite and Redis providers (validation,
+chunking, per-item results) and the save_contexts_batch MCP tool.
+"""
+
+import logging
+import tempfile
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytest_asyncio
+
+from extended_memory_mcp.core.storage.storage_utils import validate_batch_item
+from extended_memory_mcp.core.storage.providers.redis.redis_provider import RedisStorageProvider
+from extended_memory_mcp.core.storage.providers.sqlite.sqlite_provider import (
+    SQLiteStorageProvider,
+)
+from extended_memory_mcp.formatters.summary_formatter import ContextSummaryFormatter
+from extended_memory_mcp.tools.memory_tools import MemoryToolsHandler
+
+
+class TestSQLiteBatchSave:
+    """Test suite for SQLiteStorageProvider.save_contexts_batch"""
+
+    @pytest_asyncio.fixture
+    async def provider(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            provider = SQLiteStorageProvider(str(Path(temp_dir) / "batch.db"))
+            await provider.initialize()
+            yield provider
+            await provider.close()
+
+    def test_validate_batch_item_fills_defaults(self):
+        item = validate_batch_item({"content": "note"})
+        assert item == {"content": "note", "importance_level": 5, "project_id": None, "tags": []}
+
+    @pytest.mark.asyncio
+    async def test_results_follow_input_order(self, provider):
+        items = [
+            {"content": "first", "importance_level": 8, "project_id": "p", "tags": ["A", "b"]},
+            {"content": "   "},
+            {"content": "second", "importance_level": 11},
+            "not an object",
+            {"content": "third", "project_id": "p", "tags": ["b"]},
+        ]
+
+        results = await provider.save_contexts_batch(items, chunk_size=2)
+
+        assert [r["index"] for r in results] == [0, 1, 2, 3, 4]
+        assert [r["success"] for r in results] == [True, False, False, False, True]
+        assert "content" in results[1]["error"]
+        assert "importance_level" in results[2]["error"]
+
+        saved = await provider.load_contexts_by_ids([results[0]["context_id"]])
+        assert saved[0]["content"] == "first"
+        assert saved[0]["tags"] == ["a", "b"]
+
+        contexts = await provider.load_contexts(project_id="p")
+        assert {c["content"] for c in contexts} == {"first", "third"}
+
+    @pytest.mark.asyncio
+    async def test_ids_match_contents_across_chunks(self, provider):
+        await provider.save_context("existing", 5, "p")
+        items = [{"content": f"note {i}", "tags": [f"t{i % 3}"]} for i in range(25)]
+
+        results = await provider.save_contexts_batch(items, chunk_size=7)
+
+        assert all(r["success"] for r in results)
+        loaded = await provider.load_contexts_by_ids([r["context_id"] for r in results])
+        by_id = {str(c["id"]): c for c in loaded}
+        for i, result in enumerate(results):
+            assert by_id[result["context_id"]]["content"] == f"note {i}"
+            assert by_id[result["context_id"]]["tags"] == [f"t{i % 3}"]
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_does_not_stop_others(self, provider):
+        original = provider.context_repo.save_contexts_batch
+        calls = []
+
+        async def flaky(chunk):
+            calls.append(len(chunk))
+            if len(calls) == 2:
+                raise RuntimeError("disk full")
+            return await original(chunk)
+
+        provider.context_repo.save_contexts_batch = flaky
+        results = await provider.save_contexts_batch(
+            [{"content": f"note {i}"} for i in range(5)], chunk_size=2
+        )
+
+        assert calls == [2, 2, 1]
+        assert [r["success"] for r in results] == [True, True, False, False, True]
+        assert "disk full" in results[2]["error"]
+        assert await provider.context_repo.count_contexts() == 3
+
+
+class TestRedisBatchSave:
+    """Test suite for RedisStorageProvider.save_contexts_batch (mocked Redis)"""
+
+    @pytest.fixture
+    def provider(self):
+        with patch("redis.asyncio.Redis"):
+            provider = RedisStorageProvider(key_prefix="test", ttl_hours=1)
+
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[])
+        mock_redis = MagicMock()
+        mock_redis.pipeline.return_value = pipe
+
+        async def get_connection():
+            return mock_redis
+
+        provider.connection_service.get_connection = get_connection
+        provider._mock_redis = mock_redis
+        provider._pipe = pipe
+        return provider
+
+    @pytest.mark.asyncio
+    async def test_one_pipeline_round_trip_per_chunk(self, provider):
+        items = [{"content": f"note {i}", "project_id": "p", "tags": ["x"]} for i in range(5)]
+
+        results = await provider.save_contexts_batch(items + [{"content": ""}], chunk_size=2)
+
+        assert [r["success"] for r in results] == [True] * 5 + [False]
+        assert provider._pipe.execute.await_count == 3
+        provider._mock_redis.pipeline.assert_called_with(transaction=True)
+        assert provider._pipe.set.call_count == 5
+        # Project and tag lists, once per context
+        assert provider._pipe.lpush.call_count == 10
+        assert len({r["context_id"] for r in results[:5]}) == 5
+
+    @pytest.mark.asyncio
+    async def test_failed_pipeline_marks_its_chunk(self, provider):
+        provider._pipe.execute.side_effect = [[], ConnectionError("reset"), []]
+
+        results = await provider.save_contexts_batch(
+            [{"content": f"note {i}"} for i in range(5)], chunk_size=2
+        )
+
+        assert [r["success"] for r in results] == [True, True, False, False, True]
+        assert "reset" in results[3]["error"]
+
+
+class TestSaveContextsBatchTool:
+    """Test suite for the save_contexts_batch MCP tool"""
+
+    @pytest_asyncio.fixture
+    async def handler(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            provider = SQLiteStorageProvider(str(Path(temp_dir) / "tool.db"))
+            await provider.initialize()
+            yield MemoryToolsHandler(
+                provider, ContextSummaryFormatter(), logging.getLogger("test")
+            )
+            await provider.close()
+
+    @pytest.mark.asyncio
+    async def test_tool_reports_each_item(self, handler):
+        result = await handler.execute_tool(
+            "save_contexts_batch",
+            {
+                "contexts": [
+                    {"content": "imported", "tags": ["import"]},
+                    {"content": "other project", "project_id": "other"},
+                    {"importance_level": 3},
+                ],
+                "project_id": "notes",
+            },
+        )
+
+        text = result["content"][0]["text"]
+        assert "Saved 2 of 3 contexts" in text
+        assert "[0] saved as" in text
+        assert "[2] ❌ content must be a non-empty string" in text
+
+        provider = handler.storage_provider
+        assert [c["content"] for c in await provider.load_contexts(project_id="notes")] == [
+            "imported"
+        ]
+        assert len(await provider.load_contexts(project_id="other")) == 1
+
+    @pytest.mark.asyncio
+    async def test_tool_rejects_bad_project_id_per_item(self, handler):
+        result = await handler.execute_tool(
+            "save_contexts_batch",
+            {"contexts": [{"content": "bad", "project_id": 42}, {"content": "good"}]},
+        )
+
+        text = result["content"][0]["text"]
+        assert "Saved 1 of 2 contexts" in text
+        assert "[0] ❌ project_id must be a string" in text
+        assert "[1] saved as" in text
+
+    @pytest.mark.asyncio
+    async def test_tool_rejects_non_list(self, handler):
+        result = await handler.execute_tool("save_contexts_batch", {"contexts": "oops"})
+        assert "must be a list" in result["content"][0]["text"]
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Tests for SQLite Connection Pool
+
+Tests connection reuse, reader/writer separation, connection reset between
+leases and shutdown through SQLiteStorageProvider.close().
+"""
+
+import asyncio
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+from extended_memory_mcp.core.memory.connection_pool import SQLiteConnectionPool
+from extended_memory_mcp.core.storage.providers.sqlite.sqlite_provider import (
+    SQLiteStorageProvider,
+)
+
+
+class TestSQLiteConnectionPool:
+    """Test suite for SQLiteConnectionPool"""
+
+    @pytest.fixture
+    def db_path(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield str(Path(temp_dir) / "pool.db")
+
+    @pytest_asyncio.fixture
+    async def pool(self, db_path):
+        pool = SQLiteConnectionPool(db_path, readers=2)
+        async with pool.connection() as db:
+            await db.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+            await db.commit()
+        yield pool
+        await pool.close()
+
+    async def test_writer_is_reused_with_pragmas(self, pool):
+        """Test that writes share one connection with PRAGMAs applied once"""
+        async with pool.connection() as first:
+            pass
+        async with pool.connection() as second:
+            cursor = await second.execute("PRAGMA foreign_keys")
+            foreign_keys = (await cursor.fetchone())[0]
+            cursor = await second.execute("PRAGMA journal_mode")
+            journal_mode = (await cursor.fetchone())[0]
+
+        assert first is second
+        assert foreign_keys == 1
+        assert journal_mode == "wal"
+
+    async def test_readers_are_read_only(self, pool):
+        """Test that reader connections reject writes"""
+        async with pool.connection(readonly=True) as db:
+            with pytest.raises(sqlite3.OperationalError):
+                await db.execute("INSERT INTO items (name) VALUES ('x')")
+
+    async def test_concurrent_readers_capped(self, pool):
+        """Test that concurrent readers get separate connections up to the limit"""
+        leased = []
+        peak = 0
+
+        async def read():
+            nonlocal peak
+            async with pool.connection(readonly=True) as db:
+                leased.append(db)
+                peak = max(peak, len(leased))
+                await asyncio.sleep(0.02)
+                await db.execute("SELECT COUNT(*) FROM items")
+                leased.remove(db)
+
+        await asyncio.gather(*(read() for _ in range(6)))
+
+        assert peak == 2
+        assert pool.open_connections == 3  # writer + 2 readers
+
+    async def test_reader_sees_committed_writes(self, pool):
+        """Test read-after-write across writer and reader connections"""
+        async with pool.connection() as db:
+            await db.execute("INSERT INTO items (name) VALUES ('saved')")
+            await db.commit()
+
+        async with pool.connection(readonly=True) as db:
+            cursor = await db.execute("SELECT name FROM items")
+            assert await cursor.fetchall() == [("saved",)]
+
+    async def test_uncommitted_work_rolled_back_on_release(self, pool):
+        """Test that a lease ending mid-transaction does not leak into the next one"""
+        with pytest.raises(RuntimeError):
+            async with pool.connection() as db:
+                await db.execute("INSERT INTO items (name) VALUES ('lost')")
+                raise RuntimeError("caller failed before commit")
+
+        async with pool.connection() as db:
+            assert not db.in_transaction
+            cursor = await db.execute("SELECT COUNT(*) FROM items")
+            assert (await cursor.fetchone())[0] == 0
+
+    async def test_memory_database_uses_writer_for_reads(self):
+        """Test that :memory: pools never open separate readers"""
+        pool = SQLiteConnectionPool(":memory:", readers=4)
+        async with pool.connection() as writer:
+            await writer.execute("CREATE TABLE t (x)")
+        async with pool.connection(readonly=True) as reader:
+            await reader.execute("SELECT * FROM t")
+
+        assert reader is writer
+        await pool.close()
+
+    async def test_close_and_reopen(self, pool):
+        """Test that close() closes every connection and the pool reopens on use"""
+        async with pool.connection(readonly=True):
+            pass
+        assert pool.open_connections == 2
+
+        await pool.close()
+        assert pool.open_connections == 0
+
+        async with pool.connection(readonly=True) as db:
+            cursor = await db.execute("SELECT COUNT(*) FROM items")
+            assert (await cursor.fetchone())[0] == 0
+
+    async def test_provider_close_closes_pool(self, db_path):
+        """Test that SQLiteStorageProvider.close() shuts the pool down"""
+        provider = SQLiteStorageProvider(db_path)
+        await provider.initialize()
+        await provider.save_context("pooled", importance_level=5, project_id="p")
+        await provider.load_contexts(project_id="p")
+        assert provider.db_manager.pool.open_connections >= 2
+
+        await provider.close()
+
+        assert provider.db_manager.pool.open_connections == 0
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Tests for transparent content compression
+
+Tests the content codec, compressed rows in SQLite (full-text search
+included) and compressed context JSON in Redis (against a stand-in).
+"""
+
+import sqlite3
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import aiosqlite
+import pytest
+import pytest_asyncio
+
+from extended_memory_mcp.core.errors import ConfigurationError, StorageError
+from extended_memory_mcp.core.memory.context_repository import ContextRepository
+from extended_memory_mcp.core.memory.database_manager import DatabaseManager
+from extended_memory_mcp.core.memory.migrations import MIGRATIONS, apply_migrations
+from extended_memory_mcp.core.storage import content_codec
+from extended_memory_mcp.core.storage.content_codec import (
+    ContentCodec,
+    create_content_codec,
+    decompress,
+    decompress_text,
+)
+from extended_memory_mcp.core.storage.providers.redis.redis_provider import RedisStorageProvider
+
+# Compressible note well above the threshold used below
+LONG_NOTE = "Design note: the ingest pipeline batches writes per project. " * 40
+
+
+class TestContentCodec:
+    """Test suite for ContentCodec"""
+
+    def test_disabled_keeps_text(self):
+        assert ContentCodec("none").compress(LONG_NOTE) == (LONG_NOTE, None)
+
+    def test_long_content_round_trips(self):
+        stored, codec = ContentCodec("zlib", min_bytes=100).compress(LONG_NOTE)
+        assert codec == "zlib"
+        assert isinstance(stored, bytes) and len(stored) < len(LONG_NOTE) / 4
+        assert decompress(stored, codec) == LONG_NOTE
+
+    def test_short_or_incompressible_content_stays_text(self):
+        codec = ContentCodec("zlib", min_bytes=100)
+        assert codec.compress("short") == ("short", None)
+        # Past the threshold, but zlib's framing outweighs any saving
+        assert ContentCodec("zlib", min_bytes=1).compress("abc") == ("abc", None)
+
+    def test_text_form_round_trips(self):
+        stored, codec = ContentCodec("zlib", min_bytes=100).compress_text(LONG_NOTE)
+        assert codec == "zlib" and isinstance(stored, str)
+        assert decompress_text(stored, codec) == LONG_NOTE
+        assert decompress_text("plain", None) == "plain"
+
+    def test_auto_prefers_installed_zstd(self):
+        expected = "zstd" if content_codec.zstandard is not None else "zlib"
+        assert ContentCodec("auto").name == expected
+
+    def test_missing_zstd_falls_back_to_zlib(self):
+        with patch.object(content_codec, "zstandard", None):
+            assert create_content_codec("zstd", 100).name == "zlib"
+            with pytest.raises(StorageError):
+                decompress(b"\x28\xb5\x2f\xfd", "zstd")
+
+    def test_invalid_settings_raise(self):
+        with pytest.raises(ConfigurationError):
+            create_content_codec("gzip", 100)
+        with pytest.raises(ConfigurationError):
+            create_content_codec("zlib", "large")
+        with pytest.raises(StorageError):
+            decompress(b"", "lz4")
+
+    def test_default_is_disabled(self):
+        assert create_content_codec().name is None
+
+
+class TestSQLiteCompression:
+    """Test suite for compressed rows in ContextRepository"""
+
+    @pytest.fixture
+    def db_path(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield str(Path(temp_dir) / "compression.db")
+
+    @pytest_asyncio.fixture
+    async def manager(self, db_path):
+        manager = DatabaseManager(db_path)
+        yield manager
+        await manager.close()
+
+    @pytest_asyncio.fixture
+    async def repo(self, manager):
+        return ContextRepository(manager, ContentCodec("zlib", min_bytes=100))
+
+    def stored(self, db_path, context_id):
+        conn = sqlite3.connect(db_path)
+        try:
+            return conn.execute(
+                "SELECT content, content_codec FROM contexts WHERE id = ?", (context_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+
+    async def test_long_content_is_stored_compressed(self, repo, db_path):
+        long_id = await repo.save_context(LONG_NOTE, 5, project_id="p")
+        short_id = await repo.save_context("short note", 5, project_id="p")
+
+        content, codec = self.stored(db_path, long_id)
+        assert codec == "zlib" and isinstance(content, bytes)
+        assert len(content) < len(LONG_NOTE) / 4
+        assert self.stored(db_path, short_id) == ("short note", None)
+
+        assert (await repo.get_context_by_id(long_id))["content"] == LONG_NOTE
+        loaded = await repo.load_contexts(project_id="p", importance_min=1)
+        assert [c["content"] for c in loaded] == ["short note", LONG_NOTE]
+
+    async def test_batch_compresses_each_item(self, repo, db_path):
+        ids = await repo.save_contexts_batch(
+            [
+                {"content": LONG_NOTE, "importance_level": 5, "project_id": "p", "tags": []},
+                {"content": "tiny", "importance_level": 5, "project_id": "p", "tags": []},
+            ]
+        )
+        assert self.stored(db_path, ids[0])[1] == "zlib"
+        assert self.stored(db_path, ids[1]) == ("tiny", None)
+        loaded = await repo.load_contexts_by_ids(ids)
+        assert sorted(c["content"] for c in loaded) == sorted([LONG_NOTE, "tiny"])
+
+    async def test_full_text_search_indexes_plain_text(self, repo, manager):
+        if not await manager.ensure_database() or not manager.full_text_search:
+            pytest.skip("SQLite built without FTS5")
+        context_id = await repo.save_context(LONG_NOTE + " zeppelin", 5, project_id="p")
+        await repo.save_context("unrelated", 5, project_id="p")
+
+        results = await repo.search_contexts_optimized(content_search="zeppelin ingest")
+        assert [r["id"] for r in results] == [context_id]
+        assert results[0]["content"].endswith("zeppelin")
+
+        weights = {
+            "bm25_weight": 1.0,
+            "importance_weight": 0.5,
+            "recency_weight": 0.5,
+            "recency_half_life_days": 30,
+        }
+        hits = await repo.search_contexts_ranked('"zeppelin"', weights)
+        assert [hit["id"] for hit in hits] == [context_id]
+        assert "**zeppelin**" in hits[0]["snippet"]
+
+        assert await repo.delete_context(context_id) is True
+        assert await repo.search_contexts_optimized(content_search="zeppelin") == []
+
+    async def test_like_fallback_reads_plain_text(self, repo):
+        context_id = await repo.save_context(LONG_NOTE + " a-b", 5)
+        # No searchable words: the LIKE path
+        results = await repo.search_contexts_optimized(content_search="-b")
+        assert [r["id"] for r in results] == [context_id]
+
+    async def test_migration_keeps_existing_index(self, db_path):
+        async with aiosqlite.connect(db_path) as db:
+            await apply_migrations(db, MIGRATIONS[:7])
+            await db.execute(
+                "INSERT INTO contexts (content, importance_level) VALUES ('written before', 5)"
+            )
+            await db.commit()
+            await apply_migrations(db)
+
+        manager = DatabaseManager(db_path)
+        try:
+            repo = ContextRepository(manager, ContentCodec("zlib", min_bytes=100))
+            if not await manager.ensure_database() or not manager.full_text_search:
+                pytest.skip("SQLite built without FTS5")
+            results = await repo.search_contexts_optimized(content_search="before")
+            assert [r["content"] for r in results] == ["written before"]
+        finally:
+            await manager.close()
+
+
+class FakeRedis:
+    """Just enough of redis.asyncio for saving and reading contexts"""
+
+    def __init__(self):
+        self.strings = {}
+
+    async def set(self, key, value, ex=None):
+        self.strings[key] = value
+
+    async def get(self, key):
+        return self.strings.get(key)
+
+    async def mget(self, keys):
+        return [self.strings.get(key) for key in keys]
+
+    async def zadd(self, key, mapping):
+        pass
+
+    async def lpush(self, key, value):
+        pass
+
+    async def expire(self, key, seconds):
+        pass
+
+
+class TestRedisCompression:
+    """Test suite for compressed context JSON in RedisContextService"""
+
+    @pytest.fixture
+    def provider(self):
+        with patch("redis.asyncio.Redis"):
+            provider = RedisStorageProvider(key_prefix="test", ttl_hours=1)
+
+        fake = FakeRedis()
+
+        async def get_connection():
+            return fake
+
+        provider.connection_service.get_connection = get_connection
+        provider.context_service.content_codec = ContentCodec("zlib", min_bytes=100)
+        provider._fake = fake
+        return provider
+
+    def stored(self, provider, context_id):
+        from extended_memory_mcp.core import json_codec
+
+        return json_codec.loads(provider._fake.strings[f"test:context:{context_id}"])
+
+    async def test_long_content_is_stored_compressed(self, provider):
+        context_id = await provider.save_context(LONG_NOTE, 5, project_id="p")
+
+        data = self.stored(provider, context_id)
+        assert data["content_codec"] == "zlib"
+        assert len(data["content"]) < len(LONG_NOTE) / 2
+
+        context = await provider.load_context(context_id)
+        assert context["content"] == LONG_NOTE
+        assert "content_codec" not in context
+        loaded = await provider.context_service.load_contexts_by_ids([context_id])
+        assert loaded[0]["content"] == LONG_NOTE
+
+    async def test_update_recompresses_content(self, provider):
+        context_id = await provider.save_context(LONG_NOTE, 5, project_id="p")
+
+        assert await provider.context_service.update_context(context_id, content="now short")
+        assert "content_codec" not in self.stored(provider, context_id)
+        assert (await provider.load_context(context_id))["content"] == "now short"
+
+        assert await provider.context_service.update_context(context_id, content=LONG_NOTE)
+        assert self.stored(provider, context_id)["content_codec"] == "zlib"
+        assert (await provider.load_context(context_id))["content"] == LONG_NOTE
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Tests for Daemon Mode
+
+Tests the Unix socket daemon: per-connection sessions over a shared server,
+session-scoped current_project, socket ownership, idle shutdown and the
+stdio shim.
+"""
+
+import asyncio
+import json
+import os
+import stat
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+
+from extended_memory_mcp.core.errors import ConfigurationError
+from extended_memory_mcp.daemon import MemoryMCPDaemon, get_daemon_socket_path, spawn_daemon
+from extended_memory_mcp.server import MemoryMCPServer
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="Unix sockets required")
+
+
+class DaemonClient:
+    """Line-oriented JSON-RPC client for the daemon socket"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, socket_path):
+        return cls(*await asyncio.open_unix_connection(socket_path))
+
+    async def send(self, message):
+        self.writer.write(json.dumps(message).encode() + b"\n")
+        await self.writer.drain()
+
+    async def receive(self):
+        line = await asyncio.wait_for(self.reader.readline(), timeout=5)
+        return json.loads(line)
+
+    async def request(self, request_id, method, params=None):
+        await self.send(
+            {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}}
+        )
+        return await self.receive()
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+class TestMemoryMCPDaemon:
+    """Test suite for MemoryMCPDaemon"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        # Short path: Unix socket paths are limited to ~100 bytes
+        with tempfile.TemporaryDirectory(dir="/tmp") as temp_dir:
+            yield temp_dir
+
+    @pytest_asyncio.fixture
+    async def server(self, temp_dir):
+        """Create initialized server with temporary SQLite database"""
+        env = {"STORAGE_CONNECTION_STRING": f"sqlite:///{Path(temp_dir) / 'memory.db'}"}
+        with patch.dict(os.environ, env):
+            server = MemoryMCPServer()
+            await server.initialize()
+            yield server
+            await server.close()
+
+    @pytest_asyncio.fixture
+    async def daemon(self, server, temp_dir):
+        """Create started daemon on a temporary socket"""
+        daemon = MemoryMCPDaemon(server, os.path.join(temp_dir, "d.sock"), idle_timeout=0)
+        await daemon.start()
+        yield daemon
+        await daemon.close()
+
+    async def wait_for_sessions(self, daemon, count):
+        for _ in range(100):
+            if daemon.active_sessions == count:
+                return
+            await asyncio.sleep(0.01)
+        raise AssertionError(f"expected {count} sessions, got {daemon.active_sessions}")
+
+    async def test_clients_share_server(self, daemon):
+        """Test that several clients are served concurrently by one daemon"""
+        first = await DaemonClient.connect(daemon.socket_path)
+        second = await DaemonClient.connect(daemon.socket_path)
+
+        init = await first.request(1, "initialize")
+        tools = await second.request(1, "tools/list")
+
+        assert init["result"]["protocolVersion"] == "2024-11-05"
+        assert len(tools["result"]["tools"]) >= 5
+        await self.wait_for_sessions(daemon, 2)
+
+        await first.close()
+        await second.close()
+        await self.wait_for_sessions(daemon, 0)
+
+    async def test_current_project_is_session_scoped(self, daemon, server):
+        """Test that each connection keeps its own current_project"""
+        alpha = await DaemonClient.connect(daemon.socket_path)
+        beta = await DaemonClient.connect(daemon.socket_path)
+        await alpha.request(1, "initialize")
+        await beta.request(1, "initialize")
+        await self.wait_for_sessions(daemon, 2)
+
+        first_session, second_session = daemon.sessions.values()
+        first_session.current_project = "alpha"
+        second_session.current_project = "beta"
+
+        for client in (alpha, beta):
+            response = await client.request(
+                2,
+                "tools/call",
+                {
+                    "name": "save_context",
+                    "arguments": {"content": "decision", "importance_level": 7},
+                },
+            )
+            assert "error" not in response
+
+        projects = await server.storage_provider.list_all_projects_global()
+        assert {p["id"] for p in projects} >= {"alpha", "beta"}
+        assert server.tools_handler.current_project is None
+
+        await alpha.close()
+        await beta.close()
+
+    async def test_invalid_json_answered_per_session(self, daemon):
+        """Test that protocol errors go only to the client that sent them"""
+        client = await DaemonClient.connect(daemon.socket_path)
+        client.writer.write(b"{broken\n")
+        response = await client.receive()
+        assert response["error"]["code"] == -32700
+        await client.close()
+
+    async def test_live_socket_is_not_replaced(self, daemon, server):
+        """Test that a second daemon refuses a socket that is in use"""
+        other = MemoryMCPDaemon(server, daemon.socket_path, idle_timeout=0)
+        with pytest.raises(ConfigurationError):
+            await other.start()
+
+    async def test_stale_socket_is_replaced(self, server, temp_dir):
+        """Test that a leftover socket file from a dead daemon is removed"""
+        socket_path = os.path.join(temp_dir, "stale.sock")
+        first = MemoryMCPDaemon(server, socket_path, idle_timeout=0)
+        await first.start()
+        first._listener.close()
+        await first._listener.wait_closed()
+        first._listener = None
+        # asyncio leaves the file behind once the listener is gone
+        if not os.path.exists(socket_path):
+            Path(socket_path).touch()
+
+        second = MemoryMCPDaemon(server, socket_path, idle_timeout=0)
+        await second.start()
+        client = await DaemonClient.connect(socket_path)
+        assert (await client.request(1, "tools/list"))["id"] == 1
+        await client.close()
+        await second.close()
+
+    async def test_socket_is_private(self, daemon):
+        """Test that the socket and its lock file are accessible to the owner only"""
+        assert stat.S_IMODE(os.stat(daemon.socket_path).st_mode) == 0o600
+        assert stat.S_IMODE(os.stat(f"{daemon.socket_path}.lock").st_mode) == 0o600
+
+    async def test_concurrent_starts_bind_once(self, server, temp_dir):
+        """Test that of two daemons started at once, only one binds the socket"""
+        socket_path = os.path.join(temp_dir, "race.sock")
+        daemons = [MemoryMCPDaemon(server, socket_path, idle_timeout=0) for _ in range(2)]
+
+        results = await asyncio.gather(*(d.start() for d in daemons), return_exceptions=True)
+
+        assert sum(isinstance(r, ConfigurationError) for r in results) == 1
+        for d in daemons:
+            await d.close()
+
+    async def test_replaced_daemon_keeps_new_socket(self, server, temp_dir):
+        """Test that closing a daemon whose socket was taken over leaves the new one"""
+        socket_path = os.path.join(temp_dir, "taken.sock")
+        first = MemoryMCPDaemon(server, socket_path, idle_timeout=0)
+        await first.start()
+        first._listener.close()
+        await first._listener.wait_closed()
+        first._listener = None
+        if not os.path.exists(socket_path):
+            Path(socket_path).touch()
+
+        second = MemoryMCPDaemon(server, socket_path, idle_timeout=0)
+        await second.start()
+        await first.close()
+
+        assert os.path.exists(socket_path)
+        client = await DaemonClient.connect(socket_path)
+        assert (await client.request(1, "tools/list"))["id"] == 1
+        await client.close()
+        await second.close()
+        assert not os.path.exists(socket_path)
+
+    async def test_idle_timeout(self, server, temp_dir):
+        """Test that serve() returns once no client has been connected for idle_timeout"""
+        daemon = MemoryMCPDaemon(server, os.path.join(temp_dir, "idle.sock"), idle_timeout=0.1)
+        await daemon.start()
+        await asyncio.wait_for(daemon.serve(), timeout=5)
+        await daemon.close()
+        assert not os.path.exists(daemon.socket_path)
+
+    async def test_shim_relays_stdio(self, daemon):
+        """Test that the stdio shim forwards requests and responses through the daemon"""
+        code = (
+            "import asyncio, sys\n"
+            "from extended_memory_mcp.daemon import run_shim\n"
+            "asyncio.run(run_shim(sys.argv[1]))\n"
+        )
+        process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-c",
+            code,
+            daemon.socket_path,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        requests = [
+            {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}},
+            {"jsonrpc": "2.0", "id": 2, "method": "tools/list", "params": {}},
+        ]
+        stdin = b"".join(json.dumps(r).encode() + b"\n" for r in requests)
+        stdout, _ = await asyncio.wait_for(process.communicate(stdin), timeout=20)
+
+        responses = [json.loads(line) for line in stdout.splitlines()]
+        assert sorted(r["id"] for r in responses) == [1, 2]
+        assert process.returncode == 0
+
+
+def test_daemon_log_is_private_and_not_followed(tmp_path):
+    """Test that the daemon log is created 0600 and never opened through a symlink"""
+    socket_path = str(tmp_path / "d.sock")
+    with patch("extended_memory_mcp.daemon.subprocess.Popen") as popen:
+        spawn_daemon(socket_path)
+    popen.assert_called_once()
+    assert stat.S_IMODE(os.stat(f"{socket_path}.log").st_mode) == 0o600
+
+    target = tmp_path / "target"
+    target.write_bytes(b"")
+    linked = str(tmp_path / "linked.sock")
+    os.symlink(target, f"{linked}.log")
+    with patch("extended_memory_mcp.daemon.subprocess.Popen"):
+        with pytest.raises(OSError):
+            spawn_daemon(linked)
+    assert target.read_bytes() == b""
+
+
+def test_socket_path_depends_on_storage():
+    """Test that different storage connection strings get different daemons"""
+    first = get_daemon_socket_path("sqlite:///tmp/a.db")
+    second = get_daemon_socket_path("sqlite:///tmp/b.db")
+
+    assert first != second
+    assert first == get_daemon_socket_path("sqlite:///tmp/a.db")
+    assert first.endswith(".sock")
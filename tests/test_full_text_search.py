@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests for Full-Text Search
+
+Tests the FTS5 index created by migration 3: backfill of existing rows,
+trigger maintenance, MATCH-based content_search and the LIKE fallback.
+"""
+
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import aiosqlite
+import pytest
+import pytest_asyncio
+
+from extended_memory_mcp.core.memory.context_repository import ContextRepository, build_fts_query
+from extended_memory_mcp.core.memory.database_manager import DatabaseManager
+from extended_memory_mcp.core.memory.migrations import (
+    MIGRATIONS,
+    PLAIN_CONTENT_FUNCTION,
+    apply_migrations,
+)
+from extended_memory_mcp.core.storage.content_codec import decompress
+from extended_memory_mcp.core.storage.storage_utils import content_matches
+
+
+class TestFTSQuery:
+    """Test conversion of user input into FTS5 MATCH expressions"""
+
+    def test_words_become_quoted_terms(self):
+        assert build_fts_query("Database optimization") == '"database" "optimization"'
+
+    def test_query_syntax_is_neutralized(self):
+        query = build_fts_query('NOT "a" OR b* (c) col:d')
+        assert query == '"not" "a" "or" "b" "c" "col" "d"'
+
+    def test_no_words(self):
+        assert build_fts_query("++ -- !!") is None
+
+    def test_content_matches_agrees_with_fts_semantics(self):
+        assert content_matches("Database optimization tips", "TIPS database")
+        assert not content_matches("Database optimization tips", "optim")
+        assert content_matches("C++ is fast", "++")
+
+
+class TestFullTextSearch:
+    """Test suite for the FTS5 index and the content_search query path"""
+
+    @pytest.fixture
+    def db_path(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield str(Path(temp_dir) / "fts.db")
+
+    @pytest_asyncio.fixture
+    async def manager(self, db_path):
+        manager = DatabaseManager(db_path)
+        yield manager
+        await manager.close()
+
+    @pytest_asyncio.fixture
+    async def repo(self, manager):
+        assert await manager.initialize_database() is True
+        return ContextRepository(manager)
+
+    def fts_ids(self, db_path, query):
+        conn = sqlite3.connect(db_path)
+        try:
+            rows = conn.execute(
+                "SELECT rowid FROM contexts_fts WHERE contexts_fts MATCH ? ORDER BY rowid",
+                (query,),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [row[0] for row in rows]
+
+    @pytest.mark.asyncio
+    async def test_migration_backfills_existing_rows(self, db_path):
+        async with aiosqlite.connect(db_path) as db:
+            await apply_migrations(db, MIGRATIONS[:2])
+            await db.execute("INSERT INTO contexts (content, importance_level) VALUES ('written before fts', 5)")
+            await db.commit()
+            await apply_migrations(db)
+
+        assert self.fts_ids(db_path, "before") == [1]
+
+    @pytest.mark.asyncio
+    async def test_manager_reports_fts(self, repo, manager):
+        assert manager.full_text_search is True
+
+    @pytest.mark.asyncio
+    async def test_triggers_follow_insert_update_delete(self, repo, db_path):
+        first = await repo.save_context("alpha release notes", 5)
+        second = await repo.save_context("beta release notes", 5)
+        assert self.fts_ids(db_path, "release") == [first, second]
+
+        conn = sqlite3.connect(db_path)
+        conn.create_function(PLAIN_CONTENT_FUNCTION, 2, decompress)
+        conn.execute("UPDATE contexts SET content = 'gamma notes' WHERE id = ?", (first,))
+        conn.commit()
+        conn.close()
+        assert self.fts_ids(db_path, "alpha") == []
+        assert self.fts_ids(db_path, "gamma") == [first]
+
+        assert await repo.delete_context(second) is True
+        assert self.fts_ids(db_path, "release") == []
+
+    @pytest.mark.asyncio
+    async def test_content_search_uses_fts(self, repo, db_path):
+        await repo.save_context("Database optimization with indexes", 7, project_id="p")
+        await repo.save_context("Unrelated note about cooking", 7, project_id="p")
+        await repo.save_context("database tuning elsewhere", 7, project_id="other")
+
+        results = await repo.search_contexts_optimized(project_id="p", content_search="indexes DATABASE")
+        assert [r["content"] for r in results] == ["Database optimization with indexes"]
+
+        results = await repo.search_contexts_optimized(content_search='"database" (')
+        assert len(results) == 2
+
+        conn = sqlite3.connect(db_path)
+        plan = " ".join(
+            row[3]
+            for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT contexts.id FROM contexts_fts"
+                " JOIN contexts ON contexts.id = contexts_fts.rowid"
+                " WHERE contexts_fts MATCH 'x' AND importance_level >= 1"
+                " ORDER BY contexts_fts.rowid DESC LIMIT 20"
+            )
+        )
+        conn.close()
+        # Index order is consumed: results stream newest-first without a sort
+        assert "VIRTUAL TABLE INDEX" in plan
+        assert "TEMP B-TREE" not in plan
+
+    @pytest.mark.asyncio
+    async def test_like_fallback(self, repo, manager):
+        await repo.save_context("Uses C++ templates", 5)
+
+        # No words to match: substring search instead of FTS
+        results = await repo.search_contexts_optimized(content_search="++")
+        assert len(results) == 1
+
+        manager.full_text_search = False
+        results = await repo.search_contexts_optimized(content_search="templ")
+        assert len(results) == 1
+
+        manager.full_text_search = True
+        assert await repo.search_contexts_optimized(content_search="templ") == []
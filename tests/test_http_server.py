@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Tests for Streamable HTTP Transport
+
+Tests the localhost HTTP server: JSON and SSE responses, keep-alive reuse,
+sessions, request size limits and connection/concurrency caps.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+
+from extended_memory_mcp.http_server import StreamableHTTPServer
+from extended_memory_mcp.server import MemoryMCPServer
+
+
+class HTTPClient:
+    """Minimal HTTP/1.1 client over one keep-alive connection"""
+
+    def __init__(self, reader, writer, port):
+        self.reader = reader
+        self.writer = writer
+        self.port = port
+
+    @classmethod
+    async def connect(cls, port):
+        return cls(*await asyncio.open_connection("127.0.0.1", port), port)
+
+    async def request(self, method, body=b"", headers=None, path="/mcp"):
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+        lines = [f"{method} {path} HTTP/1.1", f"Host: 127.0.0.1:{self.port}"]
+        all_headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json, text/event-stream",
+            "Content-Length": str(len(body)),
+        }
+        all_headers.update(headers or {})
+        lines.extend(f"{k}: {v}" for k, v in all_headers.items())
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+        await self.writer.drain()
+        return await asyncio.wait_for(self.read_response(), timeout=5)
+
+    async def read_response(self):
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        status_line, *header_lines = head.decode().strip().split("\r\n")
+        status = int(status_line.split(" ")[1])
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding") == "chunked":
+            body = b""
+            while True:
+                size = int((await self.reader.readline()).strip(), 16)
+                chunk = await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                body += chunk[:-2]
+        else:
+            body = await self.reader.readexactly(int(headers.get("content-length", "0")))
+        return status, headers, body
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+def rpc(request_id, method, params=None):
+    return {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}}
+
+
+def sse_events(body):
+    """Decode the JSON payloads of an SSE stream"""
+    return [
+        json.loads(line[len(b"data: ") :])
+        for line in body.split(b"\n")
+        if line.startswith(b"data: ")
+    ]
+
+
+class TestStreamableHTTPServer:
+    """Test suite for StreamableHTTPServer"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield temp_dir
+
+    @pytest_asyncio.fixture
+    async def server(self, temp_dir):
+        """Create initialized server with temporary SQLite database"""
+        env = {"STORAGE_CONNECTION_STRING": f"sqlite:///{Path(temp_dir) / 'memory.db'}"}
+        with patch.dict(os.environ, env):
+            server = MemoryMCPServer()
+            await server.initialize()
+            yield server
+            await server.close()
+
+    @pytest_asyncio.fixture
+    async def http(self, server):
+        """Create started HTTP server on a free port"""
+        http = StreamableHTTPServer(server, port=0, max_body_bytes=64 * 1024)
+        await http.start()
+        yield http
+        await http.close()
+
+    async def open_session(self, http):
+        client = await HTTPClient.connect(http.port)
+        status, headers, body = await client.request("POST", rpc(1, "initialize"))
+        assert status == 200
+        return client, headers["mcp-session-id"]
+
+    async def test_initialize_returns_json_and_session(self, http):
+        """Test that initialize is answered as JSON with a session id header"""
+        client = await HTTPClient.connect(http.port)
+        status, headers, body = await client.request("POST", rpc(1, "initialize"))
+
+        assert status == 200
+        assert headers["content-type"] == "application/json"
+        assert headers["mcp-session-id"] in http.sessions
+        assert json.loads(body)["result"]["protocolVersion"] == "2024-11-05"
+        await client.close()
+
+    async def test_keep_alive_reuses_connection(self, http):
+        """Test that several requests are served over one connection"""
+        client, session_id = await self.open_session(http)
+
+        for request_id in range(2, 5):
+            status, headers, body = await client.request(
+                "POST", rpc(request_id, "tools/list"), {"Mcp-Session-Id": session_id}
+            )
+            assert status == 200
+            assert headers["connection"] == "keep-alive"
+            assert json.loads(body)["id"] == request_id
+
+        assert http.active_connections == 1
+        await client.close()
+
+    async def test_batch_streams_sse_events(self, http):
+        """Test that a batch is streamed as one SSE event per response"""
+        client, session_id = await self.open_session(http)
+        batch = [rpc(2, "tools/list"), rpc(3, "resources/list"), rpc(4, "prompts/list")]
+
+        status, headers, body = await client.request(
+            "POST", batch, {"Mcp-Session-Id": session_id}
+        )
+
+        assert status == 200
+        assert headers["content-type"] == "text/event-stream"
+        assert sorted(event["id"] for event in sse_events(body)) == [2, 3, 4]
+
+        # Connection is still usable after the chunked stream ends
+        status, _, body = await client.request(
+            "POST", rpc(5, "tools/list"), {"Mcp-Session-Id": session_id}
+        )
+        assert status == 200 and json.loads(body)["id"] == 5
+        await client.close()
+
+    async def test_sse_only_client_gets_stream(self, http):
+        """Test that a client accepting only SSE gets a stream for a single request"""
+        client, session_id = await self.open_session(http)
+
+        status, headers, body = await client.request(
+            "POST",
+            rpc(2, "tools/list"),
+            {"Mcp-Session-Id": session_id, "Accept": "text/event-stream"},
+        )
+
+        assert headers["content-type"] == "text/event-stream"
+        assert [event["id"] for event in sse_events(body)] == [2]
+        await client.close()
+
+    async def test_notification_is_accepted(self, http):
+        """Test that notifications are answered with 202 and no body"""
+        client, session_id = await self.open_session(http)
+        notification = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+
+        status, _, body = await client.request(
+            "POST", notification, {"Mcp-Session-Id": session_id}
+        )
+
+        assert status == 202
+        assert body == b""
+        await client.close()
+
+    async def test_session_required(self, http):
+        """Test missing and unknown session ids"""
+        client = await HTTPClient.connect(http.port)
+
+        status, _, _ = await client.request("POST", rpc(1, "tools/list"))
+        assert status == 400
+
+        status, _, _ = await client.request(
+            "POST", rpc(2, "tools/list"), {"Mcp-Session-Id": "unknown"}
+        )
+        assert status == 404
+        await client.close()
+
+    async def test_delete_ends_session(self, http):
+        """Test that DELETE terminates the session"""
+        client, session_id = await self.open_session(http)
+
+        status, _, _ = await client.request("DELETE", headers={"Mcp-Session-Id": session_id})
+
+        assert status == 204
+        assert session_id not in http.sessions
+        await client.close()
+
+    async def test_parse_error(self, http):
+        """Test that invalid JSON gets a JSON-RPC parse error"""
+        client = await HTTPClient.connect(http.port)
+
+        status, _, body = await client.request("POST", b"{not json")
+
+        assert status == 400
+        assert json.loads(body)["error"]["code"] == -32700
+        await client.close()
+
+    async def test_oversized_body_rejected(self, http):
+        """Test that bodies over the size limit get 413 and the connection closes"""
+        client = await HTTPClient.connect(http.port)
+
+        status, headers, _ = await client.request("POST", b"x" * (http.max_body_bytes + 1))
+
+        assert status == 413
+        assert headers["connection"] == "close"
+        await client.close()
+
+    async def test_negative_content_length_rejected(self, http):
+        """Test that a negative Content-Length gets 400 and the connection closes"""
+        client = await HTTPClient.connect(http.port)
+
+        status, headers, body = await client.request(
+            "POST", rpc(1, "initialize"), {"Content-Length": "-1"}
+        )
+
+        assert status == 400
+        assert body == b"Invalid Content-Length"
+        assert headers["connection"] == "close"
+        await client.close()
+
+    async def test_idle_sessions_expire(self, server):
+        """Test that sessions unused past the idle timeout are evicted"""
+        http = StreamableHTTPServer(server, port=0, session_idle_timeout=60)
+        await http.start()
+        try:
+            client, idle_id = await self.open_session(http)
+            _, active_id = await self.open_session(http)
+            http.sessions[idle_id].last_used -= 61
+
+            assert http.evict_idle_sessions() == 1
+            assert set(http.sessions) == {active_id}
+            status, _, _ = await client.request(
+                "POST", rpc(2, "tools/list"), {"Mcp-Session-Id": idle_id}
+            )
+            assert status == 404
+            await client.close()
+        finally:
+            await http.close()
+
+    async def test_sweeper_evicts_idle_sessions(self, server):
+        """Test that the periodic sweep drops idle sessions without new requests"""
+        http = StreamableHTTPServer(server, port=0, session_idle_timeout=0.01)
+        with patch("extended_memory_mcp.http_server.MAX_SESSION_SWEEP_INTERVAL", 0.01):
+            await http.start()
+            try:
+                client, session_id = await self.open_session(http)
+                for _ in range(50):
+                    if session_id not in http.sessions:
+                        break
+                    await asyncio.sleep(0.01)
+                assert session_id not in http.sessions
+                await client.close()
+            finally:
+                await http.close()
+
+    async def test_session_cap_evicts_least_recently_used(self, server):
+        """Test that a new session over the cap replaces the least recently used one"""
+        http = StreamableHTTPServer(server, port=0, max_sessions=2)
+        await http.start()
+        try:
+            client, first_id = await self.open_session(http)
+            _, second_id = await self.open_session(http)
+            http.sessions[second_id].last_used -= 10
+            status, _, _ = await client.request(
+                "POST", rpc(2, "tools/list"), {"Mcp-Session-Id": first_id}
+            )
+            assert status == 200
+
+            _, third_id = await self.open_session(http)
+
+            assert set(http.sessions) == {first_id, third_id}
+            await client.close()
+        finally:
+            await http.close()
+
+    async def test_foreign_origin_rejected(self, http):
+        """Test that non-local browser origins are refused"""
+        client = await HTTPClient.connect(http.port)
+
+        status, _, _ = await client.request(
+            "POST", rpc(1, "initialize"), {"Origin": "http://evil.example"}
+        )
+
+        assert status == 403
+        await client.close()
+
+    async def test_connection_cap(self, server):
+        """Test that connections over the cap get 503"""
+        http = StreamableHTTPServer(server, port=0, max_connections=1)
+        await http.start()
+        try:
+            first, _ = await self.open_session(http)
+            second = await HTTPClient.connect(http.port)
+            status, _, _ = await asyncio.wait_for(second.read_response(), timeout=5)
+            assert status == 503
+            await first.close()
+            await second.close()
+        finally:
+            await http.close()
+
+    async def test_in_flight_cap(self, server):
+        """Test that requests across clients respect the in-flight limit"""
+        http = StreamableHTTPServer(server, port=0, max_in_flight=2)
+        await http.start()
+        running = 0
+        peak = 0
+
+        async def slow_handler(method, params, request_id, **kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+            return {}
+
+        try:
+            client, session_id = await self.open_session(http)
+            http.sessions[session_id].dispatcher.handler = slow_handler
+            batch = [rpc(i, "tools/list") for i in range(2, 8)]
+
+            status, _, body = await client.request(
+                "POST", batch, {"Mcp-Session-Id": session_id, "Accept": "application/json"}
+            )
+
+            assert status == 200
+            assert len(json.loads(body)) == 6
+            assert peak == 2
+            await client.close()
+        finally:
+            await http.close()
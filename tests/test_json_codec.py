@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Tests for JSON Codec
+
+Tests backend selection and that every backend round-trips protocol and
+storage payloads with stdlib-compatible semantics.
+"""
+
+import json
+
+import pytest
+
+from extended_memory_mcp.core import json_codec
+from extended_memory_mcp.core.json_codec import JSONCodec, create_json_codec
+
+INSTALLED = ["json"] + [
+    name for name in ("orjson", "msgspec") if getattr(json_codec, name) is not None
+]
+
+PAYLOAD = {
+    "jsonrpc": "2.0",
+    "id": 7,
+    "result": {
+        "content": [{"type": "text", "text": "Контекст 🧠 with \"quotes\"\nand newlines"}],
+        "score": 0.5,
+        "tags": ["api", "design"],
+        "empty": None,
+        "flag": True,
+    },
+}
+
+
+class TestJSONCodec:
+    """Test suite for JSONCodec"""
+
+    @pytest.fixture(params=INSTALLED)
+    def codec(self, request):
+        """Create codec for each installed backend"""
+        return JSONCodec(request.param)
+
+    def test_round_trip(self, codec):
+        """Test encode/decode round trip from str and bytes"""
+        assert codec.loads(codec.dumps(PAYLOAD)) == PAYLOAD
+        assert codec.loads(codec.dumps_bytes(PAYLOAD)) == PAYLOAD
+        assert json.loads(codec.dumps(PAYLOAD)) == PAYLOAD
+
+    def test_output_is_utf8_not_ascii_escaped(self, codec):
+        """Test non-ASCII text is emitted as UTF-8"""
+        encoded = codec.dumps_bytes({"text": "тест"})
+        assert "тест".encode("utf-8") in encoded
+        assert b"\n" not in encoded
+
+    def test_indent(self, codec):
+        """Test indented output matches stdlib indent=2"""
+        expected = json.dumps(PAYLOAD, indent=2, ensure_ascii=False)
+        assert codec.loads(codec.dumps(PAYLOAD, indent=True)) == PAYLOAD
+        assert codec.dumps(PAYLOAD, indent=True).splitlines()[:3] == expected.splitlines()[:3]
+
+    def test_invalid_json_raises_value_error(self, codec):
+        """Test decode errors are ValueError for every backend"""
+        with pytest.raises(ValueError):
+            codec.loads(b'{"id": 1,')
+        with pytest.raises(ValueError):
+            codec.loads("not json")
+
+    def test_stdlib_semantics_preserved(self, codec):
+        """Test values fast backends reject are still encoded like the stdlib"""
+        data = {1: "int key", "big": 2**70}
+        assert codec.loads(codec.dumps(data)) == {"1": "int key", "big": 2**70}
+
+    def test_unserializable_raises_type_error(self, codec):
+        """Test unserializable objects raise TypeError"""
+        with pytest.raises(TypeError):
+            codec.dumps({"value": object()})
+
+    def test_auto_prefers_fast_backend(self):
+        """Test auto selects the first installed backend"""
+        preferred = [name for name in json_codec.BACKENDS if name in INSTALLED][0]
+        assert JSONCodec("auto").name == preferred
+
+    def test_unknown_backend(self):
+        """Test unknown backend is rejected and factory falls back to auto"""
+        with pytest.raises(ValueError):
+            JSONCodec("simdjson")
+        assert create_json_codec("simdjson").name == JSONCodec("auto").name
+
+    def test_module_functions_use_shared_codec(self):
+        """Test module-level helpers use the process-wide codec"""
+        assert json_codec.get_json_codec() is json_codec.get_json_codec()
+        assert json_codec.loads(json_codec.dumps_bytes(PAYLOAD)) == PAYLOAD
+
+    def test_pre_encoded_json(self):
+        """Test PreEncodedJSON reads as a dict and carries matching bytes"""
+        value = json_codec.PreEncodedJSON(PAYLOAD)
+        assert value == PAYLOAD
+        assert json_codec.loads(value.encoded) == PAYLOAD
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Tests for the maintenance scheduler
+
+Tests job scheduling, time budgets, yielding to client requests, run
+statistics, the SQLite housekeeping jobs and the scheduler's lifecycle in
+MemoryMCPServer.
+"""
+
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+
+from extended_memory_mcp.core.maintenance import (
+    MaintenanceBudget,
+    MaintenanceJob,
+    MaintenanceScheduler,
+    create_maintenance_scheduler,
+)
+from extended_memory_mcp.core.storage.providers.sqlite.sqlite_provider import (
+    SQLiteStorageProvider,
+)
+from extended_memory_mcp.core.storage.retention import RetentionPolicy
+from extended_memory_mcp.server import MemoryMCPServer
+
+SQLITE_NOW_MS = "extended_memory_mcp.core.storage.providers.sqlite.sqlite_provider.now_ms"
+
+
+def make_job(name="job", result="done", interval=60.0, budget=1.0):
+    async def run(budget):
+        return result
+
+    return MaintenanceJob(name, run, interval=interval, budget=budget)
+
+
+class TestMaintenanceScheduler:
+    """Test suite for MaintenanceScheduler"""
+
+    async def test_run_job_records_statistics(self):
+        scheduler = MaintenanceScheduler([make_job(result={"freed": 3})])
+        assert await scheduler.run_job("job") == {"freed": 3}
+
+        status = scheduler.status()["jobs"]["job"]
+        assert status["runs"] == 1
+        assert status["failures"] == 0
+        assert status["last_result"] == {"freed": 3}
+        assert status["last_duration_ms"] >= 0
+        assert status["average_duration_ms"] == status["last_duration_ms"]
+        assert status["last_started_ms"] > 0
+
+    async def test_failing_job_is_recorded(self):
+        async def broken(budget):
+            raise RuntimeError("disk on fire")
+
+        scheduler = MaintenanceScheduler([MaintenanceJob("broken", broken, 60, 1)])
+        assert await scheduler.run_job("broken") is None
+        status = scheduler.status()["jobs"]["broken"]
+        assert status["failures"] == 1
+        assert "disk on fire" in status["last_error"]
+
+    async def test_job_stops_when_budget_is_spent(self):
+        async def endless(budget):
+            steps = 0
+            while await budget.checkpoint():
+                steps += 1
+                await asyncio.sleep(0.01)
+            return steps
+
+        scheduler = MaintenanceScheduler([MaintenanceJob("endless", endless, 60, 0.05)])
+        steps = await asyncio.wait_for(scheduler.run_job("endless"), timeout=5)
+        assert 1 <= steps < 20
+
+    async def test_checkpoint_waits_while_requests_are_in_flight(self):
+        busy = True
+        budget = MaintenanceBudget(5.0, is_busy=lambda: busy, poll_interval=0.01)
+
+        waiting = asyncio.create_task(budget.checkpoint())
+        await asyncio.sleep(0.05)
+        assert not waiting.done()
+
+        busy = False
+        assert await asyncio.wait_for(waiting, timeout=1) is True
+        assert budget.yields > 0
+
+    async def test_run_due_skips_jobs_not_yet_due(self):
+        scheduler = MaintenanceScheduler([make_job("due"), make_job("later")])
+        scheduler.jobs["later"].next_run = asyncio.get_running_loop().time() + 60
+
+        assert await scheduler.run_due() == ["due"]
+        # Rescheduled one interval later
+        assert scheduler.jobs["due"].next_run > asyncio.get_running_loop().time() + 59
+
+    async def test_disabled_jobs_are_dropped(self):
+        scheduler = MaintenanceScheduler([make_job("on"), make_job("off", interval=0)])
+        assert list(scheduler.jobs) == ["on"]
+
+    async def test_background_task_waits_for_idle(self):
+        busy = True
+        scheduler = MaintenanceScheduler(
+            [make_job()], is_busy=lambda: busy, startup_delay=0, poll_interval=0.01
+        )
+        scheduler.start()
+        try:
+            assert scheduler.running
+            await asyncio.sleep(0.05)
+            assert scheduler.jobs["job"].runs == 0
+
+            busy = False
+            await asyncio.sleep(0.05)
+            assert scheduler.jobs["job"].runs == 1
+        finally:
+            await scheduler.close()
+        assert not scheduler.running
+
+    async def test_close_interrupts_running_job(self):
+        started = asyncio.Event()
+
+        async def slow(budget):
+            started.set()
+            await asyncio.sleep(60)
+
+        scheduler = MaintenanceScheduler([MaintenanceJob("slow", slow, 60, 1)], startup_delay=0)
+        scheduler.start()
+        await asyncio.wait_for(started.wait(), timeout=1)
+        await asyncio.wait_for(scheduler.close(), timeout=1)
+        assert not scheduler.running
+
+    async def test_factory_applies_defaults_and_settings(self):
+        async def run(budget):
+            return None
+
+        scheduler = create_maintenance_scheduler(
+            {"wal_checkpoint": run, "expire_contexts": run, "custom": run},
+            settings={"expire_contexts": {"interval_seconds": 0}},
+        )
+        assert scheduler.startup_delay == 60
+        assert set(scheduler.jobs) == {"wal_checkpoint", "custom"}
+        assert scheduler.jobs["wal_checkpoint"].interval == 300
+        assert scheduler.jobs["wal_checkpoint"].budget == 1
+        assert scheduler.jobs["custom"].interval == 3600
+
+
+class TestSQLiteMaintenanceJobs:
+    """Test suite for the SQLite provider's maintenance jobs"""
+
+    @pytest_asyncio.fixture
+    async def provider(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            provider = SQLiteStorageProvider(str(Path(temp_dir) / "maintenance.db"))
+            await provider.initialize()
+            yield provider
+            await provider.close()
+
+    async def test_provider_jobs_run(self, provider):
+        scheduler = create_maintenance_scheduler(provider.maintenance_jobs())
+        assert set(scheduler.jobs) == {
+            "expire_contexts",
+            "cleanup_unused_tags",
+            "wal_checkpoint",
+            "optimize",
+            "incremental_vacuum",
+        }
+
+        context_id = await provider.save_context("note", 5, project_id="p1", tags=["gone"])
+        await provider.delete_context(context_id)
+        assert await scheduler.run_job("cleanup_unused_tags") == 1
+
+        checkpoint = await scheduler.run_job("wal_checkpoint")
+        assert checkpoint["busy"] == 0
+        assert checkpoint["checkpointed"] == checkpoint["wal_frames"]
+
+        await scheduler.run_job("optimize")
+        assert all(job["failures"] == 0 for job in scheduler.status()["jobs"].values())
+
+    async def test_incremental_vacuum_shrinks_file(self, provider):
+        await provider.save_contexts_batch(
+            [{"content": "x" * 2000, "importance_level": 5} for _ in range(500)]
+        )
+        async with provider.db_manager.get_connection() as db:
+            await db.execute("DELETE FROM contexts")
+            await db.commit()
+            async with db.execute("PRAGMA freelist_count") as cursor:
+                free_pages = (await cursor.fetchone())[0]
+        assert free_pages > 0
+
+        assert await provider.incremental_vacuum() == free_pages
+        assert await provider.incremental_vacuum() == 0
+
+    async def test_expiry_sweep_stops_at_budget(self, provider):
+        provider.retention = RetentionPolicy(sweep_batch_size=2)
+        ids = [await provider.save_context(f"scratch {i}", 1) for i in range(6)]
+        later = (await provider.load_context(ids[0]))["created_ms"] + 25 * 3_600_000
+
+        with patch(SQLITE_NOW_MS, return_value=later):
+            spent = MaintenanceBudget(0)
+            assert await provider.cleanup_expired(spent) == 2
+            assert await provider.cleanup_expired(MaintenanceBudget(5)) == 4
+
+
+class TestServerMaintenance:
+    """Test suite for maintenance in MemoryMCPServer"""
+
+    @pytest_asyncio.fixture
+    async def server(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            env = {"STORAGE_CONNECTION_STRING": f"sqlite:///{Path(temp_dir) / 'memory.db'}"}
+            with patch.dict(os.environ, env):
+                server = MemoryMCPServer()
+                await server.initialize()
+                yield server
+                await server.close()
+
+    async def test_initialize_starts_scheduler(self, server):
+        status = server.maintenance_status()
+        assert status["running"]
+        assert "wal_checkpoint" in status["jobs"]
+
+    async def test_requests_hold_maintenance_back(self, server):
+        assert not server.maintenance.is_busy()
+        with server.request_in_flight():
+            assert server.maintenance.is_busy()
+        assert not server.maintenance.is_busy()
+
+    async def test_close_stops_scheduler(self, server):
+        await server.close()
+        assert not server.maintenance_status()["running"]
@@ -77,6 +77,38 @@ class TestMemoryManager:
         saved_context = next((ctx for ctx in contexts if ctx["content"] == "Context with multiple tags"), None)
         assert saved_context is not None
 
+    @pytest.mark.asyncio
+    async def test_cancelled_query_is_interrupted(self, memory_manager):
+        """Test that cancelling a caller interrupts its running SQLite statement"""
+        long_query = (
+            "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) "
+            "SELECT count(*) FROM n"
+        )
+        state = {}
+
+        async def run_query():
+            async with memory_manager.db_manager.get_connection() as db:
+                state["db"] = db
+                await db.execute(long_query)
+
+        task = asyncio.create_task(run_query())
+        await asyncio.sleep(0.2)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(task, timeout=5)
+
+        # The pooled connection is reusable at once: the query was interrupted,
+        # not left running in the worker thread
+        async def reuse_connection():
+            async with memory_manager.db_manager.get_connection() as db:
+                cursor = await db.execute("SELECT 1")
+                return db, await cursor.fetchone()
+
+        db, row = await asyncio.wait_for(reuse_connection(), timeout=5)
+        assert db is state["db"]
+        assert row == (1,)
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
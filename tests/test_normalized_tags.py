@@ -292,6 +292,60 @@ class TestNormalizedTags:
         # Should only have valid tags (empty/whitespace/None filtered out)
         assert set(context["tags"]) == {"valid-tag", "another-valid"}
 
+    @pytest.mark.asyncio
+    async def test_save_context_with_tags_is_atomic(self, memory_manager, context_repo, monkeypatch):
+        """Test that a failure while tagging leaves no untagged context behind"""
+        async def failing_link(db, context_id, tags):
+            raise RuntimeError("tag write failed")
+
+        monkeypatch.setattr(
+            "extended_memory_mcp.core.memory.context_repository.link_context_tags", failing_link
+        )
+
+        context_id = await context_repo.save_context(
+            content="Never stored", importance_level=7, project_id="test_project", tags=["a"]
+        )
+
+        assert context_id is None
+        assert await context_repo.count_contexts() == 0
+
+    @pytest.mark.asyncio
+    async def test_save_context_tag_statements_do_not_grow_with_tags(self, memory_manager, context_repo):
+        """Test that tags are written with a fixed number of statements"""
+        statements = []
+        db_manager = memory_manager.db_manager
+
+        def trace(sql):
+            # Trigger steps are reported as repeats of the statement that fired them
+            if not statements or statements[-1] != sql:
+                statements.append(sql)
+
+        async def statements_for(tags):
+            statements.clear()
+            async with db_manager.get_connection() as db:
+                await db.set_trace_callback(trace)
+            try:
+                context_id = await context_repo.save_context(
+                    content="Traced", importance_level=7, project_id="test_project", tags=tags
+                )
+            finally:
+                async with db_manager.get_connection() as db:
+                    await db.set_trace_callback(None)
+            assert context_id is not None
+            return len(statements), context_id
+
+        # The first write on a connection also loads the FTS5 configuration
+        await statements_for(["warm-up"])
+        few, _ = await statements_for(["one"])
+        many, context_id = await statements_for(
+            [f"tag-{i}" for i in range(25)] + ["TAG-0", " tag-1 "]
+        )
+
+        assert few == many
+
+        tags_repo = memory_manager.context_service.tags_repo
+        assert len(await tags_repo.load_context_tags(context_id)) == 25
+
     # --- New tests for get_popular_tags functionality ---
 
     @pytest.mark.asyncio
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests for cursor pagination
+
+Tests opaque (created_ms, id) cursors, load_contexts_page on the SQLite and
+Redis providers (ties, filters, last page) and cursors in the load_contexts
+MCP tool.
+"""
+
+import json
+import logging
+import re
+import sqlite3
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+
+from extended_memory_mcp.core.errors import ValidationError
+from extended_memory_mcp.core.storage.pagination import decode_cursor, encode_cursor
+from extended_memory_mcp.core.storage.providers.redis.redis_provider import RedisStorageProvider
+from extended_memory_mcp.core.storage.providers.redis.services.context_service import (
+    timeline_score,
+)
+from extended_memory_mcp.core.storage.providers.sqlite.sqlite_provider import (
+    SQLiteStorageProvider,
+)
+from extended_memory_mcp.core.storage.timestamps import to_epoch_ms
+from extended_memory_mcp.formatters.summary_formatter import ContextSummaryFormatter
+from extended_memory_mcp.tools.memory_tools import MemoryToolsHandler
+
+
+async def read_all_pages(provider, limit, **filters):
+    """Follow next_cursor to the end; return the pages' context ids"""
+    pages, cursor = [], None
+    while True:
+        page = await provider.load_contexts_page(limit=limit, cursor=cursor, **filters)
+        pages.append([ctx["id"] for ctx in page["contexts"]])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+class TestCursors:
+    """Test cursor encoding"""
+
+    def test_round_trip(self):
+        cursor = encode_cursor({"id": 42, "created_ms": 1767261600000})
+        assert re.fullmatch(r"[A-Za-z0-9_-]+", cursor)
+        assert decode_cursor(cursor) == (1767261600000, 42)
+        assert decode_cursor(None) is None
+
+    def test_context_without_created_ms(self):
+        cursor = encode_cursor({"id": "a", "created_at": "2026-01-01T10:00:00+00:00"})
+        assert decode_cursor(cursor) == (1767261600000, "a")
+
+    @pytest.mark.parametrize(
+        "cursor", ["not base64!", "eyJhIjoxfQ", "WyIyMDI2LTAxLTAxIiwyXQ", "W3RydWUsMl0"]
+    )
+    def test_malformed_cursor(self, cursor):
+        with pytest.raises(ValidationError, match="Invalid pagination cursor"):
+            decode_cursor(cursor)
+
+
+class TestSQLitePagination:
+    """Test suite for SQLiteStorageProvider.load_contexts_page"""
+
+    @pytest_asyncio.fixture
+    async def provider(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            provider = SQLiteStorageProvider(str(Path(temp_dir) / "pages.db"))
+            await provider.initialize()
+            # One batch: every context shares the same created_ms
+            await provider.save_contexts_batch(
+                [
+                    {
+                        "content": f"note {i}",
+                        "importance_level": 9 if i % 3 == 0 else 5,
+                        "project_id": "proj",
+                        "tags": ["even"] if i % 2 == 0 else [],
+                    }
+                    for i in range(25)
+                ]
+            )
+            await provider.save_context("newest", 9, project_id="proj", tags=["even"])
+            yield provider
+            await provider.close()
+
+    @pytest.mark.asyncio
+    async def test_pages_cover_everything_once(self, provider):
+        pages = await read_all_pages(provider, 10, project_id="proj", importance_threshold=1)
+
+        assert [len(page) for page in pages] == [10, 10, 6]
+        ids = [i for page in pages for i in page]
+        assert ids == [26] + list(range(25, 0, -1))
+
+    @pytest.mark.asyncio
+    async def test_exact_multiple_ends_without_empty_page(self, provider):
+        pages = await read_all_pages(provider, 13, importance_threshold=1)
+        assert [len(page) for page in pages] == [13, 13]
+
+    @pytest.mark.asyncio
+    async def test_filters_apply_to_every_page(self, provider):
+        pages = await read_all_pages(provider, 4, importance_threshold=9, tags_filter=["even"])
+        ids = [i for page in pages for i in page]
+        # Batch items 0, 6, 12, 18, 24 (ids 1, 7, 13, 19, 25) and the newest
+        assert ids == [26, 25, 19, 13, 7, 1]
+
+    @pytest.mark.asyncio
+    async def test_foreign_cursor_is_rejected(self, provider):
+        with pytest.raises(ValidationError):
+            await provider.load_contexts_page(
+                cursor=encode_cursor({"id": "uuid", "created_at": ""})
+            )
+
+    @pytest.mark.asyncio
+    async def test_keyset_query_seeks_the_index(self, provider):
+        select = "SELECT id, created_ms FROM contexts WHERE importance_level >= 1"
+        conn = sqlite3.connect(provider.db_manager.db_path)
+        plan = " ".join(
+            row[3]
+            for row in conn.execute(
+                f"EXPLAIN QUERY PLAN {select} AND created_ms = ? AND id < ?"
+                f" UNION ALL {select} AND created_ms < ?"
+                " ORDER BY created_ms DESC, id DESC LIMIT 11",
+                (1900000000000, 5, 1900000000000),
+            )
+        )
+        conn.close()
+        assert "MERGE (UNION ALL)" in plan
+        assert "USING INDEX idx_contexts_created_ms (created_ms=? AND rowid<?)" in plan
+        assert "TEMP B-TREE" not in plan
+
+    @pytest.mark.asyncio
+    async def test_search_contexts_optimized_before(self, provider):
+        repo = provider.context_repo
+        first = await repo.search_contexts_optimized(content_search="note", limit=5)
+        after = await repo.search_contexts_optimized(
+            content_search="note", limit=5, before=(first[-1]["created_ms"], first[-1]["id"])
+        )
+        assert [c["id"] for c in first + after] == list(range(25, 15, -1))
+
+        provider.db_manager.full_text_search = False
+        after_like = await repo.search_contexts_optimized(
+            content_search="note", limit=5, before=(first[-1]["created_ms"], first[-1]["id"])
+        )
+        assert after_like == after
+
+
+class FakeTimelineRedis:
+    """Just enough of redis.asyncio for timeline pages: strings and sorted sets"""
+
+    def __init__(self):
+        self.strings = {}
+        self.zsets = {}
+
+    async def mget(self, keys):
+        return [self.strings.get(key) for key in keys]
+
+    async def exists(self, key):
+        return int(key in self.zsets or key in self.strings)
+
+    async def zrevrangebyscore(self, key, max, min, start=None, num=None):
+        def bound(value):
+            value = str(value)
+            if value in ("+inf", "-inf"):
+                return float(value), False
+            if value.startswith("("):
+                return float(value[1:]), True
+            return float(value), False
+
+        high, high_open = bound(max)
+        low, low_open = bound(min)
+        members = sorted(
+            self.zsets.get(key, {}).items(), key=lambda m: (m[1], m[0]), reverse=True
+        )
+        members = [
+            member
+            for member, score in members
+            if (score < high or (not high_open and score == high))
+            and (score > low or (not low_open and score == low))
+        ]
+        if start is not None:
+            members = members[start : start + num]
+        return [member.encode() for member in members]
+
+    async def zrem(self, key, *members):
+        for member in members:
+            self.zsets.get(key, {}).pop(member, None)
+
+
+class TestRedisPagination:
+    """Test suite for RedisStorageProvider.load_contexts_page (fake sorted sets)"""
+
+    @pytest.fixture
+    def provider(self):
+        with patch("redis.asyncio.Redis"):
+            provider = RedisStorageProvider(key_prefix="test", ttl_hours=1)
+
+        fake = FakeTimelineRedis()
+        timeline = provider.connection_service.make_key("timeline")
+        fake.zsets[timeline] = {}
+        tie = "2026-01-01T10:00:00+00:00"
+        for i in range(12):
+            context_id = f"ctx{i:02d}"
+            created_at = tie if i < 8 else f"2026-01-0{i - 6}T10:00:00+00:00"
+            context = {
+                "id": context_id,
+                "content": f"note {i}",
+                "importance_level": 3 if i == 9 else 8,
+                "tags": ["odd"] if i % 2 else [],
+            }
+            if i == 10:  # saved before created_ms existed
+                context["created_at"] = created_at
+            else:
+                context["created_ms"] = to_epoch_ms(created_at)
+            fake.zsets[timeline][context_id] = timeline_score(context)
+            if i != 5:  # ctx05 has expired
+                fake.strings[provider.connection_service.make_key("context", context_id)] = (
+                    json.dumps(context)
+                )
+
+        async def get_connection():
+            return fake
+
+        provider.connection_service.get_connection = get_connection
+        provider._fake = fake
+        provider._timeline = timeline
+        return provider
+
+    @pytest.mark.asyncio
+    async def test_score_ranged_pages_follow_sqlite_order(self, provider):
+        pages = await read_all_pages(provider, 3, importance_threshold=5)
+
+        ids = [i for page in pages for i in page]
+        # Newest first, ties in descending id order, expired and low-importance skipped
+        assert ids == [
+            "ctx11", "ctx10", "ctx08", "ctx07", "ctx06", "ctx04", "ctx03", "ctx02", "ctx01", "ctx00"
+        ]
+        assert [len(page) for page in pages] == [3, 3, 3, 1]
+        assert "ctx05" not in provider._fake.zsets[provider._timeline]
+
+    @pytest.mark.asyncio
+    async def test_tags_filter(self, provider):
+        pages = await read_all_pages(provider, 2, importance_threshold=1, tags_filter=["ODD"])
+        assert [i for page in pages for i in page] == ["ctx11", "ctx09", "ctx07", "ctx03", "ctx01"]
+
+
+class TestLoadContextsToolCursor:
+    """Test suite for cursors in the load_contexts MCP tool"""
+
+    @pytest_asyncio.fixture
+    async def handler(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            provider = SQLiteStorageProvider(str(Path(temp_dir) / "tool.db"))
+            await provider.initialize()
+            for i in range(15):
+                await provider.save_context(f"memory number {i}", 8, project_id="proj")
+            yield MemoryToolsHandler(
+                provider, ContextSummaryFormatter(), logging.getLogger("test")
+            )
+            await provider.close()
+
+    @pytest.mark.asyncio
+    async def test_cursor_walks_older_contexts(self, handler):
+        first = await handler.load_contexts(project_id="proj", init_load=False, limit=30)
+        text = first["content"][0]["text"]
+        cursor = re.search(r'cursor="([^"]+)"', text).group(1)
+        assert "memory number 14" in text and "memory number 4\n" not in text
+
+        second = await handler.load_contexts(
+            project_id="proj", init_load=False, limit=30, cursor=cursor
+        )
+        text = second["content"][0]["text"]
+        assert "memory number 4\n" in text and "memory number 0\n" in text
+        assert "memory number 5\n" not in text
+        assert "cursor=" not in text
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_is_reported(self, handler):
+        result = await handler.load_contexts(project_id="proj", cursor="garbage")
+        assert "Invalid pagination cursor" in result["content"][0]["text"]
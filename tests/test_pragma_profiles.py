@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Tests for SQLite PRAGMA Profiles
+
+Tests profile resolution and validation, configuration overrides and the
+PRAGMAs the connection pool applies to writer and reader connections.
+"""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from extended_memory_mcp.core.errors import ConfigurationError
+from extended_memory_mcp.core.memory.connection_pool import SQLiteConnectionPool
+from extended_memory_mcp.core.memory.pragma_profiles import (
+    PRAGMA_PROFILES,
+    SUPPORTED_PRAGMAS,
+    create_pragma_settings,
+    pragma_statements,
+    resolve_pragma_settings,
+)
+
+
+async def read_pragma(connection, name):
+    async with connection.execute(f"PRAGMA {name}") as cursor:
+        return (await cursor.fetchone())[0]
+
+
+class TestPragmaProfiles:
+    """Test suite for PRAGMA profile resolution"""
+
+    def test_profiles_cover_all_supported_pragmas(self):
+        assert set(PRAGMA_PROFILES) == {"durable", "balanced", "fast-ephemeral"}
+        for settings in PRAGMA_PROFILES.values():
+            assert set(settings) == set(SUPPORTED_PRAGMAS)
+
+    def test_overrides_replace_profile_values(self):
+        settings = resolve_pragma_settings("durable", {"cache_size": -2000})
+        assert settings["cache_size"] == -2000
+        assert settings["synchronous"] == "FULL"
+        # busy_timeout is applied first
+        assert next(iter(settings)) == "busy_timeout"
+
+    def test_unknown_profile_is_rejected(self):
+        with pytest.raises(ConfigurationError, match="Unknown SQLite PRAGMA profile"):
+            resolve_pragma_settings("turbo")
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {"locking_mode": "EXCLUSIVE"},
+            {"synchronous": "OFF; DROP TABLE contexts"},
+            {"cache_size": True},
+        ],
+    )
+    def test_invalid_settings_are_rejected(self, overrides):
+        with pytest.raises(ConfigurationError):
+            resolve_pragma_settings("balanced", overrides)
+
+    def test_readers_skip_database_level_pragmas(self):
+        settings = resolve_pragma_settings("balanced")
+        assert "PRAGMA journal_mode = WAL" in pragma_statements(settings)
+        assert not any("journal_mode" in s for s in pragma_statements(settings, readonly=True))
+
+    def test_profile_selected_from_environment(self, monkeypatch):
+        monkeypatch.setenv("SQLITE_PRAGMA_PROFILE", "Durable")
+        assert create_pragma_settings()["synchronous"] == "FULL"
+
+        monkeypatch.delenv("SQLITE_PRAGMA_PROFILE")
+        assert create_pragma_settings("fast-ephemeral")["synchronous"] == "OFF"
+
+    @pytest.mark.asyncio
+    async def test_pool_applies_settings_per_connection(self):
+        settings = resolve_pragma_settings(
+            "fast-ephemeral", {"cache_size": -4096, "busy_timeout": 1234}
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pool = SQLiteConnectionPool(
+                str(Path(temp_dir) / "pragmas.db"), readers=1, pragmas=settings
+            )
+            try:
+                async with pool.connection() as writer:
+                    assert (await read_pragma(writer, "journal_mode")).lower() == "wal"
+                    assert await read_pragma(writer, "synchronous") == 0  # OFF
+                    assert await read_pragma(writer, "wal_autocheckpoint") == 10000
+                    assert await read_pragma(writer, "auto_vacuum") == 2  # INCREMENTAL
+
+                async with pool.connection(readonly=True) as reader:
+                    assert await read_pragma(reader, "cache_size") == -4096
+                    assert await read_pragma(reader, "busy_timeout") == 1234
+                    assert await read_pragma(reader, "temp_store") == 2  # MEMORY
+                    assert await read_pragma(reader, "query_only") == 1
+            finally:
+                await pool.close()
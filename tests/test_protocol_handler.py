@@ -46,9 +46,15 @@ Tests the MCP protocol handling logic separated from main server.
 
 import json
 import logging
+import shutil
+import tempfile
+from pathlib import Path
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
+from extended_memory_mcp.config.tools.descriptions_loader import ToolDescriptionsLoader
+from extended_memory_mcp.core import json_codec
+from extended_memory_mcp.core.errors import ConfigurationError
 from extended_memory_mcp.protocol.mcp_protocol_handler import MCPProtocolHandler, create_mcp_protocol_handler
 
 
@@ -108,6 +114,17 @@ class TestMCPProtocolHandler:
         )
         
         assert result is None
+
+    async def test_handle_notifications_cancelled(self, protocol_handler):
+        """Test notifications/cancelled is accepted without a response"""
+        result = await protocol_handler.handle_request(
+            method="notifications/cancelled",
+            params={"requestId": 5, "reason": "user aborted"},
+            tools_handler=None,
+            server=None
+        )
+
+        assert result is None
     
     async def test_handle_prompts_get_memory_instructions(self, protocol_handler):
         """Test prompts/get for memory_instructions"""
@@ -150,6 +167,22 @@ class TestMCPProtocolHandler:
         # Verify startup context was called
         mock_server.generate_startup_context.assert_called_once()
     
+    async def test_handle_resources_read_maintenance(self, protocol_handler, mock_server):
+        """Test resources/read for maintenance status"""
+        status = {"running": True, "jobs": {"wal_checkpoint": {"runs": 2}}}
+        mock_server.maintenance_status = MagicMock(return_value=status)
+
+        result = await protocol_handler.handle_request(
+            method="resources/read",
+            params={"uri": "memory://maintenance"},
+            tools_handler=None,
+            server=mock_server
+        )
+
+        content = result["contents"][0]
+        assert content["uri"] == "memory://maintenance"
+        assert json.loads(content["text"]) == status
+
     async def test_handle_resources_read_unknown_uri(self, protocol_handler, mock_server):
         """Test resources/read for unknown URI"""
         with pytest.raises(Exception, match="Unknown resource URI"):
@@ -209,13 +242,79 @@ class TestMCPProtocolHandler:
         
         assert "tools" in result
         tools = result["tools"]
-        assert len(tools) == 5  # save_context, load_contexts, forget_context, list_projects, get_popular_tags
+        assert len(tools) == 7
         
         # Check that we have expected tools
         tool_names = [tool["name"] for tool in tools]
-        expected_tools = ["save_context", "load_contexts", "forget_context", "list_all_projects", "get_popular_tags"]
+        expected_tools = [
+            "save_context",
+            "save_contexts_batch",
+            "load_contexts",
+            "search_contexts",
+            "forget_context",
+            "list_all_projects",
+            "get_popular_tags",
+        ]
         assert set(tool_names) == set(expected_tools), f"Expected {expected_tools}, got {tool_names}"
     
+    async def test_static_results_are_pre_encoded(self, protocol_handler):
+        """Test constant results are built once and carry their JSON encoding"""
+        for method in ("initialize", "tools/list", "resources/list", "prompts/list"):
+            first = await protocol_handler.handle_request(
+                method=method, params={}, tools_handler=None, server=None
+            )
+            second = await protocol_handler.handle_request(
+                method=method, params={}, tools_handler=None, server=None
+            )
+
+            assert first is second
+            assert isinstance(first, json_codec.PreEncodedJSON)
+            assert json.loads(first.encoded) == first
+
+    @pytest.fixture
+    def tools_config_dir(self):
+        """Copy of the tools config directory that tests may break"""
+        source = Path(ToolDescriptionsLoader().config_dir)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = Path(temp_dir) / "tools"
+            shutil.copytree(source / "descriptions", target / "descriptions")
+            shutil.copytree(source / "schema", target / "schema")
+            yield target
+
+    def create_handler_with_config(self, logger, config_dir):
+        loader = ToolDescriptionsLoader(config_dir)
+        with patch(
+            "extended_memory_mcp.protocol.mcp_protocol_handler.create_tool_descriptions_loader",
+            return_value=loader,
+        ):
+            return MCPProtocolHandler(logger)
+
+    def test_startup_check_accepts_shipped_definitions(self, logger, tools_config_dir):
+        """Test the shipped descriptions and schemas pass the startup check"""
+        handler = self.create_handler_with_config(logger, tools_config_dir)
+        assert len(handler.static_results["tools/list"]["tools"]) == 7
+
+    def test_startup_check_missing_description(self, logger, tools_config_dir):
+        """Test a tool without a description file fails at startup"""
+        (tools_config_dir / "descriptions" / "forget_context.md").unlink()
+
+        with pytest.raises(ConfigurationError, match="forget_context"):
+            self.create_handler_with_config(logger, tools_config_dir)
+
+    def test_startup_check_inconsistent_schema(self, logger, tools_config_dir):
+        """Test undefined required fields and unknown tools fail at startup"""
+        schemas_file = tools_config_dir / "schema" / "input_schemas.json"
+        schemas = json.loads(schemas_file.read_text())
+        schemas["save_context"]["required"].append("missing_field")
+        schemas["retired_tool"] = {"type": "object", "properties": {}}
+        schemas_file.write_text(json.dumps(schemas))
+
+        with pytest.raises(ConfigurationError) as exc_info:
+            self.create_handler_with_config(logger, tools_config_dir)
+
+        assert "missing_field" in str(exc_info.value)
+        assert "retired_tool" in str(exc_info.value)
+
     async def test_handle_tools_call(self, protocol_handler, mock_tools_handler):
         """Test tools/call delegation"""
         result = await protocol_handler.handle_request(
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests for repository query plans
+
+Records every statement ContextRepository and TagsRepository issue, runs
+EXPLAIN QUERY PLAN on it and checks that it uses the index it was designed
+for and never sorts or de-duplicates in a temp B-tree.
+"""
+
+import inspect
+import sqlite3
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import aiosqlite
+import pytest
+import pytest_asyncio
+
+from extended_memory_mcp.core.memory.context_repository import ContextRepository
+from extended_memory_mcp.core.memory.migrations import PLAIN_CONTENT_FUNCTION
+from extended_memory_mcp.core.memory.tags_repository import TagsRepository
+from extended_memory_mcp.core.storage.content_codec import decompress
+from extended_memory_mcp.core.storage.providers.sqlite.sqlite_provider import (
+    SQLiteStorageProvider,
+)
+
+WEIGHTS = {
+    "bm25_weight": 1.0,
+    "importance_weight": 0.5,
+    "recency_weight": 0.5,
+    "recency_half_life_days": 30,
+}
+
+# (case, repository, method, args, kwargs, expected plan fragments)
+CASES = [
+    ("save_context", "context_repo", "save_context", ("new", 5, "p1", ["t1", "new"]), {},
+     ["sqlite_autoindex_tags_1 (name=?)"]),
+    ("save_contexts_batch", "context_repo", "save_contexts_batch",
+     ([{"content": "new", "importance_level": 5, "project_id": "p1", "tags": ["t1"]}],), {},
+     ["sqlite_autoindex_tags_1 (name=?)"]),
+    ("load_contexts", "context_repo", "load_contexts", (None, 5, 10), {},
+     ["SCAN contexts USING INDEX idx_contexts_created_ms"]),
+    ("load_contexts_project", "context_repo", "load_contexts", ("p1", 5, 10), {},
+     ["SEARCH contexts USING INDEX idx_contexts_project_created_ms (project_id=?)"]),
+    ("load_contexts_before", "context_repo", "load_contexts", (None, 5, 10),
+     {"before": ("2999-01-01", 10)},
+     ["idx_contexts_created_ms (created_ms=? AND rowid<?)",
+      "idx_contexts_created_ms (created_ms<?)"]),
+    ("load_contexts_project_before", "context_repo", "load_contexts", ("p1", 5, 10),
+     {"before": ("2999-01-01", 10)},
+     ["idx_contexts_project_created_ms (project_id=? AND created_ms=? AND rowid<?)",
+      "idx_contexts_project_created_ms (project_id=? AND created_ms<?)"]),
+    ("load_contexts_tags", "context_repo", "load_contexts", (None, 5, 10),
+     {"tags": ["t1", "t2"]},
+     ["SCAN contexts USING INDEX idx_contexts_created_ms",
+      "sqlite_autoindex_context_tags_1 (context_id=? AND tag_id=?)"]),
+    ("load_contexts_project_tags", "context_repo", "load_contexts", ("p1", 5, 10),
+     {"tags": ["t1"]},
+     ["idx_contexts_project_created_ms (project_id=?)",
+      "sqlite_autoindex_context_tags_1 (context_id=? AND tag_id=?)"]),
+    ("get_context_by_id", "context_repo", "get_context_by_id", (3,), {},
+     ["SEARCH contexts USING INTEGER PRIMARY KEY (rowid=?)"]),
+    ("delete_context", "context_repo", "delete_context", (4,), {},
+     ["SEARCH contexts USING INTEGER PRIMARY KEY (rowid=?)"]),
+    ("delete_expired", "context_repo", "delete_expired", (2**62, 10), {},
+     ["COVERING INDEX idx_contexts_expires_ms (expires_ms<?)"]),
+    ("count_projects_over", "context_repo", "count_projects_over", (10,), {},
+     ["COVERING INDEX idx_contexts_project_created_ms (project_id>?)"]),
+    ("delete_oldest", "context_repo", "delete_oldest", ("p1", 10), {},
+     ["COVERING INDEX idx_contexts_project_created_ms (project_id=?)"]),
+    ("count_contexts", "context_repo", "count_contexts", (None,), {},
+     ["SCAN contexts USING COVERING INDEX idx_contexts_created_ms"]),
+    ("count_contexts_project", "context_repo", "count_contexts", ("p1",), {},
+     ["COVERING INDEX idx_contexts_project_created_ms (project_id=?)"]),
+    ("get_contexts_by_importance", "context_repo", "get_contexts_by_importance", (7, 5), {},
+     ["SCAN contexts USING INDEX idx_contexts_created_ms"]),
+    ("load_contexts_by_ids", "context_repo", "load_contexts_by_ids", ([1, 2, 3],), {},
+     ["SEARCH contexts USING INTEGER PRIMARY KEY (rowid=?)"]),
+    ("search_like", "context_repo", "search_contexts_optimized", (None, 1, "-", 5), {},
+     ["SCAN contexts USING INDEX idx_contexts_created_ms"]),
+    ("search_like_project", "context_repo", "search_contexts_optimized", ("p1", 1, "-", 5), {},
+     ["idx_contexts_project_created_ms (project_id=?)"]),
+    ("search_before_project", "context_repo", "search_contexts_optimized", ("p1", 1, None, 5),
+     {"before": ("2999-01-01", 10)},
+     ["idx_contexts_project_created_ms (project_id=? AND created_ms<?)"]),
+    ("search_full_text", "context_repo", "search_contexts_optimized", ("p1", 1, "alpha", 5), {},
+     ["SCAN contexts_fts VIRTUAL TABLE", "SEARCH contexts USING INTEGER PRIMARY KEY (rowid=?)"]),
+    ("search_ranked", "context_repo", "search_contexts_ranked", ('"alpha"', WEIGHTS, "p1"), {},
+     ["SCAN contexts_fts VIRTUAL TABLE", "SEARCH contexts USING INTEGER PRIMARY KEY (rowid=?)"]),
+    ("save_context_tags", "tags_repo", "save_context_tags", (3, ["t1", "extra"]), {},
+     ["sqlite_autoindex_tags_1 (name=?)"]),
+    ("load_context_tags", "tags_repo", "load_context_tags", (3,), {},
+     ["sqlite_autoindex_context_tags_1 (context_id=?)"]),
+    ("load_context_tags_batch", "tags_repo", "load_context_tags_batch", ([1, 2, 3],), {},
+     ["sqlite_autoindex_context_tags_1 (context_id=?)"]),
+    ("get_popular_tags", "tags_repo", "get_popular_tags", (), {},
+     ["COVERING INDEX idx_tag_stats_rank (project_id=? AND usage_count>?)",
+      "COVERING INDEX idx_tag_stats_rank (project_id=? AND usage_count=? AND last_used>?)"]),
+    ("get_popular_tags_project", "tags_repo", "get_popular_tags", (), {"project_id": "p1"},
+     ["COVERING INDEX idx_tag_stats_rank (project_id=? AND usage_count>?)"]),
+    ("find_contexts_by_tag", "tags_repo", "find_contexts_by_tag", ("t1",), {},
+     ["idx_context_tags_composite (tag_id=?)"]),
+    ("find_contexts_by_tag_project", "tags_repo", "find_contexts_by_tag", ("t1",),
+     {"project_id": "p1"},
+     ["idx_context_tags_composite (tag_id=?)", "INTEGER PRIMARY KEY (rowid=?)"]),
+    ("find_contexts_by_multiple_tags", "tags_repo", "find_contexts_by_multiple_tags",
+     (["t1", "t2"],), {},
+     ["SCAN c USING COVERING INDEX idx_contexts_created_ms",
+      "sqlite_autoindex_context_tags_1 (context_id=? AND tag_id=?)"]),
+    ("find_contexts_by_multiple_tags_project", "tags_repo", "find_contexts_by_multiple_tags",
+     (["t1", "t2"],), {"project_id": "p1"},
+     ["COVERING INDEX idx_contexts_project_created_ms (project_id=?)",
+      "sqlite_autoindex_context_tags_1 (context_id=? AND tag_id=?)"]),
+    ("delete_context_tags", "tags_repo", "delete_context_tags", (3,), {},
+     ["sqlite_autoindex_context_tags_1 (context_id=?)"]),
+    ("cleanup_unused_tags", "tags_repo", "cleanup_unused_tags", (), {},
+     ["SCAN context_tags USING COVERING INDEX idx_context_tags_composite"]),
+]
+
+# Orderings no index can provide: a computed relevance score
+SORTED_RESULTS = {"search_ranked": {"USE TEMP B-TREE FOR ORDER BY"}}
+
+# Full scans that are the point of the statement
+FULL_SCANS = {"cleanup_unused_tags": {"SCAN tags"}}
+
+PLANNED_KEYWORDS = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+
+async def record_statements(call):
+    """Await call and return the (sql, params) of every statement it executed"""
+    statements = []
+    execute, executemany = aiosqlite.Connection.execute, aiosqlite.Connection.executemany
+
+    def recording_execute(self, sql, parameters=None):
+        statements.append((sql, parameters or ()))
+        return execute(self, sql, parameters)
+
+    def recording_executemany(self, sql, parameters):
+        parameters = list(parameters)
+        statements.append((sql, parameters[0] if parameters else ()))
+        return executemany(self, sql, parameters)
+
+    with patch.object(aiosqlite.Connection, "execute", recording_execute), patch.object(
+        aiosqlite.Connection, "executemany", recording_executemany
+    ):
+        await call
+
+    return [
+        (sql, params)
+        for sql, params in statements
+        if sql.split(None, 1)[0].upper() in PLANNED_KEYWORDS
+    ]
+
+
+def explain(db_path, sql, params):
+    """EXPLAIN QUERY PLAN detail lines of one statement"""
+    conn = sqlite3.connect(db_path)
+    conn.create_function(PLAIN_CONTENT_FUNCTION, 2, decompress)
+    try:
+        return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+    finally:
+        conn.close()
+
+
+class TestQueryPlans:
+    """Test suite for the index usage of repository statements"""
+
+    @pytest_asyncio.fixture
+    async def provider(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            provider = SQLiteStorageProvider(str(Path(temp_dir) / "plans.db"))
+            await provider.initialize()
+            await provider.save_contexts_batch(
+                [
+                    {
+                        "content": f"note {i} alpha",
+                        "importance_level": 1 + i % 10,
+                        "project_id": f"p{i % 3}",
+                        "tags": [f"t{i % 5}", "common"],
+                    }
+                    for i in range(200)
+                ]
+            )
+            yield provider
+            await provider.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "case, repository, method, args, kwargs, expected",
+        CASES,
+        ids=[case[0] for case in CASES],
+    )
+    async def test_statement_uses_intended_index(
+        self, provider, case, repository, method, args, kwargs, expected
+    ):
+        if "fts" in " ".join(expected) and not provider.db_manager.full_text_search:
+            pytest.skip("SQLite built without FTS5")
+
+        repo = getattr(provider, repository)
+        statements = await record_statements(getattr(repo, method)(*args, **kwargs))
+        assert statements, f"{case} executed no statements"
+
+        plans = [explain(provider.db_manager.db_path, sql, params) for sql, params in statements]
+        plan_text = "\n".join(line for plan in plans for line in plan)
+        for fragment in expected:
+            assert fragment in plan_text, f"{case}: {fragment!r} not in plan\n{plan_text}"
+
+        allowed_sorts = SORTED_RESULTS.get(case, set())
+        allowed_scans = FULL_SCANS.get(case, set())
+        for line in plan_text.splitlines():
+            if "TEMP B-TREE" in line:
+                assert line in allowed_sorts, f"{case} sorts in a temp B-tree:\n{plan_text}"
+            # SCAN (subquery-N) reads a subquery result, not a table
+            if line.startswith("SCAN ") and " USING " not in line and "SCAN (" not in line:
+                assert (
+                    "VIRTUAL TABLE" in line or "CONSTANT ROW" in line or line in allowed_scans
+                ), f"{case} scans a table:\n{plan_text}"
+
+    def test_every_repository_method_has_a_plan_case(self):
+        covered = {(case[1], case[2]) for case in CASES}
+        for repository, cls in (("context_repo", ContextRepository), ("tags_repo", TagsRepository)):
+            methods = {
+                name
+                for name, member in inspect.getmembers(cls, inspect.iscoroutinefunction)
+                if not name.startswith("_")
+            }
+            assert methods == {method for repo, method in covered if repo == repository}
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests for ranked search
+
+Tests the shared scoring rules (weights, BM25, snippets), search_contexts_ranked
+on the SQLite and Redis providers and the search_contexts MCP tool.
+"""
+
+import json
+import logging
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytest_asyncio
+
+from extended_memory_mcp.core.errors import ConfigurationError
+from extended_memory_mcp.core.storage.providers.redis.redis_provider import RedisStorageProvider
+from extended_memory_mcp.core.storage.providers.sqlite.sqlite_provider import (
+    SQLiteStorageProvider,
+)
+from extended_memory_mcp.core.storage.search_ranking import (
+    combine_score,
+    get_search_weights,
+    make_snippet,
+    rank_contexts,
+)
+from extended_memory_mcp.formatters.summary_formatter import ContextSummaryFormatter
+from extended_memory_mcp.tools.memory_tools import MemoryToolsHandler
+
+NOW = datetime(2026, 6, 1, 12, 0, 0)
+
+CONTEXTS = [
+    {
+        "content": "Cache invalidation notes for the cache layer and cache keys",
+        "importance_level": 5,
+    },
+    {"content": "We chose Redis as cache backend", "importance_level": 9},
+    {"content": "Database migrations run at startup", "importance_level": 8},
+    {"content": "Long meeting notes " + "filler words here " * 30 + "cache", "importance_level": 5},
+]
+
+ONLY_TEXT = {
+    "bm25_weight": 1.0,
+    "importance_weight": 0.0,
+    "recency_weight": 0.0,
+    "recency_half_life_days": 30,
+}
+
+
+class TestSearchRanking:
+    """Test suite for the scoring rules shared by all providers"""
+
+    def test_weights_from_defaults_and_overrides(self):
+        weights = get_search_weights({"importance_weight": 2})
+        assert weights["importance_weight"] == 2.0
+        assert weights["bm25_weight"] == 1.0
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {"bm25_weight": -1},
+            {"recency_weight": "high"},
+            {"popularity": 1},
+            {"recency_half_life_days": 0},
+        ],
+    )
+    def test_invalid_weights(self, overrides):
+        with pytest.raises(ConfigurationError):
+            get_search_weights(overrides)
+
+    def test_recency_halves_at_half_life(self):
+        weights = {**ONLY_TEXT, "bm25_weight": 0.0, "recency_weight": 1.0}
+        assert combine_score(1.0, 5, 0, weights) == 1.0
+        assert combine_score(1.0, 5, 30, weights) == 0.5
+
+    def test_snippet_highlights_matches(self):
+        content = "one two three four five six seven eight cache nine ten eleven twelve end"
+        snippet = make_snippet(content, ["cache"], tokens=6)
+        assert "**cache**" in snippet
+        assert snippet.startswith("…") and snippet.endswith("…")
+        assert make_snippet("short cache note", ["cache"]) == "short **cache** note"
+
+    def test_bm25_prefers_frequent_terms_in_short_documents(self):
+        contexts = [dict(c, id=i) for i, c in enumerate(CONTEXTS)]
+        hits = rank_contexts(contexts, "cache", ONLY_TEXT, limit=10, now=NOW)
+        assert [h["id"] for h in hits] == [0, 1, 3]
+        assert hits[0]["score"] == 1.0
+
+    def test_importance_and_recency_weights(self):
+        contexts = [
+            {"id": "old", "content": "cache", "importance_level": 9, "created_at": "2026-01-01"},
+            {"id": "new", "content": "cache", "importance_level": 3, "created_at": "2026-06-01"},
+        ]
+        by_importance = {**ONLY_TEXT, "importance_weight": 1.0}
+        by_recency = {**ONLY_TEXT, "recency_weight": 1.0}
+
+        assert rank_contexts(contexts, "cache", by_importance, 1, now=NOW)[0]["id"] == "old"
+        assert rank_contexts(contexts, "cache", by_recency, 1, now=NOW)[0]["id"] == "new"
+
+
+class TestSQLiteRankedSearch:
+    """Test suite for SQLiteStorageProvider.search_contexts_ranked"""
+
+    @pytest_asyncio.fixture
+    async def provider(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            provider = SQLiteStorageProvider(str(Path(temp_dir) / "ranked.db"))
+            await provider.initialize()
+            for i, context in enumerate(CONTEXTS):
+                await provider.save_context(
+                    context["content"],
+                    context["importance_level"],
+                    project_id="other" if i == 2 else "proj",
+                    tags=["memo"] if i == 1 else [],
+                )
+            yield provider
+            await provider.close()
+
+    @pytest.mark.asyncio
+    async def test_ranked_hits_with_snippets_and_tags(self, provider):
+        hits = await provider.search_contexts_ranked("cache", weights=ONLY_TEXT)
+
+        assert [h["id"] for h in hits] == [1, 2, 4]
+        assert hits[0]["score"] == pytest.approx(1.0)
+        assert all("**cache**" in h["snippet"] for h in hits)
+        assert len(hits[2]["snippet"]) < len(CONTEXTS[3]["content"])
+        assert hits[1]["tags"] == ["memo"]
+
+    @pytest.mark.asyncio
+    async def test_filters(self, provider):
+        assert await provider.search_contexts_ranked("migrations", project_id="proj") == []
+        assert len(await provider.search_contexts_ranked("cache", min_importance=9)) == 1
+        assert await provider.search_contexts_ranked("cache redis meeting") == []
+        assert await provider.search_contexts_ranked("!!!") == []
+
+    @pytest.mark.asyncio
+    async def test_importance_weight_changes_order(self, provider):
+        hits = await provider.search_contexts_ranked(
+            "cache", weights={**ONLY_TEXT, "importance_weight": 5.0}
+        )
+        assert hits[0]["id"] == 2
+
+    @pytest.mark.asyncio
+    async def test_python_fallback_agrees_with_fts(self, provider):
+        fts_hits = await provider.search_contexts_ranked("cache notes", weights=ONLY_TEXT)
+
+        provider.db_manager.full_text_search = False
+        fallback_hits = await provider.search_contexts_ranked("cache notes", weights=ONLY_TEXT)
+
+        assert [h["id"] for h in fallback_hits] == [h["id"] for h in fts_hits] == [1, 4]
+
+
+class TestRedisRankedSearch:
+    """Test suite for RedisStorageProvider.search_contexts_ranked (mocked Redis)"""
+
+    @pytest.fixture
+    def provider(self):
+        with patch("redis.asyncio.Redis"):
+            provider = RedisStorageProvider(key_prefix="test", ttl_hours=1)
+
+        created_at = datetime.now().isoformat()
+        stored = [
+            json.dumps(
+                dict(context, id=f"ctx{i}", project_id="proj", created_at=created_at, tags=[])
+            )
+            for i, context in enumerate(CONTEXTS)
+        ]
+        mock_redis = MagicMock()
+        mock_redis.exists = AsyncMock(return_value=1)
+        mock_redis.zrevrange = AsyncMock(
+            side_effect=[[f"ctx{i}".encode() for i in range(len(stored))], []]
+        )
+        mock_redis.mget = AsyncMock(return_value=stored)
+
+        async def get_connection():
+            return mock_redis
+
+        provider.connection_service.get_connection = get_connection
+        provider._mock_redis = mock_redis
+        return provider
+
+    @pytest.mark.asyncio
+    async def test_same_ranking_as_sqlite(self, provider):
+        hits = await provider.search_contexts_ranked("cache", weights=ONLY_TEXT)
+
+        assert [h["id"] for h in hits] == ["ctx0", "ctx1", "ctx3"]
+        assert "**cache**" in hits[1]["snippet"]
+        provider._mock_redis.mget.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_importance_filter(self, provider):
+        hits = await provider.search_contexts_ranked("cache", min_importance=9)
+        assert [h["id"] for h in hits] == ["ctx1"]
+
+
+class FakeRedis:
+    """Just enough of redis.asyncio for saving contexts and reading them back"""
+
+    def __init__(self):
+        self.strings = {}
+        self.zsets = {}
+        self.lists = {}
+
+    async def set(self, key, value, ex=None):
+        self.strings[key] = value
+
+    async def mget(self, keys):
+        return [self.strings.get(key) for key in keys]
+
+    async def exists(self, key):
+        return int(key in self.strings or key in self.zsets or key in self.lists)
+
+    async def expire(self, key, seconds):
+        pass
+
+    async def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    async def zrem(self, key, *members):
+        for member in members:
+            self.zsets.get(key, {}).pop(member, None)
+
+    async def zrevrange(self, key, start, end):
+        ordered = sorted(self.zsets.get(key, {}).items(), key=lambda m: (m[1], m[0]))
+        return [member.encode() for member, _ in reversed(ordered)][start : end + 1]
+
+    async def lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, value)
+
+    async def keys(self, pattern):
+        raise AssertionError("KEYS must not be used")
+
+
+class TestRedisSearchKeyLayout:
+    """Test suite for Redis searches against the key layout save_context writes"""
+
+    @pytest_asyncio.fixture
+    async def provider(self):
+        with patch("redis.asyncio.Redis"):
+            provider = RedisStorageProvider(key_prefix="test", ttl_hours=1)
+
+        fake = FakeRedis()
+
+        async def get_connection():
+            return fake
+
+        provider.connection_service.get_connection = get_connection
+        provider._fake = fake
+        for project_id in ("alpha", "beta"):
+            for context in CONTEXTS:
+                await provider.save_context(
+                    context["content"], context["importance_level"], project_id=project_id
+                )
+        return provider
+
+    @pytest.mark.asyncio
+    async def test_ranked_search_is_scoped_to_project(self, provider):
+        hits = await provider.search_contexts_ranked("cache", project_id="alpha")
+        assert len(hits) == 3
+        assert {h["project_id"] for h in hits} == {"alpha"}
+
+        hits = await provider.search_contexts_ranked("cache", limit=10)
+        assert sorted(h["project_id"] for h in hits) == ["alpha"] * 3 + ["beta"] * 3
+
+    @pytest.mark.asyncio
+    async def test_filtered_search_is_scoped_to_project(self, provider):
+        service = provider.context_service
+        results = await service.search_contexts({"project_id": "beta", "content_search": "cache"})
+        assert len(results) == 3
+        assert {c["project_id"] for c in results} == {"beta"}
+
+        results = await service.search_contexts({"min_importance": 8})
+        assert len(results) == 4
+
+    @pytest.mark.asyncio
+    async def test_expired_members_are_dropped(self, provider):
+        timeline = provider._fake.zsets["test:project:alpha:timeline"]
+        expired = next(iter(timeline))
+        del provider._fake.strings[f"test:context:{expired}"]
+
+        results = await provider.context_service.search_contexts({"project_id": "alpha"})
+        assert len(results) == 3
+        assert expired not in timeline
+
+
+class TestSearchContextsTool:
+    """Test suite for the search_contexts MCP tool"""
+
+    @pytest_asyncio.fixture
+    async def handler(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            provider = SQLiteStorageProvider(str(Path(temp_dir) / "tool.db"))
+            await provider.initialize()
+            yield MemoryToolsHandler(
+                provider, ContextSummaryFormatter(), logging.getLogger("test")
+            )
+            await provider.close()
+
+    @pytest.mark.asyncio
+    async def test_tool_returns_snippets(self, handler):
+        long_content = "Decision: " + "context " * 100 + "we use sqlite for storage"
+        await handler.storage_provider.save_context(long_content, 8, project_id="proj")
+
+        result = await handler.execute_tool("search_contexts", {"query": "SQLite storage"})
+
+        text = result["content"][0]["text"]
+        assert "1 contexts for 'SQLite storage'" in text
+        assert "**sqlite** for **storage**" in text
+        assert long_content not in text
+
+    @pytest.mark.asyncio
+    async def test_tool_no_results_and_empty_query(self, handler):
+        result = await handler.execute_tool("search_contexts", {"query": "missing"})
+        assert "No contexts" in result["content"][0]["text"]
+
+        result = await handler.execute_tool("search_contexts", {"query": "  "})
+        assert "must not be empty" in result["content"][0]["text"]
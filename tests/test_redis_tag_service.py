@@ -24,6 +24,7 @@ Tests for Redis Tag Service
 Tests basic tag operations and error handling
 """
 
+import asyncio
 import sys
 import json
 import pytest
@@ -265,3 +266,28 @@ class TestRedisTagService:
         
         # Verify all requests were made
         assert mock_redis.get.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_cancellation_aborts_pipeline(self, tag_service, mock_connection_service):
+        """Test that cancelling a caller propagates into the pipeline instead of being swallowed"""
+        mock_redis = AsyncMock()
+        mock_connection_service.get_connection = AsyncMock(return_value=mock_redis)
+        mock_connection_service.make_key.side_effect = lambda *parts: ":".join(("test",) + parts)
+        mock_redis.keys.return_value = ["test:tag:python:contexts"]
+
+        started = asyncio.Event()
+
+        async def slow_execute():
+            started.set()
+            await asyncio.sleep(10)
+
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(side_effect=slow_execute)
+        mock_redis.pipeline = MagicMock(return_value=pipe)
+
+        task = asyncio.create_task(tag_service.get_popular_tags_optimized(limit=5))
+        await asyncio.wait_for(started.wait(), timeout=5)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests for Request Dispatcher
+
+Tests concurrent JSON-RPC dispatch, in-flight limits, MCP ordering rules,
+batch requests, deadlines and cancellation.
+"""
+
+import asyncio
+import logging
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from extended_memory_mcp.protocol.request_dispatcher import (
+    RequestDispatcher,
+    create_request_dispatcher,
+)
+
+
+class RecordingHandler:
+    """Handler double that records start/finish order and sleeps per method"""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.events = []
+        self.running = 0
+        self.max_running = 0
+
+    async def __call__(self, method, params, request_id):
+        self.events.append(("start", method, request_id))
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delays.get(method, 0))
+            if method == "boom":
+                raise ValueError("handler failed")
+            if method.startswith("notifications/"):
+                return None
+            return {"method": method}
+        finally:
+            self.running -= 1
+            self.events.append(("finish", method, request_id))
+
+
+class TestRequestDispatcher:
+    """Test suite for RequestDispatcher"""
+
+    @pytest.fixture
+    def builder(self):
+        """Create mock response builder"""
+        builder = MagicMock()
+        builder.wait_writable = AsyncMock()
+        return builder
+
+    @staticmethod
+    def sent(builder):
+        """Return responses passed to send_response, in order"""
+        return [c.args[0] for c in builder.send_response.call_args_list]
+
+    def make_dispatcher(self, handler, builder, max_in_flight=8, request_timeout=None):
+        return RequestDispatcher(
+            handler,
+            logger=logging.getLogger("test"),
+            max_in_flight=max_in_flight,
+            response_builder=builder,
+            request_timeout=request_timeout,
+        )
+
+    async def test_slow_request_does_not_block_fast_one(self, builder):
+        """Test that a cheap request is answered before an earlier slow one"""
+        handler = RecordingHandler(delays={"tools/call": 0.2})
+        dispatcher = self.make_dispatcher(handler, builder)
+
+        await dispatcher.dispatch({"jsonrpc": "2.0", "id": 1, "method": "tools/call"})
+        await dispatcher.dispatch({"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+        await dispatcher.drain()
+
+        answered = [r["id"] for r in self.sent(builder)]
+        assert answered == [2, 1]
+
+    async def test_responses_matched_by_id(self, builder):
+        """Test that each response carries its own request id and result"""
+        handler = RecordingHandler(delays={"a": 0.05, "b": 0.01, "c": 0.03})
+        dispatcher = self.make_dispatcher(handler, builder)
+
+        for request_id, method in [(10, "a"), (11, "b"), (12, "c")]:
+            await dispatcher.dispatch({"id": request_id, "method": method})
+        await dispatcher.drain()
+
+        results = {r["id"]: r["result"] for r in self.sent(builder)}
+        assert results == {10: {"method": "a"}, 11: {"method": "b"}, 12: {"method": "c"}}
+
+    async def test_in_flight_limit(self, builder):
+        """Test that no more than max_in_flight requests run concurrently"""
+        handler = RecordingHandler(delays={"tools/call": 0.02})
+        dispatcher = self.make_dispatcher(handler, builder, max_in_flight=2)
+
+        for request_id in range(6):
+            await dispatcher.dispatch({"id": request_id, "method": "tools/call"})
+            assert dispatcher.in_flight <= 2
+        await dispatcher.drain()
+
+        assert handler.max_running == 2
+        assert builder.send_response.call_count == 6
+
+    async def test_initialize_waits_for_in_flight_requests(self, builder):
+        """Test that initialize starts only after earlier requests finished"""
+        handler = RecordingHandler(delays={"tools/call": 0.05})
+        dispatcher = self.make_dispatcher(handler, builder)
+
+        await dispatcher.dispatch({"id": 1, "method": "tools/call"})
+        await dispatcher.dispatch({"id": 2, "method": "initialize"})
+
+        assert handler.events.index(("finish", "tools/call", 1)) < handler.events.index(
+            ("start", "initialize", 2)
+        )
+        # initialize has already been answered when dispatch returns
+        assert self.sent(builder)[-1]["id"] == 2
+
+    async def test_notifications_handled_inline_in_order(self, builder):
+        """Test that notifications are processed in arrival order without a response"""
+        handler = RecordingHandler()
+        dispatcher = self.make_dispatcher(handler, builder)
+
+        await dispatcher.dispatch({"method": "notifications/initialized"})
+        await dispatcher.dispatch({"method": "notifications/other"})
+
+        starts = [e[1] for e in handler.events if e[0] == "start"]
+        assert starts == ["notifications/initialized", "notifications/other"]
+        assert dispatcher.in_flight == 0
+        builder.send_response.assert_not_called()
+
+    async def test_handler_error_sends_internal_error(self, builder):
+        """Test that handler exceptions become internal error responses"""
+        dispatcher = self.make_dispatcher(RecordingHandler(), builder)
+
+        await dispatcher.dispatch({"id": 7, "method": "boom"})
+        await dispatcher.drain()
+
+        (response,) = self.sent(builder)
+        assert response["id"] == 7
+        assert response["error"]["code"] == -32603
+        assert "handler failed" in response["error"]["data"]
+
+    async def test_batch_members_run_concurrently(self, builder):
+        """Test that batch members execute in parallel and share one response"""
+        handler = RecordingHandler(delays={"a": 0.05, "b": 0.05, "c": 0.05})
+        dispatcher = self.make_dispatcher(handler, builder)
+
+        batch = [{"id": i, "method": m} for i, m in enumerate(["a", "b", "c"], start=1)]
+        await dispatcher.dispatch(batch)
+        assert dispatcher.in_flight == 1
+        await dispatcher.drain()
+
+        assert handler.max_running == 3
+        (response,) = self.sent(builder)
+        assert isinstance(response, list)
+        assert [r["id"] for r in response] == [1, 2, 3]
+        assert response[1]["result"] == {"method": "b"}
+
+    async def test_batch_mixed_members(self, builder):
+        """Test notifications, errors and invalid members inside a batch"""
+        dispatcher = self.make_dispatcher(RecordingHandler(), builder)
+
+        await dispatcher.dispatch(
+            [
+                {"method": "notifications/initialized"},
+                {"id": 1, "method": "tools/list"},
+                {"id": 2, "method": "boom"},
+                42,
+            ]
+        )
+        await dispatcher.drain()
+
+        (response,) = self.sent(builder)
+        assert len(response) == 3
+        assert response[0] == {"jsonrpc": "2.0", "id": 1, "result": {"method": "tools/list"}}
+        assert response[1]["error"]["code"] == -32603
+        assert response[2]["error"]["code"] == -32600
+
+    async def test_notification_only_batch_sends_nothing(self, builder):
+        """Test that a batch of notifications produces no response"""
+        handler = RecordingHandler()
+        dispatcher = self.make_dispatcher(handler, builder)
+
+        await dispatcher.dispatch([{"method": "notifications/a"}, {"method": "notifications/b"}])
+        await dispatcher.drain()
+
+        assert [e[1] for e in handler.events if e[0] == "start"] == [
+            "notifications/a",
+            "notifications/b",
+        ]
+        builder.send_response.assert_not_called()
+
+    async def test_empty_batch_and_non_object_are_invalid(self, builder):
+        """Test that empty batches and scalar messages get Invalid Request"""
+        dispatcher = self.make_dispatcher(RecordingHandler(), builder)
+
+        await dispatcher.dispatch([])
+        await dispatcher.dispatch("tools/list")
+
+        responses = self.sent(builder)
+        assert [r["error"]["code"] for r in responses] == [-32600, -32600]
+        assert all(r["id"] == 0 for r in responses)
+
+    async def test_request_deadline(self, builder):
+        """Test that a request over its deadline is aborted and answered with a timeout"""
+        handler = RecordingHandler(delays={"tools/call": 10})
+        dispatcher = self.make_dispatcher(handler, builder, request_timeout=0.05)
+
+        await dispatcher.dispatch({"id": 3, "method": "tools/call"})
+        await dispatcher.drain()
+
+        (response,) = self.sent(builder)
+        assert response["id"] == 3
+        assert response["error"]["code"] == -32001
+        # Handler was cancelled and unwound, not left running
+        assert handler.running == 0
+        assert ("finish", "tools/call", 3) in handler.events
+
+    async def test_cancel_notification(self, builder):
+        """Test that notifications/cancelled stops the request and suppresses its response"""
+        handler = RecordingHandler(delays={"tools/call": 10})
+        dispatcher = self.make_dispatcher(handler, builder)
+
+        await dispatcher.dispatch({"id": "abc", "method": "tools/call"})
+        await asyncio.sleep(0.01)
+        await dispatcher.dispatch(
+            {"method": "notifications/cancelled", "params": {"requestId": "abc"}}
+        )
+        await dispatcher.drain()
+
+        assert handler.running == 0
+        builder.send_response.assert_not_called()
+        assert not dispatcher.cancel("abc")
+
+    async def test_cancel_batch_member(self, builder):
+        """Test that one batch member can be cancelled while the others are answered"""
+        handler = RecordingHandler(delays={"slow": 10, "fast": 0.05})
+        dispatcher = self.make_dispatcher(handler, builder)
+
+        await dispatcher.dispatch([{"id": 1, "method": "slow"}, {"id": 2, "method": "fast"}])
+        await asyncio.sleep(0.01)
+        assert dispatcher.cancel(1, "no longer needed")
+        await dispatcher.drain()
+
+        (response,) = self.sent(builder)
+        assert [r["id"] for r in response] == [2]
+
+    def test_factory_uses_configured_limit(self):
+        """Test factory function reads the in-flight limit from config"""
+
+        async def handler(method, params, request_id):
+            return None
+
+        dispatcher = create_request_dispatcher(handler)
+        assert isinstance(dispatcher, RequestDispatcher)
+        assert dispatcher.max_in_flight == 8
+
+        assert dispatcher.request_timeout == 30.0
+
+        assert create_request_dispatcher(handler, max_in_flight=3).max_in_flight == 3
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests for Response Writer
+
+Tests coalescing, backpressure and JSONRPCResponseBuilder integration.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+from unittest.mock import MagicMock
+
+import pytest
+
+from extended_memory_mcp.core import json_codec
+from extended_memory_mcp.responses.json_rpc_builder import JSONRPCResponseBuilder
+from extended_memory_mcp.responses.response_writer import ResponseWriter, create_response_writer
+
+
+def read_available(read_fd: int) -> bytes:
+    """Read everything currently buffered in a non-blocking pipe"""
+    os.set_blocking(read_fd, False)
+    chunks = []
+    while True:
+        try:
+            chunk = os.read(read_fd, 65536)
+        except BlockingIOError:
+            break
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+class TestResponseWriter:
+    """Test suite for ResponseWriter"""
+
+    @pytest.fixture
+    def pipe(self):
+        """Create pipe: (read fd, binary write stream)"""
+        read_fd, write_fd = os.pipe()
+        write_stream = os.fdopen(write_fd, "wb", buffering=0)
+        yield read_fd, write_stream
+        os.close(read_fd)
+        try:
+            write_stream.close()
+        except OSError:
+            pass
+
+    async def test_coalesces_same_tick_writes(self, pipe):
+        """Test that messages queued in one loop tick become one write"""
+        read_fd, write_stream = pipe
+        writer = ResponseWriter(stream=write_stream)
+        await writer.start()
+
+        for i in range(3):
+            writer.write(json.dumps({"id": i}).encode() + b"\n")
+        await asyncio.sleep(0.01)
+
+        assert writer.writes_issued == 1
+        assert writer.messages_written == 3
+        assert read_available(read_fd).splitlines() == [b'{"id": 0}', b'{"id": 1}', b'{"id": 2}']
+        await writer.close()
+
+    async def test_backpressure_when_over_high_water(self, pipe):
+        """Test that wait_writable blocks until queued output drops below the mark"""
+        read_fd, write_stream = pipe
+        writer = ResponseWriter(stream=write_stream, high_water_bytes=16)
+        await writer.start()
+
+        writer.write(b"x" * 32 + b"\n")
+        assert writer.pending_bytes >= 16
+
+        waiter = asyncio.create_task(writer.wait_writable())
+        await asyncio.wait_for(waiter, timeout=1.0)
+
+        assert writer.pending_bytes == 0
+        assert read_available(read_fd) == b"x" * 32 + b"\n"
+        await writer.close()
+
+    async def test_close_flushes_pending_output(self, pipe):
+        """Test that close() writes everything still queued"""
+        read_fd, write_stream = pipe
+        writer = ResponseWriter(stream=write_stream)
+        await writer.start()
+
+        writer.write(b'{"id": 1}\n')
+        await writer.close()
+
+        assert read_available(read_fd) == b'{"id": 1}\n'
+
+    async def test_regular_file_fallback(self):
+        """Test writing to a stream that cannot be attached to the loop"""
+        with tempfile.TemporaryFile() as f:
+            writer = ResponseWriter(stream=f)
+            await writer.start()
+            writer.write(b'{"id": 1}\n')
+            writer.write(b'{"id": 2}\n')
+            await writer.close()
+
+            f.seek(0)
+            assert f.read() == b'{"id": 1}\n{"id": 2}\n'
+
+    def test_write_through_when_not_started(self):
+        """Test that an unstarted writer writes synchronously"""
+        with tempfile.TemporaryFile() as f:
+            writer = create_response_writer(stream=f)
+            writer.write(b'{"id": 1}\n')
+            f.seek(0)
+            assert f.read() == b'{"id": 1}\n'
+
+
+class TestResponseBuilderWriterIntegration:
+    """Test that JSONRPCResponseBuilder output goes through the writer"""
+
+    @pytest.fixture
+    def writer(self):
+        writer = MagicMock()
+        JSONRPCResponseBuilder.set_writer(writer)
+        yield writer
+        JSONRPCResponseBuilder.set_writer(None)
+
+    def test_success_and_errors_use_writer(self, writer):
+        """Test that success, error, parse and internal error responses use the writer"""
+        JSONRPCResponseBuilder.send_success_response(1, {"ok": True})
+        JSONRPCResponseBuilder.send_error_response(2, -32601, "Method not found")
+        JSONRPCResponseBuilder.send_parse_error("bad json")
+        JSONRPCResponseBuilder.send_internal_error(3, "boom")
+        JSONRPCResponseBuilder.send_invalid_request("too large")
+        JSONRPCResponseBuilder.send_response(
+            [JSONRPCResponseBuilder.build_success_response(i, {}) for i in (4, 5)]
+        )
+
+        payloads = [c.args[0] for c in writer.write.call_args_list]
+        assert len(payloads) == 6
+        assert all(p.endswith(b"\n") for p in payloads)
+        assert [json.loads(p)["id"] for p in payloads[:5]] == [1, 2, 0, 3, 0]
+        assert json.loads(payloads[4])["error"]["code"] == -32600
+        assert [r["id"] for r in json.loads(payloads[5])] == [4, 5]
+
+    def test_pre_encoded_result_is_spliced(self, writer):
+        """Test that pre-encoded results are written as-is, alone and in batches"""
+        result = json_codec.PreEncodedJSON({"tools": [{"name": "save_context"}]})
+        result.encoded = b'{"tools":"spliced"}'
+
+        JSONRPCResponseBuilder.send_success_response("a", result)
+        JSONRPCResponseBuilder.send_response(
+            [
+                JSONRPCResponseBuilder.build_success_response(1, result),
+                JSONRPCResponseBuilder.build_success_response(2, {"ok": True}),
+            ]
+        )
+
+        single, batch = [json.loads(c.args[0]) for c in writer.write.call_args_list]
+        assert single == {"jsonrpc": "2.0", "id": "a", "result": {"tools": "spliced"}}
+        assert batch == [
+            {"jsonrpc": "2.0", "id": 1, "result": {"tools": "spliced"}},
+            {"jsonrpc": "2.0", "id": 2, "result": {"ok": True}},
+        ]
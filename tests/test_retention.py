@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Tests for the retention engine
+
+Tests expiry tiers, the per-project cap and the batched cleanup_expired
+sweeps of both providers (Redis against an in-memory stand-in).
+"""
+
+import fnmatch
+import sqlite3
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import aiosqlite
+import pytest
+import pytest_asyncio
+
+from extended_memory_mcp.core.errors import ConfigurationError
+from extended_memory_mcp.core.memory.migrations import MIGRATIONS, apply_migrations
+from extended_memory_mcp.core.storage.providers.redis.redis_provider import RedisStorageProvider
+from extended_memory_mcp.core.storage.providers.sqlite.sqlite_provider import (
+    SQLiteStorageProvider,
+)
+from extended_memory_mcp.core.storage.retention import (
+    MS_PER_MONTH,
+    MS_PER_YEAR,
+    RetentionPolicy,
+    create_retention_policy,
+)
+from extended_memory_mcp.core.storage.timestamps import MS_PER_HOUR, to_epoch_ms
+
+SQLITE_NOW_MS = "extended_memory_mcp.core.storage.providers.sqlite.sqlite_provider.now_ms"
+REDIS_NOW_MS = (
+    "extended_memory_mcp.core.storage.providers.redis.services.analytics_service.now_ms"
+)
+
+
+class TestRetentionPolicy:
+    """Test suite for expiry tiers and policy configuration"""
+
+    def test_tiers_follow_importance_thresholds(self):
+        policy = RetentionPolicy()
+        assert policy.expires_ms(1, 1000) == 1000 + 24 * MS_PER_HOUR
+        assert policy.expires_ms(3, 1000) == 1000 + 6 * MS_PER_MONTH
+        assert policy.expires_ms(7, 1000) == 1000 + 6 * MS_PER_MONTH
+        assert policy.expires_ms(8, 1000) == 1000 + MS_PER_YEAR
+
+    def test_zero_or_null_window_never_expires(self):
+        policy = RetentionPolicy(working_memory_hours=0, critical_decisions_years=None)
+        assert policy.expires_ms(1, 1000) is None
+        assert policy.expires_ms(10, 1000) is None
+        assert policy.expires_ms(5, 1000) is not None
+
+    def test_factory_reads_configuration(self):
+        policy = create_retention_policy()
+        assert policy.expires_ms(2, 0) == 24 * MS_PER_HOUR
+        assert policy.max_contexts_per_project == 10000
+        assert policy.sweep_batch_size == 500
+
+    def test_factory_overrides(self):
+        policy = create_retention_policy({"max_contexts_per_project": 0, "sweep_batch_size": 7})
+        assert policy.max_contexts_per_project is None
+        assert policy.sweep_batch_size == 7
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [{"unknown": 1}, {"working_memory_hours": -1}, {"archive_threshold": "high"}],
+    )
+    def test_factory_rejects_bad_settings(self, overrides):
+        with pytest.raises(ConfigurationError):
+            create_retention_policy(overrides)
+
+
+class TestSQLiteRetention:
+    """Test suite for SQLiteStorageProvider expiry and caps"""
+
+    @pytest_asyncio.fixture
+    async def provider(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            provider = SQLiteStorageProvider(str(Path(temp_dir) / "retention.db"))
+            await provider.initialize()
+            yield provider
+            await provider.close()
+
+    async def test_save_sets_expiry(self, provider):
+        context_id = await provider.save_context("scratch", 1, project_id="p1")
+        context = await provider.load_context(context_id)
+        assert context["expires_ms"] == context["created_ms"] + 24 * MS_PER_HOUR
+        assert to_epoch_ms(context["expires_at"]) == context["expires_ms"]
+
+        results = await provider.save_contexts_batch(
+            [{"content": "decision", "importance_level": 9, "project_id": "p1"}]
+        )
+        context = await provider.load_context(results[0]["context_id"])
+        assert context["expires_ms"] == context["created_ms"] + MS_PER_YEAR
+
+    async def test_unexpired_contexts_are_kept(self, provider):
+        await provider.save_context("scratch", 1, project_id="p1")
+        assert await provider.cleanup_expired() == 0
+        assert await provider.context_repo.count_contexts() == 1
+
+    async def test_expired_contexts_are_removed_in_batches(self, provider):
+        provider.retention = RetentionPolicy(sweep_batch_size=2)
+        for i in range(5):
+            await provider.save_context(f"scratch {i}", 1, project_id="p1", tags=["tmp"])
+        keep = await provider.save_context("design", 5, project_id="p1", tags=["tmp"])
+
+        commits = provider.db_manager.write_queue.commits
+        later = (await provider.load_context(keep))["created_ms"] + 25 * MS_PER_HOUR
+        with patch(SQLITE_NOW_MS, return_value=later):
+            assert await provider.cleanup_expired() == 5
+
+        # One write per batch of two: 2 + 2 + 1
+        assert provider.db_manager.write_queue.commits - commits == 3
+        remaining = await provider.load_contexts(importance_threshold=1)
+        assert [str(c["id"]) for c in remaining] == [keep]
+        tags = await provider.get_popular_tags(min_usage=1)
+        assert [(t["tag"], t["count"]) for t in tags] == [("tmp", 1)]
+
+    async def test_projects_over_cap_lose_oldest(self, provider):
+        provider.retention = RetentionPolicy(max_contexts_per_project=3, sweep_batch_size=1)
+        ids = [await provider.save_context(f"p1 note {i}", 9, project_id="p1") for i in range(5)]
+        other = [await provider.save_context(f"p2 note {i}", 9, project_id="p2") for i in range(2)]
+        unscoped = await provider.save_context("global note", 9)
+
+        assert await provider.cleanup_expired() == 2
+        remaining = {str(c["id"]) for c in await provider.load_contexts(importance_threshold=1)}
+        assert remaining == set(ids[2:] + other + [unscoped])
+
+    async def test_migration_backfills_expires_ms(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = str(Path(temp_dir) / "legacy.db")
+            async with aiosqlite.connect(db_path) as db:
+                await apply_migrations(db, MIGRATIONS[:6])
+                await db.execute(
+                    "INSERT INTO contexts (content, importance_level, expires_at)"
+                    " VALUES ('old', 5, '2030-01-01 00:00:00'), ('kept', 5, NULL)"
+                )
+                await db.commit()
+                await apply_migrations(db)
+
+            conn = sqlite3.connect(db_path)
+            try:
+                rows = conn.execute("SELECT content, expires_ms FROM contexts").fetchall()
+            finally:
+                conn.close()
+            assert dict(rows) == {"old": to_epoch_ms("2030-01-01T00:00:00+00:00"), "kept": None}
+
+
+class FakeRedis:
+    """Just enough of redis.asyncio for saves, deletes and sweeps"""
+
+    def __init__(self):
+        self.strings = {}
+        self.zsets = {}
+        self.lists = {}
+
+    async def set(self, key, value, ex=None):
+        self.strings[key] = value
+
+    async def get(self, key):
+        return self.strings.get(key)
+
+    async def mget(self, keys):
+        return [self.strings.get(key) for key in keys]
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.strings.pop(key, None)
+
+    async def expire(self, key, seconds):
+        pass
+
+    async def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    async def zrem(self, key, *members):
+        zset = self.zsets.get(key, {})
+        for member in members:
+            zset.pop(member.decode() if isinstance(member, bytes) else member, None)
+
+    async def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    def _ordered(self, key):
+        return sorted(self.zsets.get(key, {}).items(), key=lambda m: (m[1], m[0]))
+
+    async def zrange(self, key, start, end):
+        return [member.encode() for member, _ in self._ordered(key)[start : end + 1]]
+
+    async def zrangebyscore(self, key, min, max, start=0, num=None):
+        members = [member for member, score in self._ordered(key) if score <= max]
+        return [member.encode() for member in members[start : start + num]]
+
+    async def lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, value)
+
+    async def lrem(self, key, count, value):
+        if value in self.lists.get(key, []):
+            self.lists[key].remove(value)
+
+    async def scan_iter(self, match):
+        for key in list(self.zsets):
+            if fnmatch.fnmatchcase(key, match):
+                yield key
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Queues FakeRedis commands until execute()"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+
+        return queue
+
+    async def execute(self):
+        return [
+            await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.commands
+        ]
+
+
+class TestRedisRetention:
+    """Test suite for RedisStorageProvider expiry and caps (fake Redis)"""
+
+    @pytest.fixture
+    def provider(self):
+        with patch("redis.asyncio.Redis"):
+            provider = RedisStorageProvider(key_prefix="test", ttl_hours=1)
+
+        fake = FakeRedis()
+
+        async def get_connection():
+            return fake
+
+        provider.connection_service.get_connection = get_connection
+        provider._fake = fake
+        return provider
+
+    def indexed(self, provider, context_id):
+        """Keys of the indexes still listing a context"""
+        fake = provider._fake
+        return {key for key, zset in fake.zsets.items() if context_id in zset} | {
+            key for key, items in fake.lists.items() if context_id in items
+        }
+
+    async def test_expired_contexts_are_removed_with_their_indexes(self, provider):
+        provider.context_service.retention = RetentionPolicy(sweep_batch_size=2)
+        expiring = [
+            await provider.save_context(f"scratch {i}", 1, project_id="p1", tags=["tmp"])
+            for i in range(3)
+        ]
+        kept = await provider.save_context("design", 5, project_id="p1", tags=["tmp"])
+        context = await provider.load_context(expiring[0])
+        assert context["expires_ms"] == context["created_ms"] + 24 * MS_PER_HOUR
+
+        later = context["created_ms"] + 25 * MS_PER_HOUR
+        with patch(REDIS_NOW_MS, return_value=later):
+            assert await provider.cleanup_expired() == 3
+
+        for context_id in expiring:
+            assert await provider.load_context(context_id) is None
+            assert self.indexed(provider, context_id) == set()
+        assert await provider.load_context(kept) is not None
+        assert "test:expiry" in self.indexed(provider, kept)
+
+    async def test_projects_over_cap_lose_oldest(self, provider):
+        provider.context_service.retention = RetentionPolicy(
+            max_contexts_per_project=2, sweep_batch_size=1
+        )
+        ids = [await provider.save_context(f"p1 note {i}", 9, project_id="p1") for i in range(4)]
+        for i, context_id in enumerate(ids):  # distinct creation times
+            provider._fake.zsets["test:project:p1:timeline"][context_id] = i
+        other = await provider.save_context("p2 note", 9, project_id="p2")
+
+        assert await provider.cleanup_expired() == 2
+        assert [await provider.load_context(i) is not None for i in ids] == [
+            False, False, True, True
+        ]
+        assert await provider.load_context(other) is not None
+        assert self.indexed(provider, ids[0]) == set()
+
+    async def test_importance_change_moves_expiry(self, provider):
+        context_id = await provider.save_context("scratch", 1, project_id="p1")
+        assert await provider.update_context(context_id, importance_level=9)
+        context = await provider.load_context(context_id)
+        assert context["expires_ms"] == context["created_ms"] + MS_PER_YEAR
+        assert provider._fake.zsets["test:expiry"][context_id] == context["expires_ms"]
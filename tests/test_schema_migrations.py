@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Tests for Schema Migrations
+
+Tests PRAGMA user_version migrations: fresh databases, adoption of databases
+created before versioning, idempotence and the once-per-manager fast path.
+"""
+
+import asyncio
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import aiosqlite
+import pytest
+import pytest_asyncio
+
+from extended_memory_mcp.core.errors import StorageError
+from extended_memory_mcp.core.memory.database_manager import DatabaseManager
+from extended_memory_mcp.core.memory.migrations import (
+    MIGRATIONS,
+    SCHEMA_VERSION,
+    Migration,
+    apply_migrations,
+    get_schema_version,
+)
+
+
+def read_schema(db_path):
+    """Return (user_version, table names, index names) of a database file"""
+    conn = sqlite3.connect(db_path)
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        rows = conn.execute("SELECT type, name FROM sqlite_master").fetchall()
+    finally:
+        conn.close()
+    tables = {name for kind, name in rows if kind == "table"}
+    indexes = {name for kind, name in rows if kind == "index"}
+    return version, tables, indexes
+
+
+class TestSchemaMigrations:
+    """Test suite for the migration engine and DatabaseManager bootstrap"""
+
+    @pytest.fixture
+    def db_path(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield str(Path(temp_dir) / "migrations.db")
+
+    @pytest_asyncio.fixture
+    async def manager(self, db_path):
+        manager = DatabaseManager(db_path)
+        yield manager
+        await manager.close()
+
+    def test_migrations_are_ordered(self):
+        versions = [m.version for m in MIGRATIONS]
+        assert versions == list(range(1, len(MIGRATIONS) + 1))
+        assert SCHEMA_VERSION == versions[-1]
+
+    @pytest.mark.asyncio
+    async def test_fresh_database_gets_latest_schema(self, manager, db_path):
+        assert await manager.initialize_database() is True
+
+        version, tables, indexes = read_schema(db_path)
+        assert version == SCHEMA_VERSION
+        assert {"contexts", "tags", "context_tags", "projects"} <= tables
+        assert {"idx_contexts_project_created_ms", "idx_context_tags_composite"} <= indexes
+
+    @pytest.mark.asyncio
+    async def test_unversioned_database_is_adopted(self, temp_test_db):
+        # conftest database: created by SQL script, user_version 0, has data columns
+        conn = sqlite3.connect(temp_test_db)
+        conn.execute("INSERT INTO contexts (content, importance_level) VALUES ('kept', 5)")
+        conn.commit()
+        conn.close()
+
+        manager = DatabaseManager(temp_test_db)
+        try:
+            assert await manager.ensure_database() is True
+        finally:
+            await manager.close()
+
+        version, _, indexes = read_schema(temp_test_db)
+        assert version == SCHEMA_VERSION
+        assert "idx_contexts_project_created_ms" in indexes
+        assert "idx_contexts_project_importance" not in indexes
+
+        conn = sqlite3.connect(temp_test_db)
+        rows = conn.execute("SELECT content, created_ms > 0 FROM contexts").fetchall()
+        assert rows == [("kept", 1)]
+        conn.close()
+
+    @pytest.mark.asyncio
+    async def test_reapplying_is_a_no_op(self, db_path):
+        async with aiosqlite.connect(db_path) as db:
+            assert await apply_migrations(db) == SCHEMA_VERSION
+            changes = db.total_changes
+            assert await apply_migrations(db) == SCHEMA_VERSION
+            assert db.total_changes == changes
+
+    @pytest.mark.asyncio
+    async def test_only_pending_migrations_run(self, db_path):
+        first = Migration(1, "create", ["CREATE TABLE t (x)"])
+        second = Migration(2, "seed", ["INSERT INTO t VALUES (1)"])
+
+        async with aiosqlite.connect(db_path) as db:
+            assert await apply_migrations(db, [first]) == 1
+            assert await apply_migrations(db, [first, second]) == 2
+            async with db.execute("SELECT COUNT(*) FROM t") as cursor:
+                assert (await cursor.fetchone())[0] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_migration_is_rolled_back(self, db_path):
+        broken = Migration(1, "broken", ["CREATE TABLE t (x)", "INSERT INTO missing VALUES (1)"])
+
+        async with aiosqlite.connect(db_path) as db:
+            with pytest.raises(StorageError, match="migration 1"):
+                await apply_migrations(db, [broken])
+            assert await get_schema_version(db) == 0
+            async with db.execute("SELECT name FROM sqlite_master WHERE name = 't'") as cursor:
+                assert await cursor.fetchone() is None
+
+    @pytest.mark.asyncio
+    async def test_newer_database_is_refused(self, manager, db_path):
+        conn = sqlite3.connect(db_path)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+        conn.close()
+
+        async with aiosqlite.connect(db_path) as db:
+            with pytest.raises(StorageError, match="newer than supported"):
+                await apply_migrations(db)
+        assert await manager.ensure_database() is False
+
+    @pytest.mark.asyncio
+    async def test_ensure_database_skips_checks_once_ready(self, manager):
+        assert await manager.ensure_database() is True
+
+        def no_connection(readonly=False):
+            raise AssertionError("schema checked again")
+
+        manager.pool.connection = no_connection
+        assert await manager.ensure_database() is True
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_use_migrates_once(self, manager, db_path, monkeypatch):
+        calls = []
+
+        async def counting_apply(db):
+            calls.append(db)
+            return await apply_migrations(db)
+
+        monkeypatch.setattr(
+            "extended_memory_mcp.core.memory.database_manager.apply_migrations", counting_apply
+        )
+
+        results = await asyncio.gather(*(manager.ensure_database() for _ in range(8)))
+        assert all(results)
+        assert len(calls) == 1
+        assert read_schema(db_path)[0] == SCHEMA_VERSION
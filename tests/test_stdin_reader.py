@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests for Stdin Reader
+
+Tests line reassembly, size limits and EOF handling of the asyncio stdin reader.
+"""
+
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+from extended_memory_mcp.core.errors import ValidationError
+from extended_memory_mcp.protocol.stdin_reader import StdinReader, create_stdin_reader
+
+
+class TestStdinReader:
+    """Test suite for StdinReader"""
+
+    @pytest.fixture
+    def pipe(self):
+        """Create pipe: (binary read stream, write fd)"""
+        read_fd, write_fd = os.pipe()
+        read_stream = os.fdopen(read_fd, "rb", buffering=0)
+        yield read_stream, write_fd
+        read_stream.close()
+        try:
+            os.close(write_fd)
+        except OSError:
+            pass
+
+    async def test_reassembles_partial_lines(self, pipe):
+        """Test that a line split over several writes is returned whole"""
+        read_stream, write_fd = pipe
+        reader = StdinReader(max_line_bytes=1024, stream=read_stream)
+        await reader.start()
+
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.01, os.write, write_fd, b'{"jsonrpc": "2.0", ')
+        loop.call_later(0.02, os.write, write_fd, b'"id": 1}\n{"id"')
+
+        assert await reader.readline() == b'{"jsonrpc": "2.0", "id": 1}\n'
+
+        os.write(write_fd, b": 2}\n")
+        assert await reader.readline() == b'{"id": 2}\n'
+        reader.close()
+
+    async def test_eof_returns_final_line_then_none(self, pipe):
+        """Test that an unterminated last line is returned before EOF"""
+        read_stream, write_fd = pipe
+        reader = StdinReader(max_line_bytes=1024, stream=read_stream)
+
+        os.write(write_fd, b'{"id": 1}\n{"id": 2}')
+        os.close(write_fd)
+
+        assert await reader.readline() == b'{"id": 1}\n'
+        assert await reader.readline() == b'{"id": 2}'
+        assert await reader.readline() is None
+        reader.close()
+
+    async def test_oversized_line_rejected_and_skipped(self, pipe):
+        """Test that lines over the limit raise and do not corrupt the next line"""
+        read_stream, write_fd = pipe
+        reader = StdinReader(max_line_bytes=64, stream=read_stream)
+        await reader.start()
+
+        loop = asyncio.get_running_loop()
+        big = b'{"data": "' + b"x" * 500 + b'"}\n'
+        loop.call_later(0.01, os.write, write_fd, big[:200])
+        loop.call_later(0.02, os.write, write_fd, big[200:] + b'{"id": 3}\n')
+
+        with pytest.raises(ValidationError, match="maximum size"):
+            await reader.readline()
+
+        assert await reader.readline() == b'{"id": 3}\n'
+        reader.close()
+
+    async def test_regular_file_fallback(self):
+        """Test that stdin redirected from a regular file is still readable"""
+        with tempfile.TemporaryFile() as f:
+            f.write(b'{"id": 1}\n{"id": 2}\n')
+            f.seek(0)
+
+            reader = StdinReader(max_line_bytes=1024, stream=f)
+            lines = []
+            while True:
+                line = await reader.readline()
+                if line is None:
+                    break
+                lines.append(line)
+
+            assert lines == [b'{"id": 1}\n', b'{"id": 2}\n']
+
+    def test_factory_uses_configured_limit(self):
+        """Test factory converts defaults.server.max_request_size_mb to bytes"""
+        assert create_stdin_reader().max_line_bytes == 10 * 1024 * 1024
+        assert create_stdin_reader(max_request_size_mb=1).max_line_bytes == 1024 * 1024
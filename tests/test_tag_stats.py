@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests for the trigger-maintained tag_stats table
+
+Tests that tag_stats always equals the aggregate over context_tags and
+contexts (per project and for all projects) through saves, deletes,
+unlinks and the migration backfill, and get_popular_tags on top of it.
+"""
+
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import aiosqlite
+import pytest
+import pytest_asyncio
+
+from extended_memory_mcp.core.memory.context_repository import ContextRepository
+from extended_memory_mcp.core.memory.database_manager import DatabaseManager
+from extended_memory_mcp.core.memory.migrations import (
+    ALL_PROJECTS,
+    MIGRATIONS,
+    PLAIN_CONTENT_FUNCTION,
+    apply_migrations,
+)
+from extended_memory_mcp.core.memory.tags_repository import TagsRepository
+from extended_memory_mcp.core.storage.content_codec import decompress
+from extended_memory_mcp.core.storage.timestamps import to_epoch_ms
+
+# Aggregate that tag_stats must always match
+EXPECTED_STATS = f"""
+    SELECT '{ALL_PROJECTS}', ct.tag_id, COUNT(*), MAX(c.created_ms)
+    FROM context_tags ct JOIN contexts c ON c.id = ct.context_id
+    GROUP BY ct.tag_id
+    UNION ALL
+    SELECT c.project_id, ct.tag_id, COUNT(*), MAX(c.created_ms)
+    FROM context_tags ct JOIN contexts c ON c.id = ct.context_id
+    WHERE c.project_id IS NOT NULL
+    GROUP BY c.project_id, ct.tag_id
+"""
+
+
+def read_stats(db_path):
+    """Return (stored, expected) tag_stats rows as sets"""
+    conn = sqlite3.connect(db_path)
+    try:
+        stored = set(conn.execute("SELECT * FROM tag_stats").fetchall())
+        expected = set(conn.execute(EXPECTED_STATS).fetchall())
+    finally:
+        conn.close()
+    return stored, expected
+
+
+class TestTagStats:
+    """Test suite for tag_stats triggers and get_popular_tags"""
+
+    @pytest.fixture
+    def db_path(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield str(Path(temp_dir) / "tag_stats.db")
+
+    @pytest_asyncio.fixture
+    async def manager(self, db_path):
+        manager = DatabaseManager(db_path)
+        await manager.initialize_database()
+        yield manager
+        await manager.close()
+
+    @pytest.fixture
+    def context_repo(self, manager):
+        return ContextRepository(manager)
+
+    @pytest.fixture
+    def tags_repo(self, manager):
+        return TagsRepository(manager)
+
+    @pytest.mark.asyncio
+    async def test_saves_are_counted_per_project_and_overall(self, context_repo, db_path):
+        await context_repo.save_context("one", 5, "alpha", ["python", "api"])
+        await context_repo.save_context("two", 5, "beta", ["python"])
+        await context_repo.save_contexts_batch(
+            [
+                {"content": "three", "importance_level": 5, "project_id": "alpha", "tags": ["api"]},
+                {"content": "four", "importance_level": 5, "project_id": None, "tags": ["python"]},
+            ]
+        )
+
+        stored, expected = read_stats(db_path)
+        assert stored == expected
+        counts = {(row[0], row[1]): row[2] for row in stored}
+        assert sorted(counts.values()) == [1, 1, 2, 2, 3]
+        assert (ALL_PROJECTS, 1) in counts
+
+    @pytest.mark.asyncio
+    async def test_deletes_and_unlinks_are_subtracted(self, context_repo, tags_repo, db_path):
+        first = await context_repo.save_context("one", 5, "alpha", ["python", "api"])
+        second = await context_repo.save_context("two", 5, "alpha", ["python"])
+        third = await context_repo.save_context("three", 5, "beta", ["api"])
+
+        # Deleting the newest use of a tag moves last_used back
+        assert await context_repo.delete_context(third)
+        stored, expected = read_stats(db_path)
+        assert stored == expected
+
+        assert await tags_repo.delete_context_tags(second)
+        stored, expected = read_stats(db_path)
+        assert stored == expected
+
+        assert await context_repo.delete_context(first)
+        stored, expected = read_stats(db_path)
+        assert stored == expected == set()
+
+    @pytest.mark.asyncio
+    async def test_re_linking_an_existing_tag_is_not_counted_twice(
+        self, context_repo, tags_repo, db_path
+    ):
+        context_id = await context_repo.save_context("one", 5, "alpha", ["python"])
+        assert await tags_repo.save_context_tags(context_id, ["python", "Python "])
+
+        stored, expected = read_stats(db_path)
+        assert stored == expected
+        assert {row[2] for row in stored} == {1}
+
+    @pytest.mark.asyncio
+    async def test_migration_backfills_existing_links(self, tmp_path):
+        db_path = str(tmp_path / "backfill.db")
+        async with aiosqlite.connect(db_path) as db:
+            await apply_migrations(db, MIGRATIONS[:4])
+            await db.executescript(
+                """
+                INSERT INTO contexts (id, project_id, content, importance_level, created_at)
+                VALUES (1, 'alpha', 'one', 5, '2026-01-01T10:00:00.5'),
+                       (2, 'beta', 'two', 5, '2026-01-02 10:00:00'),
+                       (3, NULL, 'three', 5, '2026-01-03T10:00:00');
+                INSERT INTO tags (id, name) VALUES (1, 'python'), (2, 'api');
+                INSERT INTO context_tags VALUES (1, 1), (2, 1), (3, 1), (1, 2), (99, 2);
+                """
+            )
+            await db.commit()
+            await apply_migrations(db)
+
+        stored, expected = read_stats(db_path)
+        assert stored == expected
+        assert (ALL_PROJECTS, 1, 3, to_epoch_ms("2026-01-03T10:00:00")) in stored
+        # Links to missing contexts are not counted
+        assert (ALL_PROJECTS, 2, 1, to_epoch_ms("2026-01-01T10:00:00.5")) in stored
+
+    @pytest.mark.asyncio
+    async def test_popular_tags_rank_by_usage_then_recent_single_use(
+        self, context_repo, tags_repo
+    ):
+        for _ in range(3):
+            await context_repo.save_context("py", 5, "alpha", ["python"])
+        for _ in range(2):
+            await context_repo.save_context("api", 5, "beta", ["api"])
+        await context_repo.save_context("new", 5, "alpha", ["fresh"])
+
+        popular = await tags_repo.get_popular_tags(limit=10, min_usage=2, recent_hours=24)
+        assert popular == [
+            {"tag": "python", "count": 3},
+            {"tag": "api", "count": 2},
+            {"tag": "fresh", "count": 1},
+        ]
+
+        alpha = await tags_repo.get_popular_tags(limit=10, min_usage=2, project_id="alpha")
+        assert [tag["tag"] for tag in alpha] == ["python", "fresh"]
+
+        limited = await tags_repo.get_popular_tags(limit=1, min_usage=2)
+        assert limited == [{"tag": "python", "count": 3}]
+
+    @pytest.mark.asyncio
+    async def test_old_single_use_tags_are_not_recent(self, tags_repo, manager, db_path):
+        conn = sqlite3.connect(db_path)
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.create_function(PLAIN_CONTENT_FUNCTION, 2, decompress)
+        conn.execute(
+            "INSERT INTO contexts (project_id, content, importance_level, created_at)"
+            " VALUES ('alpha', 'old', 5, '2020-01-01 00:00:00')"
+        )
+        conn.execute("INSERT INTO tags (name) VALUES ('stale')")
+        conn.execute("INSERT INTO context_tags VALUES (1, 1)")
+        conn.commit()
+        conn.close()
+
+        assert await tags_repo.get_popular_tags(min_usage=2, recent_hours=24) == []
+        assert await tags_repo.get_popular_tags(min_usage=1) == [{"tag": "stale", "count": 1}]
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests for integer epoch-millisecond timestamps
+
+Tests the timestamps helpers, the created_ms migration backfill and insert
+trigger, and that the SQLite and Redis providers serve created_ms and an
+identically formatted created_at.
+"""
+
+import re
+import sqlite3
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import aiosqlite
+import pytest
+import pytest_asyncio
+
+from extended_memory_mcp.core.memory.migrations import MIGRATIONS, apply_migrations
+from extended_memory_mcp.core.storage.providers.redis.redis_provider import RedisStorageProvider
+from extended_memory_mcp.core.storage.providers.sqlite.sqlite_provider import (
+    SQLiteStorageProvider,
+)
+from extended_memory_mcp.core.storage.timestamps import (
+    context_ms,
+    format_timestamp,
+    now_ms,
+    present_context,
+    to_epoch_ms,
+)
+
+ISO_UTC_MS = re.compile(r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d{3}\+00:00")
+
+# 2026-01-01 10:00:00 UTC
+JAN_FIRST_MS = 1767261600000
+
+
+class TestTimestampHelpers:
+    """Test suite for the timestamps module"""
+
+    def test_conversions(self):
+        assert to_epoch_ms("2026-01-01T10:00:00+00:00") == JAN_FIRST_MS
+        assert to_epoch_ms("2026-01-01T10:00:00Z") == JAN_FIRST_MS
+        assert to_epoch_ms("2026-01-01T11:00:00.250+01:00") == JAN_FIRST_MS + 250
+        assert to_epoch_ms(datetime(2026, 1, 1, 10, tzinfo=timezone.utc)) == JAN_FIRST_MS
+        assert to_epoch_ms(JAN_FIRST_MS) == JAN_FIRST_MS
+        naive = datetime(2026, 1, 1, 10)
+        assert to_epoch_ms("2026-01-01T10:00:00") == int(naive.timestamp() * 1000)
+
+    @pytest.mark.parametrize("value", [None, "", "yesterday", True])
+    def test_unknown_values(self, value):
+        assert to_epoch_ms(value) is None
+
+    def test_format_and_present(self):
+        assert format_timestamp(JAN_FIRST_MS + 5) == "2026-01-01T10:00:00.005+00:00"
+        assert format_timestamp(None) == ""
+
+        legacy = present_context({"id": 1, "created_at": "2026-01-01T10:00:00Z"})
+        assert legacy["created_ms"] == JAN_FIRST_MS
+        assert legacy["created_at"] == "2026-01-01T10:00:00.000+00:00"
+        assert present_context({"id": 2})["created_at"] == ""
+        assert context_ms({"created_ms": 7, "created_at": "2026-01-01"}) == 7
+
+    def test_now_ms(self):
+        before = int(datetime.now(timezone.utc).timestamp() * 1000)
+        assert before - 1 <= now_ms() <= before + 1000
+
+
+class TestCreatedMsMigration:
+    """Test suite for the created_ms migration"""
+
+    @pytest.mark.asyncio
+    async def test_backfill_matches_python_conversion(self, tmp_path):
+        db_path = str(tmp_path / "ms.db")
+        stored = [
+            "2026-01-01T10:00:00.123456",  # datetime.now().isoformat(): local time
+            "2026-01-01 10:00:00",  # CURRENT_TIMESTAMP: UTC
+            "2026-01-01T12:00:00+02:00",
+        ]
+        async with aiosqlite.connect(db_path) as db:
+            await apply_migrations(db, MIGRATIONS[:5])
+            await db.executemany(
+                "INSERT INTO contexts (content, importance_level, created_at) VALUES ('x', 5, ?)",
+                [(value,) for value in stored],
+            )
+            await db.commit()
+            await apply_migrations(db)
+
+        conn = sqlite3.connect(db_path)
+        values = [row[0] for row in conn.execute("SELECT created_ms FROM contexts ORDER BY id")]
+        conn.close()
+        assert values == [
+            to_epoch_ms(stored[0]),
+            JAN_FIRST_MS,
+            JAN_FIRST_MS,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_inserts_without_created_ms_are_filled(self, tmp_path):
+        db_path = str(tmp_path / "fill.db")
+        async with aiosqlite.connect(db_path) as db:
+            await apply_migrations(db)
+            await db.execute(
+                "INSERT INTO contexts (content, importance_level, created_at)"
+                " VALUES ('old writer', 5, '2026-01-01 10:00:00')"
+            )
+            await db.execute("INSERT INTO contexts (content, importance_level) VALUES ('now', 5)")
+            await db.execute(
+                "INSERT INTO contexts (content, importance_level, created_ms) VALUES ('set', 5, 42)"
+            )
+            await db.commit()
+            cursor = await db.execute("SELECT created_ms FROM contexts ORDER BY id")
+            old, current, explicit = [row[0] for row in await cursor.fetchall()]
+
+        assert old == JAN_FIRST_MS
+        assert abs(current - now_ms()) < 5000
+        assert explicit == 42
+
+
+class TestProvidersAgree:
+    """Test that both providers serve the same timestamp fields"""
+
+    @pytest_asyncio.fixture
+    async def sqlite_provider(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            provider = SQLiteStorageProvider(str(Path(temp_dir) / "agree.db"))
+            await provider.initialize()
+            yield provider
+            await provider.close()
+
+    @pytest.fixture
+    def redis_provider(self):
+        with patch("redis.asyncio.Redis"):
+            provider = RedisStorageProvider(key_prefix="test", ttl_hours=1)
+        stored = {}
+        redis = AsyncMock()
+
+        async def set_value(key, value, ex=None):
+            stored[key] = value
+
+        async def get_value(key):
+            return stored.get(key)
+
+        redis.set.side_effect = set_value
+        redis.get.side_effect = get_value
+        provider.connection_service.get_connection = AsyncMock(return_value=redis)
+        provider._stored = stored
+        return provider
+
+    @pytest.mark.asyncio
+    async def test_created_fields(self, sqlite_provider, redis_provider):
+        start = now_ms()
+        sqlite_id = await sqlite_provider.save_context("note", 5, project_id="p")
+        redis_id = await redis_provider.save_context("note", 5, project_id="p")
+
+        for provider, context_id in ((sqlite_provider, sqlite_id), (redis_provider, redis_id)):
+            context = await provider.load_context(str(context_id))
+            assert start <= context["created_ms"] <= now_ms()
+            assert ISO_UTC_MS.fullmatch(context["created_at"])
+            assert to_epoch_ms(context["created_at"]) == context["created_ms"]
+
+    @pytest.mark.asyncio
+    async def test_redis_stores_only_created_ms(self, redis_provider):
+        context_id = await redis_provider.save_context("note", 5)
+        key = redis_provider.connection_service.make_key("context", context_id)
+        raw = redis_provider._stored[key]
+        assert '"created_ms"' in raw and '"created_at"' not in raw
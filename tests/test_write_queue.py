@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+
+# Extended Memory MCP Server
+# Copyright (c) 2024 Sergey Smirnov
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Extended Memory MCP Server
+# Copyright (C) 2025 Sergey Smirnov
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests for the group-commit write queue
+
+Tests that concurrent writes share transactions, that every caller gets
+its own result or error, group size limits, cancellation and shutdown,
+and saves and deletes through ContextRepository.
+"""
+
+import asyncio
+import sqlite3
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import aiosqlite
+import pytest
+import pytest_asyncio
+
+from extended_memory_mcp.core.errors import StorageError
+from extended_memory_mcp.core.memory.connection_pool import SQLiteConnectionPool
+from extended_memory_mcp.core.memory.context_repository import ContextRepository
+from extended_memory_mcp.core.memory.database_manager import DatabaseManager
+from extended_memory_mcp.core.memory.write_queue import WriteQueue, create_write_queue
+
+
+def insert(name):
+    """Write adding one item; returns its id"""
+
+    async def write(db):
+        cursor = await db.execute("INSERT INTO items (name) VALUES (?)", (name,))
+        return cursor.lastrowid
+
+    return write
+
+
+class TestWriteQueue:
+    """Test suite for WriteQueue"""
+
+    @pytest.fixture
+    def db_path(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield str(Path(temp_dir) / "queue.db")
+
+    @pytest_asyncio.fixture
+    async def pool(self, db_path):
+        pool = SQLiteConnectionPool(db_path, readers=1)
+        async with pool.connection() as db:
+            await db.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT UNIQUE)")
+            await db.commit()
+        yield pool
+        await pool.close()
+
+    def stored_names(self, db_path):
+        conn = sqlite3.connect(db_path)
+        names = {row[0] for row in conn.execute("SELECT name FROM items")}
+        conn.close()
+        return names
+
+    async def test_concurrent_writes_share_commits(self, pool, db_path):
+        """Test that concurrent callers each get their id from a few commits"""
+        queue = WriteQueue(pool, window_ms=5, max_batch=64)
+
+        ids = await asyncio.gather(*(queue.submit(insert(f"n{i}")) for i in range(20)))
+
+        assert sorted(ids) == list(range(1, 21))
+        assert queue.writes == 20
+        assert queue.commits == 1
+        assert self.stored_names(db_path) == {f"n{i}" for i in range(20)}
+
+    async def test_failing_write_is_rolled_back_alone(self, pool, db_path):
+        """Test that one caller's error does not affect the rest of its group"""
+        queue = WriteQueue(pool, window_ms=5)
+
+        async def insert_twice(db):
+            await db.execute("INSERT INTO items (name) VALUES ('partial')")
+            await db.execute("INSERT INTO items (name) VALUES ('a')")  # duplicate
+
+        results = await asyncio.gather(
+            queue.submit(insert("a")),
+            queue.submit(insert_twice),
+            queue.submit(insert("b")),
+            return_exceptions=True,
+        )
+
+        assert isinstance(results[1], sqlite3.IntegrityError)
+        assert results[0] != results[2]
+        assert queue.commits == 1
+        assert self.stored_names(db_path) == {"a", "b"}
+
+    async def test_groups_are_capped(self, pool):
+        """Test that a group never holds more than max_batch writes"""
+        queue = WriteQueue(pool, window_ms=50, max_batch=4)
+
+        await asyncio.gather(*(queue.submit(insert(f"n{i}")) for i in range(10)))
+
+        assert queue.writes == 10
+        assert queue.commits == 3
+
+    async def test_without_window_writes_queue_behind_running_group(self, pool):
+        """Test that window 0 still groups writes arriving during a commit"""
+        queue = WriteQueue(pool, window_ms=0)
+
+        await asyncio.gather(*(queue.submit(insert(f"n{i}")) for i in range(10)))
+
+        assert queue.writes == 10
+        assert queue.commits < 10
+
+    async def test_failed_commit_fails_every_caller(self, pool, db_path):
+        """Test that a commit error reaches all callers and nothing is kept"""
+        queue = WriteQueue(pool, window_ms=5)
+
+        with patch.object(aiosqlite.Connection, "commit", side_effect=sqlite3.OperationalError):
+            results = await asyncio.gather(
+                queue.submit(insert("a")), queue.submit(insert("b")), return_exceptions=True
+            )
+
+        assert all(isinstance(r, sqlite3.OperationalError) for r in results)
+        assert self.stored_names(db_path) == set()
+
+    async def test_cancelled_write_is_dropped(self, pool, db_path):
+        """Test that a write cancelled before its group ran is not executed"""
+        queue = WriteQueue(pool, window_ms=20)
+
+        dropped = asyncio.ensure_future(queue.submit(insert("dropped")))
+        kept = asyncio.ensure_future(queue.submit(insert("kept")))
+        await asyncio.sleep(0)
+        dropped.cancel()
+
+        assert await kept == 1
+        assert self.stored_names(db_path) == {"kept"}
+
+    async def test_close_commits_pending_writes(self, pool, db_path):
+        """Test that close() waits for queued writes"""
+        queue = WriteQueue(pool, window_ms=20)
+        task = asyncio.ensure_future(queue.submit(insert("late")))
+        await asyncio.sleep(0)
+
+        await queue.close()
+
+        assert task.done() and task.result() == 1
+        assert self.stored_names(db_path) == {"late"}
+
+    def test_factory_reads_configured_defaults(self, pool):
+        """Test that create_write_queue uses defaults.storage settings"""
+        queue = create_write_queue(pool)
+        assert queue.window == 0
+        assert queue.max_batch == 64
+
+        assert create_write_queue(pool, window_ms=2, max_batch=8).window == 0.002
+
+    async def test_stopped_flusher_fails_waiting_callers(self, pool):
+        """Test that callers do not hang if the flusher task is cancelled"""
+        queue = WriteQueue(pool, window_ms=1000)
+        task = asyncio.ensure_future(queue.submit(insert("never")))
+        await asyncio.sleep(0)
+
+        queue._flusher.cancel()
+
+        with pytest.raises(StorageError, match="Write queue stopped"):
+            await asyncio.wait_for(task, timeout=5)
+
+
+class TestRepositoryWrites:
+    """Test suite for saves and deletes through the write queue"""
+
+    @pytest_asyncio.fixture
+    async def repo(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manager = DatabaseManager(str(Path(temp_dir) / "repo.db"))
+            await manager.ensure_database()
+            yield ContextRepository(manager)
+            await manager.close()
+
+    async def test_concurrent_saves_get_distinct_ids(self, repo):
+        """Test that concurrent save_context calls are coalesced"""
+        queue = repo.db_manager.write_queue
+
+        ids = await asyncio.gather(
+            *(repo.save_context(f"note {i}", 5, "proj", tags=[f"t{i % 3}"]) for i in range(30))
+        )
+
+        assert len(set(ids)) == 30 and None not in ids
+        assert queue.commits < 30
+        for context_id, i in zip(ids, range(30)):
+            assert (await repo.get_context_by_id(context_id))["content"] == f"note {i}"
+
+    async def test_deletes_report_their_own_rows(self, repo):
+        """Test that each delete_context caller learns whether its row existed"""
+        context_id = await repo.save_context("gone soon", 5)
+
+        results = await asyncio.gather(repo.delete_context(context_id), repo.delete_context(999))
+
+        assert results == [True, False]
+        assert await repo.count_contexts() == 0